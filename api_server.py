@@ -0,0 +1,532 @@
+"""
+Scheduler HTTP API Module
+
+This module serves the scheduler over HTTP, so that other systems (an ATS,
+automation) can use it without driving the Streamlit interface. One bot, one
+calendar and one invite dispatcher are loaded for the lifetime of the server.
+
+It provides:
+- An asyncio HTTP/1.1 server with keep-alive and JSON requests and responses
+- Intent classification, with concurrent requests classified together by
+  one model call
+- Meeting type and slot suggestions, availability checks, slot holds and
+  booking
+- Predictions and calendar queries on a thread pool, so the event loop only
+  does I/O, and invites sent in the background by the dispatch queue
+- Reminders and follow-ups for booked meetings, when given a timer service
+
+Endpoints:
+- GET  /health
+- POST /intents        {"messages": [...], "speakers": [...]}
+- POST /meeting-types  {"department", "durations": [...], "k"}
+- POST /slots          {"meeting_type", "timezone", "start_from", "count", "participants",
+                        "session_id"}
+- POST /availability   {"start", "duration", "timezone", "participants"}
+- POST /holds          {"start", "duration", "timezone", "recruiter_email",
+                        "candidate_email", "meeting_type", "session_id", "ttl_seconds"}
+- DELETE /holds/<hold_id>
+- POST /bookings       {"title", "start", "duration", "timezone", "recruiter_email",
+                        "candidate_email", "meeting_type", "location", "description",
+                        "session_id", "hold_id", "rrule", "exdates": [...]}
+- GET  /bookings/<job_id>
+- POST /responses      {"uid", "partstat"}
+
+A booking with a "hold_id" must come from the session that placed the hold
+and match the held participants and times.
+
+Datetimes are ISO 8601; values without an offset are read in the request's
+timezone (default: UTC).
+
+Run from the repository root:
+
+    python -m api_server [--host HOST] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from calendar_utils import CalendarManager
+from config import API_CONFIG, CALENDAR_CONFIG
+from event_store import EventStore
+from invite_queue import InviteDispatcher
+from recurrence import Recurrence
+from scheduling_bot import SchedulingBot
+from timer_service import MeetingReminders, TimerService
+from timezones import get_timezone
+
+logger = logging.getLogger(__name__)
+
+# iCalendar PARTSTAT values of an event attendee
+PARTSTATS = ('NEEDS-ACTION', 'ACCEPTED', 'DECLINED', 'TENTATIVE', 'DELEGATED')
+
+
+class ApiError(Exception):
+    """A request that is answered with an HTTP error status."""
+
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def _required(body, key):
+    if key not in body:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Missing field '{key}'")
+    return body[key]
+
+
+def _duration(value):
+    """A duration in whole minutes; the meeting type table has no finer grid."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not float(value).is_integer():
+        raise ApiError(HTTPStatus.BAD_REQUEST,
+                       f"Invalid duration: {value!r}, expected whole minutes")
+    return int(value)
+
+
+def _partstat(value):
+    """An attendee's iCalendar PARTSTAT, upper-cased."""
+    if not isinstance(value, str) or value.upper() not in PARTSTATS:
+        raise ApiError(HTTPStatus.BAD_REQUEST,
+                       f"Invalid partstat: {value!r}, expected one of {', '.join(PARTSTATS)}")
+    return value.upper()
+
+
+def _parse_datetime(value, timezone):
+    """Parse an ISO datetime; naive values are local to ``timezone``."""
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid datetime: {value!r}")
+    if dt.tzinfo is None:
+        dt = get_timezone(timezone).localize(dt)
+    return dt
+
+
+class IntentBatcher:
+    """
+    Classifies the messages of concurrent requests with one model call.
+
+    Requests that arrive while a batch is being classified wait for the next
+    batch, so batches grow with the load and an idle server answers a lone
+    request straight away.
+    """
+
+    def __init__(self, bot, executor, max_batch):
+        self.bot = bot
+        self.executor = executor
+        self.max_batch = max_batch
+        self._pending = []  # (messages, speakers, future)
+        self._running = False
+
+    async def classify(self, messages, speakers):
+        """Return the intent of each message."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((messages, speakers, future))
+        if not self._running:
+            self._running = True
+            asyncio.ensure_future(self._drain())
+        return await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                batch, size = [], 0
+                while self._pending and (not batch or size + len(self._pending[0][0])
+                                         <= self.max_batch):
+                    batch.append(self._pending.pop(0))
+                    size += len(batch[-1][0])
+
+                messages = [m for request in batch for m in request[0]]
+                speakers = [s for request in batch for s in request[1]]
+                try:
+                    intents = await loop.run_in_executor(
+                        self.executor, self.bot.classify_intents, messages, speakers)
+                except Exception as e:
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                offset = 0
+                for request_messages, _, future in batch:
+                    if not future.done():
+                        future.set_result(
+                            [str(i) for i in intents[offset:offset + len(request_messages)]])
+                    offset += len(request_messages)
+        finally:
+            self._running = False
+
+
+class SchedulerAPI:
+    """
+    HTTP front end of one SchedulingBot, CalendarManager and InviteDispatcher.
+
+    Calendar reads are serialized by a lock and run on the thread pool.
+    Bookings are a compare-and-book on the calendar, which records the
+    meeting as busy time for both participants before the invite is queued.
+    """
+
+    def __init__(self, bot=None, calendar=None, dispatcher=None, workers=None,
+                 max_intent_batch=None, max_body_bytes=None, timers=None):
+        """
+        Initialize the API. Defaults come from API_CONFIG.
+
+        Args:
+            bot (SchedulingBot, optional): Shared bot (default: a new one)
+            calendar (CalendarManager, optional): Shared calendar (default: a
+                new one)
+            dispatcher (InviteDispatcher, optional): Sends booking invites
+                (default: one on ``calendar``, started and stopped with the
+                server)
+            workers (int, optional): Thread pool size
+            max_intent_batch (int, optional): Most messages per model call
+            max_body_bytes (int, optional): Largest accepted request body
+            timers (TimerService, optional): Fires reminders and follow-ups
+                of bookings, started and stopped with the server (default:
+                none are sent)
+        """
+        self.bot = bot or SchedulingBot()
+        self.calendar = calendar or CalendarManager()
+        self._owns_dispatcher = dispatcher is None
+        self.dispatcher = dispatcher or InviteDispatcher(self.calendar)
+        self.executor = ThreadPoolExecutor(workers or API_CONFIG['workers'],
+                                           thread_name_prefix='scheduler-api')
+        self.intents = IntentBatcher(self.bot, self.executor,
+                                     max_intent_batch or API_CONFIG['max_intent_batch'])
+        self.max_body_bytes = max_body_bytes or API_CONFIG['max_body_bytes']
+        self.timers = timers
+        self.reminders = MeetingReminders(timers, self.dispatcher) if timers is not None else None
+        self.port = None
+        self._calendar_lock = threading.Lock()
+        self._server = None
+        self._connections = set()  # handler tasks of open connections
+        self._thread = None
+        self._routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/intents'): self.classify,
+            ('POST', '/meeting-types'): self.meeting_types,
+            ('POST', '/slots'): self.slots,
+            ('POST', '/availability'): self.availability,
+            ('POST', '/holds'): self.hold,
+            ('POST', '/bookings'): self.book,
+            ('POST', '/responses'): self.record_response,
+        }
+
+    async def start(self, host=None, port=None):
+        """Start listening; ``port=0`` picks a free port (see ``self.port``)."""
+        if self._owns_dispatcher:
+            self.dispatcher.start()
+        if self.timers is not None:
+            self.timers.start()
+        self._server = await asyncio.start_server(
+            self._handle_connection, host or API_CONFIG['host'],
+            API_CONFIG['port'] if port is None else port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def close(self):
+        """Stop accepting connections and release the workers."""
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise outlive the server
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._owns_dispatcher:
+            self.dispatcher.stop()
+        if self.timers is not None:
+            self.timers.stop()
+        self.executor.shutdown(wait=False)
+
+    async def serve_forever(self, host=None, port=None):
+        await self.start(host, port)
+        logger.info("Scheduler API listening on port %d", self.port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def start_in_thread(self, host=None, port=None):
+        """
+        Serve from an event loop on a background thread, e.g. when embedding
+        the API in another process or driving it from tests.
+
+        Returns:
+            int: The port listened on
+        """
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, name='scheduler-api',
+                                        daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(host, port), loop).result()
+        return self.port
+
+    def stop_thread(self):
+        """Close a server started with start_in_thread."""
+        loop = self._server.get_loop()
+        asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+        self._thread = None
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def _locked(self, function, *args):
+        with self._calendar_lock:
+            return function(*args)
+
+    # Handlers: parsed JSON body -> (status, JSON-serializable response)
+
+    async def health(self, body):
+        return HTTPStatus.OK, {'status': 'ok'}
+
+    async def classify(self, body):
+        messages = _required(body, 'messages')
+        if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'messages' must be a list of strings")
+        speakers = body.get('speakers') or ['Candidate'] * len(messages)
+        if len(speakers) != len(messages):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'speakers' must match 'messages'")
+        if not messages:
+            return HTTPStatus.OK, {'intents': []}
+        return HTTPStatus.OK, {'intents': await self.intents.classify(messages, speakers)}
+
+    async def meeting_types(self, body):
+        department = _required(body, 'department')
+        durations = body.get('durations') or [60]
+        ranked = await self._run(self.bot.suggest_time_slots, department,
+                                 [_duration(d) for d in durations], int(body.get('k', 3)))
+        return HTTPStatus.OK, {'meeting_types': [
+            [{'meeting_type': t, 'probability': float(p)} for t, p in options]
+            for options in ranked]}
+
+    async def slots(self, body):
+        timezone = body.get('timezone', 'UTC')
+        start_from = body.get('start_from')
+        if start_from is not None:
+            start_from = _parse_datetime(start_from, timezone)
+        slots = await self._run(self._locked, self.calendar.suggest_next_slots,
+                                body.get('meeting_type', 'Technical Interview'), timezone,
+                                start_from, int(body.get('count', 1)),
+                                body.get('participants'), None, None, body.get('session_id'))
+        return HTTPStatus.OK, {'slots': [slot.isoformat() for slot in slots]}
+
+    def _check(self, start, duration, timezone, participants):
+        local = start.astimezone(get_timezone(timezone))
+        available = self.calendar.check_availability(
+            local.date(), local.time().replace(tzinfo=None), duration, timezone, participants)
+        conflicts = self.calendar.find_conflicts(
+            participants, start, start + timedelta(minutes=duration)) if participants else []
+        return available, conflicts
+
+    async def availability(self, body):
+        timezone = body.get('timezone', 'UTC')
+        start = _parse_datetime(_required(body, 'start'), timezone)
+        available, conflicts = await self._run(
+            self._locked, self._check, start, _duration(body.get('duration', 60)), timezone,
+            body.get('participants') or [])
+        return HTTPStatus.OK, {'available': available, 'conflicts': conflicts}
+
+    def _meeting(self, body):
+        """The meeting a hold or booking request describes, and its participants."""
+        timezone = body.get('timezone', 'UTC')
+        start = _parse_datetime(_required(body, 'start'), timezone)
+        meeting_type = body.get('meeting_type', 'Technical Interview')
+        duration = _duration(body.get('duration')
+                             or CALENDAR_CONFIG['meeting_durations'].get(meeting_type, 60))
+        meeting_info = {
+            'title': body.get('title', f"{meeting_type} Interview"),
+            'start_time': start,
+            'end_time': start + timedelta(minutes=duration),
+            'location': body.get('location', ''),
+            'description': body.get('description', ''),
+            'recruiter_email': _required(body, 'recruiter_email'),
+            'candidate_email': _required(body, 'candidate_email'),
+            'meeting_type': meeting_type,
+            'timezone': timezone
+        }
+        if body.get('rrule'):
+            # Recurring meeting: start and duration describe the first occurrence
+            meeting_info['rrule'] = Recurrence.parse(body['rrule']).to_ical()
+            meeting_info['exdates'] = [_parse_datetime(exdate, timezone)
+                                       for exdate in body.get('exdates') or ()]
+        return meeting_info, [meeting_info['recruiter_email'], meeting_info['candidate_email']]
+
+    async def hold(self, body):
+        meeting_info, participants = self._meeting(body)
+        ttl_seconds = body.get('ttl_seconds')
+        hold = await self._run(self.calendar.hold_slot, participants,
+                               meeting_info['start_time'], meeting_info['end_time'],
+                               _required(body, 'session_id'),
+                               None if ttl_seconds is None else float(ttl_seconds))
+        if hold is None:
+            raise ApiError(HTTPStatus.CONFLICT, "The slot is busy or held")
+        return HTTPStatus.CREATED, {'hold_id': hold.hold_id,
+                                    'ttl_seconds': (self.calendar.holds.ttl_seconds
+                                                    if ttl_seconds is None else float(ttl_seconds))}
+
+    async def release_hold(self, hold_id):
+        if not await self._run(self.calendar.release_hold, hold_id):
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown or expired hold: {hold_id}")
+        return HTTPStatus.OK, {'released': hold_id}
+
+    def _book(self, meeting_info, participants, session_id, hold_id):
+        """Book a held or free slot (or series) atomically; returns the conflicts."""
+        if meeting_info.get('rrule'):
+            return self.calendar.book_recurring(
+                participants, meeting_info['start_time'], meeting_info['end_time'],
+                meeting_info['rrule'], meeting_info['exdates'], meeting_info['timezone'],
+                session_id=session_id)
+        if hold_id is not None:
+            if session_id is None:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Missing field 'session_id'")
+            if not self.calendar.confirm_hold(hold_id, participants, meeting_info['start_time'],
+                                              meeting_info['end_time'], session_id):
+                raise ApiError(HTTPStatus.CONFLICT,
+                               "Hold expired, does not match or the slot was taken")
+            return []
+        return self.calendar.book_slot(participants, meeting_info['start_time'],
+                                       meeting_info['end_time'], session_id)
+
+    async def book(self, body):
+        meeting_info, participants = self._meeting(body)
+        conflicts = await self._run(self._book, meeting_info, participants,
+                                    body.get('session_id'), body.get('hold_id'))
+        if conflicts:
+            raise ApiError(HTTPStatus.CONFLICT, "Participants are busy at that time",
+                           conflicts=conflicts)
+        job_id = await self._run(self.dispatcher.enqueue, meeting_info)
+        if self.reminders is not None:
+            await self._run(self.reminders.schedule_meeting, meeting_info)
+        return HTTPStatus.CREATED, {'job_id': job_id,
+                                    'uid': CalendarManager.invite_uid(meeting_info),
+                                    'start': meeting_info['start_time'].isoformat(),
+                                    'end': meeting_info['end_time'].isoformat()}
+
+    async def record_response(self, body):
+        if self.reminders is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Reminders are not enabled")
+        uid, partstat = _required(body, 'uid'), _partstat(_required(body, 'partstat'))
+        if not isinstance(uid, str):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid uid: {uid!r}")
+        await self._run(self.reminders.record_response, uid, partstat)
+        return HTTPStatus.OK, {'uid': uid, 'partstat': partstat}
+
+    async def booking_status(self, job_id):
+        status = await self._run(self.dispatcher.status, job_id)
+        if status is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown booking job: {job_id}")
+        return HTTPStatus.OK, status
+
+    async def dispatch(self, method, path, body):
+        """
+        Route one request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path, without the query string
+            body (bytes): Request body (JSON)
+
+        Returns:
+            tuple: (HTTPStatus, JSON-serializable response)
+        """
+        try:
+            if path.startswith('/bookings/') and method == 'GET':
+                return await self.booking_status(path[len('/bookings/'):])
+            if path.startswith('/holds/') and method == 'DELETE':
+                return await self.release_hold(path[len('/holds/'):])
+            handler = self._routes.get((method, path))
+            if handler is None:
+                if any(route_path == path for _, route_path in self._routes):
+                    raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+            try:
+                request = json.loads(body) if body else {}
+            except ValueError:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON")
+            if not isinstance(request, dict):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+            return await handler(request)
+        except ApiError as e:
+            return e.status, {'error': str(e), **e.details}
+        except (TypeError, ValueError, KeyError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            logger.exception("Request %s %s failed", method, path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"}
+
+    async def _handle_connection(self, reader, writer):
+        """Serve the requests of one keep-alive connection."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > self.max_body_bytes:
+                    status, response = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {
+                        'error': f"Body exceeds {self.max_body_bytes} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = await self.dispatch(method, target.split('?', 1)[0],
+                                                           body)
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                                  else connection == 'keep-alive')
+
+                payload = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # Client went away or sent a malformed request
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the scheduler over HTTP")
+    parser.add_argument('--host', default=API_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=API_CONFIG['port'])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        # Bookings share the event store with the Streamlit app
+        api = SchedulerAPI(calendar=CalendarManager(event_store=EventStore()),
+                           timers=TimerService())
+        asyncio.run(api.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
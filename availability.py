@@ -0,0 +1,332 @@
+"""
+Availability Index Module
+
+This module keeps every participant's busy time in memory so that the
+calendar manager can answer "is this slot free?" without scanning events.
+
+It provides:
+- A sorted, merged interval set per participant with O(log n) overlap queries
+- Buffer time handling around existing events
+- Bulk loading of busy events from calendar_dataset.csv
+"""
+
+import bisect
+import csv
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+import pytz
+from timezones import get_timezone, parse_utc_offset
+
+logger = logging.getLogger(__name__)
+
+
+def to_timestamp(dt):
+    """Convert a datetime to integer POSIX seconds (naive values are UTC)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class IntervalSet:
+    """
+    Union of busy intervals, kept sorted and merged.
+
+    Intervals are half-open [start, end) in integer seconds. Because merged
+    intervals are disjoint, their ends are sorted too, so an overlap query is
+    a single binary search.
+    """
+
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """Build a set from unsorted (start, end) pairs in O(n log n)."""
+        interval_set = cls()
+        starts, ends = interval_set.starts, interval_set.ends
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if ends and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        return interval_set
+
+    def add(self, start, end):
+        """Insert [start, end), merging it with any overlapping or touching intervals."""
+        if end <= start:
+            return
+        starts, ends = self.starts, self.ends
+        # First interval that ends at or after start, last that starts at or before end
+        lo = bisect.bisect_left(ends, start)
+        hi = bisect.bisect_right(starts, end)
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+        starts[lo:hi] = [start]
+        ends[lo:hi] = [end]
+
+    def remove(self, start, end):
+        """
+        Clear [start, end); intervals it overlaps keep their parts outside it.
+
+        Returns:
+            bool: Whether anything was busy in [start, end)
+        """
+        if end <= start:
+            return False
+        starts, ends = self.starts, self.ends
+        # Intervals that intersect [start, end)
+        lo = bisect.bisect_right(ends, start)
+        hi = bisect.bisect_left(starts, end)
+        if lo >= hi:
+            return False
+        kept_starts, kept_ends = [], []
+        if starts[lo] < start:
+            kept_starts.append(starts[lo])
+            kept_ends.append(start)
+        if ends[hi - 1] > end:
+            kept_starts.append(end)
+            kept_ends.append(ends[hi - 1])
+        starts[lo:hi] = kept_starts
+        ends[lo:hi] = kept_ends
+        return True
+
+    def update(self, intervals):
+        """Merge many (start, end) pairs at once."""
+        merged = IntervalSet.from_intervals(
+            list(zip(self.starts, self.ends)) + list(intervals))
+        self.starts, self.ends = merged.starts, merged.ends
+
+    def overlaps(self, start, end):
+        """Whether any busy interval intersects [start, end)."""
+        i = bisect.bisect_left(self.starts, end) - 1
+        return i >= 0 and self.ends[i] > start
+
+    def between(self, start, end):
+        """Busy intervals intersecting [start, end), clipped to it."""
+        lo = bisect.bisect_right(self.ends, start)
+        hi = bisect.bisect_left(self.starts, end)
+        return [(max(s, start), min(e, end))
+                for s, e in zip(self.starts[lo:hi], self.ends[lo:hi])]
+
+
+class AvailabilityIndex:
+    """
+    Busy intervals of many participants.
+
+    A slot is free for a participant if it does not come within
+    ``buffer_minutes`` of any of their busy intervals.
+    """
+
+    def __init__(self, buffer_minutes=0):
+        """
+        Initialize an empty index.
+
+        Args:
+            buffer_minutes (int): Minimum gap required around existing events
+        """
+        self.buffer = int(buffer_minutes * 60)
+        self._calendars = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calendars)
+
+    def __contains__(self, participant):
+        return participant in self._calendars
+
+    def participants(self):
+        return list(self._calendars)
+
+    def add_event(self, participant, start, end):
+        """
+        Mark a participant busy.
+
+        Args:
+            participant (str): Participant ID or email
+            start, end (datetime or int): Event bounds (datetimes or POSIX seconds)
+        """
+        if isinstance(start, datetime):
+            start, end = to_timestamp(start), to_timestamp(end)
+        with self._lock:
+            calendar = self._calendars.get(participant)
+            if calendar is None:
+                calendar = self._calendars[participant] = IntervalSet()
+            calendar.add(start, end)
+
+    def remove_event(self, participant, start, end):
+        """
+        Mark a participant free again for an event's time, e.g. a cancelled booking.
+
+        Busy intervals are stored merged, so this clears [start, end) rather
+        than one event; a booking never touches other events, so for bookings
+        the two are the same.
+
+        Args:
+            participant (str): Participant ID or email
+            start, end (datetime or int): Event bounds (datetimes or POSIX seconds)
+
+        Returns:
+            bool: Whether the participant was busy in that time
+        """
+        if isinstance(start, datetime):
+            start, end = to_timestamp(start), to_timestamp(end)
+        with self._lock:
+            calendar = self._calendars.get(participant)
+            if calendar is None or not calendar.remove(start, end):
+                return False
+            if not calendar:
+                del self._calendars[participant]
+            return True
+
+    def add_events(self, events):
+        """
+        Bulk-load (participant, start, end) events with POSIX-second bounds.
+
+        Events are grouped per participant and sort-merged once, which is much
+        faster than inserting them one at a time.
+
+        Returns:
+            int: Number of events read
+        """
+        grouped = {}
+        count = 0
+        for participant, start, end in events:
+            grouped.setdefault(participant, []).append((start, end))
+            count += 1
+
+        with self._lock:
+            for participant, intervals in grouped.items():
+                calendar = self._calendars.get(participant)
+                if calendar is None:
+                    self._calendars[participant] = IntervalSet.from_intervals(intervals)
+                else:
+                    calendar.update(intervals)
+        return count
+
+    def is_free(self, participant, start, end):
+        """Whether [start, end) is clear of the participant's events and buffers."""
+        calendar = self._calendars.get(participant)
+        if calendar is None:
+            return True
+        with self._lock:
+            return not calendar.overlaps(start - self.buffer, end + self.buffer)
+
+    def conflicts(self, participants, start, end):
+        """Return the participants who are busy during [start, end)."""
+        return [participant for participant in participants
+                if not self.is_free(participant, start, end)]
+
+    def book(self, participants, start, end):
+        """
+        Mark participants busy for [start, end) only if all of them are free.
+
+        The check and the update happen under one lock, so concurrent
+        bookings of overlapping slots cannot both succeed.
+
+        Returns:
+            list: The busy participants; empty if the slot was booked
+        """
+        with self._lock:
+            conflicts = [participant for participant in participants
+                         if participant in self._calendars and
+                         self._calendars[participant].overlaps(start - self.buffer,
+                                                               end + self.buffer)]
+            if not conflicts:
+                for participant in participants:
+                    calendar = self._calendars.get(participant)
+                    if calendar is None:
+                        calendar = self._calendars[participant] = IntervalSet()
+                    calendar.add(start, end)
+        return conflicts
+
+    def busy_intervals(self, participant, start, end):
+        """A participant's busy intervals within [start, end), without buffers."""
+        calendar = self._calendars.get(participant)
+        if calendar is None:
+            return []
+        with self._lock:
+            return calendar.between(start, end)
+
+    def load_csv(self, path, busy_statuses):
+        """
+        Load busy events from a calendar_dataset.csv style file.
+
+        Both the recruiter and the candidate of every row whose
+        Availability_Status is in ``busy_statuses`` are marked busy. Times are
+        local to the row's TimeZone column; an End_Time before the Start_Time
+        means the event runs past midnight.
+
+        Returns:
+            int: Number of events read
+        """
+        return self.add_events(read_calendar_events(path, busy_statuses))
+
+
+def _event_zone(name):
+    """
+    The tzinfo of a calendar CSV TimeZone value.
+
+    Fixed offsets ('UTC-5') become datetime.timezone, named zones pytz zones
+    to be localized per event; unknown names are logged and give None.
+    """
+    offset = parse_utc_offset(name)
+    if offset is not None:
+        return timezone(offset)
+    try:
+        return get_timezone(name)
+    except pytz.UnknownTimeZoneError:
+        logger.warning("Skipping calendar events in unknown timezone %r", name)
+        return None
+
+
+def read_calendar_events(path, busy_statuses):
+    """
+    Yield (participant, start, end) busy events from a calendar CSV file.
+
+    Rows whose TimeZone cannot be resolved are skipped with a logged warning.
+
+    Args:
+        path (str): Path to a file with the calendar_dataset.csv columns
+        busy_statuses (iterable): Availability_Status values that block time
+
+    Yields:
+        tuple: (participant ID, start POSIX seconds, end POSIX seconds)
+    """
+    busy_statuses = set(busy_statuses)
+    zones = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            if row['Availability_Status'] not in busy_statuses:
+                continue
+
+            zone = row.get('TimeZone') or 'UTC'
+            if zone not in zones:
+                zones[zone] = _event_zone(zone)
+            tz = zones[zone]
+            if tz is None:
+                continue
+
+            start = datetime.fromisoformat(f"{row['Date']}T{row['Start_Time']}")
+            end = datetime.fromisoformat(f"{row['Date']}T{row['End_Time']}")
+            if end <= start:
+                end += timedelta(days=1)
+            if isinstance(tz, timezone):
+                start, end = start.replace(tzinfo=tz), end.replace(tzinfo=tz)
+            else:
+                start, end = tz.localize(start), tz.localize(end)
+
+            start, end = int(start.timestamp()), int(end.timestamp())
+            yield row['Recruiter_ID'], start, end
+            yield row['Candidate_ID'], start, end
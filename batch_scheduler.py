@@ -0,0 +1,197 @@
+"""
+Batch Scheduler Module
+
+This module places many interview requests at once, for hiring drives where
+booking each interview through the chat flow would be too slow.
+
+It provides:
+- Priority ordering of interview requests (Priority, then meeting length)
+- Greedy earliest-slot assignment across a department's recruiters, using
+  CalendarManager's slot bitmap for vectorized free-time search
+- Summary statistics of an assignment's coverage and lead times
+"""
+
+from datetime import datetime
+import numpy as np
+import pytz
+from config import CALENDAR_CONFIG
+from availability import to_timestamp
+
+# Order in which the calendar data's Priority values are served
+PRIORITY_RANK = {'High': 0, 'Medium': 1, 'Low': 2}
+
+
+class BatchScheduler:
+    """
+    Assigns interview requests to recruiters and slots without conflicts.
+
+    Requests are served in priority order. Each one gets the earliest aligned
+    slot at which the candidate and at least one recruiter of the request's
+    department are free (working hours, existing events and buffer time
+    included); ties go to the recruiter with the fewest interviews so far.
+    Every booking is written back to the CalendarManager.
+    """
+
+    def __init__(self, calendar, recruiters, start_day, n_days=None, granularity=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            calendar (CalendarManager): Participants' busy time, working
+                hours, timezones and meeting durations
+            recruiters (dict): Department -> list of recruiter IDs
+            start_day (date): First UTC day of the drive
+            n_days (int, optional): Days the drive may use
+                (default: CALENDAR_CONFIG['search_horizon_days'])
+            granularity (int, optional): Start times are aligned to this many
+                minutes (default: CALENDAR_CONFIG['slot_granularity'])
+        """
+        self.calendar = calendar
+        self.bitmap = calendar.build_slot_bitmap(start_day, n_days)
+        self.buffer_minutes = calendar.availability.buffer // 60
+        self.recruiters = {department: list(ids) for department, ids in recruiters.items()}
+        self.load = {recruiter: 0 for ids in self.recruiters.values() for recruiter in ids}
+
+        step = (granularity or CALENDAR_CONFIG['slot_granularity']) // self.bitmap.slot_minutes
+        self._aligned = np.arange(self.bitmap.n_slots) % max(step, 1) == 0
+        # (department, slots) -> (recruiters x slots) mask of possible starts
+        self._starts = {}
+        # recruiter -> [(department, row in that department's masks)]
+        self._memberships = {}
+        for department, ids in self.recruiters.items():
+            for position, recruiter in enumerate(ids):
+                self._memberships.setdefault(recruiter, []).append((department, position))
+
+    def duration(self, request):
+        """Meeting length of a request in minutes."""
+        return self.calendar.meeting_durations.get(request.get('meeting_type'), 60)
+
+    def assign(self, requests, start_from=None):
+        """
+        Schedule a batch of interview requests.
+
+        Args:
+            requests (list): Dicts with 'candidate', 'department',
+                'meeting_type' and optionally 'priority' ('High', 'Medium' or
+                'Low'; default 'Medium')
+            start_from (datetime, optional): Earliest start (default: the
+                first day of the drive)
+
+        Returns:
+            list: Per request, a dict with 'recruiter', 'start' and 'end'
+                (UTC datetimes), or None if it could not be placed
+        """
+        bitmap = self.bitmap
+        earliest = 0
+        if start_from is not None:
+            earliest = max(-((bitmap.origin - to_timestamp(start_from)) // bitmap.slot_seconds), 0)
+
+        # High priority first; within a priority, long meetings before short
+        # ones since they are harder to fit
+        order = sorted(range(len(requests)), key=lambda i: (
+            PRIORITY_RANK.get(requests[i].get('priority'), PRIORITY_RANK['Medium']),
+            -self.duration(requests[i]), i))
+
+        assignments = [None] * len(requests)
+        for i in order:
+            request = requests[i]
+            department = request.get('department')
+            recruiters = self.recruiters.get(department)
+            if not recruiters:
+                continue
+            n = bitmap.slots_for(self.duration(request))
+
+            candidate_starts = bitmap.run_starts(self._free(request['candidate']), n)
+            fits = self._department_starts(department, n)[:, earliest:] & \
+                candidate_starts[earliest:]
+            found = fits.any(axis=1)
+            if not found.any():
+                continue
+
+            first = np.where(found, fits.argmax(axis=1), bitmap.n_slots)
+            loads = [self.load[recruiter] for recruiter in recruiters]
+            best = np.lexsort((loads, first))[0]
+            recruiter = recruiters[best]
+            start = bitmap.slot_time(earliest + first[best])
+            end = start + self.duration(request) * 60
+            self._book(recruiter, request['candidate'], start, end)
+            assignments[i] = {
+                'recruiter': recruiter,
+                'start': datetime.fromtimestamp(start, pytz.UTC),
+                'end': datetime.fromtimestamp(end, pytz.UTC)
+            }
+        return assignments
+
+    def _free(self, participant):
+        """A participant's bookable slots: working hours minus busy time and buffers."""
+        settings = self.calendar.participant_settings.get(participant, {})
+        working = self.bitmap.working_mask(
+            settings.get('timezone', 'UTC'),
+            settings.get('working_hours', self.calendar.working_hours))
+        row = self.bitmap.rows.get(participant)
+        if row is None:
+            return working
+        return working & ~self.bitmap.dilate(self.bitmap.busy[row], self.buffer_minutes)
+
+    def _department_starts(self, department, n):
+        """Aligned starts of n-slot runs for each recruiter of a department."""
+        starts = self._starts.get((department, n))
+        if starts is None:
+            free = np.array([self._free(recruiter)
+                             for recruiter in self.recruiters[department]])
+            starts = self.bitmap.run_starts(free, n) & self._aligned
+            self._starts[(department, n)] = starts
+        return starts
+
+    def _book(self, recruiter, candidate, start, end):
+        """Record a booking and refresh the recruiter's cached start masks."""
+        start_time = datetime.fromtimestamp(start, pytz.UTC)
+        end_time = datetime.fromtimestamp(end, pytz.UTC)
+        self.calendar.add_busy_time(recruiter, start_time, end_time)
+        self.calendar.add_busy_time(candidate, start_time, end_time)
+        self.load[recruiter] += 1
+
+        free = self._free(recruiter)
+        for department, position in self._memberships[recruiter]:
+            for (cached_department, n), starts in self._starts.items():
+                if cached_department == department:
+                    starts[position] = self.bitmap.run_starts(free, n) & self._aligned
+
+
+def assignment_summary(requests, assignments, start_from):
+    """
+    Summarize the quality of an assignment.
+
+    Args:
+        requests (list): The scheduled requests
+        assignments (list): BatchScheduler.assign output for them
+        start_from (datetime): Start of the drive, for lead times
+
+    Returns:
+        dict: Overall and per-priority placement rate and mean lead time in
+            days, plus the spread of interviews per recruiter
+    """
+    origin = to_timestamp(start_from)
+    by_priority = {}
+    loads = {}
+    for request, assignment in zip(requests, assignments):
+        stats = by_priority.setdefault(request.get('priority', 'Medium'),
+                                       {'requested': 0, 'placed': 0, 'lead_days': 0.0})
+        stats['requested'] += 1
+        if assignment is not None:
+            stats['placed'] += 1
+            stats['lead_days'] += (to_timestamp(assignment['start']) - origin) / 86400
+            loads[assignment['recruiter']] = loads.get(assignment['recruiter'], 0) + 1
+
+    for stats in by_priority.values():
+        stats['mean_lead_days'] = stats.pop('lead_days') / max(stats['placed'], 1)
+        stats['placement_rate'] = stats['placed'] / stats['requested']
+
+    placed = sum(stats['placed'] for stats in by_priority.values())
+    return {
+        'requested': len(requests),
+        'placed': placed,
+        'placement_rate': placed / max(len(requests), 1),
+        'by_priority': by_priority,
+        'recruiter_load': (min(loads.values(), default=0), max(loads.values(), default=0))
+    }
@@ -0,0 +1,136 @@
+"""
+Load test: latency of the scheduler HTTP API at increasing concurrency
+
+Starts the API on a local port with a calendar of synthetic busy time and a
+stand-in mail transport, then drives it over keep-alive connections with a
+mix of intent classification, meeting type, slot, availability and booking
+requests. Reports throughput and p50/p99 latency per concurrency level.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_api [--requests N] [--levels 1,8,32,128]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+
+from api_server import SchedulerAPI
+from calendar_utils import CalendarManager
+from invite_queue import InviteDispatcher
+
+PARTICIPANTS = 200
+EVENTS_PER_PARTICIPANT = 40
+DAYS = 28
+START = datetime(2025, 3, 3, tzinfo=pytz.UTC)
+MESSAGES = ["Can we schedule a meeting?", "I need to reschedule our meeting",
+            "I'm available tomorrow between 2 PM and 4 PM",
+            "What time slots are available next week?"]
+
+
+class NullPool:
+    """Mail transport stand-in: invites are accepted and dropped."""
+
+    def send(self, message):
+        return True
+
+
+def build_calendar(rng):
+    calendar = CalendarManager(smtp_pool=NullPool())
+    start = int(START.timestamp())
+    events = []
+    for i in range(PARTICIPANTS):
+        for _ in range(EVENTS_PER_PARTICIPANT):
+            begin = start + 900 * rng.randrange(DAYS * 96)
+            events.append((f"p{i}", begin, begin + 900 * rng.randrange(1, 9)))
+    calendar.availability.add_events(events)
+    calendar.build_slot_bitmap(START.date(), DAYS + 7)
+    return calendar
+
+
+def make_request(i, rng):
+    """The i-th request of the mix: (method, path, body)"""
+    kind = i % 10
+    pair = [f"p{rng.randrange(PARTICIPANTS)}", f"p{rng.randrange(PARTICIPANTS)}"]
+    moment = START + timedelta(minutes=15 * rng.randrange(DAYS * 96))
+    if kind < 4:
+        return 'POST', '/intents', {'messages': [rng.choice(MESSAGES)]}
+    if kind < 5:
+        return 'POST', '/meeting-types', {'department': 'Engineering', 'durations': [60]}
+    if kind < 7:
+        return 'POST', '/slots', {'start_from': moment.isoformat(), 'count': 3,
+                                  'participants': pair}
+    if kind < 9:
+        return 'POST', '/availability', {'start': moment.isoformat(), 'duration': 60,
+                                         'participants': pair}
+    return 'POST', '/bookings', {'start': moment.isoformat(), 'duration': 60,
+                                 'recruiter_email': pair[0],
+                                 'candidate_email': f"candidate{i}@example.com"}
+
+
+async def client(port, requests, latencies, statuses):
+    """Send requests one after another over one keep-alive connection"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for method, path, body in requests:
+        payload = json.dumps(body).encode()
+        begin = time.perf_counter()
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode().partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - begin)
+        statuses[status] = statuses.get(status, 0) + 1
+    writer.close()
+
+
+async def run_level(port, concurrency, n_requests, rng):
+    requests = [make_request(i, rng) for i in range(n_requests)]
+    latencies, statuses = [], {}
+    begin = time.perf_counter()
+    await asyncio.gather(*(client(port, requests[c::concurrency], latencies, statuses)
+                           for c in range(concurrency)))
+    elapsed = time.perf_counter() - begin
+    return np.array(latencies) * 1e3, n_requests / elapsed, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--levels', default='1,8,32,128')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    calendar = build_calendar(rng)
+    dispatcher = InviteDispatcher(calendar, ':memory:', rate_per_minute=10**6, burst=10**6)
+    dispatcher.start()
+    api = SchedulerAPI(calendar=calendar, dispatcher=dispatcher)
+    api.bot.warm_up()
+    port = api.start_in_thread('127.0.0.1', 0)
+    try:
+        asyncio.run(run_level(port, 4, 200, rng))  # warm up caches and connections
+        print(f"{'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}  statuses")
+        for concurrency in map(int, args.levels.split(',')):
+            latencies, rate, statuses = asyncio.run(
+                run_level(port, concurrency, args.requests, rng))
+            print(f"{concurrency:>7} {rate:>8.0f} {np.percentile(latencies, 50):>8.2f} "
+                  f"{np.percentile(latencies, 99):>8.2f}  {dict(sorted(statuses.items()))}")
+    finally:
+        api.stop_thread()
+        dispatcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: interval-indexed availability checks
+
+Bulk-loads 10k, 100k and 1M synthetic busy events spread over 1,000
+participants and a year, then measures overlap query latency. A linear scan
+over the same participant's events is timed for comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_availability
+"""
+
+import random
+import time
+import tracemalloc
+
+from availability import AvailabilityIndex
+
+PARTICIPANTS = 1000
+YEAR = 365 * 24 * 3600
+QUERIES = 20000
+
+
+def synthetic_events(n, rng):
+    for _ in range(n):
+        start = rng.randrange(0, YEAR // 60) * 60
+        yield (f"p{rng.randrange(PARTICIPANTS)}", start,
+               start + rng.choice([30, 45, 60, 90]) * 60)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'events':>9}{'load':>10}{'memory':>11}{'query':>10}{'linear scan':>14}")
+    for n in [10_000, 100_000, 1_000_000]:
+        events = list(synthetic_events(n, rng))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = AvailabilityIndex(buffer_minutes=15)
+        index.add_events(events)
+        load_seconds = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        queries = [(f"p{rng.randrange(PARTICIPANTS)}", rng.randrange(0, YEAR))
+                   for _ in range(QUERIES)]
+        start = time.perf_counter()
+        for participant, begin in queries:
+            index.is_free(participant, begin, begin + 3600)
+        query_us = (time.perf_counter() - start) / QUERIES * 1e6
+
+        by_participant = {}
+        for participant, s, e in events:
+            by_participant.setdefault(participant, []).append((s, e))
+        buffer = index.buffer
+        start = time.perf_counter()
+        for participant, begin in queries[:1000]:
+            any(s < begin + 3600 + buffer and e > begin - buffer
+                for s, e in by_participant.get(participant, ()))
+        scan_us = (time.perf_counter() - start) / 1000 * 1e6
+
+        print(f"{n:>9,}{load_seconds * 1000:>8.0f}ms{memory / 2**20:>9.1f}MB"
+              f"{query_us:>8.2f}us{scan_us:>12.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: bulk interview assignment on synthetic hiring drives
+
+Generates drives of 1k to 50k interview requests over four weeks with some
+existing busy time. There is one recruiter per 150 requests, spread across the
+calendar data's departments, which is more than they can take, so placement
+rates show how the lower priorities absorb the shortfall. Reports throughput
+and placement quality.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch_scheduler
+"""
+
+import random
+import time
+from datetime import datetime
+
+import pytz
+
+from batch_scheduler import BatchScheduler, assignment_summary
+from calendar_utils import CalendarManager
+
+SIZES = [1000, 5000, 20000, 50000]
+DAYS = 28
+DEPARTMENTS = ['Customer Success', 'Engineering', 'Marketing', 'Product', 'Sales']
+MEETING_TYPES = ['Final Round', 'Follow-up Meeting', 'HR Screening', 'Initial Discussion',
+                 'Project Presentation', 'Technical Interview']
+PRIORITIES = ['High', 'Medium', 'Low']
+
+
+def build_drive(rng, n_requests):
+    calendar = CalendarManager()
+    start = datetime(2025, 3, 3, tzinfo=pytz.UTC)
+    n_recruiters = max(len(DEPARTMENTS), n_requests // 150)
+    recruiters = {department: [] for department in DEPARTMENTS}
+    events = []
+    for i in range(n_recruiters):
+        recruiter = f"r{i}"
+        recruiters[DEPARTMENTS[i % len(DEPARTMENTS)]].append(recruiter)
+        for _ in range(10):
+            begin = int(start.timestamp()) + 900 * rng.randrange(DAYS * 96)
+            events.append((recruiter, begin, begin + 900 * rng.randrange(1, 8)))
+    calendar.availability.add_events(events)
+
+    requests = [{'candidate': f"c{i}",
+                 'department': rng.choice(DEPARTMENTS),
+                 'meeting_type': rng.choice(MEETING_TYPES),
+                 'priority': rng.choice(PRIORITIES)}
+                for i in range(n_requests)]
+    return calendar, recruiters, requests, start
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'requests':>9} {'seconds':>8} {'req/s':>8} {'placed':>7} "
+          f"{'High':>6} {'Medium':>7} {'Low':>6} {'lead(d)':>8} {'load':>9}")
+    for size in SIZES:
+        calendar, recruiters, requests, start = build_drive(rng, size)
+
+        begin = time.perf_counter()
+        scheduler = BatchScheduler(calendar, recruiters, start.date(), DAYS)
+        assignments = scheduler.assign(requests, start)
+        seconds = time.perf_counter() - begin
+
+        summary = assignment_summary(requests, assignments, start)
+        rates = {priority: stats['placement_rate']
+                 for priority, stats in summary['by_priority'].items()}
+        lead = sum(stats['mean_lead_days'] * stats['placed']
+                   for stats in summary['by_priority'].values()) / max(summary['placed'], 1)
+        low, high = summary['recruiter_load']
+        print(f"{size:>9} {seconds:>8.2f} {size / seconds:>8.0f} "
+              f"{summary['placement_rate']:>7.1%} {rates['High']:>6.1%} "
+              f"{rates['Medium']:>7.1%} {rates['Low']:>6.1%} {lead:>8.1f} "
+              f"{f'{low}-{high}':>9}")
+
+
+if __name__ == "__main__":
+    main()
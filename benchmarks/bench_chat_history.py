@@ -0,0 +1,62 @@
+"""
+Benchmark: per-turn time of the chat interface as a conversation grows
+
+Drives streamlit_app.py through Streamlit's app tester, sending messages one
+after another, and reports the time per turn at increasing conversation
+lengths, with the bounded chat tail and with every message drawn on every
+turn (the former behaviour).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_chat_history
+"""
+
+import os
+import shutil
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import config
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'streamlit_app.py')
+TURNS = 300
+REPORT_EVERY = 50
+
+
+def run(visible_messages):
+    config.CHAT_CONFIG['visible_messages'] = visible_messages
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    app.run()
+    app.sidebar.text_input[1].input("candidate@example.com").run()
+    timings = []
+    for turn in range(TURNS):
+        begin = time.perf_counter()
+        app.chat_input[0].set_value(f"message {turn}").run()
+        timings.append(time.perf_counter() - begin)
+    history = app.session_state.history
+    assert len(history) == 2 * TURNS + 1
+    return timings, history.spilled
+
+
+def main():
+    config.CHAT_CONFIG['typing_effect']['word_delay'] = 0
+    print(f"{'':>30}" + "".join(f"{f'turns {t - REPORT_EVERY + 1}-{t}':>14}"
+                                for t in range(REPORT_EVERY, TURNS + 1, REPORT_EVERY)))
+    for label, visible in (("bounded tail", config.CHAT_CONFIG['visible_messages']),
+                           ("every message drawn", 10 ** 9)):
+        max_messages = config.CHAT_CONFIG['max_messages']
+        if visible > max_messages:
+            config.CHAT_CONFIG['max_messages'] = visible
+        timings, spilled = run(visible)
+        config.CHAT_CONFIG['max_messages'] = max_messages
+        means = [sum(timings[i:i + REPORT_EVERY]) / REPORT_EVERY * 1e3
+                 for i in range(0, TURNS, REPORT_EVERY)]
+        print(f"{label + ' (ms/turn)':>30}" + "".join(f"{m:>14.1f}" for m in means)
+              + f"   ({spilled} messages on disk)")
+    shutil.rmtree(config.CHAT_CONFIG['spill_dir'], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
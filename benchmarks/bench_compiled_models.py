@@ -0,0 +1,64 @@
+"""
+Benchmark: sklearn pipelines vs compiled NumPy models
+
+Measures per-row latency (one predict call per row, as the chat flow does) and
+per-batch throughput (one predict call for the whole dataset) for both models.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compiled_models
+"""
+
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from compiled_models import compile_pipeline
+
+MODELS = [
+    ('intent', 'results/best_intent_classification_model.pkl',
+     'results/preprocessed_conversation_dataset.csv'),
+    ('time_slot', 'results/best_time_slot_prediction_model.pkl',
+     'results/preprocessed_calendar_dataset.csv'),
+]
+ROW_SAMPLES = 500
+
+
+def per_row_latency(model, X):
+    """Median latency in microseconds of single-row predict calls"""
+    timings = []
+    for row in X[:ROW_SAMPLES]:
+        start = time.perf_counter()
+        model.predict(row[None, :])
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e6
+
+
+def batch_time(model, X):
+    """Seconds for one predict call over all rows"""
+    start = time.perf_counter()
+    model.predict(X)
+    return time.perf_counter() - start
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    print(f"{'model':<11}{'backend':<9}{'per-row':>12}{'batch':>12}{'rows/s':>14}")
+    for name, model_path, data_path in MODELS:
+        pipeline = joblib.load(model_path)
+        columns = list(pipeline.named_steps['scaler'].feature_names_in_)
+        X = pd.read_csv(data_path)[columns].to_numpy(np.float64)
+        compiled = compile_pipeline(pipeline)
+
+        for backend, model in [('sklearn', pipeline), ('numpy', compiled)]:
+            row_us = per_row_latency(model, X)
+            seconds = batch_time(model, X)
+            print(f"{name:<11}{backend:<9}{row_us:>10.1f}us{seconds * 1000:>10.1f}ms"
+                  f"{len(X) / seconds:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: event store query latency as the table grows
+
+Fills a WAL-mode event store in steps up to several million events (10,000
+participants over a year) and, after each step, times batched inserts,
+single-participant overlap checks, one-day range reads and a two-person slot
+search through CalendarManager.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_event_store [--rows 3000000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pytz
+
+from calendar_utils import CalendarManager
+from event_store import EventStore
+
+PARTICIPANTS = 10000
+START = int(datetime(2025, 1, 1, tzinfo=pytz.UTC).timestamp())
+DAYS = 365
+QUERIES = 2000
+
+
+def random_events(rng, n):
+    for _ in range(n):
+        start = START + 900 * rng.randrange(DAYS * 96)
+        yield f"participant-{rng.randrange(PARTICIPANTS):05d}", start, start + 900 * rng.randrange(1, 9)
+
+
+def percentiles_us(samples):
+    samples = np.array(samples) * 1e6
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def time_queries(store, calendar, rng):
+    overlap, between, search = [], [], []
+    for _ in range(QUERIES):
+        participant = f"participant-{rng.randrange(PARTICIPANTS):05d}"
+        start = START + 60 * rng.randrange(DAYS * 1440)
+        begin = time.perf_counter()
+        store.is_free(participant, start, start + 3600)
+        overlap.append(time.perf_counter() - begin)
+        begin = time.perf_counter()
+        store.busy_intervals(participant, start, start + 86400)
+        between.append(time.perf_counter() - begin)
+    for _ in range(QUERIES // 10):
+        pair = [f"participant-{rng.randrange(PARTICIPANTS):05d}" for _ in range(2)]
+        start_from = datetime.fromtimestamp(START + 86400 * rng.randrange(DAYS - 30), pytz.UTC)
+        begin = time.perf_counter()
+        calendar.suggest_next_slots('Technical Interview', 'UTC', start_from, count=3,
+                                    participants=pair)
+        search.append(time.perf_counter() - begin)
+    return percentiles_us(overlap), percentiles_us(between), percentiles_us(search)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=3000000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.sqlite3")
+        store = EventStore(path, buffer_minutes=15, batch_size=50000)
+        calendar = CalendarManager(event_store=store)
+        print(f"{'events':>9} {'insert/s':>9} {'is_free p50/p99 us':>20} "
+              f"{'1-day range p50/p99 us':>24} {'slot search p50/p99 us':>24} {'MB':>6}")
+        total, step = 0, 100000
+        while total < args.rows:
+            n = min(step, args.rows - total)
+            begin = time.perf_counter()
+            store.add_events(random_events(rng, n))
+            insert_rate = n / (time.perf_counter() - begin)
+            total += n
+            overlap, between, search = time_queries(store, calendar, rng)
+            size = sum(os.path.getsize(os.path.join(directory, name))
+                       for name in os.listdir(directory)) / 2 ** 20
+            print(f"{store.count():>9} {insert_rate:>9.0f} "
+                  f"{overlap[0]:>9.1f} /{overlap[1]:>8.1f} "
+                  f"{between[0]:>12.1f} /{between[1]:>9.1f} "
+                  f"{search[0]:>12.1f} /{search[1]:>9.1f} {size:>6.0f}")
+            step = total  # double the table each step
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
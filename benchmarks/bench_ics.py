@@ -0,0 +1,70 @@
+"""
+Benchmark: template iCalendar writer vs the icalendar object graph
+
+Serializes the same invites with create_calendar_event(...).to_ical() and with
+calendar_event_ics, then exports a 10k-meeting recruiter schedule as one file.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ics
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from calendar_utils import CalendarManager
+
+INVITES = 2000
+SCHEDULE = 10000
+
+
+def meetings(n):
+    start = pytz.UTC.localize(datetime(2025, 3, 3, 9))
+    for i in range(n):
+        begin = start + timedelta(hours=i)
+        yield {
+            'title': f'Technical Interview - Engineering Position #{i}',
+            'start_time': begin,
+            'end_time': begin + timedelta(minutes=60),
+            'location': 'https://meet.google.com/abc-defg-hij',
+            'description': ('Technical Interview for Engineering Position\n\nAgenda:\n'
+                            '1. Introduction\n2. Technical/Role Discussion\n3. Q&A'),
+            'recruiter_email': 'recruiter@example.com',
+            'candidate_email': f'candidate{i}@example.com',
+            'meeting_type': 'Technical Interview',
+            'timezone': 'UTC'
+        }
+
+
+def main():
+    calendar = CalendarManager()
+    invites = list(meetings(INVITES))
+
+    begin = time.perf_counter()
+    for meeting_info in invites:
+        calendar.create_calendar_event(meeting_info).to_ical()
+    graph_s = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    for meeting_info in invites:
+        calendar.calendar_event_ics(meeting_info)
+    template_s = time.perf_counter() - begin
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'schedule.ics')
+        begin = time.perf_counter()
+        written = calendar.export_ics(meetings(SCHEDULE), path)
+        export_s = time.perf_counter() - begin
+
+    print(f"icalendar objects: {INVITES / graph_s:10.0f} invites/s")
+    print(f"Templates:         {INVITES / template_s:10.0f} invites/s "
+          f"({graph_s / template_s:.0f}x)")
+    print(f"Export {SCHEDULE} events: {export_s * 1000:.0f}ms, {written / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark: streaming import of a large calendar export
+
+Writes a synthetic Outlook-style export (VTIMEZONE blocks, folded
+descriptions, alarms, all-day, recurring and cancelled events) of about
+100 MB and times importing it as one recruiter's busy time, re-importing it
+unchanged and re-importing it with a few events edited, deleted and added.
+Peak Python heap use is measured with tracemalloc on separate runs, and
+icalendar.Calendar.from_ical is timed on a slice of the file for comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ics_import [--megabytes 100] [--compare-megabytes 2]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import icalendar
+
+from calendar_utils import CalendarManager
+
+HEADER = """BEGIN:VCALENDAR\r
+PRODID:-//Microsoft Corporation//Outlook 16.0 MIMEDIR//EN\r
+VERSION:2.0\r
+BEGIN:VTIMEZONE\r
+TZID:Europe/Paris\r
+BEGIN:STANDARD\r
+DTSTART:16011028T030000\r
+RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=10\r
+TZOFFSETFROM:+0200\r
+TZOFFSETTO:+0100\r
+END:STANDARD\r
+BEGIN:DAYLIGHT\r
+DTSTART:16010325T020000\r
+RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=3\r
+TZOFFSETFROM:+0100\r
+TZOFFSETTO:+0200\r
+END:DAYLIGHT\r
+END:VTIMEZONE\r
+"""
+WORDS = ['interview', 'sync', 'candidate', 'pipeline', 'review', 'offer', 'panel',
+         'feedback', 'hiring', 'manager', 'notes', 'agenda', 'Zürich', 'follow-up']
+
+
+def fold(line):
+    """Fold a content line at 75 octets the way exporters do."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + '\r\n'
+    chunks, start = [], 0
+    while start < len(data):
+        end = start + (75 if not chunks else 74)
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(data[start:end].decode())
+        start = end
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def event_text(rng, number, sequence=0):
+    start = datetime(2020, 1, 1, 8) + timedelta(days=rng.randrange(6 * 365),
+                                                minutes=15 * rng.randrange(40))
+    stamp = start.strftime('%Y%m%dT%H%M%S')
+    lines = ['BEGIN:VEVENT', f"UID:{number:08x}-5a1f-4c2e-9b7d@outlook.example.com",
+             f"SEQUENCE:{sequence}", f"LAST-MODIFIED:2025010{1 + sequence % 9}T120000Z",
+             'DTSTAMP:20250101T120000Z',
+             fold('SUMMARY:' + ' '.join(rng.choice(WORDS) for _ in range(6))),
+             fold('DESCRIPTION:' + ' '.join(rng.choice(WORDS) for _ in range(60)))]
+    kind = rng.random()
+    if kind < 0.05:
+        lines += [f"DTSTART;VALUE=DATE:{stamp[:8]}", 'TRANSP:TRANSPARENT']
+    elif kind < 0.1:
+        lines += [f"DTSTART;TZID=Europe/Paris:{stamp}", 'DURATION:PT30M',
+                  f"RRULE:FREQ=WEEKLY;BYDAY=MO,WE;COUNT={rng.randint(5, 50)}"]
+    else:
+        end = (start + timedelta(minutes=rng.choice([30, 45, 60, 90]))).strftime('%Y%m%dT%H%M%S')
+        lines += [f"DTSTART;TZID=Europe/Paris:{stamp}", f"DTEND;TZID=Europe/Paris:{end}"]
+    if kind > 0.97:
+        lines.append('STATUS:CANCELLED')
+    lines += ['LOCATION:Room 4', 'BEGIN:VALARM', 'ACTION:DISPLAY', 'DESCRIPTION:Reminder',
+              'TRIGGER:-PT15M', 'END:VALARM', 'END:VEVENT']
+    return ''.join(line if line.endswith('\r\n') else line + '\r\n' for line in lines)
+
+
+def write_export(path, megabytes, edit=None):
+    """Write an export of about ``megabytes``; ``edit`` changes a few events. Returns the count."""
+    rng = random.Random(0)
+    limit = megabytes * 1024 * 1024
+    size = count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(HEADER)
+        while size < limit:
+            text = event_text(rng, count)
+            if edit is not None and count % 100 == 0:
+                if count % 300 == 0:
+                    count += 1
+                    continue  # deleted
+                text = event_text(random.Random(count), count, sequence=1)
+            f.write(text)
+            size += len(text)
+            count += 1
+        if edit is not None:
+            for number in range(count // 300):
+                f.write(event_text(rng, count + number))
+        f.write('END:VCALENDAR\r\n')
+    return count
+
+
+def timed_import(calendar, path, trace=False):
+    if trace:
+        tracemalloc.start()
+    begin = time.perf_counter()
+    stats = calendar.import_ics('recruiter1', path, 'Europe/Paris')
+    elapsed = time.perf_counter() - begin
+    peak = None
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return stats, elapsed, peak
+
+
+def icalendar_busy(data):
+    """The same busy times read through icalendar's object tree."""
+    parsed = icalendar.Calendar.from_ical(data)
+    return [(event.decoded('dtstart'), event.get('dtend')) for event in parsed.walk('VEVENT')]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--megabytes', type=int, default=100)
+    parser.add_argument('--compare-megabytes', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.ics')
+        edited = os.path.join(directory, 'edited.ics')
+        count = write_export(path, args.megabytes)
+        write_export(edited, args.megabytes, edit=True)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"export: {size:.0f} MB, {count} events")
+
+        calendar = CalendarManager()
+        stats, elapsed, _ = timed_import(calendar, path)
+        print(f"first import:      {elapsed:6.2f}s  {size / elapsed:5.1f} MB/s  {stats}")
+        stats, elapsed, _ = timed_import(calendar, path)
+        print(f"re-import as is:   {elapsed:6.2f}s  {size / elapsed:5.1f} MB/s  {stats}")
+        stats, elapsed, _ = timed_import(calendar, edited)
+        print(f"re-import edited:  {elapsed:6.2f}s  {size / elapsed:5.1f} MB/s  {stats}")
+
+        # Memory on separate runs, tracemalloc slows allocation down
+        calendar = CalendarManager()
+        _, _, peak = timed_import(calendar, path, trace=True)
+        print(f"peak heap, first import: {peak / 1024 / 1024:6.1f} MB "
+              f"({peak / count:.0f} B/event kept for re-import checks)")
+        _, _, peak = timed_import(calendar, path, trace=True)
+        print(f"peak heap, re-import:    {peak / 1024 / 1024:6.1f} MB")
+
+        with open(path, 'rb') as f:
+            data = f.read(args.compare_megabytes * 1024 * 1024)
+        data = data[:data.rindex(b'END:VEVENT\r\n') + 12] + b'END:VCALENDAR\r\n'
+        begin = time.perf_counter()
+        busy = icalendar_busy(data)
+        elapsed = time.perf_counter() - begin
+        tracemalloc.start()
+        icalendar_busy(data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        scale = size / (len(data) / 1024 / 1024)
+        print(f"icalendar.from_ical on {len(data) / 1024 / 1024:.0f} MB ({len(busy)} events): "
+              f"{elapsed:.2f}s, peak heap {peak / 1024 / 1024:.0f} MB "
+              f"(~{elapsed * scale:.0f}s, ~{peak * scale / 1024 / 1024:.0f} MB at full size)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: batched vs per-message intent classification
+
+Scores every row of conversation_dataset.csv once through the per-message
+path (one ``predict`` per message) and once through
+``SchedulingBot.classify_intents`` (one ``predict`` for the whole dataset).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_intent_batch
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from scheduling_bot import SchedulingBot
+
+DATASET_PATH = 'results/scheduling_bot_datasets/conversation_dataset.csv'
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    bot = SchedulingBot()
+
+    df = pd.read_csv(DATASET_PATH)
+    messages = df['Raw_Text'].tolist()
+    speakers = df['Speaker'].tolist()
+    hours = pd.to_datetime(df['Timestamp']).dt.hour.to_numpy()
+
+    start = time.perf_counter()
+    loop_intents = [bot.classify_intents([message], [speaker], [hour])[0]
+                    for message, speaker, hour in zip(messages, speakers, hours)]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_intents = bot.classify_intents(messages, speakers, hours)
+    batch_time = time.perf_counter() - start
+
+    agree = np.array_equal(np.asarray(loop_intents, dtype=object), batch_intents)
+    n = len(messages)
+    print(f"Messages scored:   {n}")
+    print(f"Per-message loop:  {loop_time:.3f}s ({n / loop_time:,.0f} msg/s)")
+    print(f"Single batch:      {batch_time:.3f}s ({n / batch_time:,.0f} msg/s)")
+    print(f"Speedup:           {loop_time / batch_time:.1f}x")
+    print(f"Predictions agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
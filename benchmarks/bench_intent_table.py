@@ -0,0 +1,52 @@
+"""
+Benchmark: intent lookup table
+
+Reports the build time and memory footprint of the exhaustive intent table,
+and compares single-message classification through the table, the LRU cache
+and the live model.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_intent_table
+"""
+
+import time
+import warnings
+
+import pandas as pd
+
+from scheduling_bot import SchedulingBot
+
+DATASET_PATH = 'results/scheduling_bot_datasets/conversation_dataset.csv'
+
+
+def per_message_latency(bot, messages, speakers, hours):
+    """Mean microseconds per classify_intents call on one message"""
+    start = time.perf_counter()
+    for message, speaker, hour in zip(messages, speakers, hours):
+        bot.classify_intents([message], [speaker], [hour])
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main():
+    warnings.filterwarnings('ignore')
+    df = pd.read_csv(DATASET_PATH)
+    messages = df['Raw_Text'].tolist()
+    speakers = df['Speaker'].tolist()
+    hours = pd.to_datetime(df['Timestamp']).dt.hour.tolist()
+
+    for backend in ['numpy', 'sklearn']:
+        table = SchedulingBot(backend=backend, intent_cache='table').intent_predictor
+        print(f"[{backend}] table shape {table.table.shape}, "
+              f"{table.nbytes / 1024:.1f} KiB, built in {table.build_seconds * 1000:.1f}ms")
+
+    print(f"\n{'mode':<8}{'backend':<9}{'per message':>14}")
+    for backend in ['numpy', 'sklearn']:
+        for mode in ['table', 'lru', False]:
+            bot = SchedulingBot(backend=backend, intent_cache=mode, warm_up=True)
+            latency = per_message_latency(bot, messages, speakers, hours)
+            print(f"{str(mode or 'live'):<8}{backend:<9}{latency:>12.1f}us")
+
+
+if __name__ == "__main__":
+    main()
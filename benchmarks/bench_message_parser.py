@@ -0,0 +1,108 @@
+"""
+Benchmark: single-pass message parser vs the chat interface's regex searches
+
+Parses every Raw_Text of conversation_dataset.csv with the previous
+streamlit_app.parse_date_time (several searches per message, dates and times
+only), with parse_message and with the batch parse_messages, then compares
+the extracted Day / Duration / TimeZone / TimeSlot with the Entities column.
+
+The Entities column was generated independently of Raw_Text, so agreement
+measures the labels as much as the parser; coverage (how often a message
+mentions a key at all) and agreement on those messages are both reported.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_message_parser
+"""
+
+import json
+import re
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from message_parser import parse_message, parse_messages
+
+DATASET_PATH = 'results/scheduling_bot_datasets/conversation_dataset.csv'
+KEYS = ['Day', 'Duration', 'TimeZone', 'TimeSlot']
+
+
+def regex_parse_date_time(message, now):
+    """Baseline: the parser formerly inlined in streamlit_app"""
+    message = message.lower()
+    target_date = target_time = None
+    if "today" in message:
+        target_date = now.date()
+    elif "tomorrow" in message:
+        target_date = (now + timedelta(days=1)).date()
+    else:
+        days = {'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+                'friday': 4, 'saturday': 5, 'sunday': 6}
+        for day, day_num in days.items():
+            if day in message:
+                days_ahead = day_num - now.weekday()
+                if days_ahead <= 0:
+                    days_ahead += 7
+                target_date = (now + timedelta(days=days_ahead)).date()
+                break
+        match = re.search(r'(\d{1,2})[/.-](\d{1,2})', message)
+        if match:
+            day, month = map(int, match.groups())
+            try:
+                target_date = datetime(now.year, month, day).date()
+            except ValueError:
+                pass
+    time_matches = re.findall(r'(\d{1,2}):(\d{2})', message)
+    hour_matches = re.findall(r'(\d{1,2})\s*(am|pm)', message)
+    if time_matches:
+        hour, minute = map(int, time_matches[0])
+        if "pm" in message and hour < 12:
+            hour += 12
+        elif "am" in message and hour == 12:
+            hour = 0
+        target_time = datetime.strptime(f"{hour}:{minute}", "%H:%M").time()
+    elif hour_matches:
+        hour = int(hour_matches[0][0])
+        if hour_matches[0][1] == "pm" and hour < 12:
+            hour += 12
+        elif hour_matches[0][1] == "am" and hour == 12:
+            hour = 0
+        target_time = datetime.strptime(f"{hour}:00", "%H:%M").time()
+    return target_date, target_time
+
+
+def timed(function):
+    begin = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - begin
+
+
+def main():
+    data = pd.read_csv(DATASET_PATH)
+    messages = data['Raw_Text'].tolist()
+    labels = [json.loads(entities) for entities in data['Entities']]
+    now = datetime(2025, 3, 5, 10)
+
+    _, regex_s = timed(lambda: [regex_parse_date_time(m, now) for m in messages])
+    parsed, single_s = timed(lambda: [parse_message(m, now) for m in messages])
+    batch, batch_s = timed(lambda: parse_messages(messages, now))
+    assert batch == parsed
+
+    n = len(messages)
+    print(f"{n} messages ({len(set(messages))} distinct)")
+    print(f"regex searches (date/time):   {n / regex_s:10.0f} msg/s")
+    print(f"parse_message (all entities): {n / single_s:10.0f} msg/s")
+    print(f"parse_messages (batch):       {n / batch_s:10.0f} msg/s")
+
+    print("\nagreement with Entities:")
+    for key in KEYS:
+        found = [(p[key], l.get(key)) for p, l in zip(parsed, labels) if p[key] is not None]
+        agree = sum(value == label for value, label in found)
+        rate = agree / len(found) if found else 0.0
+        print(f"  {key:<9} coverage {len(found) / n:6.1%}  agreement {rate:6.1%} "
+              f"({agree}/{len(found)})")
+
+
+if __name__ == "__main__":
+    main()
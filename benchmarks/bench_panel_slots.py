@@ -0,0 +1,55 @@
+"""
+Benchmark: multi-participant panel slot search
+
+Panels of 2 to 20 participants across three timezones, each with about 20%
+of their working hours booked, searched over a four-week window.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_panel_slots
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from calendar_utils import CalendarManager
+
+TIMEZONES = ['UTC', 'Europe/London', 'America/New_York']
+WEEKS = 4
+RUNS = 10
+
+
+def build_calendar(panel, start, rng):
+    calendar = CalendarManager()
+    for i, participant in enumerate(panel):
+        calendar.set_participant_settings(participant, TIMEZONES[i % len(TIMEZONES)],
+                                          {'start': 8, 'end': 18})
+        for day in range(WEEKS * 7):
+            day_start = start + timedelta(days=day)
+            for hour in range(24):
+                if rng.random() < 0.2 * 10 / 24:
+                    begin = day_start + timedelta(hours=hour, minutes=rng.choice([0, 30]))
+                    calendar.add_busy_time(participant, begin, begin + timedelta(minutes=45))
+    return calendar
+
+
+def main():
+    rng = random.Random(5)
+    start = pytz.UTC.localize(datetime(2025, 3, 3))
+    window = (start, start + timedelta(weeks=WEEKS))
+    print(f"{'panel':>6}{'options':>9}{'time':>11}")
+    for size in [2, 5, 10, 15, 20]:
+        panel = [f"p{i}" for i in range(size)]
+        calendar = build_calendar(panel, start, rng)
+        begin = time.perf_counter()
+        for _ in range(RUNS):
+            options = calendar.find_common_slots(panel, 60, window, count=5)
+        elapsed = (time.perf_counter() - begin) / RUNS * 1000
+        print(f"{size:>6}{len(options):>9}{elapsed:>9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: availability queries against recurring meetings
+
+Gives every recruiter a few year-long recurring series (a weekly hiring
+sync, a daily stand-up) and times one-hour availability checks and day-long
+slot searches, against expanding every series in full with dateutil for each
+query.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_recurrence [--recruiters 200]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+from dateutil.rrule import rrulestr
+
+from calendar_utils import CalendarManager
+
+QUERIES = 5000
+ORIGIN = datetime(2025, 1, 6, tzinfo=pytz.UTC)
+RULES = ['FREQ=WEEKLY;BYDAY=MO;COUNT=52',
+         'FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR;UNTIL=20251231T235959Z',
+         'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;COUNT=52']
+
+
+def percentiles_us(samples):
+    samples = np.array(samples) * 1e6
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recruiters', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    calendar = CalendarManager()
+    expanded = {}  # recruiter -> dateutil rules, the eager alternative
+    for number in range(args.recruiters):
+        recruiter = f"recruiter{number}"
+        for rule in RULES:
+            start = ORIGIN + timedelta(hours=rng.randrange(9, 17))
+            calendar.add_recurring_busy_time(recruiter, start, start + timedelta(hours=1), rule)
+            expanded.setdefault(recruiter, []).append(rrulestr(rule, dtstart=start))
+
+    queries = []
+    for _ in range(QUERIES):
+        start = ORIGIN + timedelta(minutes=15 * rng.randrange(4 * 24 * 360))
+        queries.append((f"recruiter{rng.randrange(args.recruiters)}", start,
+                        start + timedelta(hours=1)))
+
+    # The second pass over the same days is answered from the cached windows
+    cold, warm, eager, search = [], [], [], []
+    for samples in (cold, warm):
+        for recruiter, start, end in queries:
+            begin = time.perf_counter()
+            calendar.find_conflicts([recruiter], start, end)
+            samples.append(time.perf_counter() - begin)
+
+    buffer = timedelta(minutes=calendar.buffer_time)
+    for recruiter, start, end in queries[:QUERIES // 10]:
+        begin = time.perf_counter()
+        busy = any(occurrence < end + buffer and occurrence + timedelta(hours=1) > start - buffer
+                   for rule in expanded[recruiter] for occurrence in list(rule))
+        eager.append(time.perf_counter() - begin)
+        assert busy == bool(calendar.find_conflicts([recruiter], start, end))
+
+    for _ in range(QUERIES // 10):
+        pair = [f"recruiter{rng.randrange(args.recruiters)}" for _ in range(2)]
+        start_from = ORIGIN + timedelta(days=rng.randrange(330))
+        begin = time.perf_counter()
+        calendar.suggest_next_slots('Technical Interview', 'UTC', start_from, count=3,
+                                    participants=pair)
+        search.append(time.perf_counter() - begin)
+
+    print(f"{args.recruiters} recruiters x {len(RULES)} year-long series")
+    print("is-busy (lazy, first look):     p50 %7.1fus  p99 %8.1fus" % percentiles_us(cold))
+    print("is-busy (lazy, cached windows): p50 %7.1fus  p99 %8.1fus" % percentiles_us(warm))
+    print("is-busy (expand whole series):  p50 %7.1fus  p99 %8.1fus" % percentiles_us(eager))
+    print("slot search, two recruiters:    p50 %7.1fus  p99 %8.1fus" % percentiles_us(search))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: slot bitmap vs interval index on many participants
+
+Builds four weeks of calendars for several thousand participants and compares
+checking one slot for all of them, and finding panel slots, using the
+interval index and the 15-minute slot bitmap.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slot_bitmap
+"""
+
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from calendar_utils import CalendarManager
+
+PARTICIPANTS = 5000
+EVENTS_PER_PARTICIPANT = 40
+DAYS = 28
+RUNS = 20
+
+
+def build_calendar(rng):
+    calendar = CalendarManager()
+    start = int(datetime(2025, 3, 3, tzinfo=pytz.UTC).timestamp())
+    events = []
+    for i in range(PARTICIPANTS):
+        for _ in range(EVENTS_PER_PARTICIPANT):
+            begin = start + 900 * rng.randrange(DAYS * 96)
+            events.append((f"p{i}", begin, begin + 900 * rng.randrange(1, 9)))
+    calendar.availability.add_events(events)
+    return calendar
+
+
+def main():
+    rng = random.Random(0)
+    calendar = build_calendar(rng)
+    people = calendar.availability.participants()
+    slot_start = int(datetime(2025, 3, 12, 14, tzinfo=pytz.UTC).timestamp())
+    slot_end = slot_start + 3600
+
+    begin = time.perf_counter()
+    bitmap = calendar.build_slot_bitmap(date(2025, 3, 3), DAYS)
+    build_ms = (time.perf_counter() - begin) * 1000
+
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        expected = [calendar.availability.is_free(p, slot_start, slot_end) for p in people]
+    index_ms = (time.perf_counter() - begin) / RUNS * 1000
+
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        free = bitmap.free_participants(people, slot_start, slot_end, calendar.buffer_time)
+    bitmap_ms = (time.perf_counter() - begin) / RUNS * 1000
+    assert free.tolist() == expected
+
+    panel = rng.sample(people, 3)
+    start_from = datetime(2025, 3, 3, 8, tzinfo=pytz.UTC)
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        slots = calendar.suggest_next_slots('Technical Interview', 'UTC', start_from,
+                                            count=20, participants=panel)
+    bitmap_search_ms = (time.perf_counter() - begin) / RUNS * 1000
+
+    calendar.slot_bitmap = None
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        swept = calendar.suggest_next_slots('Technical Interview', 'UTC', start_from,
+                                            count=20, participants=panel)
+    sweep_ms = (time.perf_counter() - begin) / RUNS * 1000
+    assert slots == swept
+
+    print(f"{PARTICIPANTS} participants x {DAYS} days, "
+          f"bitmap {bitmap.nbytes / 1e6:.1f} MB built in {build_ms:.0f}ms")
+    print(f"One slot, everyone  index: {index_ms:8.2f}ms   bitmap: {bitmap_ms:8.2f}ms")
+    print(f"20 panel slots      sweep: {sweep_ms:8.2f}ms   bitmap: {bitmap_search_ms:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
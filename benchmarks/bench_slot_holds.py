@@ -0,0 +1,99 @@
+"""
+Benchmark: hold and confirm throughput with many concurrent sessions
+
+Runs sessions on threads that each offer a few slots (hold), then confirm one
+and let the rest lapse or release them, against the in-memory index and the
+SQLite event store. Reports operations per second, confirm latency, how many
+holds are live at the end and whether any recruiter was booked twice.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slot_holds [--sessions 500]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+
+from calendar_utils import CalendarManager
+from event_store import EventStore
+
+RECRUITERS = 50
+ORIGIN = datetime(2025, 3, 3, 9, tzinfo=pytz.UTC)
+SLOTS = [ORIGIN + timedelta(days=day, minutes=15 * i) for day in range(5) for i in range(32)]
+
+
+def run(calendar, sessions, offers):
+    latencies, booked = [], []
+    barrier = threading.Barrier(sessions)
+
+    def session(number):
+        rng = random.Random(number)
+        barrier.wait()
+        recruiter = f"recruiter{rng.randrange(RECRUITERS)}"
+        participants = [recruiter, f"candidate{number}"]
+        holds = []
+        for _ in range(offers):
+            start = rng.choice(SLOTS)
+            hold = calendar.hold_slot(participants, start, start + timedelta(hours=1), number)
+            if hold is not None:
+                holds.append(hold)
+        if holds:
+            begin = time.perf_counter()
+            if calendar.confirm_hold(holds[0].hold_id):
+                booked.append((recruiter, holds[0].start, holds[0].end))
+            latencies.append(time.perf_counter() - begin)
+        calendar.release_session_holds(number)
+
+    threads = [threading.Thread(target=session, args=(number,)) for number in range(sessions)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+    return elapsed, latencies, booked
+
+
+def double_bookings(booked, buffer):
+    count = 0
+    for recruiter in {r for r, _, _ in booked}:
+        meetings = sorted((start, end) for r, start, end in booked if r == recruiter)
+        count += sum(start < previous_end + buffer
+                     for (_, previous_end), (start, _) in zip(meetings, meetings[1:]))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=500)
+    parser.add_argument('--offers', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = [('AvailabilityIndex', None),
+                  ('EventStore', EventStore(os.path.join(directory, 'events.sqlite3')))]
+        for name, store in stores:
+            calendar = CalendarManager(event_store=store)
+            elapsed, latencies, booked = run(calendar, args.sessions, args.offers)
+            operations = args.sessions * (args.offers + 2)
+            latencies = np.array(latencies) * 1e6
+            print(f"{name:18} {args.sessions} sessions: {operations / elapsed:9.0f} ops/s, "
+                  f"confirm p50 {np.percentile(latencies, 50):7.1f}us "
+                  f"p99 {np.percentile(latencies, 99):8.1f}us, {len(booked)} booked, "
+                  f"{len(calendar.holds)} holds left, "
+                  f"{double_bookings(booked, calendar.buffer_time * 60)} "
+                  f"double-booked")
+            if store is not None:
+                store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: gap-finding slot search on a nearly full calendar
+
+A recruiter is booked back to back for four weeks except for a single gap on
+the last day. Compares suggest_next_slots with probing every 15-minute start
+through check_availability.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slot_search
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from calendar_utils import CalendarManager
+
+RUNS = 20
+
+
+def build_calendar():
+    calendar = CalendarManager()
+    start = pytz.UTC.localize(datetime(2025, 3, 3, 9))
+    for day in range(28):
+        day_start = start + timedelta(days=day)
+        for slot in range(16):
+            begin = day_start + timedelta(minutes=30 * slot)
+            if day == 25 and slot == 12:
+                continue  # the only opening: 3 PM on the last Friday
+            calendar.add_busy_time("r1", begin, begin + timedelta(minutes=30))
+    return calendar, start
+
+
+def probe(calendar, start):
+    """Baseline: try every 15-minute start until one is free"""
+    current = start
+    end = start + timedelta(days=28)
+    while current < end:
+        if calendar.check_availability(current.date(), current.time(), 30,
+                                       participants=["r1"]):
+            return current
+        current += timedelta(minutes=15)
+    return None
+
+
+def main():
+    calendar, start = build_calendar()
+    # The buffer would hide a 30-minute gap between back-to-back events
+    calendar.availability.buffer = 0
+
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        slots = calendar.suggest_next_slots('Initial Discussion', 'UTC', start,
+                                            count=1, participants=["r1"])
+    sweep_ms = (time.perf_counter() - begin) / RUNS * 1000
+
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        probed = probe(calendar, start)
+    probe_ms = (time.perf_counter() - begin) / RUNS * 1000
+
+    print(f"Gap sweep:  {sweep_ms:8.2f}ms -> {slots[0]}")
+    print(f"Probing:    {probe_ms:8.2f}ms -> {probed}")
+
+
+if __name__ == "__main__":
+    main()
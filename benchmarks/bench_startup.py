@@ -0,0 +1,63 @@
+"""
+Benchmark: cold start of the scheduling bot
+
+Each measurement runs in a fresh interpreter so that module and model caches
+are cold. Reports the import time of scheduling_bot/calendar_utils, the time
+to construct SchedulingBot, and the time to the first intent prediction, for
+both lazy (default) and eager (warm_up=True) loading.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+"""
+
+import json
+import subprocess
+import sys
+
+PROBE = r'''
+import json, time, warnings
+warnings.filterwarnings('ignore')
+start = time.perf_counter()
+import scheduling_bot
+import calendar_utils
+imported = time.perf_counter()
+bot = scheduling_bot.SchedulingBot(warm_up=%s)
+constructed = time.perf_counter()
+bot.process_message("Can we schedule a meeting?")
+predicted = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'construct': constructed - imported,
+    'first_prediction': predicted - constructed,
+    'total': predicted - start,
+}))
+'''
+
+RUNS = 5
+
+
+def measure(warm_up):
+    """Run the probe ``RUNS`` times and return the per-stage medians"""
+    samples = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, '-c', PROBE % warm_up],
+                                capture_output=True, text=True, check=True)
+        samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return {key: sorted(sample[key] for sample in samples)[RUNS // 2]
+            for key in samples[0]}
+
+
+def main():
+    print(f"{'mode':<8}{'import':>10}{'construct':>12}{'1st pred':>12}{'total':>10}")
+    for label, warm_up in [('lazy', False), ('eager', True)]:
+        result = measure(warm_up)
+        print(f"{label:<8}"
+              f"{result['import'] * 1000:>8.1f}ms"
+              f"{result['construct'] * 1000:>10.1f}ms"
+              f"{result['first_prediction'] * 1000:>10.1f}ms"
+              f"{result['total'] * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
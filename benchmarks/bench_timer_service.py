@@ -0,0 +1,70 @@
+"""
+Benchmark: timer service scheduling, cancelling, reloading and firing
+
+Schedules reminders for many meetings, cancels half of them, reloads the
+pending timers as after a restart and fires the rest, reporting the cost per
+operation and the peak heap size.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timer_service [--timers 200000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from timer_service import TimerService
+
+BATCH = 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--timers', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'timers.sqlite3')
+        timers = TimerService(path, clock=lambda: 0)
+        dues = [rng.uniform(1, 86400 * 30) for _ in range(args.timers)]
+        payload = {'meeting': 'uid@scheduling.bot', 'minutes': 60}
+
+        begin = time.perf_counter()
+        for i in range(0, args.timers, BATCH):
+            timers.schedule_many([('ping', due, payload, f"t{i + j}")
+                                  for j, due in enumerate(dues[i:i + BATCH])])
+        elapsed = time.perf_counter() - begin
+        print(f"schedule (batches of {BATCH}): {1e6 * elapsed / args.timers:6.2f}us/timer")
+
+        begin = time.perf_counter()
+        for i in range(1000):
+            timers.schedule('ping', rng.uniform(1, 86400 * 30), payload, f"single{i}")
+        print(f"schedule (one by one):        {1e3 * (time.perf_counter() - begin):6.2f}us/timer"
+              " (one commit each)")
+
+        begin = time.perf_counter()
+        for i in range(0, args.timers, 2):
+            timers.cancel(f"t{i}")
+        elapsed = time.perf_counter() - begin
+        print(f"cancel:                       {2e6 * elapsed / args.timers:6.2f}us/timer, "
+              f"heap {len(timers._heap)} for {len(timers)} timers")
+
+        begin = time.perf_counter()
+        timers = TimerService(path, clock=lambda: 0)
+        print(f"reload {len(timers)} timers:        {time.perf_counter() - begin:6.2f}s")
+
+        fired = []
+        timers.register('ping', fired.append)
+        begin = time.perf_counter()
+        timers.run_due(86400 * 31)
+        elapsed = time.perf_counter() - begin
+        print(f"fire:                         {1e6 * elapsed / len(fired):6.2f}us/timer "
+              f"({len(fired)} fired, one commit each)")
+
+
+if __name__ == '__main__':
+    main()
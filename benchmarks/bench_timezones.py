@@ -0,0 +1,71 @@
+"""
+Benchmark: cached offset tables vs per-call pytz localization
+
+Compares resolving a zone and localizing every working day of a 28-day
+horizon through pytz with the cached working_windows, and times a slot
+search in a DST zone.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timezones
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from calendar_utils import CalendarManager
+from timezones import working_windows
+
+RUNS = 200
+ZONE = 'America/New_York'
+
+
+def localize_windows(first_day, n_days):
+    """Baseline: resolve the zone and localize both ends of every weekday"""
+    tz = pytz.timezone(ZONE)
+    windows = []
+    for offset in range(n_days):
+        day = first_day + timedelta(days=offset)
+        if day.weekday() < 5:
+            midnight = datetime(day.year, day.month, day.day)
+            windows.append((int(tz.localize(midnight + timedelta(hours=9)).timestamp()),
+                            int(tz.localize(midnight + timedelta(hours=17)).timestamp())))
+    return windows
+
+
+def main():
+    first_day = date(2025, 3, 1)
+
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        expected = localize_windows(first_day, 28)
+    pytz_us = (time.perf_counter() - begin) / RUNS * 1e6
+
+    working_windows.cache_clear()
+    begin = time.perf_counter()
+    windows = working_windows(ZONE, 9, 17, first_day, 28)
+    cold_us = (time.perf_counter() - begin) * 1e6
+
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        working_windows(ZONE, 9, 17, first_day, 28)
+    warm_us = (time.perf_counter() - begin) / RUNS * 1e6
+    assert list(windows) == expected
+
+    calendar = CalendarManager()
+    start_from = pytz.timezone(ZONE).localize(datetime(2025, 3, 3, 8))
+    begin = time.perf_counter()
+    for _ in range(RUNS):
+        calendar.suggest_next_slots('Technical Interview', ZONE, start_from, count=5)
+    search_us = (time.perf_counter() - begin) / RUNS * 1e6
+
+    print(f"28-day windows, pytz localize: {pytz_us:8.1f}us")
+    print(f"28-day windows, table (cold):  {cold_us:8.1f}us  (builds the zone's year table once)")
+    print(f"28-day windows, table (warm):  {warm_us:8.1f}us")
+    print(f"suggest_next_slots x5 ({ZONE}): {search_us:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,92 @@ This module handles all calendar-related functionality including:
 - Creating calendar events
 - Sending calendar invites
 - Managing working hours and meeting durations
+- Checking participants' availability against their existing events
+- Recurring meetings (RRULE/EXDATE), in invites and in availability checks
+- Importing participants' own calendars from .ics exports as busy time
+- Writing invites and whole schedules as iCalendar (.ics) text
 """
 
+import bisect
+import heapq
+import logging
 import os
+import threading
+import uuid
 from datetime import datetime, timedelta
 import pytz
 from config import CALENDAR_CONFIG
-import icalendar
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-import smtplib
 from config import EMAIL_CONFIG
+from availability import AvailabilityIndex, read_calendar_events, to_timestamp
+from ics_import import ImportedCalendars
+from recurrence import Recurrence, RecurringCalendar, RecurringEvent
+from slot_bitmap import SlotBitmap
+from slot_holds import HoldTable
+from timezones import get_timezone, local_midnight, working_windows
+
+logger = logging.getLogger(__name__)
+
+# Fixed parts of create_calendar_event's output, laid out in the property
+# order icalendar serializes them in
+ICS_PRODID = '-//Scheduling Bot//scheduling.bot//'
+ICS_ALARM = ('BEGIN:VALARM\r\nACTION:DISPLAY\r\nDESCRIPTION:Reminder\r\n'
+             'TRIGGER:-PT15M\r\nEND:VALARM\r\n')
+ICS_CHAIR = 'ATTENDEE;PARTSTAT=ACCEPTED;ROLE=CHAIR;RSVP=FALSE:mailto:'
+ICS_ATTENDEE = 'ATTENDEE;PARTSTAT=NEEDS-ACTION;ROLE=REQ-PARTICIPANT;RSVP=TRUE:mailto:'
+# UIDs are derived from the meeting, so resending an invite updates it
+ICS_UID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, 'scheduling.bot')
+
+
+def _ics_text(value):
+    """Escape a TEXT value (RFC 5545 section 3.3.11)."""
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+
+def _ics_datetime(dt):
+    """Format a DATE-TIME value; aware datetimes are written in UTC."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(pytz.UTC)
+        return f"{dt.year:04}{dt.month:02}{dt.day:02}T{dt.hour:02}{dt.minute:02}{dt.second:02}Z"
+    return f"{dt.year:04}{dt.month:02}{dt.day:02}T{dt.hour:02}{dt.minute:02}{dt.second:02}"
+
+
+def _ics_line(line):
+    """
+    Fold a content line into pieces of at most 74 octets plus CRLF.
+
+    Like icalendar, a fold never separates a backslash or caret escape from
+    the character it escapes.
+    """
+    if len(line) < 75 and line.isascii():
+        return line + '\r\n'
+    if line.isascii():
+        pieces = []
+        pos = 0
+        while len(line) - pos > 74:
+            end = pos + 74
+            if line[end - 1] in '\\^':
+                end -= 1
+            pieces.append(line[pos:end])
+            pos = end
+        pieces.append(line[pos:])
+        return '\r\n '.join(pieces) + '\r\n'
+
+    pieces, current, size = [], [], 0
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if current and size + char_size >= 75:
+            if len(current) > 1 and current[-1] in '\\^':
+                carried = current.pop()
+                pieces.append(''.join(current))
+                current, size = [carried], len(carried.encode('utf-8'))
+            else:
+                pieces.append(''.join(current))
+                current, size = [], 0
+        current.append(char)
+        size += char_size
+    pieces.append(''.join(current))
+    return '\r\n '.join(pieces) + '\r\n'
 
 
 class CalendarManager:
@@ -31,11 +104,448 @@ class CalendarManager:
     - Working hours management
     """
 
-    def __init__(self):
-        """Initialize the calendar manager with configuration settings."""
+    def __init__(self, smtp_pool=None, event_store=None):
+        """
+        Initialize the calendar manager with configuration settings.
+
+        Args:
+            smtp_pool (SMTPConnectionPool, optional): Transport for invites
+                (default: a pool for EMAIL_CONFIG, opened on first send)
+            event_store (EventStore, optional): Persistent store of busy time
+                to record and query events in (default: an in-memory
+                AvailabilityIndex that lasts as long as this object)
+        """
         self.working_hours = CALENDAR_CONFIG['working_hours']
         self.meeting_durations = CALENDAR_CONFIG['meeting_durations']
         self.buffer_time = CALENDAR_CONFIG['buffer_time']
+        self.availability = (event_store if event_store is not None
+                             else AvailabilityIndex(self.buffer_time))
+        # Recurring busy time, expanded only where it is queried; with an
+        # EventStore, series are also stored there and read back from it
+        self.recurring = RecurringCalendar(self.buffer_time)
+        self._stores_series = hasattr(self.availability, 'series_since')
+        self._series_seen = 0  # last series row read from the store
+        self._series_lock = threading.Lock()
+        # Busy time imported from participants' own calendar exports
+        self.imported = ImportedCalendars(self.buffer_time)
+        # Optional bitmap copy of the busy time, see build_slot_bitmap
+        self.slot_bitmap = None
+        # participant -> {'timezone': str, 'working_hours': dict}
+        self.participant_settings = {}
+        self._smtp_pool = smtp_pool
+        # Offered slots reserved for the session they were offered to
+        self.holds = HoldTable(CALENDAR_CONFIG['hold_ttl_seconds'])
+        self._holds_lock = threading.Lock()
+        self._load_series()
+
+    def set_participant_settings(self, participant, timezone='UTC', working_hours=None):
+        """
+        Set the timezone and working hours used for a participant.
+
+        Args:
+            participant (str): Participant ID or email
+            timezone (str): Timezone name (default: 'UTC')
+            working_hours (dict, optional): {'start': hour, 'end': hour}
+                (default: CALENDAR_CONFIG['working_hours'])
+        """
+        self.participant_settings[participant] = {
+            'timezone': timezone,
+            'working_hours': working_hours or self.working_hours
+        }
+
+    def add_busy_time(self, participant, start_time, end_time):
+        """
+        Record an existing event in a participant's calendar.
+
+        Args:
+            participant (str): Participant ID or email
+            start_time (datetime): Event start
+            end_time (datetime): Event end
+        """
+        self.availability.add_event(participant, start_time, end_time)
+        if self.slot_bitmap is not None:
+            self.slot_bitmap.mark_busy(participant, to_timestamp(start_time),
+                                       to_timestamp(end_time))
+
+    def add_recurring_busy_time(self, participant, start_time, end_time, rrule,
+                                exdates=None, timezone='UTC'):
+        """
+        Record a recurring event in a participant's calendar.
+
+        Only the series is stored; occurrences are expanded when a query
+        looks at the days they fall on.
+
+        Args:
+            participant (str): Participant ID or email
+            start_time (datetime): Start of the first occurrence
+            end_time (datetime): End of the first occurrence
+            rrule (str or Recurrence): Rule such as 'FREQ=WEEKLY;BYDAY=MO;COUNT=52'
+            exdates (list, optional): Start datetimes of skipped occurrences
+            timezone (str): Zone whose wall-clock time occurrences keep
+
+        Returns:
+            RecurringEvent: The series
+        """
+        series = RecurringEvent(to_timestamp(start_time), to_timestamp(end_time), rrule,
+                                [to_timestamp(exdate) for exdate in exdates or ()],
+                                timezone)
+        if self._stores_series:
+            self._store_series([participant], series)
+        else:
+            self._add_series([participant], series)
+        return series
+
+    def _add_series(self, participants, series):
+        for participant in participants:
+            self.recurring.add(participant, series)
+            if self.slot_bitmap is not None:
+                self._mark_series(self.slot_bitmap, participant, series)
+
+    def _store_series(self, participants, series, after=None):
+        """Write a series to the event store and read it back; see EventStore.add_series."""
+        stored = self.availability.add_series(
+            participants, series.start, series.start + series.duration,
+            series.recurrence.to_ical(), series.exdates, series.timezone_name, after)
+        self._load_series()
+        return stored
+
+    def _load_series(self):
+        """Pick up series stored since the last look, by this or another process."""
+        if not self._stores_series:
+            return
+        with self._series_lock:
+            rows = self.availability.series_since(self._series_seen)
+            shared = {}  # the participants of one booking share its RecurringEvent
+            for row_id, participant, start, end, rrule, exdates, timezone in rows:
+                key = (start, end, rrule, tuple(exdates), timezone)
+                series = shared.get(key)
+                if series is None:
+                    series = shared[key] = RecurringEvent(start, end, rrule, exdates, timezone)
+                self._add_series([participant], series)
+                self._series_seen = row_id
+
+    def import_ics(self, participant, source, timezone=None):
+        """
+        Sync a participant's busy time with an export of their own calendar.
+
+        The .ics file is streamed rather than parsed into an object tree, and
+        only events that are new or changed since the last import of the
+        participant's calendar are converted; events no longer in the export
+        stop blocking time.
+
+        Args:
+            participant (str): Participant ID or email
+            source (str or file): Path of the .ics file, or an open file
+            timezone (str, optional): Zone for floating times and all-day
+                events (default: the participant's timezone, else 'UTC')
+
+        Returns:
+            ImportStats: Events added, updated, unchanged, removed, skipped,
+                ignored and duplicated (see ics_import.ImportStats)
+        """
+        if timezone is None:
+            timezone = self.participant_settings.get(participant, {}).get('timezone', 'UTC')
+        stats = self.imported.import_ics(participant, source, timezone)
+        if stats.added or stats.updated or stats.removed or stats.skipped:
+            # Bitmap slots cannot be cleared one event at a time; the rebuild
+            # reads every source, so bookings must not change them meanwhile
+            with self._holds_lock:
+                bitmap = self.slot_bitmap
+                if bitmap is not None:
+                    self.build_slot_bitmap(bitmap.start_day, bitmap.n_days,
+                                           bitmap.slot_minutes)
+        return stats
+
+    @staticmethod
+    def _mark_series(bitmap, participant, series):
+        occurrences = series.between(bitmap.origin, bitmap.end)
+        if occurrences:
+            bitmap.mark_busy_many([participant] * len(occurrences), *zip(*occurrences))
+
+    def find_conflicts(self, participants, start_time, end_time):
+        """
+        Find participants who are busy at the given time.
+
+        Args:
+            participants (list): Participant IDs or emails
+            start_time (datetime): Proposed start
+            end_time (datetime): Proposed end
+
+        Returns:
+            list: Participants whose events (plus buffer time) overlap the slot
+        """
+        return self._conflicts(participants, to_timestamp(start_time),
+                               to_timestamp(end_time))
+
+    def _conflicts(self, participants, start, end):
+        """Busy participants, one-off and recurring events alike; POSIX seconds."""
+        self._load_series()
+        busy = set(self.availability.conflicts(participants, start, end))
+        if self.recurring:
+            busy.update(self.recurring.conflicts(participants, start, end))
+        if self.imported:
+            busy.update(self.imported.conflicts(participants, start, end))
+        return [participant for participant in participants if participant in busy]
+
+    def _is_free(self, participant, start, end):
+        self._load_series()
+        return (self.availability.is_free(participant, start, end) and
+                (participant not in self.recurring or
+                 self.recurring.is_free(participant, start, end)) and
+                (participant not in self.imported or
+                 self.imported.is_free(participant, start, end)))
+
+    def _busy_intervals(self, participant, start, end):
+        """A participant's sorted busy intervals in [start, end) from every source."""
+        self._load_series()
+        busy = self.availability.busy_intervals(participant, start, end)
+        if participant in self.recurring:
+            busy = heapq.merge(busy, self.recurring.busy_intervals(participant, start, end))
+        if participant in self.imported:
+            busy = heapq.merge(busy, self.imported.busy_intervals(participant, start, end))
+        return busy
+
+    def hold_slot(self, participants, start_time, end_time, session_id, ttl_seconds=None):
+        """
+        Reserve a slot for a session while it is being offered.
+
+        The slot is held only if every participant is free and nobody else
+        holds an overlapping slot for any of them.
+
+        Args:
+            participants (list): Participant IDs or emails
+            start_time (datetime): Slot start
+            end_time (datetime): Slot end
+            session_id (str): Session the slot is offered to
+            ttl_seconds (float, optional): Lifetime of the hold
+                (default: CALENDAR_CONFIG['hold_ttl_seconds'])
+
+        Returns:
+            SlotHold: The hold, or None if the slot is taken
+        """
+        start, end = to_timestamp(start_time), to_timestamp(end_time)
+        with self._holds_lock:
+            if (self.holds.conflicts(participants, start, end, session_id) or
+                    self._conflicts(participants, start, end)):
+                return None
+            return self.holds.add(participants, start, end, session_id, ttl_seconds)
+
+    def release_hold(self, hold_id):
+        """Give up a hold; returns whether it was still live."""
+        with self._holds_lock:
+            return self.holds.release(hold_id) is not None
+
+    def release_session_holds(self, session_id):
+        """Give up every hold of a session; returns how many there were."""
+        with self._holds_lock:
+            return self.holds.release_session(session_id)
+
+    def confirm_hold(self, hold_id, participants=None, start_time=None, end_time=None,
+                     session_id=None):
+        """
+        Book a held slot.
+
+        Booking is a compare-and-set on the availability store: the slot is
+        recorded only if every participant is still free, so a slot is never
+        booked twice even by callers that bypass holds. The hold is checked
+        against the meeting being booked and the session booking it under the
+        same lock, so it cannot expire or change hands in between.
+
+        Args:
+            hold_id (str): Hold returned by hold_slot
+            participants (list, optional): Participants the meeting is for;
+                must be the held ones
+            start_time, end_time (datetime, optional): Meeting bounds; must
+                be the held slot
+            session_id (str, optional): Session booking the slot; must be the
+                one that placed the hold
+
+        Returns:
+            bool: True if the slot was booked; False if the hold expired,
+                does not match or the slot was taken meanwhile
+        """
+        with self._holds_lock:
+            hold = self.holds.get(hold_id)
+            if hold is None or (
+                    (participants is not None and tuple(participants) != hold.participants) or
+                    (start_time is not None and to_timestamp(start_time) != hold.start) or
+                    (end_time is not None and to_timestamp(end_time) != hold.end) or
+                    (session_id is not None and session_id != hold.session_id)):
+                return False
+            if self._book(hold.participants, hold.start, hold.end):
+                # Keep the hold, so the session can still book the slot
+                # once whatever conflicts is gone
+                return False
+            self.holds.release(hold_id)
+            return True
+
+    def book_slot(self, participants, start_time, end_time, session_id=None):
+        """
+        Book a slot for all participants at once, if they are all free.
+
+        Slots held by other sessions count as taken.
+
+        Args:
+            participants (list): Participant IDs or emails
+            start_time (datetime): Meeting start
+            end_time (datetime): Meeting end
+            session_id (str, optional): Session booking the slot; its own
+                holds do not block it
+
+        Returns:
+            list: Conflicting participants; empty if the slot was booked
+        """
+        start, end = to_timestamp(start_time), to_timestamp(end_time)
+        with self._holds_lock:
+            conflicts = self.holds.conflicts(participants, start, end, session_id)
+            if conflicts:
+                return conflicts
+            return self._book(participants, start, end)
+
+    def cancel_booking(self, participants, start_time, end_time):
+        """
+        Free a booked slot again, e.g. when a meeting is cancelled or moved.
+
+        Args:
+            participants (list): Participant IDs or emails the slot was booked for
+            start_time (datetime): Meeting start
+            end_time (datetime): Meeting end
+
+        Returns:
+            list: Participants whose booking was removed
+        """
+        start, end = to_timestamp(start_time), to_timestamp(end_time)
+        with self._holds_lock:
+            removed = [participant for participant in participants
+                       if self.availability.remove_event(participant, start, end)]
+            if removed and self.slot_bitmap is not None:
+                # Bitmap slots cannot be cleared one event at a time
+                bitmap = self.slot_bitmap
+                self.build_slot_bitmap(bitmap.start_day, bitmap.n_days, bitmap.slot_minutes)
+        return removed
+
+    def book_recurring(self, participants, start_time, end_time, rrule, exdates=None,
+                       timezone='UTC', check_days=None, session_id=None):
+        """
+        Book a recurring meeting for all participants, if they are all free.
+
+        Occurrences are checked against events, series and other sessions'
+        holds up to ``check_days`` after the first one; the series is then
+        stored once and expanded lazily by later queries. With an EventStore
+        the rule is stored in it, so it survives restarts and is seen by
+        other processes; if one of them stored a series meanwhile, the check
+        is repeated against it.
+
+        Args:
+            participants (list): Participant IDs or emails
+            start_time (datetime): Start of the first occurrence
+            end_time (datetime): End of the first occurrence
+            rrule (str or Recurrence): Recurrence rule
+            exdates (list, optional): Start datetimes of skipped occurrences
+            timezone (str): Zone whose wall-clock time occurrences keep
+            check_days (int, optional): Days of occurrences checked
+                (default: CALENDAR_CONFIG['recurring_check_days'])
+            session_id (str, optional): Session booking the series; its own
+                holds do not block it
+
+        Returns:
+            list: Participants busy at some occurrence; empty if booked
+        """
+        series = RecurringEvent(to_timestamp(start_time), to_timestamp(end_time), rrule,
+                                [to_timestamp(exdate) for exdate in exdates or ()],
+                                timezone)
+        horizon = series.start + 86400 * (check_days or CALENDAR_CONFIG['recurring_check_days'])
+        with self._holds_lock:
+            while True:
+                self._load_series()
+                seen = self._series_seen
+                busy = set()
+                for start, end in series.occurrences(series.start, horizon):
+                    busy.update(self.holds.conflicts(participants, start, end, session_id))
+                    busy.update(self._conflicts(participants, start, end))
+                    if len(busy) == len(participants):
+                        break
+                if busy:
+                    return [participant for participant in participants if participant in busy]
+                if not self._stores_series:
+                    self._add_series(participants, series)
+                    return []
+                if self._store_series(participants, series, after=seen):
+                    return []
+
+    def _book(self, participants, start, end):
+        """Compare-and-book on the availability store; times in POSIX seconds."""
+        self._load_series()
+        conflicts = [participant for participant in participants
+                     if (participant in self.recurring and
+                         not self.recurring.is_free(participant, start, end)) or
+                     (participant in self.imported and
+                      not self.imported.is_free(participant, start, end))]
+        if conflicts:
+            return conflicts
+        conflicts = self.availability.book(participants, start, end)
+        if not conflicts and self.slot_bitmap is not None:
+            for participant in participants:
+                self.slot_bitmap.mark_busy(participant, start, end)
+        return conflicts
+
+    def load_calendar_dataset(self, path=None):
+        """
+        Load busy events for all recruiters and candidates from a calendar CSV.
+
+        Args:
+            path (str, optional): CSV path (default: CALENDAR_CONFIG['calendar_dataset'])
+
+        Returns:
+            int: Number of participant events loaded
+        """
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                CALENDAR_CONFIG['calendar_dataset'])
+        events = list(read_calendar_events(path, CALENDAR_CONFIG['busy_statuses']))
+        if self.slot_bitmap is not None and events:
+            self.slot_bitmap.mark_busy_many(*zip(*events))
+        return self.availability.add_events(events)
+
+    def build_slot_bitmap(self, start_day, n_days=None, slot_minutes=None):
+        """
+        Keep a slot bitmap of everyone's busy time alongside the interval index.
+
+        While the bitmap covers the queried range, check_availability and
+        suggest_next_slots answer from vectorized bitmap operations. Events
+        are rounded outwards to whole slots, so results only differ from the
+        interval index when events do not start and end on slot boundaries.
+
+        Args:
+            start_day (date): First UTC day covered
+            n_days (int, optional): Days covered
+                (default: CALENDAR_CONFIG['search_horizon_days'])
+            slot_minutes (int, optional): Slot length
+                (default: CALENDAR_CONFIG['bitmap_slot_minutes'])
+
+        Returns:
+            SlotBitmap: The new bitmap
+        """
+        self._load_series()
+        bitmap = SlotBitmap(start_day, n_days or CALENDAR_CONFIG['search_horizon_days'],
+                            slot_minutes or CALENDAR_CONFIG['bitmap_slot_minutes'])
+        events = [(participant, start, end)
+                  for participant in self.availability.participants()
+                  for start, end in self.availability.busy_intervals(
+                      participant, bitmap.origin, bitmap.end)]
+        if events:
+            bitmap.mark_busy_many(*zip(*events))
+        for participant in self.recurring.participants():
+            for series in self.recurring.series(participant):
+                self._mark_series(bitmap, participant, series)
+        events = [(participant, start, end)
+                  for participant in self.imported.participants()
+                  for start, end in self.imported.busy_intervals(
+                      participant, bitmap.origin, bitmap.end)]
+        if events:
+            bitmap.mark_busy_many(*zip(*events))
+        self.slot_bitmap = bitmap
+        return bitmap
 
     def create_calendar_event(self, meeting_info):
         """
@@ -50,10 +560,17 @@ class CalendarManager:
                 - description: Meeting description
                 - recruiter_email: Organizer's email
                 - candidate_email: Attendee's email
+                - uid (optional): Event UID (default: invite_uid(meeting_info))
+                - dtstamp (optional): Creation time (default: now)
+                - rrule (optional): Recurrence rule (str or Recurrence), making
+                  start_time and end_time the first occurrence
+                - exdates (optional): Start datetimes of skipped occurrences
 
         Returns:
             icalendar.Calendar: The created calendar event
         """
+        import icalendar  # deferred: only needed when an event object is built
+
         cal = icalendar.Calendar()
         cal.add('prodid', '-//Scheduling Bot//scheduling.bot//')
         cal.add('version', '2.0')
@@ -65,7 +582,14 @@ class CalendarManager:
         event.add('summary', meeting_info['title'])
         event.add('dtstart', meeting_info['start_time'])
         event.add('dtend', meeting_info['end_time'])
-        event.add('dtstamp', datetime.now(pytz.UTC))
+        event.add('dtstamp', meeting_info.get('dtstamp') or datetime.now(pytz.UTC))
+        event.add('uid', self.invite_uid(meeting_info))
+        if meeting_info.get('rrule'):
+            event.add('rrule', icalendar.vRecur.from_ical(
+                self._recurrence(meeting_info).to_ical()))
+            if meeting_info.get('exdates'):
+                event.add('exdate', [exdate.astimezone(pytz.UTC) if exdate.tzinfo else exdate
+                                     for exdate in meeting_info['exdates']])
 
         # Location and description
         event.add('location', meeting_info['location'])
@@ -99,6 +623,209 @@ class CalendarManager:
         cal.add_component(event)
         return cal
 
+    @staticmethod
+    def invite_uid(meeting_info):
+        """
+        Stable UID of a meeting's calendar event.
+
+        Derived from the organizer, attendee, title and start time, so sending
+        the same invite again updates the event instead of duplicating it.
+        """
+        if meeting_info.get('uid'):
+            return meeting_info['uid']
+        key = '|'.join([meeting_info['recruiter_email'], meeting_info['candidate_email'],
+                        meeting_info['title'], meeting_info['start_time'].isoformat()])
+        return f"{uuid.uuid5(ICS_UID_NAMESPACE, key)}@scheduling.bot"
+
+    @staticmethod
+    def _recurrence(meeting_info):
+        rrule = meeting_info['rrule']
+        return Recurrence.parse(rrule) if isinstance(rrule, str) else rrule
+
+    def _event_ics(self, meeting_info, dtstamp):
+        """VEVENT text of one meeting, in create_calendar_event's layout."""
+        location = meeting_info['location']
+        lines = [
+            'BEGIN:VEVENT\r\n',
+            _ics_line('SUMMARY:' + _ics_text(meeting_info['title'])),
+            'DTSTART:' + _ics_datetime(meeting_info['start_time']) + '\r\n',
+            'DTEND:' + _ics_datetime(meeting_info['end_time']) + '\r\n',
+            'DTSTAMP:' + _ics_datetime(meeting_info.get('dtstamp') or dtstamp) + '\r\n',
+            _ics_line('UID:' + self.invite_uid(meeting_info))
+        ]
+        if meeting_info.get('rrule'):
+            lines.append(_ics_line('RRULE:' + self._recurrence(meeting_info).to_ical()))
+            if meeting_info.get('exdates'):
+                lines.append(_ics_line('EXDATE:' + ','.join(
+                    _ics_datetime(exdate) for exdate in meeting_info['exdates'])))
+        lines += [
+            _ics_line(ICS_CHAIR + meeting_info['recruiter_email']),
+            _ics_line(ICS_ATTENDEE + meeting_info['candidate_email']),
+            _ics_line('DESCRIPTION:' + _ics_text(meeting_info['description'])),
+            _ics_line('LOCATION:' + _ics_text(location)),
+            _ics_line('ORGANIZER:mailto:' + meeting_info['recruiter_email'])
+        ]
+        if 'meet.google.com' in location:
+            lines.append(_ics_line('URL:' + location))
+        lines.append(ICS_ALARM)
+        lines.append('END:VEVENT\r\n')
+        return ''.join(lines)
+
+    def iter_ics(self, meeting_infos, method='REQUEST'):
+        """
+        Stream an iCalendar file holding one VEVENT per meeting.
+
+        The text is written from precompiled templates rather than an
+        icalendar object graph, but matches create_calendar_event's output
+        byte for byte (aware times are always written in UTC).
+
+        Args:
+            meeting_infos (iterable): Meeting detail dicts
+                (same structure as create_calendar_event)
+            method (str): iTIP method; 'PUBLISH' suits schedule exports
+
+        Yields:
+            bytes: Consecutive UTF-8 chunks of the file
+        """
+        dtstamp = datetime.now(pytz.UTC)
+        yield (f'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODID}\r\n'
+               f'METHOD:{method}\r\n').encode()
+        for meeting_info in meeting_infos:
+            yield self._event_ics(meeting_info, dtstamp).encode()
+        yield b'END:VCALENDAR\r\n'
+
+    def calendar_event_ics(self, meeting_info):
+        """
+        Serialize a single meeting invite; a fast equivalent of
+        ``create_calendar_event(meeting_info).to_ical()``.
+
+        Returns:
+            bytes: The iCalendar text
+        """
+        return b''.join(self.iter_ics([meeting_info]))
+
+    def export_ics(self, meeting_infos, path, method='PUBLISH'):
+        """
+        Write many meetings, e.g. a recruiter's whole schedule, to one .ics file.
+
+        Events are streamed to the file, so the schedule is never held in
+        memory as a whole.
+
+        Args:
+            meeting_infos (iterable): Meeting detail dicts
+            path (str): Output file
+            method (str): iTIP method of the file (default: 'PUBLISH')
+
+        Returns:
+            int: Bytes written
+        """
+        written = 0
+        with open(path, 'wb') as f:
+            for chunk in self.iter_ics(meeting_infos, method):
+                written += f.write(chunk)
+        return written
+
+    @property
+    def smtp_pool(self):
+        """Pooled SMTP transport used to send invites"""
+        if self._smtp_pool is None:
+            from smtp_pool import SMTPConnectionPool  # deferred: only needed to send mail
+            self._smtp_pool = SMTPConnectionPool()
+        return self._smtp_pool
+
+    def create_invite_message(self, meeting_info):
+        """
+        Build the invite email with the calendar event attached.
+
+        Args:
+            meeting_info (dict): Dictionary containing meeting details
+                (same structure as create_calendar_event)
+
+        Returns:
+            email.mime.multipart.MIMEMultipart: The message to send
+        """
+        # Deferred: mail modules are only needed when an invite is sent
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.base import MIMEBase
+        from email import encoders
+
+        # Create email message
+        msg = MIMEMultipart()
+        msg['Subject'] = meeting_info['title']
+        msg['From'] = EMAIL_CONFIG['email']
+        msg['To'] = ', '.join([meeting_info['candidate_email'],
+                               meeting_info['recruiter_email']])
+        msg['Content-Type'] = 'text/calendar; method=REQUEST'
+
+        # Add meeting details to email body
+        body = self._create_email_body(meeting_info)
+        msg.attach(MIMEText(body, 'plain'))
+
+        # Add calendar invite attachment
+        ical_data = self.calendar_event_ics(meeting_info)
+        attachment = MIMEBase('text', 'calendar',
+                              method='REQUEST', name='invite.ics')
+        attachment.set_payload(ical_data)
+        encoders.encode_base64(attachment)
+        attachment.add_header('Content-Disposition',
+                              'attachment; filename="invite.ics"')
+        attachment.add_header(
+            'Content-Type', 'text/calendar; method=REQUEST; name="invite.ics"')
+        msg.attach(attachment)
+        return msg
+
+    def create_reminder_message(self, meeting_info, kind='reminder'):
+        """
+        Build a plain-text email about a booked meeting.
+
+        Args:
+            meeting_info (dict): Meeting details (same structure as
+                create_calendar_event)
+            kind (str): 'reminder' for an upcoming meeting, sent to both
+                participants, or 'follow_up' for a candidate who has not
+                answered the invite
+
+        Returns:
+            email.mime.text.MIMEText: The message to send
+        """
+        from email.mime.text import MIMEText  # deferred: only needed to send mail
+
+        start = meeting_info['start_time']
+        when = f"{start.strftime('%A, %B %d at %I:%M %p')} {meeting_info['timezone']}"
+        if kind == 'follow_up':
+            recipients = [meeting_info['candidate_email']]
+            subject = f"Please confirm: {meeting_info['title']}"
+            body = f"""
+Hello,
+
+We have not yet heard back about your {meeting_info['meeting_type']} on {when}.
+Please accept or decline the calendar invite so we can plan accordingly.
+
+Meeting Link: {meeting_info['location']}
+
+Best regards,
+Scheduling Bot
+"""
+        else:
+            recipients = [meeting_info['candidate_email'], meeting_info['recruiter_email']]
+            subject = f"Reminder: {meeting_info['title']}"
+            body = f"""
+Hello,
+
+This is a reminder of your {meeting_info['meeting_type']} on {when}.
+
+Meeting Link: {meeting_info['location']}
+
+Best regards,
+Scheduling Bot
+"""
+        msg = MIMEText(body, 'plain')
+        msg['Subject'] = subject
+        msg['From'] = EMAIL_CONFIG['email']
+        msg['To'] = ', '.join(recipients)
+        return msg
+
     def send_calendar_invite(self, meeting_info):
         """
         Send calendar invite via email to all participants.
@@ -110,44 +837,41 @@ class CalendarManager:
         Returns:
             bool: True if the invite was sent successfully, False otherwise
         """
-        try:
-            # Create the calendar event
-            cal = self.create_calendar_event(meeting_info)
-
-            # Create email message
-            msg = MIMEMultipart()
-            msg['Subject'] = meeting_info['title']
-            msg['From'] = EMAIL_CONFIG['email']
-            msg['To'] = ', '.join([meeting_info['candidate_email'],
-                                   meeting_info['recruiter_email']])
-            msg['Content-Type'] = 'text/calendar; method=REQUEST'
-
-            # Add meeting details to email body
-            body = self._create_email_body(meeting_info)
-            msg.attach(MIMEText(body, 'plain'))
-
-            # Add calendar invite attachment
-            ical_data = cal.to_ical()
-            attachment = MIMEBase('text', 'calendar',
-                                  method='REQUEST', name='invite.ics')
-            attachment.set_payload(ical_data)
-            encoders.encode_base64(attachment)
-            attachment.add_header('Content-Disposition',
-                                  'attachment; filename="invite.ics"')
-            attachment.add_header(
-                'Content-Type', 'text/calendar; method=REQUEST; name="invite.ics"')
-            msg.attach(attachment)
-
-            # Send email
-            with smtplib.SMTP(EMAIL_CONFIG['smtp_server'], EMAIL_CONFIG['smtp_port']) as server:
-                server.starttls()
-                server.login(EMAIL_CONFIG['email'], EMAIL_CONFIG['password'])
-                server.send_message(msg)
-            return True
+        return self.send_calendar_invites([meeting_info])[0]
 
-        except Exception as e:
-            print(f"Failed to send calendar invite: {str(e)}")
-            return False
+    def send_calendar_invites(self, meeting_infos):
+        """
+        Send many calendar invites over one pooled SMTP session.
+
+        Args:
+            meeting_infos (list): Meeting detail dicts
+                (same structure as create_calendar_event)
+
+        Returns:
+            list: True for each invite sent successfully, False otherwise
+        """
+        results = [False] * len(meeting_infos)
+        messages, positions = [], []
+        for i, meeting_info in enumerate(meeting_infos):
+            try:
+                messages.append(self.create_invite_message(meeting_info))
+                positions.append(i)
+            except Exception:
+                logger.exception("Failed to build calendar invite %r",
+                                 meeting_info.get('title'))
+
+        if messages:
+            try:
+                sent = self.smtp_pool.send_many(messages)
+            except Exception as e:
+                sent = [e] * len(messages)
+            for i, outcome in zip(positions, sent):
+                if outcome is True:
+                    results[i] = True
+                else:
+                    logger.warning("Failed to send calendar invite %r: %s",
+                                   meeting_infos[i].get('title'), outcome)
+        return results
 
     def _create_email_body(self, meeting_info):
         """
@@ -177,7 +901,8 @@ Scheduling Bot
 """
         return body
 
-    def check_availability(self, date, start_time, duration, timezone='UTC'):
+    def check_availability(self, date, start_time, duration, timezone='UTC',
+                           participants=None):
         """
         Check if a time slot is available for scheduling.
 
@@ -186,12 +911,14 @@ Scheduling Bot
             start_time (time): The start time to check
             duration (int): Meeting duration in minutes
             timezone (str): Timezone name (default: 'UTC')
+            participants (list, optional): Participants whose calendars must
+                be free, including buffer time around their events
 
         Returns:
             bool: True if the slot is available, False otherwise
         """
         # Convert to UTC for standardization
-        tz = pytz.timezone(timezone)
+        tz = get_timezone(timezone)
         local_dt = tz.localize(datetime.combine(date, start_time))
         utc_dt = local_dt.astimezone(pytz.UTC)
 
@@ -199,8 +926,16 @@ Scheduling Bot
         if not self._is_within_working_hours(utc_dt, timezone):
             return False
 
-        # Here you would check against existing calendar events
-        # For now, we'll just return True
+        # Check against existing calendar events
+        if participants:
+            start = to_timestamp(utc_dt)
+            end = start + int(duration * 60)
+            bitmap = self.slot_bitmap
+            if bitmap is not None and bitmap.covers(start, end):
+                return bitmap.is_free(participants, start, end,
+                                      self.availability.buffer // 60)
+            return all(self._is_free(participant, start, end)
+                       for participant in participants)
         return True
 
     def _is_within_working_hours(self, dt, timezone):
@@ -214,13 +949,14 @@ Scheduling Bot
         Returns:
             bool: True if within working hours, False otherwise
         """
-        local_dt = dt.astimezone(pytz.timezone(timezone))
+        local_dt = dt.astimezone(get_timezone(timezone))
         hour = local_dt.hour
 
         return (self.working_hours['start'] <= hour < self.working_hours['end'] and
                 local_dt.weekday() < 5)  # Monday = 0, Sunday = 6
 
-    def suggest_next_slot(self, meeting_type, timezone='UTC', start_from=None):
+    def suggest_next_slot(self, meeting_type, timezone='UTC', start_from=None,
+                          participants=None):
         """
         Suggest the next available time slot for a meeting.
 
@@ -228,36 +964,255 @@ Scheduling Bot
             meeting_type (str): Type of meeting to schedule
             timezone (str): Timezone name (default: 'UTC')
             start_from (datetime, optional): Starting datetime for the search
+            participants (list, optional): Participants who must all be free
 
         Returns:
             datetime: Suggested meeting start time, or None if no slots available
         """
+        slots = self.suggest_next_slots(meeting_type, timezone, start_from,
+                                        count=1, participants=participants)
+        return slots[0] if slots else None
+
+    def suggest_next_slots(self, meeting_type, timezone='UTC', start_from=None,
+                           count=1, participants=None, horizon_days=None,
+                           granularity=None, session_id=None):
+        """
+        Find the first free slots for a meeting.
+
+        Free gaps are computed directly from each working day's window and
+        the participants' sorted busy intervals (plus buffer time), so the
+        cost depends on the number of events in the horizon, not on the
+        number of candidate start times.
+
+        Args:
+            meeting_type (str): Type of meeting; its duration comes from
+                meeting_durations (default: 60 minutes)
+            timezone (str): Timezone name used for working hours (default: 'UTC')
+            start_from (datetime, optional): Earliest start (default: now)
+            count (int): Maximum number of slots to return
+            participants (list, optional): Participants who must all be free
+            horizon_days (int, optional): Calendar days to search
+                (default: CALENDAR_CONFIG['search_horizon_days'])
+            granularity (int, optional): Start times are aligned to this many
+                minutes from the start of the working day
+                (default: CALENDAR_CONFIG['slot_granularity'])
+            session_id (str, optional): Session asking; slots held for
+                participants by other sessions count as busy time (buffer
+                included), its own do not
+
+        Returns:
+            list: Up to ``count`` non-overlapping start datetimes in ``timezone``,
+                earliest first
+        """
+        held = []
+        if participants:
+            with self._holds_lock:
+                holds = self.holds.holds_for(participants, session_id)
+            held = sorted((hold.start, hold.end) for hold in holds)
+        return self._free_slots(meeting_type, timezone, start_from, count, participants,
+                                horizon_days, granularity, held)
+
+    def _free_slots(self, meeting_type, timezone, start_from, count, participants,
+                    horizon_days, granularity, held=()):
+        """suggest_next_slots, with the sorted (start, end) ``held`` slots as busy time."""
+        tz = get_timezone(timezone)
         if start_from is None:
-            start_from = datetime.now(pytz.timezone(timezone))
+            start_from = datetime.now(tz)
+        elif start_from.tzinfo is None:
+            start_from = tz.localize(start_from)
+
+        duration = self.meeting_durations.get(meeting_type, 60) * 60
+        horizon_days = horizon_days or CALENDAR_CONFIG['search_horizon_days']
+        step = (granularity or CALENDAR_CONFIG['slot_granularity']) * 60
+        earliest = to_timestamp(start_from)
+        first_day = start_from.astimezone(tz).date()
 
-        duration = self.meeting_durations.get(meeting_type, 60)
-        current = start_from
+        bitmap = self.slot_bitmap
+        if bitmap is not None and step % bitmap.slot_seconds == 0:
+            horizon_start = local_midnight(timezone, first_day)
+            horizon_end = local_midnight(timezone, first_day + timedelta(days=horizon_days))
+            if bitmap.covers(horizon_start, horizon_end):
+                return self._suggest_from_bitmap(
+                    bitmap, timezone, earliest, horizon_start, horizon_end,
+                    duration, step, count, participants or [], held)
 
-        # Look for slots in the next 5 business days
-        for _ in range(5):
-            if current.weekday() >= 5:  # Skip weekends
-                current += timedelta(days=1)
+        slots = []
+        for window_start, window_end in self._working_windows(
+                timezone, self.working_hours, first_day, horizon_days):
+            if window_end <= earliest:
                 continue
 
-            # Try each hour during working hours
-            for hour in range(self.working_hours['start'], self.working_hours['end']):
-                slot_time = current.replace(
-                    hour=hour, minute=0, second=0, microsecond=0)
+            for gap_start, gap_end in self._free_gaps(window_start, window_end,
+                                                      participants or [], held):
+                # Earliest aligned start inside the gap
+                slot = max(gap_start, earliest)
+                slot = window_start - (window_start - slot) // step * step
+                while slot + duration <= gap_end:
+                    slots.append(datetime.fromtimestamp(slot, tz))
+                    if len(slots) == count:
+                        return slots
+                    slot += duration
+                    slot = window_start - (window_start - slot) // step * step
+
+        return slots
+
+    def _suggest_from_bitmap(self, bitmap, timezone, earliest, horizon_start,
+                             horizon_end, duration, step, count, participants, held=()):
+        """suggest_next_slots over the slot bitmap; all times in POSIX seconds."""
+        free = bitmap.free_mask(participants, timezone, self.working_hours,
+                                self.availability.buffer // 60, held)
+        free[bitmap.slot_of(horizon_end):] = False
+        # Starts are aligned from the start of the working day, as in the gap sweep
+        align_to = horizon_start + self.working_hours['start'] * 3600
+        tz = get_timezone(timezone)
+        return [datetime.fromtimestamp(slot, tz)
+                for slot in bitmap.find_slots(free, duration // 60, earliest, count,
+                                              step // 60, align_to)]
+
+    def find_common_slots(self, participants, duration, window=None, count=5,
+                          granularity=None, session_id=None):
+        """
+        Find slots where every participant of a panel is free.
+
+        Each participant's free time is their own working hours (see
+        set_participant_settings) minus their busy intervals, the slots held
+        for them by other sessions, and buffer time.
+        The participants' sorted free intervals are intersected with a k-way
+        merge of their boundaries.
+
+        Options are ranked by comfort, the smallest distance in whole hours
+        from the slot to any participant's start or end of working day, so
+        slots that fall early or late for someone rank lower. Ties go to the
+        earlier slot.
+
+        Args:
+            participants (list): Participant IDs or emails (recruiters and candidate)
+            duration (int): Meeting duration in minutes
+            window (tuple, optional): (start, end) datetimes to search
+                (default: now until CALENDAR_CONFIG['search_horizon_days'] ahead)
+            count (int): Maximum number of options to return
+            granularity (int, optional): Candidate starts are aligned to this
+                many minutes (default: CALENDAR_CONFIG['slot_granularity'])
+            session_id (str, optional): Session asking; its own holds do not
+                block slots
+
+        Returns:
+            list: Up to ``count`` dicts with 'start' and 'end' (UTC datetimes)
+                and 'comfort' (hours), best first
+        """
+        if not participants:
+            return []
+        if window is None:
+            now = datetime.now(pytz.UTC)
+            window = (now, now + timedelta(days=CALENDAR_CONFIG['search_horizon_days']))
+        window_start, window_end = (to_timestamp(bound) for bound in window)
+        duration = int(duration * 60)
+        step = (granularity or CALENDAR_CONFIG['slot_granularity']) * 60
+
+        with self._holds_lock:
+            holds = self.holds.holds_for(participants, session_id)
+        held = {participant: sorted((hold.start, hold.end) for hold in holds
+                                    if participant in hold.participants)
+                for participant in participants}
+
+        # Each participant's working windows, then their free intervals inside
+        # them as time-ordered +1/-1 boundary events
+        windows = [self._participant_windows(participant, window_start, window_end)
+                   for participant in participants]
+        boundaries = [self._free_boundaries(participant, participant_windows,
+                                            window_start, window_end, held[participant])
+                      for participant, participant_windows in zip(participants, windows)]
+        window_starts = [[start for start, _ in participant_windows]
+                         for participant_windows in windows]
+
+        options = []
+        free_count = 0
+        gap_start = None
+        for moment, delta in heapq.merge(*boundaries):
+            free_count += delta
+            if free_count == len(participants):
+                gap_start = moment
+            elif gap_start is not None:
+                # Every aligned slot inside the common gap is an option
+                slot = -(-gap_start // step) * step
+                while slot + duration <= moment:
+                    comfort = min(
+                        self._margin(slot, slot + duration, participant_windows, starts)
+                        for participant_windows, starts in zip(windows, window_starts))
+                    options.append((comfort // 3600, slot))
+                    slot += step
+                gap_start = None
+
+        options.sort(key=lambda option: (-option[0], option[1]))
+        return [{'start': datetime.fromtimestamp(start, pytz.UTC),
+                 'end': datetime.fromtimestamp(start + duration, pytz.UTC),
+                 'comfort': comfort}
+                for comfort, start in options[:count]]
+
+    def _participant_windows(self, participant, start, end):
+        """A participant's working windows overlapping [start, end), in POSIX seconds."""
+        settings = self.participant_settings.get(participant, {})
+        tz_name = settings.get('timezone', 'UTC')
+        working_hours = settings.get('working_hours', self.working_hours)
+
+        first_day = (datetime.fromtimestamp(start, get_timezone(tz_name)).date() -
+                     timedelta(days=1))
+        n_days = (end - start) // 86400 + 3
+        return [(window_start, window_end)
+                for window_start, window_end in self._working_windows(
+                    tz_name, working_hours, first_day, n_days)
+                if window_start < end and window_end > start]
+
+    def _free_boundaries(self, participant, windows, start, end, held=()):
+        """
+        Yield (time, +1) / (time, -1) at the start / end of each of a
+        participant's free intervals inside their working windows and [start, end).
+        ``held`` are sorted (start, end) holds that also count as busy.
+        """
+        for window_start, window_end in windows:
+            window_start, window_end = max(window_start, start), min(window_end, end)
+            for gap_start, gap_end in self._free_gaps(window_start, window_end,
+                                                      [participant], held):
+                # Ends sort before starts at the same instant, so touching
+                # intervals of different participants do not count as shared
+                yield gap_start, 1
+                yield gap_end, -1
 
-                if slot_time < start_from:
-                    continue
+    @staticmethod
+    def _margin(start, end, windows, window_starts):
+        """Seconds between a slot and the edges of the working window holding it."""
+        window_start, window_end = windows[bisect.bisect_right(window_starts, start) - 1]
+        return min(start - window_start, window_end - end)
 
-                if self.check_availability(slot_time.date(),
-                                           slot_time.time(),
-                                           duration,
-                                           timezone):
-                    return slot_time
+    def _working_windows(self, tz_name, working_hours, first_day, n_days):
+        """
+        (start, end) POSIX seconds of working hours on weekdays.
 
-            current += timedelta(days=1)
+        Windows are converted to UTC once per zone and range and then cached,
+        rather than localized again for every search.
+        """
+        return working_windows(tz_name, working_hours['start'], working_hours['end'],
+                               first_day, n_days)
 
-        return None  # No available slots found
+    def _free_gaps(self, start, end, participants, held=()):
+        """
+        Yield the gaps in [start, end) where every participant is free.
+
+        The participants' busy intervals (and ``held``, further sorted busy
+        intervals such as holds) are already sorted, so they are combined
+        with a k-way merge and swept once; buffer time is added around every
+        busy interval.
+        """
+        buffer = self.availability.buffer
+        busy = heapq.merge(held, *(self._busy_intervals(participant, start - buffer,
+                                                        end + buffer)
+                                   for participant in participants))
+        cursor = start
+        for busy_start, busy_end in busy:
+            if busy_start - buffer > cursor:
+                yield cursor, min(busy_start - buffer, end)
+            cursor = max(cursor, busy_end + buffer)
+            if cursor >= end:
+                return
+        if cursor < end:
+            yield cursor, end
@@ -0,0 +1,129 @@
+"""
+Chat History Module
+
+This module holds a conversation's messages for the chat interface in
+bounded memory, so long-running sessions do not grow the server's memory
+or the time it takes to draw a turn.
+
+It provides:
+- A ring buffer of the most recent messages
+- Spilling of older messages to a JSON-lines file on disk
+- Random access and pagination over the whole conversation
+"""
+
+import json
+import os
+from array import array
+from collections import deque
+from config import CHAT_CONFIG
+
+
+class ChatHistory:
+    """
+    Message history with the newest ``max_messages`` messages in memory.
+
+    Messages pushed out of the buffer are appended to a file, and their byte
+    offsets are kept so any older message or page can be read back without
+    scanning the file. Message ``i`` is the i-th message of the conversation,
+    whether it is in memory or on disk.
+    """
+
+    def __init__(self, path, max_messages=None):
+        """
+        Initialize an empty history.
+
+        Args:
+            path (str): File older messages are spilled to; created on the
+                first spill and replaced if it exists
+            max_messages (int, optional): Messages kept in memory
+                (default: CHAT_CONFIG['max_messages'])
+        """
+        self.path = path
+        self.max_messages = max_messages or CHAT_CONFIG['max_messages']
+        self._recent = deque()
+        self._offsets = array('q')  # byte offset of each spilled message
+        self._spilled_bytes = 0
+        if os.path.exists(path):
+            os.remove(path)
+
+    def __len__(self):
+        return len(self._offsets) + len(self._recent)
+
+    @property
+    def spilled(self):
+        """Number of messages stored on disk."""
+        return len(self._offsets)
+
+    def append(self, role, content):
+        """Add a message, spilling the oldest in-memory one if the buffer is full."""
+        self._recent.append({'role': role, 'content': content})
+        if len(self._recent) > self.max_messages:
+            self._spill(self._recent.popleft())
+
+    def _spill(self, message):
+        line = (json.dumps(message) + '\n').encode()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(line)
+        self._offsets.append(self._spilled_bytes)
+        self._spilled_bytes += len(line)
+
+    def tail(self, count):
+        """The last ``count`` messages (at most the ones held in memory)."""
+        start = max(len(self._recent) - count, 0)
+        return [self._recent[i] for i in range(start, len(self._recent))]
+
+    def messages(self, start, stop):
+        """
+        Messages ``start`` to ``stop - 1`` of the conversation.
+
+        Args:
+            start, stop (int): Message range, clamped to the history
+
+        Returns:
+            list: {'role', 'content'} dicts, oldest first
+        """
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return []
+        messages = []
+        if start < self.spilled:
+            end = min(stop, self.spilled)
+            with open(self.path, 'rb') as f:
+                f.seek(self._offsets[start])
+                messages = [json.loads(f.readline()) for _ in range(start, end)]
+        first_recent = max(start - self.spilled, 0)
+        messages.extend(self._recent[i] for i in range(first_recent, stop - self.spilled))
+        return messages
+
+    def page_count(self, page_size, before=None):
+        """Number of pages of the messages before index ``before`` (default: all)."""
+        before = len(self) if before is None else before
+        return -(-before // page_size)
+
+    def page(self, number, page_size, before=None):
+        """
+        One page of the conversation, counted back from the newest.
+
+        Args:
+            number (int): Page number; 0 holds the newest messages
+            page_size (int): Messages per page
+            before (int, optional): Only page through messages before this
+                index, e.g. the ones no longer shown in the chat tail
+
+        Returns:
+            list: The page's messages, oldest first
+        """
+        before = len(self) if before is None else before
+        stop = before - number * page_size
+        return self.messages(stop - page_size, stop)
+
+    def clear(self):
+        """Forget every message and delete the spill file."""
+        self._recent.clear()
+        self._offsets = array('q')
+        self._spilled_bytes = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,330 @@
+"""
+Compiled Model Module
+
+This module exports the trained sklearn pipelines in ``results/`` into a
+lightweight ``.npz`` format and evaluates them with plain NumPy, so that
+inference does not pay sklearn's per-call validation overhead.
+
+Supported pipelines:
+- StandardScaler + linear SVC: the scaler is folded into the one-vs-one
+  weight matrix and prediction is a matrix product plus voting
+- StandardScaler + GradientBoostingClassifier: all regression trees are
+  flattened into contiguous node arrays and evaluated level by level
+
+Every export records the SHA-256 of the pickle it was compiled from, so a
+retrained pickle is noticed instead of being shadowed by an old export.
+
+Run ``python -m compiled_models`` from the repository root to export the
+models configured in ``BOT_CONFIG``.
+"""
+
+import hashlib
+import itertools
+import numpy as np
+from config import BOT_CONFIG
+
+
+class CompiledLinearOvOClassifier:
+    """
+    NumPy evaluation of a scaled linear one-vs-one classifier.
+
+    Reproduces ``Pipeline([StandardScaler, SVC(kernel='linear')]).predict``.
+    """
+
+    kind = 'linear_ovo'
+
+    def __init__(self, weights, intercept, pairs, classes):
+        """
+        Initialize the classifier.
+
+        Args:
+            weights (numpy.ndarray): (n_pairs, n_features) weights with the
+                scaler folded in
+            intercept (numpy.ndarray): (n_pairs,) intercepts with the scaler
+                folded in
+            pairs (numpy.ndarray): (n_pairs, 2) class indices voted for when
+                the decision value is positive/non-positive
+            classes (numpy.ndarray): Class labels
+        """
+        self.weights = weights
+        self.intercept = intercept
+        self.pairs = pairs
+        self.classes_ = classes
+        self.n_features_in_ = weights.shape[1]
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Compile a fitted StandardScaler + linear SVC pipeline."""
+        scaler = pipeline.named_steps['scaler']
+        svc = pipeline.steps[-1][1]
+        if getattr(svc, 'kernel', None) != 'linear' or len(svc.classes_) < 3:
+            raise ValueError("Only multi-class linear-kernel SVC pipelines are supported")
+
+        # w . (x - mean) / scale + b == (w / scale) . x + (b - w . mean / scale)
+        weights = svc.coef_ / scaler.scale_
+        intercept = svc.intercept_ - weights @ scaler.mean_
+        pairs = np.array(list(itertools.combinations(range(len(svc.classes_)), 2)))
+        return cls(weights, intercept, pairs, np.asarray(svc.classes_))
+
+    def to_arrays(self):
+        return {'weights': self.weights, 'intercept': self.intercept,
+                'pairs': self.pairs, 'classes': self.classes_}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['weights'], arrays['intercept'], arrays['pairs'],
+                   arrays['classes'])
+
+    def decision_function(self, X):
+        """Return the (n_samples, n_pairs) one-vs-one decision values."""
+        return np.asarray(X, dtype=np.float64) @ self.weights.T + self.intercept
+
+    def predict(self, X):
+        """Predict class labels by one-vs-one voting, ties going to the lower class."""
+        positive = self.decision_function(X) > 0
+        n_samples = positive.shape[0]
+        winners = np.where(positive, self.pairs[:, 0], self.pairs[:, 1])
+        votes = np.zeros((n_samples, len(self.classes_)), dtype=np.int64)
+        np.add.at(votes, (np.arange(n_samples)[:, None], winners), 1)
+        return self.classes_[votes.argmax(axis=1)]
+
+
+class CompiledTreeEnsembleClassifier:
+    """
+    NumPy evaluation of a scaled gradient boosting classifier.
+
+    Reproduces ``Pipeline([StandardScaler, GradientBoostingClassifier])``
+    ``predict``/``predict_proba`` for multinomial log-loss models.
+    """
+
+    kind = 'tree_ensemble'
+
+    # Rows traversed together; keeps the (rows x trees) node matrix in cache
+    CHUNK_ROWS = 256
+
+    def __init__(self, mean, scale, feature, threshold, left, right, value,
+                 roots, init_raw, learning_rate, max_depth, classes):
+        """
+        Initialize the classifier.
+
+        Args:
+            mean, scale (numpy.ndarray): StandardScaler statistics
+            feature, threshold (numpy.ndarray): Split feature/threshold per node
+            left, right (numpy.ndarray): Global child node indices (-1 at leaves)
+            value (numpy.ndarray): Leaf value per node
+            roots (numpy.ndarray): (n_estimators, n_classes) root node indices
+            init_raw (numpy.ndarray): (n_classes,) initial raw prediction
+            learning_rate (float): Boosting learning rate
+            max_depth (int): Depth of the deepest tree
+            classes (numpy.ndarray): Class labels
+        """
+        self.mean = mean
+        self.scale = scale
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.init_raw = init_raw
+        self.learning_rate = float(learning_rate)
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = len(mean)
+
+        # Leaves loop back to themselves so every row can take max_depth steps.
+        # Children are interleaved so the next node is child[2 * node + go_right].
+        nodes = np.arange(len(feature))
+        is_leaf = left < 0
+        self._child = np.stack([np.where(is_leaf, nodes, left),
+                                np.where(is_leaf, nodes, right)], axis=1).ravel()
+        self._feature = np.where(is_leaf, 0, feature)
+        self._roots = roots.ravel()
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Compile a fitted StandardScaler + GradientBoostingClassifier pipeline."""
+        scaler = pipeline.named_steps['scaler']
+        gbc = pipeline.steps[-1][1]
+        n_stages, n_classes = gbc.estimators_.shape
+        if n_classes < 3:
+            raise ValueError("Only multi-class gradient boosting pipelines are supported")
+
+        features, thresholds, lefts, rights, values = [], [], [], [], []
+        roots = np.empty((n_stages, n_classes), dtype=np.int64)
+        offset = 0
+        max_depth = 0
+        for stage in range(n_stages):
+            for k in range(n_classes):
+                tree = gbc.estimators_[stage, k].tree_
+                roots[stage, k] = offset
+                features.append(tree.feature)
+                thresholds.append(tree.threshold)
+                lefts.append(np.where(tree.children_left < 0, -1,
+                                      tree.children_left + offset))
+                rights.append(np.where(tree.children_right < 0, -1,
+                                       tree.children_right + offset))
+                values.append(tree.value[:, 0, 0])
+                offset += tree.node_count
+                max_depth = max(max_depth, tree.max_depth)
+
+        init_raw = gbc._raw_predict_init(np.zeros((1, gbc.n_features_in_)))[0]
+        return cls(np.asarray(scaler.mean_, dtype=np.float64),
+                   np.asarray(scaler.scale_, dtype=np.float64),
+                   np.concatenate(features).astype(np.int64),
+                   np.concatenate(thresholds).astype(np.float64),
+                   np.concatenate(lefts).astype(np.int64),
+                   np.concatenate(rights).astype(np.int64),
+                   np.concatenate(values).astype(np.float64),
+                   roots, np.asarray(init_raw, dtype=np.float64),
+                   gbc.learning_rate, max_depth, np.asarray(gbc.classes_))
+
+    def to_arrays(self):
+        return {'mean': self.mean, 'scale': self.scale, 'feature': self.feature,
+                'threshold': self.threshold, 'left': self.left,
+                'right': self.right, 'value': self.value, 'roots': self.roots,
+                'init_raw': self.init_raw,
+                'learning_rate': np.float64(self.learning_rate),
+                'max_depth': np.int64(self.max_depth), 'classes': self.classes_}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['mean'], arrays['scale'], arrays['feature'],
+                   arrays['threshold'], arrays['left'], arrays['right'],
+                   arrays['value'], arrays['roots'], arrays['init_raw'],
+                   arrays['learning_rate'], arrays['max_depth'], arrays['classes'])
+
+    def decision_function(self, X):
+        """Return the (n_samples, n_classes) raw boosting scores."""
+        X = np.asarray(X, dtype=np.float64)
+        # sklearn trees compare float32 inputs against float64 thresholds
+        Xs = ((X - self.mean) / self.scale).astype(np.float32)
+        raw = np.empty((Xs.shape[0], len(self.classes_)), dtype=np.float64)
+        for start in range(0, Xs.shape[0], self.CHUNK_ROWS):
+            chunk = Xs[start:start + self.CHUNK_ROWS]
+            raw[start:start + len(chunk)] = self._raw_scores(chunk)
+        return raw
+
+    def _raw_scores(self, Xs):
+        """Traverse every tree for a cache-sized chunk of scaled rows."""
+        n_samples, n_features = Xs.shape
+        flat = Xs.ravel()
+        offsets = (np.arange(n_samples) * n_features)[:, None]
+
+        node = np.broadcast_to(self._roots, (n_samples, self._roots.size))
+        for _ in range(self.max_depth):
+            go_right = flat.take(offsets + self._feature.take(node)) > self.threshold.take(node)
+            node = self._child.take(2 * node + go_right)
+
+        leaf_values = self.value.take(node).reshape((n_samples,) + self.roots.shape)
+        return self.init_raw + self.learning_rate * leaf_values.sum(axis=1)
+
+    def predict_proba(self, X):
+        """Return class probabilities (softmax of the raw scores)."""
+        raw = self.decision_function(X)
+        raw -= raw.max(axis=1, keepdims=True)
+        proba = np.exp(raw)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict(self, X):
+        """Predict class labels."""
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
+
+
+COMPILED_MODEL_TYPES = {
+    CompiledLinearOvOClassifier.kind: CompiledLinearOvOClassifier,
+    CompiledTreeEnsembleClassifier.kind: CompiledTreeEnsembleClassifier,
+}
+
+
+def compile_pipeline(pipeline):
+    """
+    Compile a fitted sklearn pipeline into a NumPy classifier.
+
+    Args:
+        pipeline (sklearn.pipeline.Pipeline): StandardScaler + estimator
+
+    Returns:
+        CompiledLinearOvOClassifier or CompiledTreeEnsembleClassifier
+
+    Raises:
+        ValueError: If the pipeline's estimator is not supported
+    """
+    estimator = pipeline.steps[-1][1]
+    if hasattr(estimator, 'estimators_') and hasattr(estimator, 'learning_rate'):
+        return CompiledTreeEnsembleClassifier.from_pipeline(pipeline)
+    if getattr(estimator, 'kernel', None) == 'linear':
+        return CompiledLinearOvOClassifier.from_pipeline(pipeline)
+    raise ValueError(f"Unsupported estimator: {type(estimator).__name__}")
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_compiled_model(model, path, source_path=None):
+    """
+    Write a compiled model to an ``.npz`` file.
+
+    Args:
+        model: Compiled classifier
+        path (str): Destination ``.npz``
+        source_path (str, optional): Pickle the model was compiled from; its
+            digest is stored so ``is_export_current`` can check it later
+    """
+    extra = {}
+    if source_path is not None:
+        extra['source_sha256'] = np.array(file_digest(source_path))
+    np.savez(path, kind=np.array(model.kind), **extra, **model.to_arrays())
+
+
+def load_compiled_model(path):
+    """Load a compiled model written by ``save_compiled_model``."""
+    with np.load(path, allow_pickle=False) as arrays:
+        arrays = {name: arrays[name] for name in arrays.files}
+    arrays.pop('source_sha256', None)
+    return COMPILED_MODEL_TYPES[str(arrays.pop('kind'))].from_arrays(arrays)
+
+
+def is_export_current(path, source_path):
+    """
+    Whether an ``.npz`` export was compiled from the pickle as it is now.
+
+    Exports written without a source digest count as out of date.
+    """
+    with np.load(path, allow_pickle=False) as arrays:
+        if 'source_sha256' not in arrays.files:
+            return False
+        recorded = str(arrays['source_sha256'])
+    return recorded == file_digest(source_path)
+
+
+def export_models(model_names=('intent_model', 'time_slot_model')):
+    """
+    Compile the configured sklearn pipelines and write them next to the pickles.
+
+    Returns:
+        dict: Model name -> path of the written ``.npz`` file
+    """
+    import joblib
+    from scheduling_bot import resolve_model_path
+
+    written = {}
+    for name in model_names:
+        source_path = resolve_model_path(BOT_CONFIG['model_paths'][name])
+        pipeline = joblib.load(source_path)
+        path = resolve_model_path(BOT_CONFIG['compiled_model_paths'][name])
+        save_compiled_model(compile_pipeline(pipeline), path, source_path)
+        written[name] = path
+    return written
+
+
+if __name__ == "__main__":
+    for name, path in export_models().items():
+        print(f"Exported {name} -> {path}")
@@ -4,7 +4,43 @@ EMAIL_CONFIG = {
     'smtp_port': 587,
     'email': 'chillajagadesh68@gmail.com',
     # This should be an App Password generated from Google Account settings
-    'password': 'bmrs kbjo zyjw omdp'
+    'password': 'bmrs kbjo zyjw omdp',
+    # Invites reuse logged-in SMTP sessions (see smtp_pool.py)
+    'starttls': True,
+    'pool_size': 2,
+    'keepalive_seconds': 30,   # idle sessions are checked with NOOP after this
+    'max_idle_seconds': 300    # and closed instead of reused after this
+}
+
+# Background invite delivery (see invite_queue.py)
+DISPATCH_CONFIG = {
+    'queue_path': 'results/invite_queue.sqlite3',
+    'workers': 2,
+    'rate_per_minute': 60,  # sustained sending rate
+    'burst': 10,            # invites that may go out back to back
+    'max_attempts': 5,
+    'base_delay': 2,        # seconds before the first retry, doubling after
+    'max_delay': 300
+}
+
+# Reminder and follow-up emails, fired by the timer service (see timer_service.py)
+TIMER_CONFIG = {
+    'timer_path': 'results/timers.sqlite3',
+    'reminder_minutes': [1440, 60],  # reminders sent this long before a meeting
+    'follow_up_hours': 24,           # nudge a candidate who has not answered the invite
+    'max_follow_ups': 2,
+    'max_attempts': 5,               # handler runs before a failing timer is dropped
+    'base_delay': 30,                # seconds before the first retry, doubling after
+    'max_delay': 3600
+}
+
+# Headless HTTP API (see api_server.py)
+API_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    'workers': 4,              # threads running predictions and calendar queries
+    'max_intent_batch': 256,   # messages classified together by one model call
+    'max_body_bytes': 1 << 20
 }
 
 # Calendar Settings
@@ -21,7 +57,19 @@ CALENDAR_CONFIG = {
         'Follow-up Meeting': 30,
         'Project Presentation': 60
     },
-    'buffer_time': 15  # minutes between meetings
+    'buffer_time': 15,  # minutes between meetings
+    'slot_granularity': 15,  # minutes; suggested start times are aligned to this
+    'search_horizon_days': 28,  # how far ahead slot suggestions look
+    'bitmap_slot_minutes': 15,  # slot length of CalendarManager.build_slot_bitmap
+    # Availability_Status values in calendar_dataset.csv that block time
+    'busy_statuses': ['Blocked', 'Booked', 'Pending Confirmation', 'Tentative'],
+    'calendar_dataset': 'results/scheduling_bot_datasets/calendar_dataset.csv',
+    # SQLite file of booked meetings and imported busy time (see event_store.py)
+    'event_store_path': 'results/events.sqlite3',
+    # Seconds an offered slot stays reserved for the session it was offered to
+    'hold_ttl_seconds': 300,
+    # Days of a recurring meeting's occurrences checked for conflicts when it is booked
+    'recurring_check_days': 365
 }
 
 # Bot Settings
@@ -33,5 +81,53 @@ BOT_CONFIG = {
         'time_slot_model': 'results/best_time_slot_prediction_model.pkl',
         'conversation_encoders': 'results/conversation_label_encoders.pkl',
         'calendar_encoders': 'results/calendar_label_encoders.pkl'
+    },
+    # 'numpy' serves predictions from the compiled models below when they
+    # exist (see compiled_models.py); 'sklearn' always unpickles the pipelines
+    'inference_backend': 'numpy',
+    'compiled_model_paths': {
+        'intent_model': 'results/best_intent_classification_model.npz',
+        'time_slot_model': 'results/best_time_slot_prediction_model.npz'
+    },
+    # How intent predictions are cached: 'table' precomputes every
+    # (hour, text length, speaker) input up to max_text_length, 'lru' caches
+    # predictions as they are made, None calls the model every time
+    'intent_cache': {
+        'mode': 'table',
+        'max_text_length': 512,
+        'lru_size': 4096
+    },
+    # Meeting type suggestions are precomputed for every department and every
+    # whole-minute duration up to max_duration
+    'time_slot_table': {
+        'max_duration': 480
+    },
+    # Per-session conversation contexts held by one shared bot
+    'sessions': {
+        'max_sessions': 10000,
+        'ttl_seconds': 3600
+    },
+    # Streams from SchedulingBot.stream_response come in one piece by default,
+    # so a server never sleeps on a response; with 'instant' off they are
+    # paced word_delay seconds per word, never more than max_seconds in total.
+    # The chat UI paces its own typing effect (CHAT_CONFIG['typing_effect']).
+    'response_streaming': {
+        'instant': True,
+        'word_delay': 0.02,
+        'max_seconds': 0.5
+    }
+}
+
+# Chat history of the Streamlit interface (see chat_history.py)
+CHAT_CONFIG = {
+    'max_messages': 100,     # kept in memory per session; older ones go to disk
+    'visible_messages': 20,  # drawn in the chat; earlier ones are paginated
+    'page_size': 20,
+    'spill_dir': 'results/chat_history',
+    # Replies are typed into the chat word by word: word_delay seconds per
+    # word, never more than max_seconds in total
+    'typing_effect': {
+        'word_delay': 0.02,
+        'max_seconds': 0.5
     }
 }
@@ -0,0 +1,349 @@
+"""
+Event Store Module
+
+This module keeps participants' busy time in SQLite, so booked meetings
+outlive the session that made them and can be shared by several processes
+(the Streamlit app and the HTTP API).
+
+It provides:
+- A WAL-mode SQLite table of (participant, start, end) events, indexed on
+  (participant, start_time) and (participant, end_time)
+- Batched inserts, deletes of cancelled bookings and bulk import of
+  calendar_dataset.csv
+- Overlap and range queries answered as index range scans, with the same
+  interface as availability.AvailabilityIndex so it can back CalendarManager
+- Stored recurrence rules of recurring meetings, read back incrementally so
+  every process sharing the file sees the series the others book
+"""
+
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from availability import read_calendar_events, to_timestamp
+from config import CALENDAR_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    participant TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL
+);
+-- Also makes imports idempotent
+CREATE UNIQUE INDEX IF NOT EXISTS events_participant_start
+    ON events (participant, start_time, end_time);
+CREATE INDEX IF NOT EXISTS events_participant_end
+    ON events (participant, end_time);
+-- Longest event stored, which bounds how far back an overlapping event can start
+CREATE TABLE IF NOT EXISTS event_bounds (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    max_length INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO event_bounds (id, max_length) VALUES (0, 0);
+-- Recurring meetings, one row per participant; expanded by recurrence.py
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    participant TEXT NOT NULL,
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL,
+    rrule TEXT NOT NULL,
+    exdates TEXT NOT NULL,
+    timezone TEXT NOT NULL
+);
+"""
+
+_INSERT = ("INSERT OR IGNORE INTO events (participant, start_time, end_time) "
+           "VALUES (?, ?, ?)")
+_GROW_BOUND = "UPDATE event_bounds SET max_length = max(max_length, ?) WHERE id = 0"
+
+# An event overlaps [start, end) if it starts before end and ends after start.
+# Events are at most max_length long, so the start_time range is bounded on
+# both sides and the lookup is a short scan of the (participant, start_time,
+# end_time) index, which also covers end_time.
+_OVERLAPS = """
+SELECT 1 FROM events
+WHERE participant = :participant
+  AND start_time < :end
+  AND start_time > :start - (SELECT max_length FROM event_bounds)
+  AND end_time > :start
+LIMIT 1
+"""
+_BETWEEN = """
+SELECT start_time, end_time FROM events
+WHERE participant = :participant
+  AND start_time < :end
+  AND start_time > :start - (SELECT max_length FROM event_bounds)
+  AND end_time > :start
+ORDER BY start_time
+"""
+
+
+class EventStore:
+    """
+    Busy intervals of many participants, stored in SQLite.
+
+    Every thread gets its own connection; in WAL mode readers never wait for
+    a writer. Statements are fixed strings, so sqlite3's statement cache
+    prepares each of them once per connection.
+    """
+
+    def __init__(self, path=None, buffer_minutes=None, batch_size=10000):
+        """
+        Open (or create) a store.
+
+        Args:
+            path (str, optional): Database file; ':memory:' keeps the store in
+                memory, shared by this object's threads
+                (default: CALENDAR_CONFIG['event_store_path'])
+            buffer_minutes (int, optional): Minimum gap required around
+                existing events (default: CALENDAR_CONFIG['buffer_time'])
+            batch_size (int): Events written per transaction by add_events
+        """
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                CALENDAR_CONFIG['event_store_path'])
+        if path == ':memory:':
+            self._uri = f"file:event-store-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._uri = f"file:{path}"
+        self.path = path
+        if buffer_minutes is None:
+            buffer_minutes = CALENDAR_CONFIG['buffer_time']
+        self.buffer = int(buffer_minutes * 60)
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._connections_lock = threading.Lock()
+        self._connections = []  # every thread's connection, closed by close()
+
+        # Held open for the store's lifetime; keeps an in-memory database alive
+        self._db = self._connect()
+        if path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._local.db = self._db
+
+    def _connect(self):
+        db = sqlite3.connect(self._uri, uri=True, timeout=30, check_same_thread=False,
+                             cached_statements=64)
+        db.execute("PRAGMA synchronous=NORMAL")
+        with self._connections_lock:
+            self._connections.append(db)
+        return db
+
+    @property
+    def db(self):
+        """This thread's connection."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = self._connect()
+        return db
+
+    def __len__(self):
+        """Number of participants with events."""
+        return self.db.execute(
+            "SELECT COUNT(DISTINCT participant) FROM events").fetchone()[0]
+
+    def __contains__(self, participant):
+        return self.db.execute("SELECT 1 FROM events WHERE participant = ? LIMIT 1",
+                               (participant,)).fetchone() is not None
+
+    def count(self):
+        """Number of stored events."""
+        return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def participants(self):
+        return [row[0] for row in self.db.execute(
+            "SELECT DISTINCT participant FROM events ORDER BY participant")]
+
+    def add_event(self, participant, start, end):
+        """
+        Mark a participant busy.
+
+        Args:
+            participant (str): Participant ID or email
+            start, end (datetime or int): Event bounds (datetimes or POSIX seconds)
+        """
+        if isinstance(start, datetime):
+            start, end = to_timestamp(start), to_timestamp(end)
+        if end <= start:
+            return
+        db = self.db
+        with self._write_lock, db:
+            db.execute(_INSERT, (participant, start, end))
+            db.execute(_GROW_BOUND, (end - start,))
+
+    def remove_event(self, participant, start, end):
+        """
+        Delete an event, e.g. a cancelled booking.
+
+        Args:
+            participant (str): Participant ID or email
+            start, end (datetime or int): Bounds of the stored event
+
+        Returns:
+            bool: Whether the event was stored
+        """
+        if isinstance(start, datetime):
+            start, end = to_timestamp(start), to_timestamp(end)
+        db = self.db
+        with self._write_lock, db:
+            return db.execute("DELETE FROM events WHERE participant = ? AND start_time = ? "
+                              "AND end_time = ?", (participant, start, end)).rowcount > 0
+
+    def add_events(self, events):
+        """
+        Bulk-insert (participant, start, end) events with POSIX-second bounds.
+
+        Events are written ``batch_size`` per transaction; events already in
+        the store are skipped.
+
+        Returns:
+            int: Number of events read
+        """
+        count = 0
+        batch = []
+        for participant, start, end in events:
+            count += 1
+            if end > start:
+                batch.append((participant, start, end))
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+        return count
+
+    def _write_batch(self, batch):
+        longest = max(end - start for _, start, end in batch)
+        db = self.db
+        with self._write_lock, db:
+            db.executemany(_INSERT, batch)
+            db.execute(_GROW_BOUND, (longest,))
+
+    def load_csv(self, path, busy_statuses):
+        """
+        Import busy events from a calendar_dataset.csv style file (see
+        availability.read_calendar_events). Importing a file again adds
+        nothing.
+
+        Returns:
+            int: Number of events read
+        """
+        return self.add_events(read_calendar_events(path, busy_statuses))
+
+    def is_free(self, participant, start, end):
+        """Whether [start, end) is clear of the participant's events and buffers."""
+        return self.db.execute(_OVERLAPS, {'participant': participant,
+                                           'start': start - self.buffer,
+                                           'end': end + self.buffer}).fetchone() is None
+
+    def conflicts(self, participants, start, end):
+        """Return the participants who are busy during [start, end)."""
+        return [participant for participant in participants
+                if not self.is_free(participant, start, end)]
+
+    def book(self, participants, start, end):
+        """
+        Mark participants busy for [start, end) only if all of them are free.
+
+        The check and the inserts run in one write transaction
+        (BEGIN IMMEDIATE), so overlapping bookings cannot both succeed, even
+        from different processes sharing the file.
+
+        Returns:
+            list: The busy participants; empty if the slot was booked
+        """
+        db = self.db
+        query = {'start': start - self.buffer, 'end': end + self.buffer}
+        with self._write_lock:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                conflicts = [participant for participant in participants
+                             if db.execute(_OVERLAPS, dict(query, participant=participant))
+                             .fetchone() is not None]
+                if not conflicts and end > start:
+                    db.executemany(_INSERT, [(p, start, end) for p in participants])
+                    db.execute(_GROW_BOUND, (end - start,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return conflicts
+
+    def add_series(self, participants, start, end, rrule, exdates=(), timezone='UTC',
+                   after=None):
+        """
+        Store a recurring meeting for participants.
+
+        Args:
+            participants (list): Participant IDs or emails
+            start, end (int): Bounds of the first occurrence, POSIX seconds
+            rrule (str): Recurrence rule
+            exdates (iterable): Starts (POSIX seconds) of excluded occurrences
+            timezone (str): Zone whose wall-clock time occurrences keep
+            after (int, optional): Store the series only if no series row
+                newer than this ID exists, i.e. nobody stored one since the
+                caller last read them with ``series_since``
+
+        Returns:
+            bool: Whether the series was stored
+        """
+        exdates = ','.join(str(exdate) for exdate in sorted(exdates))
+        db = self.db
+        with self._write_lock:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                stored = after is None or db.execute(
+                    "SELECT 1 FROM series WHERE id > ? LIMIT 1", (after,)).fetchone() is None
+                if stored:
+                    db.executemany(
+                        "INSERT INTO series (participant, start_time, end_time, rrule, exdates, "
+                        "timezone) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(participant, start, end, rrule, exdates, timezone)
+                         for participant in participants])
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return stored
+
+    def series_since(self, after=0):
+        """
+        Series rows stored after row ``after``, oldest first.
+
+        Returns:
+            list: (id, participant, start, end, rrule, exdates, timezone)
+                tuples, ``exdates`` as a list of POSIX seconds
+        """
+        return [(row_id, participant, start, end, rrule,
+                 [int(exdate) for exdate in exdates.split(',') if exdate], timezone)
+                for row_id, participant, start, end, rrule, exdates, timezone in self.db.execute(
+                    "SELECT id, participant, start_time, end_time, rrule, exdates, timezone "
+                    "FROM series WHERE id > ? ORDER BY id", (after,))]
+
+    def busy_intervals(self, participant, start, end):
+        """A participant's busy intervals within [start, end), merged, clipped
+        to the range and without buffers."""
+        merged = []
+        for event_start, event_end in self.db.execute(
+                _BETWEEN, {'participant': participant, 'start': start, 'end': end}):
+            if merged and event_start <= merged[-1][1]:
+                if event_end > merged[-1][1]:
+                    merged[-1][1] = event_end
+            else:
+                merged.append([event_start, event_end])
+        return [(max(s, start), min(e, end)) for s, e in merged]
+
+    def close(self):
+        """Close the connections of every thread that used the store."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            db.close()
+        self._local.db = None
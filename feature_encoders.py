@@ -0,0 +1,205 @@
+"""
+Compiled Feature Encoders
+
+This module turns the fitted sklearn ``LabelEncoder`` objects stored in
+``results/*_label_encoders.pkl`` into plain lookup tables so that building
+model features does not go through ``LabelEncoder.transform`` on every request.
+
+It provides:
+- Dict/array backed label encoding and decoding with fallback for unknown labels
+- Precomputed feature rows for intent classification and time slot prediction
+- Vectorized column encode/decode for batches
+"""
+
+import numpy as np
+
+# Label used in place of values the encoder has never seen. Encoders that are
+# not listed here fall back to their first class (code 0).
+DEFAULT_FALLBACKS = {
+    'Speaker': 'Candidate',
+    'Language': 'en',
+    'Sentiment': 'neutral',
+    'Availability_Status': 'Available',
+    'Location': 'Zoom',
+}
+
+
+class CompiledLabelEncoder:
+    """
+    Lookup-table replacement for a fitted ``LabelEncoder``.
+
+    Encoding is a dict lookup and decoding an array index. Labels the encoder
+    was not fitted on are mapped to the fallback code instead of raising.
+    """
+
+    def __init__(self, classes, fallback=None):
+        """
+        Initialize the encoder from the fitted classes.
+
+        Args:
+            classes (array-like): Sorted classes, as in ``LabelEncoder.classes_``
+            fallback (str, optional): Label used for unknown values
+                (default: the first class)
+        """
+        self.classes_ = np.asarray(classes, dtype=object)
+        self.table = {label: code for code, label in enumerate(self.classes_)}
+        if fallback is None or fallback not in self.table:
+            self.fallback_code = 0
+        else:
+            self.fallback_code = self.table[fallback]
+
+    @classmethod
+    def from_label_encoder(cls, encoder, fallback=None):
+        """Build a compiled encoder from a fitted sklearn ``LabelEncoder``."""
+        return cls(encoder.classes_, fallback)
+
+    @property
+    def fallback(self):
+        """The label unknown values are encoded as."""
+        return self.classes_[self.fallback_code]
+
+    def __contains__(self, label):
+        return label in self.table
+
+    def __len__(self):
+        return len(self.classes_)
+
+    def encode(self, label):
+        """Encode a single label, using the fallback code if it is unknown."""
+        return self.table.get(label, self.fallback_code)
+
+    def encode_column(self, labels):
+        """Encode a sequence of labels into an int64 array."""
+        table = self.table
+        fallback_code = self.fallback_code
+        return np.fromiter((table.get(label, fallback_code) for label in labels),
+                           dtype=np.int64, count=len(labels))
+
+    def decode(self, code):
+        """Decode a single code back to its label."""
+        return self.classes_[code]
+
+    def decode_column(self, codes):
+        """Decode an array of codes back to labels."""
+        return self.classes_[np.asarray(codes, dtype=np.intp)]
+
+
+def compile_encoders(encoders, fallbacks=None):
+    """
+    Compile a dict of fitted ``LabelEncoder`` objects.
+
+    Args:
+        encoders (dict): Column name -> fitted ``LabelEncoder``
+        fallbacks (dict, optional): Column name -> fallback label
+            (default: DEFAULT_FALLBACKS)
+
+    Returns:
+        dict: Column name -> CompiledLabelEncoder
+    """
+    if fallbacks is None:
+        fallbacks = DEFAULT_FALLBACKS
+    return {name: CompiledLabelEncoder.from_label_encoder(encoder, fallbacks.get(name))
+            for name, encoder in encoders.items()}
+
+
+class ConversationFeatureEncoder:
+    """
+    Builds intent classification features.
+
+    Feature layout: [hour, text_length, speaker, language, sentiment]. The
+    language and sentiment columns are constant and encoded once.
+    """
+
+    def __init__(self, encoders, language='en', sentiment='neutral'):
+        """
+        Initialize the feature encoder.
+
+        Args:
+            encoders (dict): Compiled conversation encoders
+            language (str): Language label used for every message
+            sentiment (str): Sentiment label used for every message
+        """
+        self.speaker = encoders['Speaker']
+        self.intent = encoders['Intent_Label']
+        self.template = np.array(
+            [0, 0, 0,
+             encoders['Language'].encode(language),
+             encoders['Sentiment'].encode(sentiment)], dtype=np.int64)
+
+    def encode(self, message, speaker, hour):
+        """Build the feature row for a single message."""
+        return [hour, len(message), self.speaker.encode(speaker),
+                int(self.template[3]), int(self.template[4])]
+
+    def encode_batch(self, messages, speakers, hours):
+        """
+        Build the feature matrix for a batch of messages.
+
+        Args:
+            messages (list): Message texts
+            speakers (list): Speaker per message
+            hours (array-like or int): Hour of day per message
+
+        Returns:
+            numpy.ndarray: (n, 5) int64 feature matrix
+        """
+        features = np.tile(self.template, (len(messages), 1))
+        features[:, 0] = hours
+        features[:, 1] = [len(message) for message in messages]
+        features[:, 2] = self.speaker.encode_column(speakers)
+        return features
+
+    def decode_intents(self, codes):
+        """Decode predicted intent codes to labels."""
+        return self.intent.decode_column(codes)
+
+
+class CalendarFeatureEncoder:
+    """
+    Builds time slot prediction features.
+
+    Feature layout: [duration, availability_status, location, department].
+    The availability status and location columns are constant and encoded once.
+    """
+
+    def __init__(self, encoders, availability_status='Available', location='Zoom'):
+        """
+        Initialize the feature encoder.
+
+        Args:
+            encoders (dict): Compiled calendar encoders
+            availability_status (str): Availability status used for every slot
+            location (str): Location used for every slot
+        """
+        self.department = encoders['Department']
+        self.meeting_type = encoders['Meeting_Type']
+        self.template = np.array(
+            [0,
+             encoders['Availability_Status'].encode(availability_status),
+             encoders['Location'].encode(location),
+             0], dtype=np.int64)
+
+    def encode(self, department, duration):
+        """Build the feature row for a single department/duration pair."""
+        return [duration, int(self.template[1]), int(self.template[2]),
+                self.department.encode(department)]
+
+    def encode_batch(self, departments, durations):
+        """
+        Build the feature matrix for a batch of department/duration pairs.
+
+        Args:
+            departments (list): Department per row
+            durations (array-like): Meeting duration in minutes per row
+
+        Returns:
+            numpy.ndarray: (n, 4) int64 feature matrix
+        """
+        features = np.tile(self.template, (len(departments), 1))
+        features[:, 0] = durations
+        features[:, 3] = self.department.encode_column(departments)
+        return features
+
+    def decode_meeting_types(self, codes):
+        """Decode predicted meeting type codes to labels."""
+        return self.meeting_type.decode_column(codes)
@@ -0,0 +1,485 @@
+"""
+ICS Import Module
+
+This module imports participants' own calendars, exported as (possibly very
+large) iCalendar files, as busy time. The file is read one line at a time
+and only the properties that decide when an event blocks time are kept, so
+instead of the whole document only a small record per event stays in memory.
+
+It provides:
+- Lazy unfolding of folded content lines from binary or text streams
+- A streaming VEVENT reader that skips VTIMEZONE, VALARM and other components
+- Conversion of DTSTART/DTEND/DURATION, all-day and recurring events into
+  busy intervals, ignoring cancelled and transparent events; a recurring
+  event whose rule cannot be expanded blocks its first occurrence
+- Per-participant imported busy time that is synced on re-import: events
+  whose UID, RECURRENCE-ID, SEQUENCE and LAST-MODIFIED are unchanged are
+  skipped, changed ones replaced and ones no longer exported removed
+"""
+
+import re
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+from availability import IntervalSet
+from recurrence import RecurringCalendar, RecurringEvent
+from timezones import get_timezone, offset_table
+
+# Properties read from a VEVENT; everything else is skipped unparsed
+EVENT_PROPERTIES = frozenset({
+    'UID', 'SEQUENCE', 'LAST-MODIFIED', 'RECURRENCE-ID', 'DTSTART', 'DTEND',
+    'DURATION', 'STATUS', 'TRANSP', 'RRULE', 'RDATE', 'EXDATE'})
+# Properties that may repeat, read as lists
+REPEATED_PROPERTIES = frozenset({'RDATE', 'EXDATE'})
+# Properties that decide when an event blocks time; a change to any of them
+# is a change to the event even when SEQUENCE and LAST-MODIFIED stay the same
+TIMING_PROPERTIES = ('DTSTART', 'DTEND', 'DURATION', 'RRULE', 'RDATE', 'EXDATE',
+                     'TRANSP', 'STATUS')
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_DURATION = re.compile(r'([+-]?)P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+ImportStats = namedtuple('ImportStats', ['added', 'updated', 'unchanged', 'removed', 'skipped',
+                                         'ignored', 'duplicates', 'first_only'])
+ImportStats.__doc__ = """
+Outcome of an import. Every VEVENT of the export counts in exactly one of:
+new events that block time (added), changed events (updated), unchanged
+events, malformed events (skipped), new events that block no time, such as
+cancelled or transparent ones (ignored), and repeats of an event already
+read from the same export (duplicates). ``removed`` counts events missing
+from the export and ``first_only`` the added or updated recurring events
+whose rule could not be expanded, so only their first occurrence blocks time.
+"""
+
+
+def unfold_lines(stream):
+    """
+    Yield the unfolded content lines of an iCalendar stream, lazily.
+
+    Args:
+        stream (iterable): File object or other iterable of physical lines,
+            bytes (decoded as UTF-8) or str; CRLF and bare LF both work
+
+    Yields:
+        str: Logical lines without line endings
+    """
+    pending = None
+    for line in stream:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', 'replace')
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t'):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+
+def _split_params(head):
+    """Parameters of a property head 'NAME;P1=V1;P2="V2"' as an upper-cased dict."""
+    params = {}
+    for match in re.finditer(r';([^=;:]+)=("[^"]*"|[^;:]*)', head):
+        params[match.group(1).upper()] = match.group(2).strip('"')
+    return params
+
+
+def iter_vevents(lines):
+    """
+    Yield the busy-time properties of each VEVENT in a stream of lines.
+
+    Components nested in an event (VALARM) and everything outside events
+    are skipped without parsing their properties.
+
+    Args:
+        lines (iterable): Unfolded content lines, e.g. from unfold_lines
+
+    Yields:
+        dict: Property name -> (params dict, value) for the properties in
+            EVENT_PROPERTIES; 'RDATE' and 'EXDATE' map to lists of such pairs
+    """
+    event = None
+    nested = 0
+    for line in lines:
+        head, _, value = line.partition(':')
+        name = head.partition(';')[0].upper()
+        if name == 'BEGIN':
+            if event is None:
+                if value.upper() == 'VEVENT':
+                    event = {}
+            else:
+                nested += 1
+        elif name == 'END':
+            if nested:
+                nested -= 1
+            elif event is not None and value.upper() == 'VEVENT':
+                yield event
+                event = None
+        elif event is not None and not nested and name in EVENT_PROPERTIES:
+            if '"' in head:
+                # A quoted parameter value may contain the colon we split on
+                match = re.match(r'((?:[^":]|"[^"]*")*):(.*)$', line)
+                if match:
+                    head, value = match.groups()
+            params = _split_params(head) if ';' in head else {}
+            if name in REPEATED_PROPERTIES:
+                event.setdefault(name, []).append((params, value))
+            else:
+                event[name] = (params, value)
+
+
+def parse_duration(value):
+    """
+    Parse an iCalendar DURATION value such as 'PT1H30M' or 'P1D'.
+
+    Raises:
+        ValueError: If the value is not a duration
+    """
+    match = _DURATION.match(value.strip().upper())
+    if not match or not any(match.groups()[1:]):
+        raise ValueError(f"Malformed duration: {value}")
+    weeks, days, hours, minutes, seconds = (int(part or 0) for part in match.groups()[1:])
+    duration = timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+    return -duration if match.group(1) == '-' else duration
+
+
+class _Resolver:
+    """
+    Converts DATE and DATE-TIME values to POSIX seconds.
+
+    Zones are looked up by TZID (IANA names); TZIDs that only a VTIMEZONE
+    block defines, such as Windows zone names, and floating times fall back
+    to the default zone, as do all-day dates. Local times are converted
+    through per-year timezones.OffsetTable lookups instead of pytz.
+    """
+
+    def __init__(self, timezone_name):
+        get_timezone(timezone_name)
+        self.timezone_name = timezone_name
+        self._zones = {}
+        self._tables = {}  # (zone name, year) -> OffsetTable
+
+    def zone_name(self, params):
+        """Name of the zone a value is in: its known TZID or the default zone."""
+        tzid = params.get('TZID')
+        if not tzid:
+            return self.timezone_name
+        name = self._zones.get(tzid)
+        if name is None:
+            try:
+                get_timezone(tzid)
+                name = tzid
+            except Exception:
+                name = self.timezone_name
+            self._zones[tzid] = name
+        return name
+
+    def timestamp(self, params, value):
+        """
+        Convert a value to POSIX seconds.
+
+        Returns:
+            tuple: (seconds, whether the value is a whole-day DATE)
+
+        Raises:
+            ValueError: If the value is not a DATE or DATE-TIME
+        """
+        value = value.strip()
+        year = int(value[0:4])
+        day = date(year, int(value[4:6]), int(value[6:8])).toordinal() - _EPOCH_ORDINAL
+        if params.get('VALUE', '').upper() == 'DATE' or len(value) == 8:
+            return self._to_utc(self.timezone_name, year, day * 86400), True
+        if len(value) < 15 or value[8] != 'T':
+            raise ValueError(f"Malformed date-time: {value}")
+        local = (day * 86400 + int(value[9:11]) * 3600 + int(value[11:13]) * 60 +
+                 int(value[13:15]))
+        if value.endswith('Z'):
+            return local, False
+        return self._to_utc(self.zone_name(params), year, local), False
+
+    def _to_utc(self, name, year, local):
+        table = self._tables.get((name, year))
+        if table is None:
+            # Margins on either side cover any UTC offset
+            first = (date(year, 1, 1).toordinal() - _EPOCH_ORDINAL) * 86400
+            table = self._tables[name, year] = offset_table(
+                name, first - 2 * 86400, first + 368 * 86400)
+        return table.to_utc(local)
+
+
+def _version(event):
+    """
+    What a re-import compares to decide whether an event changed: SEQUENCE,
+    LAST-MODIFIED and a hash of the timing properties, since many exports
+    carry neither field. Versions only live in memory, so the per-process
+    string hash is stable enough.
+    """
+    sequence = event.get('SEQUENCE')
+    modified = event.get('LAST-MODIFIED')
+    return (sequence[1].strip() if sequence else '', modified[1].strip() if modified else '',
+            hash(repr([event.get(name) for name in TIMING_PROPERTIES])))
+
+
+def _key(event):
+    """The event's identity: its UID, plus RECURRENCE-ID for a changed occurrence."""
+    uid = event['UID'][1] if 'UID' in event else (
+        'no-uid:' + event.get('DTSTART', ({}, ''))[1] + '/' + event.get('DTEND', ({}, ''))[1])
+    if 'RECURRENCE-ID' in event:
+        return uid, event['RECURRENCE-ID'][1]
+    return uid
+
+
+def _is_busy(event):
+    status = event.get('STATUS')
+    transp = event.get('TRANSP')
+    return not ((status and status[1].strip().upper() == 'CANCELLED') or
+                (transp and transp[1].strip().upper() == 'TRANSPARENT'))
+
+
+def _bounds(event, resolver):
+    """(start, end) of a VEVENT in POSIX seconds, or None if it is not busy."""
+    start, whole_day = resolver.timestamp(*event['DTSTART'])
+    if 'DTEND' in event:
+        end = resolver.timestamp(*event['DTEND'])[0]
+    elif 'DURATION' in event:
+        end = start + int(parse_duration(event['DURATION'][1]).total_seconds())
+    else:
+        # RFC 5545: a date lasts the day, a date-time takes no time
+        end = start + 86400 if whole_day else start
+    return (start, end) if end > start else None
+
+
+class ImportedCalendars:
+    """
+    Busy time imported from participants' own calendars.
+
+    Each participant's one-off events are kept merged in an
+    availability.IntervalSet and recurring ones as lazily expanded series;
+    queries match availability.AvailabilityIndex (with the same buffer
+    around every event). Every imported event is remembered by its identity
+    and version, so importing a newer export of the same calendar only
+    converts and re-indexes what changed.
+    """
+
+    def __init__(self, buffer_minutes=0):
+        """
+        Initialize an empty set of imported calendars.
+
+        Args:
+            buffer_minutes (int): Minimum gap required around imported events
+        """
+        self.buffer = int(buffer_minutes * 60)
+        # participant -> {key: (version, (start, end) or None, RecurringEvent or None)}
+        self._events = {}
+        self._busy = {}  # participant -> IntervalSet of one-off events
+        self.recurring = RecurringCalendar(buffer_minutes)
+        self._lock = threading.Lock()
+        # Imports parse outside _lock; this keeps two of them from interleaving
+        self._import_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._events)
+
+    def __contains__(self, participant):
+        return participant in self._events
+
+    def participants(self):
+        return list(self._events)
+
+    def event_count(self, participant):
+        """Number of events imported for a participant."""
+        return len(self._events.get(participant, ()))
+
+    def import_ics(self, participant, source, timezone_name='UTC'):
+        """
+        Sync a participant's imported busy time with an iCalendar export.
+
+        The export replaces what was imported for the participant before:
+        unchanged events are skipped, changed ones replaced and ones missing
+        from it removed. Changed occurrences of a recurring event
+        (RECURRENCE-ID) are imported on their own and excluded from the series.
+
+        Args:
+            participant (str): Participant ID or email
+            source (str or iterable): Path of an .ics file, or an open file
+                or other iterable of its lines
+            timezone_name (str): Zone for floating times, all-day events and
+                unknown TZIDs
+
+        Returns:
+            ImportStats: Events added, updated, unchanged, removed, skipped
+                (malformed), ignored (blocking no time) and duplicated, and
+                recurring events imported as their first occurrence only
+        """
+        with self._import_lock:
+            if isinstance(source, str):
+                with open(source, encoding='utf-8', errors='replace', newline='') as f:
+                    return self._sync(participant, iter_vevents(unfold_lines(f)),
+                                      timezone_name)
+            return self._sync(participant, iter_vevents(unfold_lines(source)), timezone_name)
+
+    def _sync(self, participant, events, timezone_name):
+        resolver = _Resolver(timezone_name)
+        known = self._events.get(participant, {})
+        seen = set()
+        changes = {}
+        masters = []
+        moved = {}  # uid -> starts of occurrences given as separate events
+        counts = dict.fromkeys(ImportStats._fields, 0)
+
+        def record(key, entry, malformed=False):
+            changes[key] = entry
+            if malformed:
+                counts['skipped'] += 1
+            elif key in known:
+                counts['updated'] += 1
+            elif entry[1] is not None or entry[2] is not None:
+                counts['added'] += 1
+            else:
+                counts['ignored'] += 1
+
+        for event in events:
+            key = _key(event)
+            if key in seen:
+                counts['duplicates'] += 1
+                continue
+            seen.add(key)
+            version = _version(event)
+            if 'RECURRENCE-ID' in event:
+                try:
+                    moved.setdefault(key[0], set()).add(
+                        resolver.timestamp(*event['RECURRENCE-ID'])[0])
+                except ValueError:
+                    pass
+            if 'RRULE' in event and 'RECURRENCE-ID' not in event:
+                masters.append((key, version, event))
+                continue
+            old = known.get(key)
+            if old is not None and old[0] == version:
+                counts['unchanged'] += 1
+                continue
+            try:
+                bounds = _bounds(event, resolver) if _is_busy(event) else None
+            except (KeyError, ValueError):
+                # No version, so the next import tries the event again
+                record(key, (None, None, None), malformed=True)
+                continue
+            record(key, (version, bounds, None))
+
+        # Series are built last, once every moved occurrence is known
+        for key, version, event in masters:
+            version += (frozenset(moved.get(key, ())),)
+            old = known.get(key)
+            if old is not None and old[0] == version:
+                counts['unchanged'] += 1
+                continue
+            if not _is_busy(event):
+                record(key, (version, None, None))
+                continue
+            try:
+                bounds, series = self._series(event, version[-1], resolver)
+            except (KeyError, ValueError):
+                record(key, (None, None, None), malformed=True)
+                continue
+            if series is not None:
+                record(key, (version, None, series))
+            else:
+                counts['first_only'] += bounds is not None
+                record(key, (version, bounds, None))
+
+        removed = [key for key in known if key not in seen]
+        counts['removed'] = len(removed)
+        self._apply(participant, changes, removed)
+        return ImportStats(**counts)
+
+    @staticmethod
+    def _series(event, moved, resolver):
+        """
+        A recurring VEVENT as (None, RecurringEvent), or as ((start, end) of
+        its first occurrence, None) if its rule cannot be expanded; (None,
+        None) if it blocks no time.
+
+        Raises:
+            KeyError, ValueError: If DTSTART, DTEND or EXDATE are malformed
+        """
+        bounds = _bounds(event, resolver)
+        if bounds is None:
+            return None, None
+        exdates = set(moved)
+        for params, value in event.get('EXDATE', ()):
+            for item in value.split(','):
+                if item.strip():
+                    exdates.add(resolver.timestamp(params, item)[0])
+        try:
+            return None, RecurringEvent(bounds[0], bounds[1], event['RRULE'][1], exdates,
+                                        resolver.zone_name(event['DTSTART'][0]))
+        except ValueError:
+            return (None if bounds[0] in exdates else bounds), None
+
+    def _apply(self, participant, changes, removed):
+        """Swap in changed events and drop removed ones, re-merging only if needed."""
+        if not changes and not removed:
+            return
+        with self._lock:
+            entries = self._events.setdefault(participant, {})
+            added = []
+            rebuild = False
+            for key in removed:
+                _, bounds, series = entries.pop(key)
+                rebuild = rebuild or bounds is not None
+                if series is not None:
+                    self.recurring.remove(participant, series)
+            for key, entry in changes.items():
+                old = entries.get(key)
+                if old is not None:
+                    rebuild = rebuild or old[1] is not None
+                    if old[2] is not None:
+                        self.recurring.remove(participant, old[2])
+                entries[key] = entry
+                if entry[1] is not None:
+                    added.append(entry[1])
+                if entry[2] is not None:
+                    self.recurring.add(participant, entry[2])
+
+            if rebuild:
+                self._busy[participant] = IntervalSet.from_intervals(
+                    entry[1] for entry in entries.values() if entry[1] is not None)
+            elif added:
+                busy = self._busy.get(participant)
+                if busy is None:
+                    self._busy[participant] = IntervalSet.from_intervals(added)
+                else:
+                    busy.update(added)
+            if not entries:
+                del self._events[participant]
+                self._busy.pop(participant, None)
+
+    def is_free(self, participant, start, end):
+        """Whether [start, end) is clear of the participant's imported events and buffers."""
+        busy = self._busy.get(participant)
+        if busy is not None:
+            with self._lock:
+                if busy.overlaps(start - self.buffer, end + self.buffer):
+                    return False
+        return participant not in self.recurring or self.recurring.is_free(
+            participant, start, end)
+
+    def conflicts(self, participants, start, end):
+        """Return the participants who are busy during [start, end)."""
+        return [participant for participant in participants
+                if not self.is_free(participant, start, end)]
+
+    def busy_intervals(self, participant, start, end):
+        """A participant's imported busy intervals within [start, end), merged and clipped."""
+        busy = self._busy.get(participant)
+        with self._lock:
+            intervals = busy.between(start, end) if busy is not None else []
+        if participant in self.recurring:
+            intervals = IntervalSet.from_intervals(
+                intervals + self.recurring.busy_intervals(participant, start, end)
+            ).between(start, end)
+        return intervals
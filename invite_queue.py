@@ -0,0 +1,365 @@
+"""
+Invite Dispatch Queue Module
+
+This module sends calendar invites in the background, so that confirming a
+booking only has to record the invite instead of waiting on the mail server.
+
+It provides:
+- A persistent (SQLite) queue of invite jobs that survives restarts
+- A pool of worker threads with exponential backoff between attempts;
+  permanent failures (5xx replies, refused recipients) are not retried
+- Token-bucket rate limiting of outgoing mail
+- Deduplication of repeated invites, pollable job status and cancelling
+  of jobs not sent yet
+- Reminder and follow-up emails about booked meetings, sent like invites
+"""
+
+import hashlib
+import json
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from config import DISPATCH_CONFIG
+from smtp_pool import session_dropped
+
+# Job states
+QUEUED = 'queued'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Job kinds: the message sent about the meeting
+INVITE = 'invite'
+REMINDER = 'reminder'
+FOLLOW_UP = 'follow_up'
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens accrue at ``rate`` per second up to ``capacity``; each send takes
+    one, so bursts of up to ``capacity`` go out at once and the long-run rate
+    stays at ``rate``.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one will be
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(obj):
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def is_transient(error):
+    """
+    Whether a failed send may succeed if retried: a 4xx reply from the server
+    or a lost connection. 5xx replies, recipients refused for good and errors
+    building the message are permanent.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return any(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return session_dropped(error)
+
+
+def invite_key(meeting_info):
+    """Deduplication key of an invite: the same meeting for the same people."""
+    fields = [meeting_info.get(key) for key in
+              ('title', 'start_time', 'end_time', 'recruiter_email', 'candidate_email')]
+    return hashlib.sha256(json.dumps(fields, default=_encode).encode()).hexdigest()
+
+
+class InviteDispatcher:
+    """
+    Background sender of calendar invites.
+
+    ``enqueue`` stores the invite and returns a job ID immediately; worker
+    threads deliver it through the CalendarManager's SMTP pool. An attempt
+    that failed transiently (see is_transient) is retried after an
+    exponentially growing delay until ``max_attempts`` is reached; a
+    permanent failure fails the job straight away. Jobs that were being sent when the process
+    stopped are queued again on start, so delivery is at-least-once.
+    """
+
+    def __init__(self, calendar, path=None, workers=None, rate_per_minute=None,
+                 burst=None, max_attempts=None, base_delay=None, max_delay=None,
+                 clock=time.time):
+        """
+        Initialize the dispatcher. Defaults come from DISPATCH_CONFIG.
+
+        Args:
+            calendar (CalendarManager): Builds and sends the invites
+            path (str, optional): SQLite file holding the queue; ':memory:'
+                keeps it in memory
+            workers (int, optional): Number of sender threads
+            rate_per_minute (float, optional): Sustained sending rate
+            burst (int, optional): Invites that may be sent back to back
+            max_attempts (int, optional): Attempts before a job is failed
+            base_delay (float, optional): Seconds before the first retry;
+                doubles with every further attempt
+            max_delay (float, optional): Longest delay between attempts
+            clock (callable): Wall-clock time source, in seconds
+        """
+        self.calendar = calendar
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                DISPATCH_CONFIG['queue_path'])
+        self.workers = workers or DISPATCH_CONFIG['workers']
+        self.max_attempts = max_attempts or DISPATCH_CONFIG['max_attempts']
+        self.base_delay = DISPATCH_CONFIG['base_delay'] if base_delay is None else base_delay
+        self.max_delay = max_delay or DISPATCH_CONFIG['max_delay']
+        self.clock = clock
+        self.bucket = TokenBucket((rate_per_minute or DISPATCH_CONFIG['rate_per_minute']) / 60,
+                                  burst or DISPATCH_CONFIG['burst'])
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS invite_jobs (
+                id TEXT PRIMARY KEY,
+                dedup_key TEXT UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                last_error TEXT,
+                updated REAL NOT NULL,
+                kind TEXT NOT NULL DEFAULT 'invite'
+            )""")
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(invite_jobs)")]
+        if 'kind' not in columns:  # queues created before reminders existed
+            self._db.execute("ALTER TABLE invite_jobs ADD COLUMN kind TEXT NOT NULL "
+                             "DEFAULT 'invite'")
+        self._db.execute("CREATE INDEX IF NOT EXISTS invite_jobs_due "
+                         "ON invite_jobs (status, next_attempt)")
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._threads = []
+        self._stopping = False
+
+    def enqueue(self, meeting_info, dedup_key=None, kind=INVITE):
+        """
+        Queue an invite (or a reminder or follow-up) for delivery.
+
+        An invite with the same deduplication key as a queued, in-flight or
+        sent one is not queued again; a failed or cancelled one is queued for
+        a new round of attempts.
+
+        Args:
+            meeting_info (dict): Meeting details (see
+                CalendarManager.create_calendar_event)
+            dedup_key (str, optional): Key identifying repeats
+                (default: invite_key(meeting_info), prefixed by the kind for
+                reminders and follow-ups)
+            kind (str): INVITE, REMINDER or FOLLOW_UP
+
+        Returns:
+            str: Job ID to poll with ``status``
+        """
+        if dedup_key is None:
+            dedup_key = invite_key(meeting_info)
+            if kind != INVITE:
+                dedup_key = f"{kind}:{dedup_key}"
+        payload = json.dumps(meeting_info, default=_encode)
+        now = self.clock()
+        with self._wakeup:
+            row = self._db.execute("SELECT id, status FROM invite_jobs WHERE dedup_key = ?",
+                                   (dedup_key,)).fetchone()
+            if row is None:
+                job_id = uuid.uuid4().hex
+                self._db.execute(
+                    "INSERT INTO invite_jobs (id, dedup_key, payload, status, next_attempt, "
+                    "updated, kind) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, dedup_key, payload, QUEUED, now, now, kind))
+            else:
+                job_id, status = row
+                if status not in (FAILED, CANCELLED):
+                    return job_id
+                self._db.execute(
+                    "UPDATE invite_jobs SET payload = ?, status = ?, attempts = 0, "
+                    "next_attempt = ?, last_error = NULL, updated = ? WHERE id = ?",
+                    (payload, QUEUED, now, now, job_id))
+            self._db.commit()
+            self._wakeup.notify()
+        return job_id
+
+    def status(self, job_id):
+        """
+        Return the state of a job.
+
+        Returns:
+            dict: 'status' (queued, sending, sent, failed or cancelled), 'attempts' and
+                'last_error', or None for an unknown job ID
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, attempts, last_error FROM invite_jobs WHERE id = ?",
+                (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {'status': row[0], 'attempts': row[1], 'last_error': row[2]}
+
+    def cancel(self, job_id):
+        """
+        Drop a job that has not been sent, e.g. the invite of a cancelled meeting.
+
+        Returns:
+            bool: Whether the job was still queued; one being sent or already
+                sent is left alone
+        """
+        with self._wakeup:
+            cancelled = self._db.execute(
+                "UPDATE invite_jobs SET status = ?, updated = ? WHERE id = ? AND status = ?",
+                (CANCELLED, self.clock(), job_id, QUEUED)).rowcount > 0
+            self._db.commit()
+        return cancelled
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job is sent, failed or cancelled; returns its final status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.status(job_id)
+            if status is None or status['status'] in (SENT, FAILED, CANCELLED):
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return status
+            time.sleep(0.01)
+
+    def start(self):
+        """Start the worker threads, re-queueing jobs interrupted mid-send."""
+        with self._wakeup:
+            self._db.execute("UPDATE invite_jobs SET status = ? WHERE status = ?",
+                             (QUEUED, SENDING))
+            self._db.commit()
+            self._stopping = False
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"invite-dispatch-{i}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Stop the workers after their current send."""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _claim(self):
+        """
+        Mark the next due job as being sent.
+
+        Returns:
+            tuple: (job ID, payload, attempts, kind) and None, or None and the
+                seconds until the next job is due (None if the queue is empty)
+        """
+        now = self.clock()
+        row = self._db.execute(
+            "SELECT id, payload, attempts, next_attempt, kind FROM invite_jobs "
+            "WHERE status = ? ORDER BY next_attempt LIMIT 1", (QUEUED,)).fetchone()
+        if row is None:
+            return None, None
+        job_id, payload, attempts, next_attempt, kind = row
+        if next_attempt > now:
+            return None, next_attempt - now
+        self._db.execute("UPDATE invite_jobs SET status = ?, updated = ? WHERE id = ?",
+                         (SENDING, now, job_id))
+        self._db.commit()
+        return (job_id, payload, attempts, kind), None
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while True:
+                    if self._stopping:
+                        return
+                    job, wait = self._claim()
+                    if job is not None:
+                        break
+                    self._wakeup.wait(wait)
+
+            job_id, payload, attempts, kind = job
+            # Wait for a token outside the queue lock
+            delay = self.bucket.try_acquire()
+            while delay:
+                time.sleep(delay)
+                delay = self.bucket.try_acquire()
+
+            error, retry = self._deliver(json.loads(payload, object_hook=_decode), kind)
+            self._finish(job_id, attempts + 1, error, retry)
+
+    def _deliver(self, meeting_info, kind=INVITE):
+        """
+        Send one message.
+
+        Returns:
+            tuple: The error message (None on success) and whether the
+                failure is worth retrying
+        """
+        try:
+            if kind == INVITE:
+                message = self.calendar.create_invite_message(meeting_info)
+            else:
+                message = self.calendar.create_reminder_message(meeting_info, kind)
+            self.calendar.smtp_pool.send(message)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}", is_transient(e)
+        return None, False
+
+    def _finish(self, job_id, attempts, error, retry=True):
+        now = self.clock()
+        with self._wakeup:
+            if error is None:
+                self._db.execute(
+                    "UPDATE invite_jobs SET status = ?, attempts = ?, last_error = NULL, "
+                    "updated = ? WHERE id = ?", (SENT, attempts, now, job_id))
+            elif not retry or attempts >= self.max_attempts:
+                self._db.execute(
+                    "UPDATE invite_jobs SET status = ?, attempts = ?, last_error = ?, "
+                    "updated = ? WHERE id = ?", (FAILED, attempts, error, now, job_id))
+            else:
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+                self._db.execute(
+                    "UPDATE invite_jobs SET status = ?, attempts = ?, last_error = ?, "
+                    "next_attempt = ?, updated = ? WHERE id = ?",
+                    (QUEUED, attempts, error, now + delay, now, job_id))
+            self._db.commit()
+            self._wakeup.notify()
@@ -0,0 +1,306 @@
+"""
+Message Parser Module
+
+This module extracts scheduling details from free-text chat messages with one
+precompiled tokenizer, so that every message is scanned once instead of being
+searched again for each kind of detail.
+
+It provides:
+- Extraction of dates, times and time ranges, durations, timezones and day
+  parts, reported under the same keys as the datasets' Entities column
+  ('Day', 'Duration', 'TimeZone', 'TimeSlot')
+- A batch API that parses repeated messages only once
+- The (date, time) helper used by the chat interface
+"""
+
+import re
+from datetime import datetime, time, timedelta
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+            'Saturday', 'Sunday']
+
+# Day-name spellings (full names and common abbreviations) by weekday index
+_WEEKDAY_NAMES = {
+    'monday': 0, 'mon': 0, 'tuesday': 1, 'tue': 1, 'tues': 1,
+    'wednesday': 2, 'wed': 2, 'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+    'friday': 4, 'fri': 4, 'saturday': 5, 'sunday': 6
+}
+
+_MONTHS = {name: number for number, names in enumerate(
+    [('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'),
+     ('may',), ('jun', 'june'), ('jul', 'july'), ('aug', 'august'),
+     ('sep', 'sept', 'september'), ('oct', 'october'), ('nov', 'november'),
+     ('dec', 'december')], start=1) for name in names}
+
+# Zone abbreviations, as the datasets' fixed-offset names
+ZONE_ABBREVIATIONS = {
+    'gmt': 'UTC', 'utc': 'UTC',
+    'est': 'UTC-5', 'edt': 'UTC-4', 'cst': 'UTC-6', 'cdt': 'UTC-5',
+    'mst': 'UTC-7', 'mdt': 'UTC-6', 'pst': 'UTC-8', 'pdt': 'UTC-7',
+    'bst': 'UTC+1', 'cet': 'UTC+1', 'cest': 'UTC+2', 'ist': 'UTC+5:30',
+    'sgt': 'UTC+8', 'jst': 'UTC+9', 'aest': 'UTC+10'
+}
+
+_DAY_PARTS = {'morning': 'Morning', 'afternoon': 'Afternoon',
+              'evening': 'Evening', 'night': 'Evening', 'tonight': 'Evening'}
+
+
+def _alternation(words):
+    # Longest first, so that 'thurs' is not matched as 'thu'
+    return '|'.join(sorted(map(re.escape, words), key=len, reverse=True))
+
+
+# One pass over the lower-cased message. Each position is first sorted into
+# number, word or dash so only the alternatives that can start there are
+# tried, and words that mean nothing are skipped whole. Alternatives are tried
+# in order, so durations ('60-minute') and dates ('25/03') win over the bare
+# numbers they start with, and ISO dates ('2026-12-01') over day/month dates.
+TOKEN_PATTERN = re.compile(rf"""
+    \b(?=\d)(?:
+        (?P<duration>(?P<amount>\d+(?:\.\d+)?)\s*-?\s*(?P<unit>minutes?|mins?|hours?|hrs?)\b)
+      | (?P<iso_date>(?P<iso_year>\d{{4}})-(?P<iso_month>\d{{1,2}})-(?P<iso_day>\d{{1,2}})\b)
+      | (?P<date>(?P<day>\d{{1,2}})[/.-](?P<month>\d{{1,2}})(?:[/.-](?P<year>\d{{4}}|\d{{2}}))?\b
+            (?!\s*(?:[ap]\.?m\b|:)))
+      | (?P<day_month>(?P<md_day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?
+            (?P<md_month>{_alternation(_MONTHS)})\b)
+      | (?P<clock>(?P<hour>\d{{1,2}})(?::(?P<minute>[0-5]\d))?(?!\d)\s*
+            (?P<meridian>[ap]\.?m\b\.?)?))
+  | \b(?=[a-z])(?:
+        (?P<month_day>(?P<dm_month>{_alternation(_MONTHS)})\.?\s+(?P<dm_day>\d{{1,2}})
+            (?:st|nd|rd|th)?\b)
+      | (?P<noon>(?:noon|midday)\b)
+      | (?P<midnight>midnight\b)
+      | (?P<relative>(?:day\s+after\s+tomorrow|today|tomorrow)\b)
+      | (?P<weekday>(?:{_alternation(_WEEKDAY_NAMES)})\b)
+      | (?P<zone>(?P<zone_base>utc|gmt)(?:\s*(?P<zone_sign>[+-])\s*(?P<zone_hours>\d{{1,2}})
+            (?::?(?P<zone_minutes>[0-5]\d))?)?\b
+          | (?P<zone_abbreviation>{_alternation(ZONE_ABBREVIATIONS)})\b)
+      | (?P<day_part>(?:{_alternation(_DAY_PARTS)})\b)
+      | (?P<at>(?:at|around)\b)
+      | (?P<range_to>(?:to|until|till|and)\b)
+      | (?P<word>[a-z]+))
+  | (?P<dash>[-–])
+""", re.VERBOSE)
+
+
+_CLOCK_KINDS = ('clock', 'noon', 'midnight')
+
+
+class _Clock:
+    """A time-of-day mention before am/pm has been resolved."""
+
+    __slots__ = ('hour', 'minute', 'meridian', 'bare')
+
+    def __init__(self, hour, minute, meridian, bare):
+        self.hour = hour
+        self.minute = minute
+        self.meridian = meridian  # 'am', 'pm' or None
+        self.bare = bare  # a plain number such as '2'
+
+    def resolve(self, day_part=None):
+        """Return the time, or None if it is not a valid time of day."""
+        hour = self.hour
+        if self.meridian:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if self.meridian == 'pm' else 0)
+        elif hour < 12 and day_part in ('Afternoon', 'Evening'):
+            hour += 12
+        elif self.bare and 1 <= hour <= 7 and day_part is None:
+            hour += 12  # 'at 3' is in the afternoon, not at night
+        if hour > 23:
+            return None
+        return time(hour, self.minute)
+
+
+def _day_part_of(moment):
+    if moment.hour < 12:
+        return 'Morning'
+    return 'Afternoon' if moment.hour < 17 else 'Evening'
+
+
+def _next_weekday(today, weekday):
+    days_ahead = weekday - today.weekday()
+    if days_ahead <= 0:  # If the day has passed this week
+        days_ahead += 7
+    return today + timedelta(days=days_ahead)
+
+
+def _future_date(today, year, month, day):
+    """Date of a day and month; without a year, the next such date."""
+    try:
+        if year is not None:
+            return datetime(year, month, day).date()
+        target = datetime(today.year, month, day).date()
+        if target < today:
+            target = datetime(today.year + 1, month, day).date()
+        return target
+    except ValueError:
+        return None
+
+
+def _zone_name(match):
+    abbreviation = match.group('zone_abbreviation')
+    if abbreviation:
+        return ZONE_ABBREVIATIONS[abbreviation]
+    if not match.group('zone_sign'):
+        return 'UTC'
+    name = f"UTC{match.group('zone_sign')}{int(match.group('zone_hours'))}"
+    minutes = match.group('zone_minutes')
+    if minutes and minutes != '00':
+        name += f":{minutes}"
+    return name
+
+
+def parse_message(message, now=None):
+    """
+    Extract scheduling details from a message.
+
+    Times are read as 12-hour times when they carry am/pm, otherwise as
+    24-hour times moved to the afternoon when the message says 'afternoon' or
+    'evening'. Bare numbers only count as times inside a range such as
+    'between 2 and 4 pm', where they take the meridian of the other end.
+
+    Args:
+        message (str): Chat message
+        now (datetime, optional): Reference time for relative days
+            (default: the current local time)
+
+    Returns:
+        dict: Entities-style keys 'Day' (weekday name), 'Duration' ('30 min'),
+            'TimeZone' ('UTC-5') and 'TimeSlot' ('Morning', 'Afternoon' or
+            'Evening'), plus 'Date' (date), 'StartTime' and 'EndTime'
+            (time) and 'DurationMinutes' (int); missing details are None
+    """
+    today = (now or datetime.now()).date()
+    date = weekday = zone = day_part = None
+    duration = None
+    # (_Clock, index of the time it ends a range with or None,
+    #  whether it counts as a time on its own)
+    clocks = []
+    last_kind = None
+    range_open = False  # a time was just followed by 'to', 'and' or '-'
+
+    for match in TOKEN_PATTERN.finditer(message.lower()):
+        kind = match.lastgroup
+        if kind == 'duration':
+            if duration is None:
+                amount = float(match.group('amount'))
+                duration = round(amount * 60 if match.group('unit').startswith('h') else amount)
+        elif kind == 'date':
+            year = match.group('year')
+            if year is not None:
+                year = int(year) + (2000 if len(year) == 2 else 0)
+            date = date or _future_date(today, year, int(match.group('month')),
+                                        int(match.group('day')))
+        elif kind == 'iso_date':
+            date = date or _future_date(today, int(match.group('iso_year')),
+                                        int(match.group('iso_month')),
+                                        int(match.group('iso_day')))
+        elif kind in ('day_month', 'month_day'):
+            month = match.group('md_month') or match.group('dm_month')
+            day = match.group('md_day') or match.group('dm_day')
+            date = date or _future_date(today, None, _MONTHS[month], int(day))
+        elif kind in _CLOCK_KINDS:
+            if kind == 'clock':
+                meridian = match.group('meridian')
+                clock = _Clock(int(match.group('hour')), int(match.group('minute') or 0),
+                               meridian and meridian[0] + 'm',
+                               not (meridian or match.group('minute')))
+            else:
+                clock = _Clock(12 if kind == 'noon' else 0, 0, None, False)
+            # 'X to Y' / 'X - Y' / 'between X and Y' joins this to the previous time
+            joined = range_open and clocks[-1][1] is None
+            clocks.append((clock, len(clocks) - 1 if joined else None,
+                           not clock.bare or last_kind == 'at'))
+        elif kind == 'relative':
+            if date is None:
+                word = match.group()
+                offset = 0 if word == 'today' else 1 if word == 'tomorrow' else 2
+                date = today + timedelta(days=offset)
+        elif kind == 'weekday':
+            weekday = weekday if weekday is not None else _WEEKDAY_NAMES[match.group()]
+        elif kind == 'zone':
+            zone = zone or _zone_name(match)
+        elif kind == 'day_part':
+            word = match.group()
+            day_part = day_part or _DAY_PARTS[word]
+            if word == 'tonight' and date is None:
+                date = today
+        range_open = kind in ('range_to', 'dash') and last_kind in _CLOCK_KINDS
+        last_kind = kind
+
+    if date is None and weekday is not None:
+        date = _next_weekday(today, weekday)
+
+    start = end = None
+    for position, (clock, joins, standalone) in enumerate(clocks):
+        if joins is not None:
+            first = clocks[joins][0]
+            # Share am/pm across the range: '2-4 pm', '11 to 2 pm'
+            if first.meridian is None and clock.meridian:
+                first.meridian = clock.meridian
+                if first.hour % 12 > clock.hour % 12:
+                    first.meridian = 'am' if clock.meridian == 'pm' else 'pm'
+            elif clock.meridian is None and first.meridian:
+                clock.meridian = first.meridian
+                if clock.hour % 12 < first.hour % 12:
+                    clock.meridian = 'am' if first.meridian == 'pm' else 'pm'
+            start, end = first.resolve(day_part), clock.resolve(day_part)
+            break
+        is_range_start = position + 1 < len(clocks) and clocks[position + 1][1] == position
+        if standalone and not is_range_start:
+            start = clock.resolve(day_part)
+            if start is not None:
+                break
+
+    if day_part is None and start is not None:
+        day_part = _day_part_of(start)
+
+    return {
+        'Date': date,
+        'Day': WEEKDAYS[date.weekday()] if date else (
+            WEEKDAYS[weekday] if weekday is not None else None),
+        'StartTime': start,
+        'EndTime': end,
+        'Duration': f"{duration} min" if duration is not None else None,
+        'DurationMinutes': duration,
+        'TimeZone': zone,
+        'TimeSlot': day_part
+    }
+
+
+def parse_messages(messages, now=None):
+    """
+    Parse a batch of messages.
+
+    Chat traffic repeats a lot of messages verbatim, so each distinct message
+    is parsed once per batch.
+
+    Args:
+        messages (iterable of str): Messages
+        now (datetime, optional): Reference time shared by the batch
+
+    Returns:
+        list: One dict per message, as returned by parse_message
+    """
+    now = now or datetime.now()
+    parsed = {}
+    results = []
+    for message in messages:
+        entities = parsed.get(message)
+        if entities is None:
+            entities = parsed[message] = parse_message(message, now)
+        results.append(dict(entities))
+    return results
+
+
+def parse_date_time(message, now=None):
+    """
+    Parse date and time from user message.
+
+    Returns:
+        tuple: (date, time), either of which may be None
+    """
+    entities = parse_message(message, now)
+    return entities['Date'], entities['StartTime']
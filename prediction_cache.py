@@ -0,0 +1,286 @@
+"""
+Prediction Cache Module
+
+This module precomputes model outputs over the small, discrete input spaces
+the scheduling bot actually uses, so that serving a prediction becomes an
+array index instead of a model call.
+
+It provides:
+- An exhaustive intent lookup table over (hour, text length, speaker)
+- An LRU cache of intent predictions as a lighter-weight alternative
+- A (department x duration) table of ranked meeting type suggestions
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+
+class IntentLookupTable:
+    """
+    Exhaustive table of intent predictions.
+
+    The intent model's features are [hour, text_length, speaker, language,
+    sentiment] with language and sentiment fixed by the feature encoder, so
+    every reachable input up to ``max_text_length`` is predicted once at build
+    time. Rows outside the table are passed to the live model.
+    """
+
+    def __init__(self, model, feature_encoder, max_text_length=512):
+        """
+        Build the table.
+
+        Args:
+            model: Fitted intent model with a ``predict`` method
+            feature_encoder (ConversationFeatureEncoder): Provides the speaker
+                codes and the constant language/sentiment columns
+            max_text_length (int): Longest message length held in the table
+        """
+        self.model = model
+        self.template = feature_encoder.template
+        self.max_text_length = max_text_length
+        n_speakers = len(feature_encoder.speaker)
+
+        start = time.perf_counter()
+        hours, lengths, speakers = np.meshgrid(np.arange(24),
+                                               np.arange(max_text_length + 1),
+                                               np.arange(n_speakers),
+                                               indexing='ij')
+        grid = np.tile(self.template, (hours.size, 1))
+        grid[:, 0] = hours.ravel()
+        grid[:, 1] = lengths.ravel()
+        grid[:, 2] = speakers.ravel()
+        predictions = np.asarray(model.predict(grid))
+        if predictions.dtype.kind in 'iu':
+            # Class codes are small integers; store them in the narrowest type
+            predictions = predictions.astype(np.min_scalar_type(predictions.max()))
+        self.table = predictions.reshape(hours.shape)
+        self._constants = self.template[3:].tolist()
+        self.build_seconds = time.perf_counter() - start
+
+    @property
+    def nbytes(self):
+        """Memory held by the table in bytes"""
+        return self.table.nbytes
+
+    def predict(self, X):
+        """
+        Predict intents, reading from the table where possible.
+
+        Args:
+            X (array-like): (n, 5) intent feature matrix
+
+        Returns:
+            numpy.ndarray: Predicted intent codes
+        """
+        X = np.asarray(X, dtype=np.int64)
+        n_hours, _, n_speakers = self.table.shape
+        if len(X) == 1:
+            # Chat turns classify one message at a time; skip the array masks
+            hour, length, speaker, *constants = X[0].tolist()
+            if (0 <= hour < n_hours and 0 <= length <= self.max_text_length and
+                    0 <= speaker < n_speakers and constants == self._constants):
+                return self.table[hour, length, speaker:speaker + 1]
+
+        hours, lengths, speakers = X[:, 0], X[:, 1], X[:, 2]
+        inside = ((hours >= 0) & (hours < n_hours) &
+                  (lengths >= 0) & (lengths <= self.max_text_length) &
+                  (speakers >= 0) & (speakers < n_speakers) &
+                  (X[:, 3:] == self.template[3:]).all(axis=1))
+
+        if inside.all():
+            return self.table[hours, lengths, speakers]
+
+        predictions = np.empty(len(X), dtype=self.table.dtype)
+        predictions[inside] = self.table[hours[inside], lengths[inside],
+                                         speakers[inside]]
+        predictions[~inside] = self.model.predict(X[~inside])
+        return predictions
+
+
+class LRUPredictionCache:
+    """
+    Least-recently-used cache of model predictions keyed by feature row.
+
+    Misses within one ``predict`` call are sent to the model together.
+    """
+
+    def __init__(self, model, maxsize=4096):
+        """
+        Initialize the cache.
+
+        Args:
+            model: Fitted model with a ``predict`` method
+            maxsize (int): Maximum number of cached rows
+        """
+        self.model = model
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, X):
+        """Predict each row, calling the model only for uncached rows"""
+        X = np.asarray(X, dtype=np.int64)
+        keys = [tuple(row) for row in X.tolist()]
+        results = [None] * len(keys)
+        missing = []
+        with self.lock:
+            for i, key in enumerate(keys):
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    results[i] = self.entries[key]
+                else:
+                    missing.append(i)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            predictions = self.model.predict(X[missing])
+            with self.lock:
+                for i, prediction in zip(missing, predictions):
+                    results[i] = prediction
+                    self.entries[keys[i]] = prediction
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+
+        return np.asarray(results)
+
+
+def file_signature(path):
+    """Return (mtime, size) of a file, or None if it cannot be read"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class TimeSlotTable:
+    """
+    Precomputed meeting type suggestions for every department and duration.
+
+    The time slot model's only varying inputs are department and duration
+    (availability status and location are fixed by the feature encoder), so
+    predictions and class probabilities are computed once for every known
+    department and every whole-minute duration up to ``max_duration``.
+    """
+
+    def __init__(self, model, feature_encoder, max_duration=480, source_path=None):
+        """
+        Build the table.
+
+        Args:
+            model: Fitted time slot model with ``predict`` (and ideally
+                ``predict_proba``)
+            feature_encoder (CalendarFeatureEncoder): Encodes departments and
+                decodes meeting types
+            max_duration (int): Longest duration in minutes held in the table
+            source_path (str, optional): Model file; the table reports itself
+                stale once this file changes
+        """
+        self.model = model
+        self.feature_encoder = feature_encoder
+        self.max_duration = max_duration
+        self.source_path = source_path
+        self.source_signature = file_signature(source_path)
+
+        start = time.perf_counter()
+        n_departments = len(feature_encoder.department)
+        departments, durations = np.meshgrid(np.arange(n_departments),
+                                             np.arange(max_duration + 1),
+                                             indexing='ij')
+        grid = np.tile(feature_encoder.template, (departments.size, 1))
+        grid[:, 0] = durations.ravel()
+        grid[:, 3] = departments.ravel()
+
+        shape = departments.shape
+        self.classes_ = np.asarray(model.classes_)
+        predictions = np.asarray(model.predict(grid))
+        self.predictions = predictions.reshape(shape)
+        proba = self._predict_proba(grid, predictions)
+        self.proba = proba.reshape(shape + (proba.shape[1],))
+        # Column order of proba follows model.classes_; rank it once
+        self.ranking = np.argsort(-self.proba, axis=-1, kind='stable').astype(
+            np.min_scalar_type(self.proba.shape[-1]))
+        self.build_seconds = time.perf_counter() - start
+
+    @property
+    def nbytes(self):
+        """Memory held by the table in bytes"""
+        return self.predictions.nbytes + self.proba.nbytes + self.ranking.nbytes
+
+    def is_stale(self):
+        """Whether the model file has changed since the table was built"""
+        return (self.source_path is not None and
+                file_signature(self.source_path) != self.source_signature)
+
+    def _predict_proba(self, features, predictions=None):
+        """Class probabilities of the model, or a one-hot of its predictions"""
+        if hasattr(self.model, 'predict_proba'):
+            return np.asarray(self.model.predict_proba(features), dtype=np.float32)
+        # Without probabilities every suggestion beyond the first scores 0
+        if predictions is None:
+            predictions = np.asarray(self.model.predict(features))
+        return (self.classes_ == predictions.reshape(-1, 1)).astype(np.float32)
+
+    def _in_table(self, duration):
+        return float(duration).is_integer() and 0 <= duration <= self.max_duration
+
+    def predict(self, department, duration):
+        """
+        Predict the meeting type for one department and duration.
+
+        Returns:
+            str: Suggested meeting type
+        """
+        department_code = self.feature_encoder.department.encode(department)
+        if self._in_table(duration):
+            code = self.predictions[department_code, int(duration)]
+        else:
+            code = self.model.predict(
+                [self.feature_encoder.encode(department, duration)])[0]
+        return self.feature_encoder.meeting_type.decode(code)
+
+    def top_k(self, department, durations, k=3):
+        """
+        Rank meeting types for one department over several durations.
+
+        Args:
+            department (str): Department name (unknown names use the encoder
+                fallback)
+            durations (list): Meeting durations in minutes
+            k (int): Number of suggestions per duration
+
+        Returns:
+            list: One list of (meeting_type, probability) tuples per duration,
+                most likely first
+        """
+        department_code = self.feature_encoder.department.encode(department)
+        decode = self.feature_encoder.meeting_type.decode_column
+        k = min(k, len(self.classes_))
+
+        results = []
+        outside = []
+        for duration in durations:
+            if self._in_table(duration):
+                ranked = self.ranking[department_code, int(duration), :k]
+                scores = self.proba[department_code, int(duration), ranked]
+                results.append(list(zip(decode(self.classes_[ranked]).tolist(),
+                                        scores.tolist())))
+            else:
+                outside.append(len(results))
+                results.append(None)
+
+        if outside:
+            features = self.feature_encoder.encode_batch(
+                [department] * len(outside), [durations[i] for i in outside])
+            proba = self._predict_proba(features)
+            for i, row in zip(outside, proba):
+                ranked = np.argsort(-row, kind='stable')[:k]
+                results[i] = list(zip(decode(self.classes_[ranked]).tolist(),
+                                      row[ranked].tolist()))
+        return results
@@ -0,0 +1,314 @@
+"""
+Recurrence Module
+
+This module expands recurring meetings (RFC 5545 recurrence rules) on
+demand, so a long series costs nothing until a query looks at part of it.
+
+It provides:
+- Parsing and writing of DAILY and WEEKLY RRULEs with INTERVAL, BYDAY,
+  UNTIL and COUNT, and EXDATE exclusions
+- A generator of the occurrences that overlap a time range, which jumps to
+  the range instead of walking the series from its first occurrence
+- Per-participant recurring busy time with cached expansions of fixed-size
+  windows, queried like availability.AvailabilityIndex
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from pytz.tzinfo import DstTzInfo
+from timezones import get_timezone
+
+WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+# Occurrences are cached per window of this many seconds, keyed by the window
+WINDOW_SECONDS = 7 * 86400
+
+
+def _parse_until(value):
+    """UNTIL as POSIX seconds; a date means the end of that day, floating times are UTC."""
+    value = value.rstrip('Z')
+    if 'T' not in value:
+        moment = datetime.strptime(value, '%Y%m%d') + timedelta(days=1, seconds=-1)
+    else:
+        moment = datetime.strptime(value, '%Y%m%dT%H%M%S')
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+class Recurrence:
+    """
+    A recurrence rule: every ``interval`` days or weeks, on the ``byday``
+    weekdays (0 = Monday), until a time or for a number of occurrences.
+    """
+
+    __slots__ = ('freq', 'interval', 'byday', 'until', 'count')
+
+    def __init__(self, freq, interval=1, byday=None, until=None, count=None):
+        """
+        Initialize a rule.
+
+        Args:
+            freq (str): 'DAILY' or 'WEEKLY'
+            interval (int): Days or weeks between periods
+            byday (list, optional): Weekdays (0 = Monday); with DAILY they
+                restrict the days, with WEEKLY they are the days of each week
+                (default: every day / the weekday of the first occurrence)
+            until (int, optional): Last allowed start, in POSIX seconds
+            count (int, optional): Number of occurrences (before exclusions)
+
+        Raises:
+            ValueError: For rules this module cannot expand
+        """
+        if freq not in ('DAILY', 'WEEKLY'):
+            raise ValueError(f"Unsupported recurrence frequency: {freq}")
+        if interval < 1 or (count is not None and count < 0):
+            raise ValueError("INTERVAL must be positive and COUNT not negative")
+        if freq == 'DAILY' and byday and interval != 1:
+            raise ValueError("DAILY rules with BYDAY need INTERVAL=1")
+        self.freq = freq
+        self.interval = interval
+        self.byday = sorted(set(byday)) if byday else None
+        self.until = until
+        self.count = count
+
+    @classmethod
+    def parse(cls, rule):
+        """
+        Parse an RRULE value such as 'FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10'.
+
+        Raises:
+            ValueError: If the rule is malformed or uses unsupported parts
+        """
+        if rule.upper().startswith('RRULE:'):
+            rule = rule[len('RRULE:'):]
+        parts = {}
+        for part in rule.strip().split(';'):
+            if part:
+                name, _, value = part.partition('=')
+                parts[name.upper()] = value.upper()
+        unsupported = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'UNTIL', 'COUNT', 'WKST'}
+        if unsupported or parts.get('WKST', 'MO') != 'MO':
+            raise ValueError(f"Unsupported recurrence rule: {rule}")
+        if 'UNTIL' in parts and 'COUNT' in parts:
+            raise ValueError("UNTIL and COUNT cannot both be given")
+        try:
+            byday = [WEEKDAY_CODES.index(day) for day in parts['BYDAY'].split(',')
+                     ] if parts.get('BYDAY') else None
+            return cls(parts.get('FREQ'), int(parts.get('INTERVAL', 1)), byday,
+                       _parse_until(parts['UNTIL']) if 'UNTIL' in parts else None,
+                       int(parts['COUNT']) if 'COUNT' in parts else None)
+        except (IndexError, KeyError) as e:
+            raise ValueError(f"Malformed recurrence rule: {rule}") from e
+
+    def to_ical(self):
+        """The rule as an RRULE value, parts in the order icalendar writes them."""
+        parts = [f"FREQ={self.freq}"]
+        if self.until is not None:
+            parts.append("UNTIL=" + datetime.fromtimestamp(self.until, timezone.utc)
+                         .strftime('%Y%m%dT%H%M%SZ'))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ','.join(WEEKDAY_CODES[day] for day in self.byday))
+        return ';'.join(parts)
+
+    def __repr__(self):
+        return f"Recurrence({self.to_ical()!r})"
+
+
+class RecurringEvent:
+    """
+    A series of equally long occurrences of one meeting.
+
+    Occurrences keep the wall-clock start time of the first one in the
+    series' timezone. They are generated lazily; the expansion of each
+    WINDOW_SECONDS window that ``between`` touches is kept in a small LRU
+    cache, so repeated availability queries over the same days do not expand
+    the series again.
+    """
+
+    def __init__(self, start, end, recurrence, exdates=(), timezone_name='UTC',
+                 cache_windows=64):
+        """
+        Initialize a series.
+
+        Args:
+            start, end (int): Bounds of the first occurrence, POSIX seconds
+            recurrence (Recurrence or str): The rule
+            exdates (iterable): Starts (POSIX seconds) of excluded occurrences
+            timezone_name (str): Zone whose wall-clock time occurrences keep
+            cache_windows (int): Expanded windows kept in the cache
+        """
+        if isinstance(recurrence, str):
+            recurrence = Recurrence.parse(recurrence)
+        self.start = start
+        self.duration = end - start
+        self.recurrence = recurrence
+        self.exdates = frozenset(exdates)
+        self.timezone_name = timezone_name
+        self.cache_windows = cache_windows
+        tz = get_timezone(timezone_name)
+        # Zones without daylight saving time keep occurrences a whole number of days apart
+        self._tz = tz if isinstance(tz, DstTzInfo) else None
+        local = datetime.fromtimestamp(start, tz)
+        self._first_day = local.date()
+        self._local_time = local.time().replace(tzinfo=None)
+
+        # Occurrences fall on day anchor + period * period_days + offset
+        if recurrence.freq == 'DAILY' and not recurrence.byday:
+            self._anchor = self._first_day
+            self._period_days = recurrence.interval
+            self._offsets = [0]
+        else:
+            self._anchor = self._first_day - timedelta(days=self._first_day.weekday())
+            self._period_days = 7 * recurrence.interval
+            self._offsets = recurrence.byday or [self._first_day.weekday()]
+        # Offsets of the first period that fall before the first occurrence
+        self._skipped = sum(1 for offset in self._offsets
+                            if self._anchor + timedelta(days=offset) < self._first_day)
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _start_on(self, day):
+        """POSIX start of the occurrence on a local day."""
+        if self._tz is None:
+            return self.start + (day - self._first_day).days * 86400
+        return int(self._tz.localize(datetime.combine(day, self._local_time)).timestamp())
+
+    def occurrences(self, start=None, end=None):
+        """
+        Yield the (start, end) of occurrences overlapping [start, end), in order.
+
+        Args:
+            start, end (int, optional): Range in POSIX seconds (default: the
+                whole series; unbounded rules never end)
+        """
+        recurrence = self.recurrence
+        offsets = self._offsets
+        period = 0
+        if start is not None:
+            # First period that can hold an occurrence still running at start;
+            # a day of margin covers zone offsets
+            earliest = date(1970, 1, 1) + timedelta(
+                days=(start - self.duration) // 86400 - 1)
+            period = max(0, (earliest - self._anchor).days // self._period_days)
+        while True:
+            base = self._anchor + timedelta(days=period * self._period_days)
+            for position, offset in enumerate(offsets):
+                if period == 0:
+                    if position < self._skipped:
+                        continue
+                    index = position - self._skipped
+                else:
+                    index = len(offsets) - self._skipped + (period - 1) * len(offsets) + position
+                if recurrence.count is not None and index >= recurrence.count:
+                    return
+                occurrence = self._start_on(base + timedelta(days=offset))
+                if recurrence.until is not None and occurrence > recurrence.until:
+                    return
+                if end is not None and occurrence >= end:
+                    return
+                if ((start is None or occurrence + self.duration > start) and
+                        occurrence not in self.exdates):
+                    yield occurrence, occurrence + self.duration
+            period += 1
+
+    def _window(self, number):
+        """Occurrences starting in window ``number``, from the cache if expanded."""
+        with self._lock:
+            occurrences = self._windows.get(number)
+            if occurrences is not None:
+                self._windows.move_to_end(number)
+                return occurrences
+        window_start = number * WINDOW_SECONDS
+        occurrences = [(start, end) for start, end in
+                       self.occurrences(window_start, window_start + WINDOW_SECONDS)
+                       if start >= window_start]
+        with self._lock:
+            self._windows[number] = occurrences
+            if len(self._windows) > self.cache_windows:
+                self._windows.popitem(last=False)
+        return occurrences
+
+    def between(self, start, end):
+        """
+        The occurrences overlapping [start, end), earliest first.
+
+        Args:
+            start, end (int): Range in POSIX seconds
+        """
+        if end <= self.start:
+            return []
+        first = max(start - self.duration, self.start) // WINDOW_SECONDS
+        result = []
+        for number in range(first, (end - 1) // WINDOW_SECONDS + 1):
+            result.extend(occurrence for occurrence in self._window(number)
+                          if occurrence[0] < end and occurrence[1] > start)
+        return result
+
+
+class RecurringCalendar:
+    """
+    Recurring busy time of many participants.
+
+    Answers the same queries as availability.AvailabilityIndex (with the
+    same buffer around every occurrence) from the participants' series.
+    """
+
+    def __init__(self, buffer_minutes=0):
+        self.buffer = int(buffer_minutes * 60)
+        self._series = {}  # participant -> [RecurringEvent]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._series)
+
+    def __contains__(self, participant):
+        return participant in self._series
+
+    def participants(self):
+        return list(self._series)
+
+    def add(self, participant, series):
+        """Add a RecurringEvent to a participant's busy time."""
+        with self._lock:
+            self._series.setdefault(participant, []).append(series)
+
+    def remove(self, participant, series):
+        """Remove a series added with ``add``; returns whether it was there."""
+        with self._lock:
+            participant_series = self._series.get(participant, [])
+            if series not in participant_series:
+                return False
+            participant_series.remove(series)
+            if not participant_series:
+                del self._series[participant]
+            return True
+
+    def series(self, participant):
+        """A participant's series."""
+        return list(self._series.get(participant, ()))
+
+    def is_free(self, participant, start, end):
+        """Whether [start, end) is clear of the participant's occurrences and buffers."""
+        return not any(series.between(start - self.buffer, end + self.buffer)
+                       for series in self._series.get(participant, ()))
+
+    def conflicts(self, participants, start, end):
+        """Return the participants who are busy during [start, end)."""
+        return [participant for participant in participants
+                if not self.is_free(participant, start, end)]
+
+    def busy_intervals(self, participant, start, end):
+        """A participant's occurrences within [start, end), merged and clipped."""
+        merged = []
+        for busy_start, busy_end in heapq.merge(
+                *(series.between(start, end) for series in self._series.get(participant, ()))):
+            if merged and busy_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], busy_end)
+            else:
+                merged.append([busy_start, busy_end])
+        return [(max(s, start), min(e, end)) for s, e in merged]
@@ -1,77 +1,299 @@
+import logging
 import os
-import joblib
-import pandas as pd
-from datetime import datetime, timedelta
-import pytz
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import smtplib
+import threading
+from datetime import datetime, time, timedelta
+import numpy as np
+from config import BOT_CONFIG, CALENDAR_CONFIG
+from compiled_models import is_export_current, load_compiled_model
+from feature_encoders import (compile_encoders, ConversationFeatureEncoder,
+                              CalendarFeatureEncoder)
+from message_parser import parse_message
+from prediction_cache import (IntentLookupTable, LRUPredictionCache, TimeSlotTable,
+                              file_signature)
+from session_store import ConversationContext, SessionStore
+from utils import stream_words
+
+logger = logging.getLogger(__name__)
+
+# Model paths in BOT_CONFIG are relative to the repository root
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def resolve_model_path(path):
+    """Resolve a configured model path independently of the working directory"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(BASE_DIR, path)
 
 
 class SchedulingBot:
-    def __init__(self):
-        # Load trained models
-        self.intent_model = joblib.load(
-            'results/best_intent_classification_model.pkl')
-        self.time_slot_model = joblib.load(
-            'results/best_time_slot_prediction_model.pkl')
-
-        # Load label encoders
-        self.conversation_encoders = joblib.load(
-            'results/conversation_label_encoders.pkl')
-        self.calendar_encoders = joblib.load(
-            'results/calendar_label_encoders.pkl')
-
-        # Initialize conversation context
-        self.context = {
-            'current_recruiter': None,
-            'current_candidate': None,
-            'proposed_time': None,
-            'meeting_type': None,
-            'duration': 60  # default duration in minutes
-        }
-
-    def process_message(self, message, speaker='Candidate'):
+    def __init__(self, model_paths=None, warm_up=False, backend=None,
+                 intent_cache=None):
+        """Initialize the bot.
+
+        Models and encoders are loaded lazily on first use from the paths in
+        ``BOT_CONFIG['model_paths']``, optionally overridden by ``model_paths``.
+        Pass ``warm_up=True`` to load everything up front instead.
+
+        With the 'numpy' backend (``BOT_CONFIG['inference_backend']`` by
+        default) models are served from their compiled ``.npz`` export when one
+        exists and was compiled from the current pickle, falling back to the
+        sklearn pickle (with a logged warning for an outdated export)
+        otherwise. Models whose path is overridden through ``model_paths`` are
+        always unpickled.
+
+        ``intent_cache`` ('table', 'lru', or False to disable) overrides
+        ``BOT_CONFIG['intent_cache']['mode']``.
+        """
+        self.model_paths = dict(BOT_CONFIG['model_paths'])
+        if model_paths:
+            self.model_paths.update(model_paths)
+        self.backend = backend or BOT_CONFIG['inference_backend']
+        self.intent_cache_config = dict(BOT_CONFIG['intent_cache'])
+        if intent_cache is not None:
+            self.intent_cache_config['mode'] = intent_cache or None
+
+        self._artifacts = {}
+        self._load_lock = threading.RLock()
+        # name -> (file signatures, whether the export matched its pickle)
+        self._export_checks = {}
+
+        # Conversation context used when no session ID is given; concurrent
+        # conversations each get their own context from the session store
+        self.context = ConversationContext()
+        self.sessions = SessionStore()
+
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self):
+        """Load all models and encoders and build the prediction tables"""
+        self.classify_intents(['warm up'])
+        self.time_slot_table
+        return self
+
+    def _lazy(self, name, factory, *args):
+        """Return a cached artifact, building it with ``factory`` on first use"""
+        artifact = self._artifacts.get(name)
+        if artifact is None:
+            with self._load_lock:
+                artifact = self._artifacts.get(name)
+                if artifact is None:
+                    artifact = factory(*args)
+                    self._artifacts[name] = artifact
+        return artifact
+
+    def model_source(self, name):
+        """Path of the file an artifact is (or will be) loaded from"""
+        compiled_path = BOT_CONFIG['compiled_model_paths'].get(name)
+        if (self.backend == 'numpy' and compiled_path and
+                self.model_paths[name] == BOT_CONFIG['model_paths'][name]):
+            compiled_path = resolve_model_path(compiled_path)
+            if os.path.exists(compiled_path) and self._export_is_current(name, compiled_path):
+                return compiled_path
+        return resolve_model_path(self.model_paths[name])
+
+    def _export_is_current(self, name, compiled_path):
+        """Whether a compiled export matches its pickle; checked again when either file changes"""
+        source_path = resolve_model_path(self.model_paths[name])
+        signatures = (file_signature(compiled_path), file_signature(source_path))
+        checked = self._export_checks.get(name)
+        if checked is not None and checked[0] == signatures:
+            return checked[1]
+        current = signatures[1] is None or is_export_current(compiled_path, source_path)
+        if not current:
+            logger.warning("%s is out of date with %s; loading the pickle instead. "
+                           "Run `python -m compiled_models` to re-export it.",
+                           compiled_path, source_path)
+        self._export_checks[name] = (signatures, current)
+        return current
+
+    def _read_model(self, name):
+        """Load a configured artifact, preferring its compiled NumPy export"""
+        path = self.model_source(name)
+        if path.endswith('.npz'):
+            return load_compiled_model(path)
+
+        # Memory-map the numpy arrays of the pickled sklearn objects
+        import joblib  # deferred: importing joblib dominates module import time
+        return joblib.load(path, mmap_mode='r')
+
+    def _load_model(self, name):
+        return self._lazy(name, self._read_model, name)
+
+    @property
+    def intent_model(self):
+        return self._load_model('intent_model')
+
+    @property
+    def time_slot_model(self):
+        return self._load_model('time_slot_model')
+
+    @property
+    def conversation_encoders(self):
+        return self._load_model('conversation_encoders')
+
+    @property
+    def calendar_encoders(self):
+        return self._load_model('calendar_encoders')
+
+    @property
+    def conversation_features(self):
+        # Encoders compiled into lookup tables with constant features precomputed
+        return self._lazy('conversation_features', self._compile_features,
+                          ConversationFeatureEncoder, 'conversation_encoders')
+
+    @property
+    def calendar_features(self):
+        return self._lazy('calendar_features', self._compile_features,
+                          CalendarFeatureEncoder, 'calendar_encoders')
+
+    def _compile_features(self, feature_encoder, encoders_name):
+        return feature_encoder(compile_encoders(self._load_model(encoders_name)))
+
+    @property
+    def time_slot_table(self):
+        """Precomputed meeting type suggestions, rebuilt when the model pickle changes"""
+        table = self._lazy('time_slot_table', self._build_time_slot_table)
+        if table.is_stale():
+            with self._load_lock:
+                if self._artifacts.get('time_slot_table') is table:
+                    self._artifacts.pop('time_slot_model', None)
+                    self._artifacts.pop('time_slot_table', None)
+            table = self._lazy('time_slot_table', self._build_time_slot_table)
+        return table
+
+    def _build_time_slot_table(self):
+        return TimeSlotTable(self.time_slot_model, self.calendar_features,
+                             BOT_CONFIG['time_slot_table']['max_duration'],
+                             resolve_model_path(self.model_paths['time_slot_model']))
+
+    @property
+    def intent_predictor(self):
+        """The intent model, wrapped in the configured prediction cache"""
+        return self._lazy('intent_predictor', self._build_intent_predictor)
+
+    def _build_intent_predictor(self):
+        mode = self.intent_cache_config['mode']
+        if mode == 'table':
+            return IntentLookupTable(self.intent_model, self.conversation_features,
+                                     self.intent_cache_config['max_text_length'])
+        if mode == 'lru':
+            return LRUPredictionCache(self.intent_model,
+                                      self.intent_cache_config['lru_size'])
+        return self.intent_model
+
+    def get_context(self, session_id=None):
+        """Return the conversation context of a session (default: the bot's own)"""
+        if session_id is None:
+            return self.context
+        return self.sessions.get(session_id)
+
+    def end_session(self, session_id):
+        """Drop the conversation context of a session"""
+        self.sessions.discard(session_id)
+
+    def process_message(self, message, speaker='Candidate', session_id=None):
         """Process incoming messages and determine intent"""
-        # Prepare features for intent classification
-        features = self._prepare_conversation_features(message, speaker)
-
         # Predict intent
-        intent_encoded = self.intent_model.predict([features])[0]
-        intent = self.conversation_encoders['Intent_Label'].inverse_transform([
-                                                                              intent_encoded])[0]
+        intent = self.classify_intents([message], [speaker])[0]
 
         # Handle intent
-        response = self._handle_intent(intent, message)
+        response = self._handle_intent(intent, message,
+                                       self.get_context(session_id))
         return response
 
+    def stream_message(self, message, speaker='Candidate', session_id=None):
+        """Process a message like ``process_message`` and return its response
+        as a generator of text chunks (see ``stream_response``).
+
+        The message is handled before this returns; only the rendering is lazy.
+        """
+        return self.stream_response(self.process_message(message, speaker, session_id))
+
+    def stream_response(self, response):
+        """Return a response as a generator of word chunks, paced by
+        ``BOT_CONFIG['response_streaming']`` (a single chunk when 'instant')"""
+        config = BOT_CONFIG['response_streaming']
+        if config['instant']:
+            return iter([response])
+        return stream_words(response, config['word_delay'], config['max_seconds'])
+
+    def process_messages(self, batch, speaker='Candidate', session_id=None):
+        """Process a batch of messages with a single model call.
+
+        Each item of ``batch`` is either a message string, a
+        ``(message, speaker)`` tuple or a ``(message, speaker, session_id)``
+        tuple. Responses are returned in order and each session's context is
+        updated exactly as if the messages had been passed to
+        ``process_message`` one after another.
+        """
+        messages = []
+        speakers = []
+        session_ids = []
+        for item in batch:
+            if isinstance(item, str):
+                item = (item,)
+            messages.append(item[0])
+            speakers.append(item[1] if len(item) > 1 else speaker)
+            session_ids.append(item[2] if len(item) > 2 else session_id)
+
+        intents = self.classify_intents(messages, speakers)
+        return [self._handle_intent(intent, message, self.get_context(sid))
+                for intent, message, sid in zip(intents, messages, session_ids)]
+
+    def classify_intents(self, messages, speakers=None, hours=None):
+        """Classify many messages at once.
+
+        Builds one feature matrix, runs a single ``predict`` and decodes the
+        labels by indexing the encoder classes.
+
+        Args:
+            messages (list): Message texts
+            speakers (list, optional): Speaker per message (default: 'Candidate')
+            hours (list, optional): Hour of day per message (default: now)
+
+        Returns:
+            numpy.ndarray: Intent label per message
+        """
+        features = self._prepare_conversation_feature_matrix(
+            messages, speakers, hours)
+        if len(features) == 0:
+            return np.empty(0, dtype=object)
+
+        intents_encoded = self.intent_predictor.predict(features)
+        return self.conversation_features.decode_intents(intents_encoded)
+
     def _prepare_conversation_features(self, message, speaker):
         """Prepare features for intent classification"""
-        # Basic feature extraction
-        hour = datetime.now().hour
-        text_length = len(message)
-        speaker_encoded = self.conversation_encoders['Speaker'].transform([speaker])[
-            0]
+        return self.conversation_features.encode(message, speaker, datetime.now().hour)
 
-        # Default values for other features
-        language_encoded = self.conversation_encoders['Language'].transform(['en'])[
-            0]
-        sentiment_encoded = self.conversation_encoders['Sentiment'].transform(['neutral'])[
-            0]
+    def _prepare_conversation_feature_matrix(self, messages, speakers=None, hours=None):
+        """Prepare the intent classification feature matrix for a batch"""
+        if speakers is None:
+            speakers = ['Candidate'] * len(messages)
+        if hours is None:
+            hours = datetime.now().hour
+        return self.conversation_features.encode_batch(messages, speakers, hours)
 
-        return [hour, text_length, speaker_encoded, language_encoded, sentiment_encoded]
-
-    def _handle_intent(self, intent, message):
+    def _handle_intent(self, intent, message, context):
         """Handle different intents and generate appropriate responses"""
         if intent == 'offer_availability':
-            # Extract time information from message
-            # For now, just store a dummy time
-            self.context['proposed_time'] = datetime.now() + timedelta(days=1)
+            entities = parse_message(message)
+            if entities['DurationMinutes']:
+                context.duration = entities['DurationMinutes']
+            if entities['Date'] is None and entities['StartTime'] is None:
+                return "Which day and time would work best for you?"
+            # A time without a day means tomorrow; a day without a time, the
+            # start of working hours
+            day = entities['Date'] or (datetime.now() + timedelta(days=1)).date()
+            start = entities['StartTime'] or time(CALENDAR_CONFIG['working_hours']['start'])
+            context.proposed_time = datetime.combine(day, start)
             return "I've noted your availability. Would you like me to schedule the meeting?"
 
         elif intent == 'schedule_meeting':
-            if self.context['proposed_time']:
-                return self._schedule_meeting()
+            if context.proposed_time:
+                return self._schedule_meeting(context)
             else:
                 return "Please let me know your preferred time first."
 
@@ -87,11 +309,11 @@ class SchedulingBot:
         else:
             return "I'm not sure how to help with that. Could you please rephrase?"
 
-    def _schedule_meeting(self):
+    def _schedule_meeting(self, context):
         """Schedule a meeting and send calendar invites"""
-        if not all([self.context['current_recruiter'],
-                   self.context['current_candidate'],
-                   self.context['proposed_time']]):
+        if not all([context.current_recruiter,
+                   context.current_candidate,
+                   context.proposed_time]):
             return "Missing required information to schedule the meeting."
 
         # Here we would:
@@ -99,41 +321,37 @@ class SchedulingBot:
         # 2. Create calendar event
         # 3. Send invites
 
-        return f"Meeting scheduled for {self.context['proposed_time'].strftime('%Y-%m-%d %H:%M')}. Calendar invites will be sent shortly."
+        return f"Meeting scheduled for {context.proposed_time.strftime('%Y-%m-%d %H:%M')}. Calendar invites will be sent shortly."
 
-    def set_participants(self, recruiter_id, candidate_id):
+    def set_participants(self, recruiter_id, candidate_id, session_id=None):
         """Set the participants for the current scheduling session"""
-        self.context['current_recruiter'] = recruiter_id
-        self.context['current_candidate'] = candidate_id
+        context = self.get_context(session_id)
+        context.current_recruiter = recruiter_id
+        context.current_candidate = candidate_id
 
-    def suggest_time_slot(self, department, duration=60):
+    def suggest_time_slot(self, department, duration=60, session_id=None):
         """Suggest a time slot based on the trained model"""
-        # Prepare features for time slot prediction
-        features = self._prepare_calendar_features(department, duration)
-
-        # Predict meeting type
-        meeting_type_encoded = self.time_slot_model.predict([features])[0]
-        meeting_type = self.calendar_encoders['Meeting_Type'].inverse_transform(
-            [meeting_type_encoded])[0]
+        # Predict meeting type from the precomputed table
+        meeting_type = self.time_slot_table.predict(department, duration)
 
-        self.context['meeting_type'] = meeting_type
-        self.context['duration'] = duration
+        context = self.get_context(session_id)
+        context.meeting_type = meeting_type
+        context.duration = duration
 
         return f"I suggest scheduling a {meeting_type} for {duration} minutes."
 
-    def _prepare_calendar_features(self, department, duration):
-        """Prepare features for time slot prediction"""
-        # Encode department
-        department_encoded = self.calendar_encoders['Department'].transform([department])[
-            0]
+    def suggest_time_slots(self, department, durations, k=3):
+        """Rank the k most likely meeting types for each duration.
 
-        # Default values for other features
-        availability_encoded = self.calendar_encoders['Availability_Status'].transform([
-                                                                                       'Available'])[0]
-        location_encoded = self.calendar_encoders['Location'].transform(['Zoom'])[
-            0]
+        Answers from the precomputed table without touching the conversation
+        context. Returns one list of (meeting_type, probability) tuples per
+        duration.
+        """
+        return self.time_slot_table.top_k(department, durations, k)
 
-        return [duration, availability_encoded, location_encoded, department_encoded]
+    def _prepare_calendar_features(self, department, duration):
+        """Prepare features for time slot prediction"""
+        return self.calendar_features.encode(department, duration)
 
 
 # Example usage
@@ -0,0 +1,121 @@
+"""
+Session Store Module
+
+This module keeps per-session conversation state apart from the model-holding
+SchedulingBot, so one read-only bot can serve many concurrent sessions.
+
+It provides:
+- A compact conversation context object
+- A session-keyed store with LRU and idle-timeout (TTL) eviction
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from config import BOT_CONFIG
+
+
+class ConversationContext:
+    """
+    Scheduling state of a single conversation.
+
+    Fields can be read as attributes or, for compatibility with the former
+    context dict, with ``context['key']`` and ``context.get('key')``.
+    """
+
+    __slots__ = ('current_recruiter', 'current_candidate', 'proposed_time',
+                 'meeting_type', 'duration')
+
+    def __init__(self):
+        self.current_recruiter = None
+        self.current_candidate = None
+        self.proposed_time = None
+        self.meeting_type = None
+        self.duration = 60  # default duration in minutes
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class SessionStore:
+    """
+    Thread-safe map of session ID to ConversationContext.
+
+    Sessions are kept in least-recently-used order. A session idle for longer
+    than ``ttl_seconds`` is dropped, and the least recently used session is
+    evicted once more than ``max_sessions`` are held.
+    """
+
+    def __init__(self, max_sessions=None, ttl_seconds=None, clock=time.monotonic):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions (int, optional): Maximum number of live sessions
+                (default: BOT_CONFIG['sessions']['max_sessions'])
+            ttl_seconds (float, optional): Idle time after which a session
+                expires (default: BOT_CONFIG['sessions']['ttl_seconds'])
+            clock (callable): Time source, in seconds
+        """
+        config = BOT_CONFIG['sessions']
+        self.max_sessions = max_sessions or config['max_sessions']
+        self.ttl_seconds = ttl_seconds or config['ttl_seconds']
+        self.clock = clock
+        self._sessions = OrderedDict()  # session_id -> (context, last_access)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            self._expire(self.clock())
+            return session_id in self._sessions
+
+    def get(self, session_id):
+        """
+        Return the context of a session, creating it if needed.
+
+        Args:
+            session_id (hashable): Session identifier
+
+        Returns:
+            ConversationContext: The session's context
+        """
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.pop(session_id, None)
+            context = entry[0] if entry else ConversationContext()
+            self._sessions[session_id] = (context, now)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return context
+
+    def discard(self, session_id):
+        """Forget a session."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _expire(self, now):
+        # Least recently used entries sit at the front, so expired ones do too
+        cutoff = now - self.ttl_seconds
+        while self._sessions:
+            session_id, (_, last_access) = next(iter(self._sessions.items()))
+            if last_access > cutoff:
+                break
+            del self._sessions[session_id]
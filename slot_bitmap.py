@@ -0,0 +1,286 @@
+"""
+Slot Bitmap Module
+
+This module stores participants' calendars as NumPy boolean bitmaps of fixed
+length slots (5 or 15 minutes) over a date range, so that availability
+questions about many participants become vectorized array operations.
+
+It provides:
+- A (participants x slots) busy bitmap built from events or calendar_dataset.csv
+- Working-hours masks per timezone and buffer dilation
+- Vectorized free/busy intersection and free-run search
+"""
+
+from datetime import datetime, timezone
+import numpy as np
+from availability import read_calendar_events
+from timezones import offset_table
+
+SECONDS_PER_DAY = 86400
+
+
+class SlotBitmap:
+    """
+    Busy bitmap of many participants over a fixed UTC date range.
+
+    Row ``i`` holds one participant; column ``j`` is the slot starting
+    ``j * slot_minutes`` minutes after midnight UTC of ``start_day``. Events are
+    rounded outwards to whole slots, so a bitmap never reports busy time as
+    free.
+    """
+
+    def __init__(self, start_day, n_days, slot_minutes=15):
+        """
+        Initialize an empty bitmap.
+
+        Args:
+            start_day (date): First UTC day covered
+            n_days (int): Number of days covered
+            slot_minutes (int): Slot length; must divide a day evenly
+        """
+        if (24 * 60) % slot_minutes:
+            raise ValueError("slot_minutes must divide 1440")
+        self.start_day = start_day
+        self.n_days = n_days
+        self.slot_minutes = slot_minutes
+        self.slot_seconds = slot_minutes * 60
+        self.slots_per_day = 24 * 60 // slot_minutes
+        self.n_slots = n_days * self.slots_per_day
+        self.origin = int(datetime(start_day.year, start_day.month, start_day.day,
+                                   tzinfo=timezone.utc).timestamp())
+        self.end = self.origin + n_days * SECONDS_PER_DAY
+
+        self.rows = {}
+        self.busy = np.zeros((0, self.n_slots), dtype=bool)
+        self._working_masks = {}
+
+    @property
+    def nbytes(self):
+        """Memory held by the bitmap in bytes"""
+        return self.busy[:len(self.rows)].nbytes
+
+    def covers(self, start, end):
+        """Whether [start, end) POSIX seconds lies inside the bitmap's range."""
+        return self.origin <= start and end <= self.end
+
+    def slot_of(self, timestamp):
+        """Index of the slot containing a POSIX timestamp."""
+        return (timestamp - self.origin) // self.slot_seconds
+
+    def slot_time(self, index):
+        """POSIX timestamp at which a slot starts."""
+        return self.origin + int(index) * self.slot_seconds
+
+    def row(self, participant):
+        """Row index of a participant, adding an empty row if needed."""
+        row = self.rows.get(participant)
+        if row is None:
+            row = self.rows[participant] = len(self.rows)
+            if row >= len(self.busy):
+                # Grow geometrically so adding participants stays amortized O(1)
+                grown = np.zeros((max(16, 2 * len(self.busy)), self.n_slots), dtype=bool)
+                grown[:len(self.busy)] = self.busy
+                self.busy = grown
+        return row
+
+    def mark_busy(self, participant, start, end):
+        """Mark [start, end) POSIX seconds busy for one participant."""
+        self.mark_busy_many([participant], [start], [end])
+
+    def mark_busy_many(self, participants, starts, ends):
+        """
+        Mark many (participant, start, end) events busy at once.
+
+        Args:
+            participants (list): Participant per event
+            starts, ends (array-like): Event bounds in POSIX seconds
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+
+        first = np.clip((starts - self.origin) // self.slot_seconds, 0, self.n_slots)
+        last = np.clip(-((self.origin - ends) // self.slot_seconds), 0, self.n_slots)
+        lengths = last - first
+        inside = np.flatnonzero(lengths > 0)
+        if not len(inside):
+            return
+        # Only participants with events in range get a row
+        rows = np.fromiter((self.row(participants[i]) for i in inside.tolist()),
+                           dtype=np.int64, count=len(inside))
+        first, lengths = first[inside], lengths[inside]
+
+        # Expand every event into its slot columns without a Python loop
+        event_rows = np.repeat(rows, lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.busy[event_rows, np.repeat(first, lengths) + offsets] = True
+
+    @classmethod
+    def from_events(cls, events, start_day, n_days, slot_minutes=15):
+        """Build a bitmap from (participant, start, end) POSIX-second events."""
+        bitmap = cls(start_day, n_days, slot_minutes)
+        events = list(events)
+        if events:
+            participants, starts, ends = zip(*events)
+            bitmap.mark_busy_many(participants, starts, ends)
+        return bitmap
+
+    @classmethod
+    def from_csv(cls, path, busy_statuses, start_day, n_days, slot_minutes=15):
+        """Build a bitmap from a calendar_dataset.csv style file."""
+        return cls.from_events(read_calendar_events(path, busy_statuses),
+                               start_day, n_days, slot_minutes)
+
+    def rows_of(self, participants):
+        """Row indices of known participants (unknown ones have no events)."""
+        return [self.rows[p] for p in participants if p in self.rows]
+
+    def combined_busy(self, participants):
+        """Slots in which any of the participants is busy."""
+        rows = self.rows_of(participants)
+        if not rows:
+            return np.zeros(self.n_slots, dtype=bool)
+        return self.busy[rows].any(axis=0)
+
+    def dilate(self, busy, buffer_minutes):
+        """
+        Extend busy slots by the buffer on both sides.
+
+        Works on a 1-D timeline or on a 2-D (participants x slots) array.
+        """
+        width = -(-int(buffer_minutes) // self.slot_minutes)
+        if width <= 0:
+            return busy
+        # A slot is busy if any slot within `width` of it is busy
+        counts = np.cumsum(busy, axis=-1, dtype=np.int32)
+        counts = np.concatenate([np.zeros(busy.shape[:-1] + (1,), dtype=np.int32), counts],
+                                axis=-1)
+        n = busy.shape[-1]
+        index = np.arange(n)
+        upper = np.minimum(index + width + 1, n)
+        lower = np.maximum(index - width, 0)
+        return (counts[..., upper] - counts[..., lower]) > 0
+
+    def working_mask(self, tz_name, working_hours):
+        """
+        Slots that fall entirely inside working hours on weekdays.
+
+        Args:
+            tz_name (str): Timezone name used for local working hours
+            working_hours (dict): {'start': hour, 'end': hour}
+
+        Returns:
+            numpy.ndarray: Boolean mask over the bitmap's slots
+        """
+        key = (tz_name, working_hours['start'], working_hours['end'])
+        mask = self._working_masks.get(key)
+        if mask is None:
+            times = self.origin + np.arange(self.n_slots, dtype=np.int64) * self.slot_seconds
+            local = times + self._utc_offsets(tz_name, times)
+            minute = (local // 60) % (24 * 60)
+            weekday = (local // SECONDS_PER_DAY + 3) % 7  # 1970-01-01 was a Thursday
+            mask = ((weekday < 5) &
+                    (minute >= working_hours['start'] * 60) &
+                    (minute + self.slot_minutes <= working_hours['end'] * 60))
+            self._working_masks[key] = mask
+        return mask
+
+    def _utc_offsets(self, tz_name, times):
+        """UTC offset in seconds at each timestamp, from the zone's transition table."""
+        table = offset_table(tz_name, self.origin, self.end)
+        index = np.searchsorted(np.asarray(table.times), times, side='right') - 1
+        return np.asarray(table.offsets, dtype=np.int64)[np.maximum(index, 0)]
+
+    def free_mask(self, participants, tz_name, working_hours, buffer_minutes=0, held=()):
+        """
+        Slots in working hours where all participants are clear of events and buffers.
+
+        ``held`` are further (start, end) POSIX-second intervals, such as slot
+        holds, that count as busy for everyone.
+        """
+        busy = self.combined_busy(participants)
+        for start, end in held:
+            busy[max(self.slot_of(start), 0):
+                 max(-((self.origin - end) // self.slot_seconds), 0)] = True
+        busy = self.dilate(busy, buffer_minutes)
+        return self.working_mask(tz_name, working_hours) & ~busy
+
+    def free_participants(self, participants, start, end, buffer_minutes=0):
+        """
+        Vectorized availability of many participants for one slot.
+
+        Returns:
+            numpy.ndarray: Boolean per participant, True if they are free
+        """
+        width = -(-int(buffer_minutes) // self.slot_minutes)
+        first = max(self.slot_of(start) - width, 0)
+        last = min(-((self.origin - end) // self.slot_seconds) + width, self.n_slots)
+        free = np.ones(len(participants), dtype=bool)
+        known = [i for i, p in enumerate(participants) if p in self.rows]
+        if known:
+            rows = [self.rows[participants[i]] for i in known]
+            free[known] = ~self.busy[rows, first:last].any(axis=1)
+        return free
+
+    def is_free(self, participants, start, end, buffer_minutes=0):
+        """Whether all participants are free during [start, end)."""
+        return bool(self.free_participants(participants, start, end, buffer_minutes).all())
+
+    def slots_for(self, minutes):
+        """Number of slots needed to hold ``minutes``."""
+        return -(-int(minutes) // self.slot_minutes)
+
+    @staticmethod
+    def run_starts(free, n):
+        """
+        Slots at which a run of ``n`` free slots starts.
+
+        Works on a 1-D timeline or on a 2-D (participants x slots) array;
+        the result has the same shape as ``free``.
+        """
+        counts = np.cumsum(free, axis=-1, dtype=np.int32)
+        counts = np.concatenate([np.zeros(free.shape[:-1] + (1,), dtype=np.int32), counts],
+                                axis=-1)
+        fits = np.zeros(free.shape, dtype=bool)
+        if n <= free.shape[-1]:
+            fits[..., :free.shape[-1] - n + 1] = (counts[..., n:] - counts[..., :-n]) == n
+        return fits
+
+    def find_slots(self, free, duration_minutes, earliest, count=1, step_minutes=None,
+                   align_to=None):
+        """
+        Find the first non-overlapping runs of free slots.
+
+        Args:
+            free (numpy.ndarray): Boolean free mask over the bitmap's slots
+            duration_minutes (int): Meeting length
+            earliest (int): Earliest start in POSIX seconds
+            count (int): Maximum number of slots
+            step_minutes (int, optional): Starts are a multiple of this many
+                minutes after ``align_to`` (default: the slot length)
+            align_to (int, optional): POSIX timestamp that aligned starts are
+                counted from, e.g. the start of a working day (default: the
+                bitmap's origin)
+
+        Returns:
+            list: Start times in POSIX seconds
+        """
+        n = self.slots_for(duration_minutes)
+        fits = self.run_starts(free, n)
+
+        index = np.arange(len(fits))
+        fits &= (self.origin + index * self.slot_seconds) >= earliest
+        step = (step_minutes or self.slot_minutes) // self.slot_minutes
+        if step > 1:
+            shift = 0 if align_to is None else self.slot_of(align_to)
+            fits &= ((index - shift) % step) == 0
+
+        slots = []
+        next_allowed = 0
+        for i in np.flatnonzero(fits):
+            if i < next_allowed:
+                continue
+            slots.append(self.slot_time(i))
+            if len(slots) == count:
+                break
+            next_allowed = i + n
+        return slots
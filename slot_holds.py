@@ -0,0 +1,136 @@
+"""
+Slot Holds Module
+
+This module reserves offered meeting slots for a short time, so that two
+sessions offered the same recruiter slot cannot both book it.
+
+It provides:
+- Tentative holds on a slot for a set of participants, expiring after a TTL
+- Expiry driven by a heap of deadlines, so only expired holds are touched
+- Per-participant lookup of the holds that overlap a time range
+"""
+
+import heapq
+import time
+import uuid
+from collections import namedtuple
+
+SlotHold = namedtuple('SlotHold', ['hold_id', 'participants', 'start', 'end',
+                                   'session_id', 'expires'])
+SlotHold.__doc__ = """A held slot; times are POSIX seconds, ``expires`` on the table's clock."""
+
+
+class HoldTable:
+    """
+    Active slot holds.
+
+    Expired holds are dropped lazily: every operation first pops the
+    deadlines that have passed off a heap. Released holds leave their heap
+    entry behind, which is skipped when it comes up.
+
+    The table does not lock; CalendarManager serializes access to it together
+    with the bookings it guards.
+    """
+
+    def __init__(self, ttl_seconds, clock=time.monotonic):
+        """
+        Initialize an empty table.
+
+        Args:
+            ttl_seconds (float): Default lifetime of a hold
+            clock (callable): Time source for expiry, in seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._holds = {}            # hold_id -> SlotHold
+        self._by_participant = {}   # participant -> {hold_id: SlotHold}
+        self._by_session = {}       # session_id -> {hold_id}
+        self._deadlines = []        # heap of (expires, hold_id)
+
+    def __len__(self):
+        self.expire()
+        return len(self._holds)
+
+    def expire(self):
+        """Drop every hold whose deadline has passed."""
+        now = self.clock()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, hold_id = heapq.heappop(deadlines)
+            hold = self._holds.get(hold_id)
+            if hold is not None and hold.expires <= now:
+                self._remove(hold)
+
+    def get(self, hold_id):
+        """The live hold with this ID, or None if it expired or was released."""
+        self.expire()
+        return self._holds.get(hold_id)
+
+    def conflicts(self, participants, start, end, session_id=None):
+        """
+        Participants with a live hold overlapping [start, end).
+
+        Holds placed by ``session_id`` itself do not count.
+        """
+        self.expire()
+        conflicts = []
+        for participant in participants:
+            for hold in self._by_participant.get(participant, {}).values():
+                if (hold.start < end and hold.end > start and
+                        (session_id is None or hold.session_id != session_id)):
+                    conflicts.append(participant)
+                    break
+        return conflicts
+
+    def holds_for(self, participants, session_id=None):
+        """Live holds involving any of the participants, except ``session_id``'s."""
+        self.expire()
+        holds = {}
+        for participant in participants:
+            for hold in self._by_participant.get(participant, {}).values():
+                if session_id is None or hold.session_id != session_id:
+                    holds[hold.hold_id] = hold
+        return list(holds.values())
+
+    def add(self, participants, start, end, session_id=None, ttl_seconds=None):
+        """
+        Place a hold without checking for conflicts.
+
+        Returns:
+            SlotHold: The new hold
+        """
+        expires = self.clock() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        hold = SlotHold(uuid.uuid4().hex, tuple(participants), start, end,
+                        session_id, expires)
+        self._holds[hold.hold_id] = hold
+        for participant in hold.participants:
+            self._by_participant.setdefault(participant, {})[hold.hold_id] = hold
+        self._by_session.setdefault(session_id, set()).add(hold.hold_id)
+        heapq.heappush(self._deadlines, (expires, hold.hold_id))
+        return hold
+
+    def release(self, hold_id):
+        """Drop a hold; returns it, or None if it was not live."""
+        hold = self._holds.get(hold_id)
+        if hold is not None:
+            self._remove(hold)
+        return hold
+
+    def release_session(self, session_id):
+        """Drop every hold placed by a session; returns how many there were."""
+        held = list(self._by_session.get(session_id, ()))
+        for hold_id in held:
+            self._remove(self._holds[hold_id])
+        return len(held)
+
+    def _remove(self, hold):
+        del self._holds[hold.hold_id]
+        for participant in hold.participants:
+            holds = self._by_participant[participant]
+            del holds[hold.hold_id]
+            if not holds:
+                del self._by_participant[participant]
+        session_holds = self._by_session[hold.session_id]
+        session_holds.discard(hold.hold_id)
+        if not session_holds:
+            del self._by_session[hold.session_id]
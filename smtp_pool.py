@@ -0,0 +1,225 @@
+"""
+SMTP Connection Pool Module
+
+This module keeps authenticated SMTP sessions open between calendar invites,
+so that sending an invite costs one message exchange instead of a new
+connection, STARTTLS handshake and login each time.
+
+It provides:
+- A thread-safe pool of logged-in SMTP connections with a size limit
+- NOOP health checks on connections that have been idle, and reconnects
+  when the server has dropped a session
+- Sending many messages over a single session
+"""
+
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from config import EMAIL_CONFIG
+
+
+def session_dropped(error):
+    """
+    Whether an exception means the SMTP session is gone: the server
+    disconnected or the socket failed. SMTPException derives from OSError,
+    so other SMTP errors (refused recipients, error replies) are told apart.
+    """
+    return (isinstance(error, smtplib.SMTPServerDisconnected) or
+            (isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)))
+
+
+class SMTPConnectionPool:
+    """
+    Pool of reusable, authenticated SMTP connections.
+
+    Connections are created on demand up to ``pool_size`` and returned to the
+    pool after use. A connection idle for longer than ``keepalive_seconds`` is
+    checked with NOOP before it is handed out, and one idle for longer than
+    ``max_idle_seconds`` is closed instead of reused.
+    """
+
+    def __init__(self, host=None, port=None, username=None, password=None,
+                 pool_size=None, keepalive_seconds=None, max_idle_seconds=None,
+                 starttls=None, timeout=30, smtp_class=smtplib.SMTP, clock=time.monotonic):
+        """
+        Initialize the pool. Defaults come from EMAIL_CONFIG.
+
+        Args:
+            host (str, optional): SMTP server
+            port (int, optional): SMTP port
+            username (str, optional): Login name; no login when empty
+            password (str, optional): Login password
+            pool_size (int, optional): Maximum number of open connections
+            keepalive_seconds (float, optional): Idle time after which a
+                connection is checked with NOOP before reuse
+            max_idle_seconds (float, optional): Idle time after which a
+                connection is closed instead of reused
+            starttls (bool, optional): Whether to upgrade connections with STARTTLS
+            timeout (float): Socket timeout in seconds
+            smtp_class (type): SMTP client class
+            clock (callable): Time source, in seconds
+        """
+        self.host = host or EMAIL_CONFIG['smtp_server']
+        self.port = port or EMAIL_CONFIG['smtp_port']
+        self.username = EMAIL_CONFIG['email'] if username is None else username
+        self.password = EMAIL_CONFIG['password'] if password is None else password
+        self.pool_size = pool_size or EMAIL_CONFIG.get('pool_size', 2)
+        self.keepalive_seconds = (EMAIL_CONFIG.get('keepalive_seconds', 30)
+                                  if keepalive_seconds is None else keepalive_seconds)
+        self.max_idle_seconds = (EMAIL_CONFIG.get('max_idle_seconds', 300)
+                                 if max_idle_seconds is None else max_idle_seconds)
+        self.starttls = EMAIL_CONFIG.get('starttls', True) if starttls is None else starttls
+        self.timeout = timeout
+        self.smtp_class = smtp_class
+        self.clock = clock
+
+        self._idle = []  # (connection, last_used), most recently used last
+        self._open = 0
+        self._available = threading.Condition()
+        self.connections_opened = 0
+
+    def _connect(self):
+        """Open, secure and log in a new connection."""
+        server = self.smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        self.connections_opened += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @staticmethod
+    def _is_alive(server):
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _acquire(self):
+        with self._available:
+            while True:
+                if self._idle:
+                    server, last_used = self._idle.pop()
+                    break
+                if self._open < self.pool_size:
+                    self._open += 1
+                    server = None
+                    break
+                self._available.wait()
+
+        if server is not None:
+            idle = self.clock() - last_used
+            if idle <= self.keepalive_seconds or (idle <= self.max_idle_seconds and
+                                                  self._is_alive(server)):
+                return server
+            self._close(server)
+
+        try:
+            return self._connect()
+        except Exception:
+            self._release(None)
+            raise
+
+    def _release(self, server):
+        with self._available:
+            if server is None:
+                self._open -= 1
+            else:
+                self._idle.append((server, self.clock()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a ``with`` block.
+
+        A connection whose session was dropped (SMTPServerDisconnected or a
+        socket error) is closed rather than returned to the pool; after other
+        errors, such as a refused recipient, the session is still usable.
+        """
+        server = self._acquire()
+        try:
+            yield server
+        except BaseException as e:
+            if session_dropped(e):
+                self._close(server)
+                self._release(None)
+            else:
+                self._release(server)
+            raise
+        self._release(server)
+
+    def send(self, message):
+        """
+        Send one email.Message, reconnecting once if the session was dropped.
+
+        Raises:
+            smtplib.SMTPException: If the message could not be sent
+        """
+        return self.send_many([message], raise_errors=True)[0]
+
+    def send_many(self, messages, raise_errors=False):
+        """
+        Send several messages over one session.
+
+        If the server drops the session part way through, the remaining
+        messages are retried once on a fresh connection.
+
+        Args:
+            messages (list): email.Message objects
+            raise_errors (bool): Raise the first failure instead of recording it
+
+        Returns:
+            list: Per message, True if it was sent or the exception that
+                stopped it
+        """
+        results = [None] * len(messages)
+        pending = list(range(len(messages)))
+        for attempt in range(2):
+            try:
+                with self.connection() as server:
+                    while pending:
+                        i = pending[0]
+                        try:
+                            server.send_message(messages[i])
+                            results[i] = True
+                        except smtplib.SMTPServerDisconnected:
+                            raise
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                                smtplib.SMTPDataError) as e:
+                            # The message was refused; the session is still usable
+                            if raise_errors:
+                                raise
+                            results[i] = e
+                        pending.pop(0)
+            except (smtplib.SMTPException, OSError) as e:
+                # Only a dropped session is worth one more try
+                if attempt == 0 and session_dropped(e) and pending:
+                    continue
+                if raise_errors:
+                    raise
+                for i in pending:
+                    results[i] = e
+            break
+        return results
+
+    def close(self):
+        """Close all idle connections."""
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._available.notify_all()
+        for server, _ in idle:
+            self._close(server)
@@ -7,13 +7,19 @@ scheduling bot for natural language processing and scheduling logic.
 """
 
 import streamlit as st
-import time
 from datetime import datetime, timedelta
 import pytz
-import re
+import os
+import uuid
 from scheduling_bot import SchedulingBot
 from calendar_utils import CalendarManager
-from utils import generate_meet_link
+from chat_history import ChatHistory
+from event_store import EventStore
+from config import CHAT_CONFIG
+from invite_queue import InviteDispatcher
+from message_parser import parse_date_time
+from timer_service import MeetingReminders, TimerService
+from utils import generate_meet_link, stream_words
 
 # Configure the page - this must be the first Streamlit command
 st.set_page_config(
@@ -261,90 +267,6 @@ st.markdown("""
 # Function to generate a random Google Meet link
 
 
-def parse_date_time(message):
-    """Parse date and time from user message"""
-    message = message.lower()
-    current_date = datetime.now()
-
-    # Initialize date and time
-    target_date = None
-    target_time = None
-
-    # Check for specific days
-    if "today" in message:
-        target_date = current_date.date()
-    elif "tomorrow" in message:
-        target_date = (current_date + timedelta(days=1)).date()
-    else:
-        # Check for days of the week
-        days = {
-            'monday': 0, 'tuesday': 1, 'wednesday': 2,
-            'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6
-        }
-        for day, day_num in days.items():
-            if day in message:
-                # Calculate days until next occurrence of this day
-                current_day = current_date.weekday()
-                days_ahead = day_num - current_day
-                if days_ahead <= 0:  # If the day has passed this week
-                    days_ahead += 7
-                target_date = (
-                    current_date + timedelta(days=days_ahead)).date()
-                break
-
-        # Check for specific date (format: DD/MM, DD-MM, DD.MM)
-        date_patterns = [
-            r'(\d{1,2})[/.-](\d{1,2})',  # DD/MM or D/M
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, message)
-            if match:
-                day, month = map(int, match.groups())
-                year = current_date.year
-                try:
-                    target_date = datetime(year, month, day).date()
-                    # If the date is in the past, assume next year
-                    if target_date < current_date.date():
-                        target_date = datetime(year + 1, month, day).date()
-                    break
-                except ValueError:
-                    continue
-
-    # Parse time
-    # Look for HH:MM format
-    time_pattern = r'(\d{1,2}):(\d{2})'
-    time_matches = re.findall(time_pattern, message)
-
-    # Look for simple hour mentions with AM/PM
-    hour_pattern = r'(\d{1,2})\s*(am|pm)'
-    hour_matches = re.findall(hour_pattern, message)
-
-    if time_matches:
-        # Use HH:MM format
-        hour, minute = map(int, time_matches[0])
-        if "pm" in message.lower() and hour < 12:
-            hour += 12
-        elif "am" in message.lower() and hour == 12:
-            hour = 0
-        try:
-            target_time = datetime.strptime(f"{hour}:{minute}", "%H:%M").time()
-        except ValueError:
-            pass
-    elif hour_matches:
-        # Use simple hour format
-        hour = int(hour_matches[0][0])
-        meridian = hour_matches[0][1].lower()
-        if meridian == "pm" and hour < 12:
-            hour += 12
-        elif meridian == "am" and hour == 12:
-            hour = 0
-        try:
-            target_time = datetime.strptime(f"{hour}:00", "%H:%M").time()
-        except ValueError:
-            pass
-
-    return target_date, target_time
-
 # Initialize the scheduling bot and calendar manager
 
 
@@ -355,12 +277,37 @@ def load_bot():
 
 @st.cache_resource
 def load_calendar_manager():
-    return CalendarManager()
+    # Booked meetings are kept in the event store and survive restarts
+    return CalendarManager(event_store=EventStore())
+
+
+@st.cache_resource
+def load_invite_dispatcher(_calendar_manager):
+    # Invites are delivered by background workers so confirming never waits on SMTP
+    dispatcher = InviteDispatcher(_calendar_manager)
+    dispatcher.start()
+    return dispatcher
+
+
+@st.cache_resource
+def load_reminders(_invite_dispatcher):
+    # One timer thread sends every booked meeting's reminders and follow-ups
+    timers = TimerService()
+    reminders = MeetingReminders(timers, _invite_dispatcher)
+    timers.start()
+    return reminders
 
 
 # Initialize session state variables if they don't exist
-if 'messages' not in st.session_state:
-    st.session_state.messages = []
+if 'session_id' not in st.session_state:
+    # Keys this browser session's conversation context in the shared bot
+    st.session_state.session_id = uuid.uuid4().hex
+
+if 'history' not in st.session_state:
+    # Recent turns stay in memory, older ones are spilled to disk
+    st.session_state.history = ChatHistory(os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), CHAT_CONFIG['spill_dir'],
+        f"{st.session_state.session_id}.jsonl"))
 
 if 'scheduled' not in st.session_state:
     st.session_state.scheduled = False
@@ -389,9 +336,18 @@ if 'selected_date' not in st.session_state:
 if 'selected_time' not in st.session_state:
     st.session_state.selected_time = None
 
+if 'invite_job' not in st.session_state:
+    st.session_state.invite_job = None
+
+if 'hold_id' not in st.session_state:
+    # Hold on the slot offered at the confirm_schedule step
+    st.session_state.hold_id = None
+
 # Load the bot and calendar manager
 bot = load_bot()
 calendar_manager = load_calendar_manager()
+invite_dispatcher = load_invite_dispatcher(calendar_manager)
+reminders = load_reminders(invite_dispatcher)
 
 # Main app interface
 st.title("AI Interview Scheduler 🤖")
@@ -410,7 +366,8 @@ with st.sidebar:
     if recruiter_email and candidate_email:
         st.session_state.recruiter_email = recruiter_email
         st.session_state.candidate_email = candidate_email
-        bot.set_participants(recruiter_email, candidate_email)
+        bot.set_participants(recruiter_email, candidate_email,
+                             session_id=st.session_state.session_id)
 
     # Department selection
     st.subheader("Department")
@@ -422,9 +379,24 @@ with st.sidebar:
     )
     st.session_state.department = department
 
+    # Served from the bot's precomputed suggestion table
+    suggested_types = bot.suggest_time_slots(department, [60], k=3)[0]
+    st.caption("Suggested meeting types: " + ", ".join(
+        f"{meeting_type} ({probability:.0%})" for meeting_type, probability in suggested_types))
+
+    # Delivery status of the last confirmed interview's invites
+    if st.session_state.invite_job:
+        job = invite_dispatcher.status(st.session_state.invite_job)
+        if job:
+            st.caption(f"Calendar invite: {job['status']}" +
+                       (f" (attempt {job['attempts']})" if job['status'] == 'queued' and job['attempts'] else ""))
+
     # Reset button
     if st.button("Reset Conversation"):
-        st.session_state.messages = []
+        bot.end_session(st.session_state.session_id)
+        calendar_manager.release_session_holds(st.session_state.session_id)
+        st.session_state.invite_job = None
+        st.session_state.history.clear()
         st.session_state.scheduled = False
         st.session_state.meeting_info = None
         st.session_state.step = 'greeting'
@@ -433,108 +405,107 @@ with st.sidebar:
         st.session_state.selected_time = None
         st.rerun()
 
-# Display chat messages
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.write(message["content"])
-
-# Initialize the chat with a greeting if it's the first interaction
-if len(st.session_state.messages) == 0:
-    with st.chat_message("assistant"):
-        st.write(
-            "👋 Hello! I'm your Interview Scheduling Assistant. How can I help you today?")
-
-    st.session_state.messages.append(
-        {"role": "assistant", "content": "👋 Hello! I'm your Interview Scheduling Assistant. How can I help you today?"})
-
-# Handle user input
-if user_input := st.chat_input("Type your message here..."):
-    # Display user message
-    with st.chat_message("user"):
-        st.write(user_input)
-
-    st.session_state.messages.append({"role": "user", "content": user_input})
-
-    # Process the message with the bot
-    with st.chat_message("assistant"):
-        response_placeholder = st.empty()
-
-        # Check if emails are set
-        if not st.session_state.recruiter_email or not st.session_state.candidate_email:
-            response = "⚠️ Please enter both recruiter and candidate email addresses in the sidebar first."
-            response_placeholder.write(response)
-            st.session_state.messages.append(
-                {"role": "assistant", "content": response})
-            st.stop()
-
-        # Process the conversation step by step
-        if "schedule" in user_input.lower() or "interview" in user_input.lower() or "meeting" in user_input.lower():
-            if st.session_state.step == 'greeting':
-                response = """I'll help you schedule an interview. Please let me know your preferred day and time within the next week.
-                
+GREETING = "👋 Hello! I'm your Interview Scheduling Assistant. How can I help you today?"
+
+
+def cancel_scheduled_meeting():
+    """Free the scheduled meeting's slot and stop its invite and reminders."""
+    meeting_info = st.session_state.meeting_info
+    calendar_manager.cancel_booking(
+        [meeting_info['recruiter_email'], meeting_info['candidate_email']],
+        meeting_info['start_time'], meeting_info['end_time'])
+    reminders.cancel_meeting(CalendarManager.invite_uid(meeting_info))
+    if st.session_state.invite_job:
+        invite_dispatcher.cancel(st.session_state.invite_job)
+        st.session_state.invite_job = None
+
+
+def respond(user_input):
+    """Reply to a chat message, advancing the scheduling steps."""
+    # Process the conversation step by step
+    if "schedule" in user_input.lower() or "interview" in user_input.lower() or "meeting" in user_input.lower():
+        if st.session_state.step == 'greeting':
+            response = """I'll help you schedule an interview. Please let me know your preferred day and time within the next week.
+            
 You can specify:
 - A specific day (e.g., "Monday at 2 PM")
 - Relative day (e.g., "tomorrow at 3:30 PM")
 - Today with time (e.g., "today at 4 PM")
 - A specific date (e.g., "25/03 at 2:30 PM")"""
-                st.session_state.step = 'collect_availability'
-            else:
-                response = bot.process_message(user_input)
-
+            st.session_state.step = 'collect_availability'
         else:
-            # Try to parse date and time from the message
-            target_date, target_time = parse_date_time(user_input)
-
-            if st.session_state.step == 'collect_availability':
-                if target_date and target_time:
-                    # Both date and time provided
-                    meeting_datetime = datetime.combine(
-                        target_date, target_time)
-                    if meeting_datetime < datetime.now():
-                        response = "⚠️ The specified time is in the past. Please provide a future date and time."
+            response = bot.process_message(
+                user_input, session_id=st.session_state.session_id)
+
+    else:
+        # Try to parse date and time from the message
+        target_date, target_time = parse_date_time(user_input)
+
+        if st.session_state.step == 'collect_availability':
+            if target_date and target_time:
+                # Both date and time provided
+                meeting_datetime = datetime.combine(
+                    target_date, target_time)
+                if meeting_datetime < datetime.now():
+                    response = "⚠️ The specified time is in the past. Please provide a future date and time."
+                else:
+                    meeting_start = meeting_datetime.replace(tzinfo=pytz.UTC)
+                    meeting_suggestion = bot.suggest_time_slot(
+                        department=st.session_state.department,
+                        session_id=st.session_state.session_id)
+                    duration = bot.get_context(
+                        st.session_state.session_id).get('duration', 60)
+                    # Keep the offered slot for this session until it is confirmed
+                    calendar_manager.release_session_holds(st.session_state.session_id)
+                    hold = calendar_manager.hold_slot(
+                        [st.session_state.recruiter_email, st.session_state.candidate_email],
+                        meeting_start, meeting_start + timedelta(minutes=duration),
+                        st.session_state.session_id)
+                    if hold is None:
+                        response = "⚠️ That time is already taken. Please suggest another day or time."
                     else:
-                        st.session_state.available_time = meeting_datetime.replace(
-                            tzinfo=pytz.UTC)
-                        meeting_suggestion = bot.suggest_time_slot(
-                            department=st.session_state.department)
+                        st.session_state.available_time = meeting_start
+                        st.session_state.hold_id = hold.hold_id
                         response = f"Thanks! I see you're available on {target_date.strftime('%A, %B %d')} at {target_time.strftime('%I:%M %p')}. {meeting_suggestion} Would you like me to schedule this now?"
                         st.session_state.step = 'confirm_schedule'
-                elif target_date:
-                    # Only date provided, ask for time
-                    st.session_state.selected_date = target_date
-                    response = f"I see you're interested in {target_date.strftime('%A, %B %d')}. What time would work best for you?"
-                elif target_time:
-                    # Only time provided, ask for date
-                    st.session_state.selected_time = target_time
-                    response = f"I see you prefer {target_time.strftime('%I:%M %p')}. Which day would you like to schedule this for?"
-                else:
-                    # Handle other responses during availability collection
-                    response = "I didn't catch a specific day or time. Could you please specify when you'd like to schedule the interview? For example, 'tomorrow at 2 PM' or 'Monday at 3:30 PM'."
-
-            elif "yes" in user_input.lower() or "confirm" in user_input.lower() or "schedule" in user_input.lower():
-                if st.session_state.step == 'confirm_schedule' and st.session_state.available_time:
-                    # Schedule the meeting
-                    with st.spinner("Scheduling your interview..."):
-                        # Generate Google Meet link
-                        meet_link = generate_meet_link()
-
-                        # Extract meeting type from bot context
-                        meeting_type = bot.context.get(
-                            'meeting_type', 'Technical Interview')
-                        duration = bot.context.get('duration', 60)
-
-                        # Create meeting info
-                        meeting_start = st.session_state.available_time
-                        meeting_end = meeting_start + \
-                            timedelta(minutes=duration)
-
-                        meeting_info = {
-                            'title': f'{meeting_type} - {st.session_state.department} Position',
-                            'start_time': meeting_start,
-                            'end_time': meeting_end,
-                            'timezone': 'UTC',
-                            'location': meet_link,
-                            'description': f'''{meeting_type} for {st.session_state.department} Position
+            elif target_date:
+                # Only date provided, ask for time
+                st.session_state.selected_date = target_date
+                response = f"I see you're interested in {target_date.strftime('%A, %B %d')}. What time would work best for you?"
+            elif target_time:
+                # Only time provided, ask for date
+                st.session_state.selected_time = target_time
+                response = f"I see you prefer {target_time.strftime('%I:%M %p')}. Which day would you like to schedule this for?"
+            else:
+                # Handle other responses during availability collection
+                response = "I didn't catch a specific day or time. Could you please specify when you'd like to schedule the interview? For example, 'tomorrow at 2 PM' or 'Monday at 3:30 PM'."
+
+        elif "yes" in user_input.lower() or "confirm" in user_input.lower() or "schedule" in user_input.lower():
+            if st.session_state.step == 'confirm_schedule' and st.session_state.available_time:
+                # Schedule the meeting
+                with st.spinner("Scheduling your interview..."):
+                    # Generate Google Meet link
+                    meet_link = generate_meet_link()
+
+                    # Extract meeting type from bot context
+                    context = bot.get_context(
+                        st.session_state.session_id)
+                    meeting_type = context.get(
+                        'meeting_type', 'Technical Interview')
+                    duration = context.get('duration', 60)
+
+                    # Create meeting info
+                    meeting_start = st.session_state.available_time
+                    meeting_end = meeting_start + \
+                        timedelta(minutes=duration)
+
+                    meeting_info = {
+                        'title': f'{meeting_type} - {st.session_state.department} Position',
+                        'start_time': meeting_start,
+                        'end_time': meeting_end,
+                        'timezone': 'UTC',
+                        'location': meet_link,
+                        'description': f'''{meeting_type} for {st.session_state.department} Position
 
 Meeting Link: {meet_link}
 
@@ -547,21 +518,36 @@ Please prepare to discuss your experience and relevant skills.
 Join the meeting using the Google Meet link above.
 
 Note: If you have any issues joining the meeting, please contact the recruiter.''',
-                            'meeting_type': meeting_type,
-                            'recruiter_email': st.session_state.recruiter_email,
-                            'candidate_email': st.session_state.candidate_email
-                        }
-
-                        # Store meeting info in session state
-                        st.session_state.meeting_info = meeting_info
-
-                        # Send calendar invite
-                        success = calendar_manager.send_calendar_invite(
+                        'meeting_type': meeting_type,
+                        'recruiter_email': st.session_state.recruiter_email,
+                        'candidate_email': st.session_state.candidate_email
+                    }
+
+                    # Store meeting info in session state
+                    st.session_state.meeting_info = meeting_info
+
+                    # Book the held slot; if the hold lapsed, book it if it is still free
+                    participants = [st.session_state.recruiter_email,
+                                    st.session_state.candidate_email]
+                    hold_id = st.session_state.hold_id
+                    st.session_state.hold_id = None
+                    conflicts = [] if hold_id and calendar_manager.confirm_hold(
+                        hold_id, participants, meeting_start, meeting_end,
+                        st.session_state.session_id) else \
+                        calendar_manager.book_slot(participants, meeting_start, meeting_end,
+                                                   st.session_state.session_id)
+
+                    if conflicts:
+                        st.session_state.meeting_info = None
+                        st.session_state.available_time = None
+                        st.session_state.step = 'collect_availability'
+                        response = f"⚠️ {', '.join(conflicts)} already has a meeting around that time. Please suggest another day or time."
+                    else:
+                        st.session_state.invite_job = invite_dispatcher.enqueue(
                             meeting_info)
-
-                        if success:
-                            st.session_state.scheduled = True
-                            response = f"""✅ Interview scheduled successfully!
+                        reminders.schedule_meeting(meeting_info)
+                        st.session_state.scheduled = True
+                        response = f"""✅ Interview scheduled successfully!
 
 **Meeting Details:**
 - **Type:** {meeting_type}
@@ -570,22 +556,24 @@ Note: If you have any issues joining the meeting, please contact the recruiter.'
 - **Participants:** {st.session_state.recruiter_email}, {st.session_state.candidate_email}
 - **Meeting Link:** {meet_link}
 
-Calendar invites have been sent to both participants. Looking forward to the interview!"""
-                            st.session_state.step = 'completed'
-                        else:
-                            response = "⚠️ There was an issue sending the calendar invite. Please check the email configuration and try again."
-                else:
-                    response = bot.process_message(user_input)
-
-            elif "reschedule" in user_input.lower() or "change" in user_input.lower():
-                # Reset the scheduling process
-                st.session_state.scheduled = False
-                st.session_state.meeting_info = None
-                st.session_state.available_time = None
-                st.session_state.selected_date = None
-                st.session_state.selected_time = None
-                st.session_state.step = 'collect_availability'
-                response = """I understand you want to reschedule. Please let me know your new preferred day and time.
+Calendar invites are on their way to both participants; you can follow their delivery in the sidebar. Looking forward to the interview!"""
+                        st.session_state.step = 'completed'
+            else:
+                response = bot.process_message(
+                    user_input, session_id=st.session_state.session_id)
+
+        elif "reschedule" in user_input.lower() or "change" in user_input.lower():
+            # Reset the scheduling process
+            calendar_manager.release_session_holds(st.session_state.session_id)
+            if st.session_state.scheduled:
+                cancel_scheduled_meeting()
+            st.session_state.scheduled = False
+            st.session_state.meeting_info = None
+            st.session_state.available_time = None
+            st.session_state.selected_date = None
+            st.session_state.selected_time = None
+            st.session_state.step = 'collect_availability'
+            response = """I understand you want to reschedule. Please let me know your new preferred day and time.
 
 You can specify:
 - A specific day (e.g., "Monday at 2 PM")
@@ -593,32 +581,92 @@ You can specify:
 - Today with time (e.g., "today at 4 PM")
 - A specific date (e.g., "25/03 at 2:30 PM")"""
 
-            elif "cancel" in user_input.lower():
-                if st.session_state.scheduled:
-                    st.session_state.scheduled = False
-                    st.session_state.meeting_info = None
-                    st.session_state.available_time = None
-                    st.session_state.selected_date = None
-                    st.session_state.selected_time = None
-                    response = "I've cancelled the scheduled interview. Let me know if you'd like to schedule another time."
-                    st.session_state.step = 'greeting'
-                else:
-                    response = "There's no active interview scheduled to cancel. Would you like to schedule a new interview?"
-                    st.session_state.step = 'greeting'
-
+        elif "cancel" in user_input.lower():
+            if st.session_state.scheduled:
+                cancel_scheduled_meeting()
+                st.session_state.scheduled = False
+                st.session_state.meeting_info = None
+                st.session_state.available_time = None
+                st.session_state.selected_date = None
+                st.session_state.selected_time = None
+                response = "I've cancelled the scheduled interview. Let me know if you'd like to schedule another time."
+                st.session_state.step = 'greeting'
             else:
-                # Default response for other queries
-                response = bot.process_message(user_input)
-
-        # Display the response with a typing animation
-        full_response = ""
-        for chunk in response.split():
-            full_response += chunk + " "
-            time.sleep(0.05)
-            response_placeholder.write(full_response)
-
-    st.session_state.messages.append(
-        {"role": "assistant", "content": response})
+                response = "There's no active interview scheduled to cancel. Would you like to schedule a new interview?"
+                st.session_state.step = 'greeting'
+
+        else:
+            # Default response for other queries
+            response = bot.process_message(
+                user_input, session_id=st.session_state.session_id)
+
+    return response
+
+
+@st.fragment
+def earlier_messages(before):
+    """Pages of the messages above the chat tail; paging reruns only this."""
+    history = st.session_state.history
+    page_size = CHAT_CONFIG['page_size']
+    pages = history.page_count(page_size, before)
+    with st.expander(f"Earlier messages ({before})"):
+        number = st.number_input("Page (1 = most recent)", min_value=1,
+                                 max_value=pages, value=1) - 1
+        for message in history.page(number, page_size, before):
+            with st.chat_message(message["role"]):
+                st.write(message["content"])
+
+
+@st.fragment
+def chat():
+    """The chat tail and input; sending a message reruns only this fragment."""
+    history = st.session_state.history
+
+    # Initialize the chat with a greeting if it's the first interaction
+    if len(history) == 0:
+        history.append("assistant", GREETING)
+
+    # Draw only the newest messages; earlier ones are paginated
+    tail = history.tail(CHAT_CONFIG['visible_messages'])
+    if len(history) > len(tail):
+        earlier_messages(len(history) - len(tail))
+    for message in tail:
+        with st.chat_message(message["role"]):
+            st.write(message["content"])
+
+    # Handle user input
+    if user_input := st.chat_input("Type your message here..."):
+        # Display user message
+        with st.chat_message("user"):
+            st.write(user_input)
+
+        history.append("user", user_input)
+
+        # Process the message with the bot
+        with st.chat_message("assistant"):
+            # Check if emails are set
+            if not st.session_state.recruiter_email or not st.session_state.candidate_email:
+                response = "⚠️ Please enter both recruiter and candidate email addresses in the sidebar first."
+                st.write(response)
+                history.append("assistant", response)
+                return
+
+            scheduled = (st.session_state.scheduled, st.session_state.invite_job)
+            response = respond(user_input)
+
+            # Type the response into the chat
+            typing = CHAT_CONFIG['typing_effect']
+            response = st.write_stream(
+                stream_words(response, typing['word_delay'], typing['max_seconds']))
+
+        history.append("assistant", response)
+
+        # The sidebar and the meeting details are drawn outside the fragment
+        if (st.session_state.scheduled, st.session_state.invite_job) != scheduled:
+            st.rerun()
+
+
+chat()
 
 # Display meeting details if a meeting has been scheduled
 if st.session_state.scheduled and st.session_state.meeting_info:
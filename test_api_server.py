@@ -0,0 +1,162 @@
+"""
+Test module for the scheduler HTTP API
+"""
+
+import asyncio
+import http.client
+import json
+import logging
+import threading
+from datetime import date
+from api_server import SchedulerAPI
+from calendar_utils import CalendarManager
+from invite_queue import InviteDispatcher
+from scheduling_bot import SchedulingBot
+from test_invite_queue import FlakyPool
+from timer_service import TimerService
+
+
+def call(port, method, path, body=None, connection=None):
+    connection = connection or http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request(method, path, body=None if body is None else json.dumps(body),
+                       headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_endpoints(tmp_path):
+    """
+    Test classification, slot search, availability and booking over HTTP.
+    """
+    pool = FlakyPool(0)
+    calendar = CalendarManager(smtp_pool=pool)
+    dispatcher = InviteDispatcher(calendar, str(tmp_path / "queue.sqlite3"))
+    dispatcher.start()
+    bot = SchedulingBot()
+    api = SchedulerAPI(bot, calendar, dispatcher)
+    port = api.start_in_thread('127.0.0.1', 0)
+    try:
+        # One keep-alive connection serves several requests
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        assert call(port, 'GET', '/health', connection=connection) == (200, {'status': 'ok'})
+        messages = ["Can we schedule a meeting?", "I need to reschedule"]
+        status, response = call(port, 'POST', '/intents', {'messages': messages},
+                                connection=connection)
+        assert status == 200
+        assert response['intents'] == list(bot.classify_intents(messages))
+
+        status, response = call(port, 'POST', '/meeting-types',
+                                {'department': 'Engineering', 'durations': [30, 60], 'k': 2})
+        assert status == 200 and [len(options) for options in response['meeting_types']] == [2, 2]
+        assert call(port, 'POST', '/meeting-types', {
+            'department': 'Engineering', 'durations': [45.5]})[0] == 400
+
+        status, response = call(port, 'POST', '/slots', {
+            'meeting_type': 'Technical Interview', 'timezone': 'UTC',
+            'start_from': '2025-03-03T09:00:00', 'count': 2, 'participants': ['r1', 'c1']})
+        assert response == {'slots': ['2025-03-03T09:00:00+00:00', '2025-03-03T10:00:00+00:00']}
+
+        booking = {'start': '2025-03-03T09:00:00', 'duration': 60, 'timezone': 'UTC',
+                   'recruiter_email': 'r1', 'candidate_email': 'c1', 'title': 'Interview'}
+        status, response = call(port, 'POST', '/bookings', booking)
+        assert status == 201
+        assert dispatcher.wait(response['job_id'], timeout=10)['status'] == 'sent'
+        assert call(port, 'GET', f"/bookings/{response['job_id']}")[1]['status'] == 'sent'
+        assert len(pool.sent) == 1
+
+        # The booked hour is now busy for both participants
+        status, response = call(port, 'POST', '/bookings', dict(booking, candidate_email='c2'))
+        assert status == 409 and response['conflicts'] == ['r1']
+        status, response = call(port, 'POST', '/availability', {
+            'start': '2025-03-03T09:30:00+00:00', 'duration': 30, 'participants': ['c1']})
+        assert response == {'available': False, 'conflicts': ['c1']}
+        assert call(port, 'POST', '/slots', {
+            'start_from': '2025-03-03T09:00:00', 'participants': ['r1']})[1] == {
+            'slots': ['2025-03-03T10:15:00+00:00']}
+
+        # A held slot can only be booked through its hold
+        hold = {'start': '2025-03-04T09:00:00', 'duration': 60, 'recruiter_email': 'r1',
+                'candidate_email': 'c3', 'session_id': 's1'}
+        status, response = call(port, 'POST', '/holds', hold)
+        assert status == 201
+        assert call(port, 'POST', '/holds', dict(hold, session_id='s2'))[0] == 409
+        assert call(port, 'POST', '/bookings', dict(hold, session_id='s2'))[0] == 409
+        assert call(port, 'POST', '/bookings', dict(hold, session_id='s2',
+                                                    hold_id=response['hold_id']))[0] == 409
+        assert call(port, 'POST', '/bookings', dict(hold, hold_id=response['hold_id']))[0] == 201
+        assert call(port, 'DELETE', f"/holds/{response['hold_id']}")[0] == 404
+
+        assert call(port, 'POST', '/bookings', {'start': '2025-03-03T09:00:00'})[0] == 400
+        assert call(port, 'POST', '/availability', {'start': 'soon'})[0] == 400
+        assert call(port, 'GET', '/intents')[0] == 405
+        assert call(port, 'GET', '/nowhere')[0] == 404
+        assert call(port, 'GET', '/bookings/unknown')[0] == 404
+    finally:
+        api.stop_thread()
+        dispatcher.stop()
+
+
+def test_responses_and_errors(caplog):
+    """
+    Test invite response validation and the logging of unexpected failures.
+    """
+    calendar = CalendarManager(smtp_pool=FlakyPool(0))
+    api = SchedulerAPI(SchedulingBot(), calendar, InviteDispatcher(calendar, ':memory:'),
+                       timers=TimerService(':memory:'))
+
+    def respond(body):
+        return asyncio.run(api.dispatch('POST', '/responses', json.dumps(body).encode()))
+
+    assert respond({'uid': 'm1', 'partstat': 'accepted'}) == (
+        200, {'uid': 'm1', 'partstat': 'ACCEPTED'})
+    assert respond({'uid': 'm1', 'partstat': 5})[0] == 400
+    assert respond({'uid': 'm1', 'partstat': 'maybe'})[0] == 400
+    assert respond({'uid': ['m1'], 'partstat': 'DECLINED'})[0] == 400
+
+    async def broken(body):
+        raise RuntimeError("store unavailable")
+
+    api._routes[('POST', '/responses')] = broken
+    with caplog.at_level(logging.ERROR, logger='api_server'):
+        status, response = respond({})
+    assert status == 500 and response == {'error': "RuntimeError: store unavailable"}
+    assert [record.exc_info[1].args[0] for record in caplog.records] == ["store unavailable"]
+    api.executor.shutdown()
+
+
+def test_concurrent_intents_share_model_calls():
+    """
+    Test that concurrent classification requests are batched and answered in order.
+    """
+    bot = SchedulingBot()
+    calls = []
+    classify = bot.classify_intents
+
+    def counting_classify(messages, speakers=None, hours=None):
+        calls.append(len(messages))
+        return classify(messages, speakers, hours)
+
+    bot.classify_intents = counting_classify
+    api = SchedulerAPI(bot, CalendarManager(smtp_pool=FlakyPool(0)),
+                       InviteDispatcher(CalendarManager(), ':memory:'))
+    port = api.start_in_thread('127.0.0.1', 0)
+    texts = ["Can we schedule a meeting?", "I need to reschedule our meeting",
+             "Please cancel the interview", "What time slots are available next week?"]
+    expected = {text: classify([text])[0] for text in texts}
+    results = {}
+
+    def client(i):
+        messages = [texts[(i + j) % len(texts)] for j in range(3)]
+        status, response = call(port, 'POST', '/intents', {'messages': messages})
+        results[i] = (status, response['intents'] == [expected[m] for m in messages])
+
+    try:
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        api.stop_thread()
+    assert all(result == (200, True) for result in results.values()) and len(results) == 32
+    assert sum(calls) == 96 and len(calls) < 32
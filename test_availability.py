@@ -0,0 +1,205 @@
+"""
+Test module for the availability index and CalendarManager availability checks
+"""
+
+import logging
+import random
+from datetime import date, datetime, time, timedelta
+import pytz
+from availability import AvailabilityIndex, IntervalSet, parse_utc_offset, read_calendar_events
+from calendar_utils import CalendarManager
+
+
+def test_interval_set_matches_brute_force():
+    """
+    Test merged interval overlap queries against a linear scan.
+    """
+    rng = random.Random(7)
+    events = []
+    for _ in range(300):
+        start = rng.randrange(0, 10000)
+        events.append((start, start + rng.randrange(1, 200)))
+
+    incremental = IntervalSet()
+    for start, end in events:
+        incremental.add(start, end)
+    bulk = IntervalSet.from_intervals(events)
+    assert (incremental.starts, incremental.ends) == (bulk.starts, bulk.ends)
+
+    for _ in range(1000):
+        start = rng.randrange(-100, 10100)
+        end = start + rng.randrange(1, 100)
+        expected = any(s < end and e > start for s, e in events)
+        assert incremental.overlaps(start, end) == expected
+
+
+def test_buffer_time():
+    """
+    Test that slots within the buffer of an existing event are busy.
+    """
+    index = AvailabilityIndex(buffer_minutes=15)
+    index.add_event("r1", datetime(2025, 3, 3, 10), datetime(2025, 3, 3, 11))
+    t = lambda h, m=0: int(datetime(2025, 3, 3, h, m, tzinfo=pytz.UTC).timestamp())
+
+    assert not index.is_free("r1", t(11, 10), t(12))
+    assert index.is_free("r1", t(11, 15), t(12))
+    assert not index.is_free("r1", t(9), t(9, 50))
+    assert index.is_free("r1", t(9), t(9, 45))
+    assert index.is_free("someone-else", t(10), t(11))
+
+
+def test_calendar_manager_availability():
+    """
+    Test check_availability with participant calendars and the dataset loader.
+    """
+    calendar = CalendarManager()
+    monday = date(2025, 3, 3)
+    calendar.add_busy_time("recruiter@example.com",
+                           pytz.UTC.localize(datetime(2025, 3, 3, 14)),
+                           pytz.UTC.localize(datetime(2025, 3, 3, 15)))
+
+    assert calendar.check_availability(monday, time(14), 60)
+    assert not calendar.check_availability(monday, time(14), 60,
+                                           participants=["recruiter@example.com"])
+    assert calendar.check_availability(monday, time(10), 60,
+                                       participants=["recruiter@example.com"])
+
+    assert calendar.load_calendar_dataset() > 0
+    # Row 1: 2024-10-25 02:56-03:58 UTC-5, Pending Confirmation
+    recruiter = "85f9503c-d12e-4280-a260-6d5779f01af7"
+    start = pytz.UTC.localize(datetime(2024, 10, 25, 8))
+    assert calendar.find_conflicts([recruiter], start, start + timedelta(minutes=30)) == [recruiter]
+    assert parse_utc_offset("UTC+5") == timedelta(hours=5)
+    assert parse_utc_offset("America/New_York") is None
+
+
+def test_calendar_csv_zones(tmp_path, caplog):
+    """
+    Test that named zones in a calendar CSV are localized and unknown ones skipped.
+    """
+    path = tmp_path / "calendar.csv"
+    rows = [('r1', 'c1', '2025-07-01', '09:00:00', '10:00:00', 'America/New_York'),
+            ('r2', 'c2', '2025-01-15', '23:30:00', '00:30:00', 'UTC+5:30'),
+            ('r3', 'c3', '2025-07-01', '09:00:00', '10:00:00', 'Mars/Olympus_Mons')]
+    path.write_text("Recruiter_ID,Candidate_ID,Date,Start_Time,End_Time,"
+                    "Availability_Status,TimeZone\n" +
+                    "".join(",".join(row[:5] + ('Busy', row[5])) + "\n" for row in rows))
+
+    with caplog.at_level(logging.WARNING, logger='availability'):
+        events = list(read_calendar_events(str(path), ['Busy']))
+    summer = int(pytz.UTC.localize(datetime(2025, 7, 1, 13)).timestamp())
+    winter = int(pytz.UTC.localize(datetime(2025, 1, 15, 18)).timestamp())
+    assert events == [('r1', summer, summer + 3600), ('c1', summer, summer + 3600),
+                      ('r2', winter, winter + 3600), ('c2', winter, winter + 3600)]
+    assert 'Mars/Olympus_Mons' in caplog.text
+
+
+def test_suggest_next_slots_matches_probing():
+    """
+    Test the gap sweep against probing every aligned start time.
+    """
+    calendar = CalendarManager()
+    rng = random.Random(3)
+    tz = pytz.timezone('America/New_York')
+    start_from = tz.localize(datetime(2025, 3, 3, 8, 7))
+    for participant in ["r1", "c1"]:
+        for _ in range(80):
+            day = start_from + timedelta(days=rng.randrange(14))
+            begin = day.replace(hour=rng.randrange(9, 17), minute=rng.choice([0, 20, 40]))
+            calendar.add_busy_time(participant, begin, begin + timedelta(minutes=rng.choice([30, 60])))
+
+    slots = calendar.suggest_next_slots('HR Screening', 'America/New_York', start_from,
+                                        count=10, participants=["r1", "c1"],
+                                        horizon_days=14, granularity=5)
+    assert len(slots) == 10
+
+    expected = []
+    probe = start_from.replace(hour=0, minute=0)
+    while len(expected) < 10:
+        probe = tz.normalize(probe + timedelta(minutes=5))
+        end = probe + timedelta(minutes=45)
+        if (probe < start_from or probe.weekday() >= 5 or probe.hour < 9 or
+                (end.hour, end.minute) > (17, 0) or end.date() != probe.date()):
+            continue
+        if expected and probe < expected[-1] + timedelta(minutes=45):
+            continue
+        if not calendar.find_conflicts(["r1", "c1"], probe, end):
+            expected.append(probe)
+    assert slots == expected
+
+
+def test_suggest_next_slot_skips_full_days():
+    """
+    Test that a fully booked day is skipped and weekends are ignored.
+    """
+    calendar = CalendarManager()
+    friday = pytz.UTC.localize(datetime(2025, 3, 7, 9))
+    calendar.add_busy_time("r1", friday, friday.replace(hour=17))
+
+    slot = calendar.suggest_next_slot('Technical Interview', 'UTC', friday, participants=["r1"])
+    assert slot == pytz.UTC.localize(datetime(2025, 3, 10, 9))
+    assert calendar.suggest_next_slot('Technical Interview', 'UTC', friday) == friday
+
+
+def test_find_common_slots_matches_brute_force():
+    """
+    Test panel slot search against checking every aligned start directly.
+    """
+    calendar = CalendarManager()
+    rng = random.Random(11)
+    panel = ["r1", "r2", "r3", "candidate"]
+    calendar.set_participant_settings("r2", 'Europe/London')
+    calendar.set_participant_settings("candidate", 'America/New_York',
+                                      {'start': 8, 'end': 18})
+    window = (pytz.UTC.localize(datetime(2025, 3, 3)), pytz.UTC.localize(datetime(2025, 3, 8)))
+    for participant in panel:
+        for _ in range(25):
+            begin = window[0] + timedelta(minutes=15 * rng.randrange(5 * 96))
+            calendar.add_busy_time(participant, begin, begin + timedelta(minutes=45))
+
+    options = calendar.find_common_slots(panel, 60, window, count=1000)
+
+    def in_working_hours(participant, start, end):
+        settings = calendar.participant_settings.get(participant, {})
+        tz = pytz.timezone(settings.get('timezone', 'UTC'))
+        hours = settings.get('working_hours', calendar.working_hours)
+        local_start, local_end = start.astimezone(tz), end.astimezone(tz)
+        return (local_start.weekday() < 5 and local_start.date() == local_end.date() and
+                local_start.hour >= hours['start'] and
+                (local_end.hour, local_end.minute) <= (hours['end'], 0))
+
+    expected = set()
+    start = window[0]
+    while start + timedelta(minutes=60) <= window[1]:
+        end = start + timedelta(minutes=60)
+        if (all(in_working_hours(p, start, end) for p in panel) and
+                not calendar.find_conflicts(panel, start, end)):
+            expected.add(start)
+        start += timedelta(minutes=15)
+
+    assert expected
+    assert {option['start'] for option in options} == expected
+    comforts = [option['comfort'] for option in options]
+    assert comforts == sorted(comforts, reverse=True)
+
+
+def test_interval_set_remove():
+    """
+    Test clearing ranges from merged intervals against a brute-force set of minutes.
+    """
+    rng = random.Random(4)
+    for _ in range(200):
+        interval_set, minutes = IntervalSet(), set()
+        for _ in range(rng.randint(1, 15)):
+            start = rng.randrange(500)
+            end = start + rng.randint(1, 60)
+            interval_set.add(start, end)
+            minutes.update(range(start, end))
+        for _ in range(5):
+            start = rng.randrange(500)
+            end = start + rng.randint(1, 80)
+            assert interval_set.remove(start, end) == bool(minutes & set(range(start, end)))
+            minutes.difference_update(range(start, end))
+        assert {minute for s, e in zip(interval_set.starts, interval_set.ends)
+                for minute in range(s, e)} == minutes
+        assert all(e > s for s, e in zip(interval_set.starts, interval_set.ends))
@@ -0,0 +1,84 @@
+"""
+Test module for bulk interview assignment
+"""
+
+import random
+from datetime import date, datetime, timedelta
+import pytz
+from batch_scheduler import BatchScheduler, assignment_summary
+from calendar_utils import CalendarManager
+
+DEPARTMENTS = ['Engineering', 'Sales', 'Product']
+MEETING_TYPES = ['Technical Interview', 'HR Screening', 'Final Round', 'Initial Discussion']
+
+
+def make_drive(rng, n_requests, n_recruiters, n_days):
+    calendar = CalendarManager()
+    start = pytz.UTC.localize(datetime(2025, 3, 3))
+    recruiters = {department: [f"{department}-r{i}" for i in range(n_recruiters)]
+                  for department in DEPARTMENTS}
+    existing = []
+    for ids in recruiters.values():
+        for recruiter in ids:
+            for _ in range(5):
+                begin = start + timedelta(minutes=15 * rng.randrange(n_days * 96))
+                end = begin + timedelta(minutes=15 * rng.randrange(1, 8))
+                calendar.add_busy_time(recruiter, begin, end)
+                existing.append((recruiter, begin, end))
+    requests = [{'candidate': f"c{rng.randrange(n_requests)}",
+                 'department': rng.choice(DEPARTMENTS),
+                 'meeting_type': rng.choice(MEETING_TYPES),
+                 'priority': rng.choice(['High', 'Medium', 'Low'])}
+                for _ in range(n_requests)]
+    return calendar, recruiters, requests, existing
+
+
+def test_assignment_is_conflict_free():
+    """
+    Test that bookings respect working hours, existing events, buffers and
+    each other.
+    """
+    rng = random.Random(2)
+    calendar, recruiters, requests, existing = make_drive(rng, 300, 4, 14)
+    scheduler = BatchScheduler(calendar, recruiters, date(2025, 3, 3), 14)
+    assignments = scheduler.assign(requests)
+    assert sum(a is not None for a in assignments) > 250
+
+    # Replay everything into a fresh calendar and check each booking against it
+    check = CalendarManager()
+    for participant, begin, end in existing:
+        check.add_busy_time(participant, begin, end)
+    for request, assignment in zip(requests, assignments):
+        if assignment is None:
+            continue
+        start = assignment['start']
+        assert request['department'] in assignment['recruiter']
+        assert assignment['end'] - start == timedelta(
+            minutes=calendar.meeting_durations[request['meeting_type']])
+        assert check.check_availability(start.date(), start.time(),
+                                        (assignment['end'] - start).seconds // 60,
+                                        participants=[assignment['recruiter'],
+                                                      request['candidate']])
+        assert check.check_availability(start.date(), (assignment['end'] - timedelta(
+            minutes=1)).time(), 1)
+        check.add_busy_time(assignment['recruiter'], start, assignment['end'])
+        check.add_busy_time(request['candidate'], start, assignment['end'])
+
+
+def test_priority_served_first():
+    """
+    Test that high priority requests are placed first when capacity is short.
+    """
+    rng = random.Random(4)
+    calendar, recruiters, requests, _ = make_drive(rng, 400, 1, 5)
+    start_from = pytz.UTC.localize(datetime(2025, 3, 3))
+    scheduler = BatchScheduler(calendar, recruiters, start_from.date(), 5)
+    summary = assignment_summary(requests, scheduler.assign(requests, start_from),
+                                 start_from)
+
+    rates = summary['by_priority']
+    assert rates['High']['placement_rate'] < 1
+    assert summary['placed'] == rates['High']['placed']
+    # Ties between equally early recruiters go to the least loaded one
+    low, high = summary['recruiter_load']
+    assert high - low <= 2
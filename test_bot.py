@@ -8,8 +8,13 @@ It simulates a conversation flow and tests the meeting scheduling process.
 from scheduling_bot import SchedulingBot
 from calendar_utils import CalendarManager
 from datetime import datetime, timedelta
+import os
+import shutil
 import pytz
-from utils import generate_meet_link
+import time
+from config import BOT_CONFIG
+from prediction_cache import TimeSlotTable
+from utils import generate_meet_link, stream_words
 
 
 def test_scheduling_conversation():
@@ -109,5 +114,119 @@ Note: If you have any issues joining the meeting, please contact the recruiter.'
             "× Failed to send calendar invite. Please check email settings and try again.")
 
 
+def test_batch_intent_classification():
+    """
+    Test that batched intent classification matches the per-message path.
+    """
+    bot = SchedulingBot()
+    messages = [
+        "I'm available tomorrow between 2 PM and 4 PM",
+        "Can we schedule a meeting?",
+        "I need to reschedule our meeting",
+        "What time slots are available next week?"
+    ]
+    speakers = ["Candidate", "Recruiter", "Candidate", "Bot"]
+
+    batch_intents = bot.classify_intents(messages, speakers)
+    single_intents = [bot.classify_intents([message], [speaker])[0]
+                      for message, speaker in zip(messages, speakers)]
+
+    assert list(batch_intents) == single_intents
+    assert len(bot.process_messages(list(zip(messages, speakers)))) == len(messages)
+    assert len(bot.classify_intents([])) == 0
+
+
+def test_lazy_model_loading(tmp_path, monkeypatch):
+    """
+    Test that models load on first use, independently of the working directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    bot = SchedulingBot()
+    assert bot._artifacts == {}
+
+    bot.classify_intents(["Can we schedule a meeting?"])
+    assert 'intent_model' in bot._artifacts
+    assert 'time_slot_model' not in bot._artifacts
+
+    bot.warm_up()
+    assert 'time_slot_model' in bot._artifacts
+
+
+def test_intent_lookup_table():
+    """
+    Test that cached intent predictions match the live model.
+    """
+    live_bot = SchedulingBot(intent_cache=False)
+    table_bot = SchedulingBot(intent_cache='table')
+    lru_bot = SchedulingBot(intent_cache='lru')
+
+    # The last message is longer than the table and falls back to the model
+    messages = ["Can we schedule a meeting?", "Cancel", "x" * 40, "y" * 600]
+    speakers = ["Candidate", "Recruiter", "Bot", "Candidate"]
+    hours = [0, 9, 23, 14]
+
+    expected = list(live_bot.classify_intents(messages, speakers, hours))
+    assert list(table_bot.classify_intents(messages, speakers, hours)) == expected
+    assert list(lru_bot.classify_intents(messages, speakers, hours)) == expected
+    assert list(lru_bot.classify_intents(messages, speakers, hours)) == expected
+    assert lru_bot.intent_predictor.hits == len(messages)
+
+
+def test_time_slot_table(tmp_path):
+    """
+    Test precomputed time slot suggestions and their invalidation.
+    """
+    model_path = tmp_path / 'time_slot_model.pkl'
+    shutil.copy('results/best_time_slot_prediction_model.pkl', model_path)
+    bot = SchedulingBot(model_paths={'time_slot_model': str(model_path)})
+
+    durations = [30, 45, 60, 90, 600]
+    suggestions = bot.suggest_time_slots("Engineering", durations, k=2)
+    features = [bot._prepare_calendar_features("Engineering", d) for d in durations]
+    expected = bot.calendar_features.decode_meeting_types(
+        bot.time_slot_model.predict(features))
+    assert [ranked[0][0] for ranked in suggestions] == list(expected)
+    assert all(len(ranked) == 2 for ranked in suggestions)
+
+    table = bot.time_slot_table
+    assert bot.time_slot_table is table
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert bot.time_slot_table is not table
+
+    # The numpy backend serves the compiled export but watches the pickle
+    assert SchedulingBot(backend='numpy').time_slot_table.source_path.endswith('.pkl')
+
+    # Models without predict_proba rank their prediction first, in and outside the table
+    class PredictOnly:
+        def __init__(self, model):
+            self.predict, self.classes_ = model.predict, model.classes_
+
+    table = TimeSlotTable(PredictOnly(bot.time_slot_model), bot.calendar_features, 60)
+    assert [ranked[0] for ranked in table.top_k("Engineering", [30, 90], k=2)] == [
+        (meeting_type, 1.0) for meeting_type in expected[[0, 3]]]
+
+
+def test_streamed_responses(monkeypatch):
+    """
+    Test that streamed responses join back to the full text, with bounded pacing.
+    """
+    text = "Please choose:\n- Monday at 2 PM\n- Tuesday  at 3 PM "
+    assert "".join(stream_words(text)) == text
+    assert list(stream_words("")) == [""]
+
+    begin = time.perf_counter()
+    chunks = list(stream_words("word " * 200, word_delay=0.05, max_seconds=0.2))
+    assert len(chunks) == 200 and time.perf_counter() - begin < 1
+
+    bot = SchedulingBot()
+    message = "Can we schedule a meeting?"
+    expected = bot.process_message(message, session_id="plain")
+    assert list(bot.stream_message(message, session_id="instant")) == [expected]
+    monkeypatch.setitem(BOT_CONFIG, 'response_streaming',
+                        dict(BOT_CONFIG['response_streaming'], instant=False))
+    assert "".join(bot.stream_message(message, session_id="streamed")) == expected
+
+
 if __name__ == "__main__":
     test_scheduling_conversation()
@@ -0,0 +1,33 @@
+"""
+Test module for the bounded, disk-backed chat history
+"""
+
+from chat_history import ChatHistory
+
+
+def test_spills_and_pages(tmp_path):
+    """
+    Test that old messages move to disk and read back in order.
+    """
+    history = ChatHistory(str(tmp_path / "chat" / "session.jsonl"), max_messages=5)
+    for i in range(23):
+        history.append('user' if i % 2 else 'assistant', f"message {i} ✓\nline two")
+
+    assert len(history) == 23 and history.spilled == 18
+    assert len(history._recent) == 5
+    expected = [f"message {i} ✓\nline two" for i in range(23)]
+    assert [m['content'] for m in history.messages(0, 23)] == expected
+    assert [m['content'] for m in history.messages(16, 20)] == expected[16:20]
+    assert [m['content'] for m in history.tail(3)] == expected[20:]
+    assert history.messages(0, 1)[0]['role'] == 'assistant'
+
+    # Pages count back from the newest message before the tail
+    assert history.page_count(10) == 3 and history.page_count(10, before=18) == 2
+    assert [m['content'] for m in history.page(0, 10, before=18)] == expected[8:18]
+    assert [m['content'] for m in history.page(1, 10, before=18)] == expected[:8]
+    assert history.page(2, 10, before=18) == []
+
+    history.clear()
+    assert len(history) == 0 and not (tmp_path / "chat" / "session.jsonl").exists()
+    history.append('user', "again")
+    assert history.messages(0, 5) == [{'role': 'user', 'content': "again"}]
@@ -0,0 +1,86 @@
+"""
+Test module for the compiled NumPy models
+
+Checks that the compiled exports reproduce the original sklearn pipelines over
+every row of both datasets.
+"""
+
+import logging
+import shutil
+import joblib
+import numpy as np
+import pandas as pd
+import scheduling_bot
+from compiled_models import (compile_pipeline, is_export_current, load_compiled_model,
+                             save_compiled_model)
+from config import BOT_CONFIG
+from scheduling_bot import SchedulingBot
+
+
+def _dataset_features(pipeline, path):
+    df = pd.read_csv(path)
+    return df[list(pipeline.named_steps['scaler'].feature_names_in_)].to_numpy(np.float64)
+
+
+def test_intent_model_equivalence(tmp_path):
+    """
+    Test the compiled intent model against the pickle on the conversation dataset.
+    """
+    pipeline = joblib.load('results/best_intent_classification_model.pkl')
+    X = _dataset_features(pipeline, 'results/preprocessed_conversation_dataset.csv')
+
+    save_compiled_model(compile_pipeline(pipeline), tmp_path / 'intent.npz')
+    compiled = load_compiled_model(tmp_path / 'intent.npz')
+
+    assert np.array_equal(compiled.predict(X), pipeline.predict(X))
+
+
+def test_time_slot_model_equivalence(tmp_path):
+    """
+    Test the compiled time slot model against the pickle on the calendar dataset.
+    """
+    pipeline = joblib.load('results/best_time_slot_prediction_model.pkl')
+    X = _dataset_features(pipeline, 'results/preprocessed_calendar_dataset.csv')
+
+    save_compiled_model(compile_pipeline(pipeline), tmp_path / 'time_slot.npz')
+    compiled = load_compiled_model(tmp_path / 'time_slot.npz')
+
+    assert np.array_equal(compiled.predict(X), pipeline.predict(X))
+    assert np.allclose(compiled.predict_proba(X), pipeline.predict_proba(X))
+
+
+def test_shipped_exports_are_current():
+    """
+    Test that the .npz files in results/ match the shipped pickles.
+    """
+    for name in ['best_intent_classification_model',
+                 'best_time_slot_prediction_model']:
+        pipeline = joblib.load(f'results/{name}.pkl')
+        assert is_export_current(f'results/{name}.npz', f'results/{name}.pkl')
+        shipped = load_compiled_model(f'results/{name}.npz')
+        shipped_arrays = shipped.to_arrays()
+        for key, value in compile_pipeline(pipeline).to_arrays().items():
+            assert np.array_equal(shipped_arrays[key], value)
+
+
+def test_outdated_export_falls_back_to_pickle(tmp_path, monkeypatch, caplog):
+    """
+    Test that an export no longer matching its pickle is not served.
+    """
+    name = 'best_time_slot_prediction_model'
+    shutil.copy(f'results/{name}.pkl', tmp_path / 'model.pkl')
+    shutil.copy(f'results/{name}.npz', tmp_path / 'model.npz')
+    monkeypatch.setitem(BOT_CONFIG, 'model_paths', dict(
+        BOT_CONFIG['model_paths'], time_slot_model=str(tmp_path / 'model.pkl')))
+    monkeypatch.setitem(BOT_CONFIG, 'compiled_model_paths', dict(
+        BOT_CONFIG['compiled_model_paths'], time_slot_model=str(tmp_path / 'model.npz')))
+
+    bot = SchedulingBot(backend='numpy')
+    assert bot.model_source('time_slot_model') == str(tmp_path / 'model.npz')
+
+    # Retrain without re-exporting
+    with open(tmp_path / 'model.pkl', 'ab') as f:
+        f.write(b'\0')
+    with caplog.at_level(logging.WARNING, logger=scheduling_bot.__name__):
+        assert bot.model_source('time_slot_model') == str(tmp_path / 'model.pkl')
+    assert 'out of date' in caplog.text
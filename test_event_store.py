@@ -0,0 +1,130 @@
+"""
+Test module for the SQLite event store
+"""
+
+import random
+import sqlite3
+import threading
+from datetime import datetime
+import pytest
+import pytz
+from availability import AvailabilityIndex
+from calendar_utils import CalendarManager
+from config import CALENDAR_CONFIG
+from event_store import EventStore
+
+
+def random_events(rng, n, participants=40):
+    events = []
+    for _ in range(n):
+        start = 1740960000 + 900 * rng.randrange(28 * 96)
+        events.append((f"p{rng.randrange(participants)}", start,
+                       start + 900 * rng.randrange(1, 12)))
+    return events
+
+
+def test_matches_in_memory_index(tmp_path):
+    """
+    Test that overlap and range queries agree with AvailabilityIndex.
+    """
+    rng = random.Random(0)
+    events = random_events(rng, 3000)
+    store = EventStore(str(tmp_path / "events.sqlite3"), buffer_minutes=15, batch_size=500)
+    index = AvailabilityIndex(15)
+    assert store.add_events(events) == index.add_events(events) == 3000
+    assert store.participants() == sorted(index.participants())
+    assert "p0" in store and "nobody" not in store
+
+    for _ in range(2000):
+        participant = f"p{rng.randrange(45)}"
+        start = 1740960000 + 60 * rng.randrange(28 * 1440)
+        end = start + 60 * rng.randrange(1, 600)
+        assert store.is_free(participant, start, end) == index.is_free(participant, start, end)
+        assert store.busy_intervals(participant, start, end) == \
+            index.busy_intervals(participant, start, end)
+
+    # Events are stored once, and persist
+    store.add_events(events[:100])
+    store.add_event("p0", datetime(2025, 3, 3, 9, tzinfo=pytz.UTC),
+                    datetime(2025, 3, 3, 10, tzinfo=pytz.UTC))
+    count = store.count()
+    store.close()
+    reopened = EventStore(str(tmp_path / "events.sqlite3"), buffer_minutes=15)
+    assert reopened.count() == count <= 3001
+    assert not reopened.is_free("p0", 1740995000, 1740996000)
+    assert reopened.db.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+def test_calendar_manager_on_store(tmp_path):
+    """
+    Test availability and slot search backed by the store, including the dataset import.
+    """
+    store = EventStore(str(tmp_path / "events.sqlite3"))
+    calendar = CalendarManager(event_store=store)
+    reference = CalendarManager()
+    assert calendar.load_calendar_dataset() == reference.load_calendar_dataset()
+    count = store.count()
+    assert calendar.load_calendar_dataset() > 0 and store.count() == count
+
+    start = datetime(2025, 3, 3, 9, tzinfo=pytz.UTC)
+    for manager in (calendar, reference):
+        manager.add_busy_time("recruiter", start, start.replace(hour=11))
+    participants = ["recruiter", "candidate"]
+    for hour in range(8, 17):
+        moment = start.replace(hour=hour)
+        assert calendar.check_availability(moment.date(), moment.time(), 60, 'UTC', participants) == \
+            reference.check_availability(moment.date(), moment.time(), 60, 'UTC', participants)
+    assert calendar.suggest_next_slots('Technical Interview', 'UTC', start, count=4,
+                                       participants=participants) == \
+        reference.suggest_next_slots('Technical Interview', 'UTC', start, count=4,
+                                     participants=participants)
+
+    # A second manager on the same file sees the booking
+    other = CalendarManager(event_store=EventStore(str(tmp_path / "events.sqlite3")))
+    assert other.find_conflicts(participants, start, start.replace(hour=10)) == ["recruiter"]
+    assert CALENDAR_CONFIG['buffer_time'] * 60 == other.availability.buffer
+
+
+def test_cancel_booking_frees_slot(tmp_path):
+    """
+    Test booking, cancelling and booking the same slot again on both stores.
+    """
+    start = datetime(2025, 3, 3, 10, tzinfo=pytz.UTC)
+    end = start.replace(hour=11)
+    participants = ["recruiter", "candidate"]
+    for store in (EventStore(str(tmp_path / "events.sqlite3")), None):
+        calendar = CalendarManager(event_store=store)
+        calendar.add_busy_time("recruiter", start.replace(hour=8), start.replace(hour=9))
+        calendar.build_slot_bitmap(start.date(), n_days=7)
+        assert calendar.book_slot(participants, start, end) == []
+        assert calendar.book_slot(participants, start, end) == participants
+        assert calendar.cancel_booking(participants, start, end) == participants
+        assert calendar.cancel_booking(participants, start, end) == []
+        assert calendar.check_availability(start.date(), start.time(), 60, 'UTC', participants)
+        assert calendar.book_slot(participants, start, end) == []
+        # Other events stay busy
+        assert calendar.find_conflicts(participants, start.replace(hour=8),
+                                       start.replace(hour=9)) == ["recruiter"]
+
+
+def test_close_closes_every_thread_connection(tmp_path):
+    """
+    Test that close() also closes the connections opened by other threads.
+    """
+    store = EventStore(str(tmp_path / "events.sqlite3"))
+    connections = []
+
+    def worker():
+        store.add_event("p0", 1740996000, 1740999600)
+        connections.append(store.db)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(map(id, connections))) == 3
+    store.close()
+    for db in connections + [store._db]:
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
@@ -0,0 +1,47 @@
+"""
+Test module for the compiled feature encoders
+
+Checks that the lookup tables reproduce the fitted LabelEncoders and that
+unknown labels fall back instead of raising.
+"""
+
+import joblib
+import numpy as np
+from feature_encoders import (compile_encoders, ConversationFeatureEncoder,
+                              CalendarFeatureEncoder)
+
+
+def test_compiled_encoders_match_label_encoders():
+    """
+    Test that every compiled encoder agrees with its LabelEncoder.
+    """
+    for path in ['results/conversation_label_encoders.pkl',
+                 'results/calendar_label_encoders.pkl']:
+        encoders = joblib.load(path)
+        compiled = compile_encoders(encoders)
+        for name, encoder in encoders.items():
+            labels = list(encoder.classes_)
+            codes = compiled[name].encode_column(labels)
+            assert np.array_equal(codes, encoder.transform(labels))
+            assert list(compiled[name].decode_column(codes)) == labels
+
+
+def test_feature_rows_and_unknown_labels():
+    """
+    Test the precomputed feature rows and the unknown label fallback.
+    """
+    conversation = ConversationFeatureEncoder(
+        compile_encoders(joblib.load('results/conversation_label_encoders.pkl')))
+    calendar = CalendarFeatureEncoder(
+        compile_encoders(joblib.load('results/calendar_label_encoders.pkl')))
+
+    # Bot=0, Candidate=1, Recruiter=2; en=1; neutral=1
+    assert conversation.encode("Hello", "Recruiter", 10) == [10, 5, 2, 1, 1]
+    assert conversation.encode("Hello", "Someone", 10) == [10, 5, 1, 1, 1]
+    batch = conversation.encode_batch(["Hi", "Hello"], ["Bot", "Recruiter"], [9, 10])
+    assert batch.tolist() == [[9, 2, 0, 1, 1], [10, 5, 2, 1, 1]]
+
+    # Available=0, Zoom=5, Engineering=1; unknown departments use code 0
+    assert calendar.encode("Engineering", 60) == [60, 0, 5, 1]
+    assert calendar.encode("Design", 45) == [45, 0, 5, 0]
+    assert calendar.decode_meeting_types([5]).tolist() == ["Technical Interview"]
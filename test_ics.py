@@ -0,0 +1,68 @@
+"""
+Test module for the template-based iCalendar writer
+"""
+
+import random
+from datetime import datetime, timedelta
+import icalendar
+import pytz
+from calendar_utils import CalendarManager
+
+PIECES = ['Technical', 'Interview', 'a,b', 'x;y', 'back\\slash', 'line\nbreak',
+          'crlf\r\nend', 'caret^', 'quote"', 'Zürich', 'façade', '日本語', '🙂', ' ',
+          'https://meet.google.com/abc-defg-hij', 'Room 4']
+
+
+def random_meeting(rng):
+    def text(n, pieces=PIECES):
+        return ''.join(rng.choice(pieces) for _ in range(rng.randrange(n)))
+
+    start = pytz.UTC.localize(datetime(2025, 3, 3, 9) +
+                              timedelta(minutes=15 * rng.randrange(2000)))
+    return {
+        'title': text(12) or 'Interview',
+        'start_time': start,
+        'end_time': start + timedelta(minutes=rng.choice([30, 45, 60, 90])),
+        # URL values may not contain line breaks
+        'location': text(6, [piece for piece in PIECES if '\n' not in piece]),
+        'description': text(40),
+        'recruiter_email': f"{'r' * rng.randrange(1, 80)}@example.com",
+        'candidate_email': f"candidate{rng.randrange(1000)}@example.org",
+        'meeting_type': 'Technical Interview',
+        'timezone': 'UTC',
+        'dtstamp': pytz.UTC.localize(datetime(2025, 1, 1, 12, 30, 5))
+    }
+
+
+def test_matches_icalendar_byte_for_byte():
+    """
+    Test the template writer against icalendar on awkward text.
+    """
+    rng = random.Random(1)
+    calendar = CalendarManager()
+    for _ in range(300):
+        meeting_info = random_meeting(rng)
+        assert (calendar.calendar_event_ics(meeting_info) ==
+                calendar.create_calendar_event(meeting_info).to_ical())
+
+
+def test_bulk_export(tmp_path):
+    """
+    Test that a multi-event export parses back with stable UIDs.
+    """
+    rng = random.Random(2)
+    calendar = CalendarManager()
+    meetings = [random_meeting(rng) for _ in range(50)]
+    path = tmp_path / "schedule.ics"
+    written = calendar.export_ics(meetings, str(path))
+
+    data = path.read_bytes()
+    assert written == len(data)
+    parsed = icalendar.Calendar.from_ical(data)
+    events = parsed.walk('VEVENT')
+    assert parsed['METHOD'] == 'PUBLISH' and len(events) == 50
+    for event, meeting_info in zip(events, meetings):
+        assert str(event['SUMMARY']) == meeting_info['title'].replace('\r\n', '\n')
+        assert event.decoded('DTSTART') == meeting_info['start_time']
+        assert str(event['UID']) == calendar.invite_uid(meeting_info)
+    assert calendar.invite_uid(dict(meetings[0])) == calendar.invite_uid(meetings[0])
@@ -0,0 +1,206 @@
+"""
+Test module for the streaming ICS importer
+"""
+
+import io
+import random
+from datetime import date, datetime, timedelta
+import icalendar
+import pytz
+from availability import IntervalSet
+from calendar_utils import CalendarManager
+from ics_import import ImportedCalendars, iter_vevents, unfold_lines
+
+ZONES = ['UTC', 'Europe/Paris', 'America/New_York', 'Asia/Kolkata']
+
+
+def random_export(rng, n_events):
+    """An icalendar-written export with the properties the importer reads, and some it skips."""
+    cal = icalendar.Calendar()
+    cal.add('prodid', '-//Test//test//')
+    cal.add('version', '2.0')
+    tz = icalendar.Timezone()
+    tz.add('tzid', 'Europe/Paris')
+    cal.add_component(tz)
+    for number in range(n_events):
+        event = icalendar.Event()
+        event.add('uid', f"event{number}@example.com")
+        event.add('summary', 'Sync; with "quotes", commas and a long title ' * rng.randint(0, 3))
+        zone = pytz.timezone(rng.choice(ZONES))
+        start = zone.localize(datetime(2025, rng.randint(1, 12), rng.randint(1, 28),
+                                       rng.randint(0, 23), rng.choice([0, 15, 30])))
+        kind = rng.random()
+        if kind < 0.15:
+            day = start.date()
+            event.add('dtstart', day)
+            if rng.random() < 0.5:
+                event.add('dtend', day + timedelta(days=rng.randint(1, 3)))
+        elif kind < 0.4:
+            event.add('dtstart', start)
+            event.add('duration', timedelta(minutes=rng.choice([15, 45, 90, 24 * 60])))
+        else:
+            event.add('dtstart', start if rng.random() < 0.7 else start.astimezone(pytz.UTC))
+            event.add('dtend', start + timedelta(minutes=rng.choice([30, 60, 120])))
+        if rng.random() < 0.1:
+            event.add('transp', 'TRANSPARENT')
+        if rng.random() < 0.1:
+            event.add('status', 'CANCELLED')
+        event.add('sequence', rng.randint(0, 3))
+        event.add('description', 'x' * rng.randint(0, 300))
+        if rng.random() < 0.3:
+            alarm = icalendar.Alarm()
+            alarm.add('action', 'DISPLAY')
+            alarm.add('trigger', timedelta(minutes=-15))
+            alarm.add('description', 'Reminder')
+            event.add_component(alarm)
+        cal.add_component(event)
+    return cal
+
+
+def reference_busy(cal, default_zone='UTC'):
+    """Busy intervals read through icalendar's object tree."""
+    tz = pytz.timezone(default_zone)
+    busy = {}
+    for event in cal.walk('VEVENT'):
+        if (str(event.get('status', '')).upper() == 'CANCELLED' or
+                str(event.get('transp', '')).upper() == 'TRANSPARENT'):
+            continue
+        start = event.decoded('dtstart')
+        if not isinstance(start, datetime):
+            start_ts = int(tz.localize(datetime(start.year, start.month, start.day)).timestamp())
+            end = event.decoded('dtend') if 'dtend' in event else start + timedelta(days=1)
+            end_ts = int(tz.localize(datetime(end.year, end.month, end.day)).timestamp())
+        else:
+            end = (event.decoded('dtend') if 'dtend' in event
+                   else start + event.decoded('duration'))
+            start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+        busy[str(event['uid'])] = (start_ts, end_ts)
+    return busy
+
+
+def test_unfolding_and_event_properties():
+    """
+    Test folded lines, quoted parameters and nested components.
+    """
+    text = ('BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:a\r\n b@x\r\n'
+            'DTSTART;TZID="Europe/Paris":20250301T0\r\n\t90000\r\n'
+            'DESCRIPTION;ALTREP="cid:part1":no: colon trouble\r\n'
+            'BEGIN:VALARM\r\nDTSTART:19700101T000000Z\r\nEND:VALARM\r\n'
+            'EXDATE:20250308T090000Z\r\nEXDATE:20250315T090000Z\r\nEND:VEVENT\r\n'
+            'BEGIN:VTODO\r\nUID:todo\r\nEND:VTODO\r\nEND:VCALENDAR\r\n')
+    assert list(unfold_lines(io.BytesIO(text.encode())))[2:4] == [
+        'UID:ab@x', 'DTSTART;TZID="Europe/Paris":20250301T090000']
+    assert list(unfold_lines(io.StringIO(text.replace('\r\n', '\n')))) == list(
+        unfold_lines(io.BytesIO(text.encode())))
+    assert list(iter_vevents(unfold_lines(io.StringIO(text)))) == [{
+        'UID': ({}, 'ab@x'),
+        'DTSTART': ({'TZID': 'Europe/Paris'}, '20250301T090000'),
+        'EXDATE': [({}, '20250308T090000Z'), ({}, '20250315T090000Z')]}]
+
+
+def test_busy_intervals_match_icalendar(tmp_path):
+    """
+    Test imported busy time against icalendar on a random export.
+    """
+    rng = random.Random(0)
+    cal = random_export(rng, 400)
+    path = tmp_path / "export.ics"
+    path.write_bytes(cal.to_ical())
+
+    imported = ImportedCalendars()
+    stats = imported.import_ics('r1', str(path), 'America/New_York')
+    expected = reference_busy(cal, 'America/New_York')
+    assert (stats.added, stats.ignored, stats.skipped) == (len(expected), 400 - len(expected), 0)
+    assert imported.busy_intervals('r1', 0, 2 ** 32) == IntervalSet.from_intervals(
+        expected.values()).between(0, 2 ** 32)
+    for uid, (start, end) in expected.items():
+        assert not imported.is_free('r1', start, end), uid
+
+
+def test_reimport_skips_unchanged_events():
+    """
+    Test that a re-import only replaces changed events and drops deleted ones.
+    """
+    def export(events):
+        lines = ['BEGIN:VCALENDAR']
+        for uid, sequence, start, extra in events:
+            lines += ['BEGIN:VEVENT', f"UID:{uid}", f"SEQUENCE:{sequence}",
+                      f"DTSTART:{start}", 'DURATION:PT1H'] + extra + ['END:VEVENT']
+        return io.StringIO('\r\n'.join(lines + ['END:VCALENDAR']) + '\r\n')
+
+    def at(day, hour):
+        return int(pytz.UTC.localize(datetime(2025, 3, day, hour)).timestamp())
+
+    weekly = ['RRULE:FREQ=WEEKLY;COUNT=10']
+    imported = ImportedCalendars()
+    events = [('a', 0, '20250303T090000Z', []), ('b', 0, '20250304T090000Z', []),
+              ('c', 0, '20250305T090000Z', weekly),
+              ('d', 0, '20250306T090000Z', ['RRULE:FREQ=MONTHLY'])]
+    # 'd' repeats monthly, which cannot be expanded: its first occurrence still blocks
+    assert imported.import_ics('r1', export(events)) == (4, 0, 0, 0, 0, 0, 0, 1)
+    assert imported.import_ics('r1', export(events)) == (0, 0, 4, 0, 0, 0, 0, 0)
+    assert not imported.is_free('r1', at(19, 9), at(19, 10))
+    assert not imported.is_free('r1', at(6, 9), at(6, 10))
+
+    # Cancelled and repeated events block nothing and are counted apart from added ones
+    extra = [('e', 0, '20250307T090000Z', ['STATUS:CANCELLED']), events[0]]
+    assert imported.import_ics('r1', export(events + extra)) == (0, 0, 4, 0, 0, 1, 1, 0)
+
+    # 'a' moves, 'b' is deleted, one occurrence of 'c' moves to the afternoon
+    events = [('a', 1, '20250303T140000Z', []), events[2], events[3],
+              ('c', 1, '20250319T150000Z', ['RECURRENCE-ID:20250319T090000Z'])]
+    assert imported.import_ics('r1', export(events)) == (1, 2, 1, 2, 0, 0, 0, 0)
+    assert imported.busy_intervals('r1', at(3, 0), at(20, 0)) == [
+        (at(3, 14), at(3, 15)), (at(5, 9), at(5, 10)), (at(6, 9), at(6, 10)),
+        (at(12, 9), at(12, 10)), (at(19, 15), at(19, 16))]
+
+    assert imported.import_ics('r1', export([])) == (0, 0, 0, 4, 0, 0, 0, 0)
+    assert 'r1' not in imported and imported.is_free('r1', at(19, 9), at(19, 16))
+
+
+def test_reimport_without_sequence():
+    """
+    Test that events without SEQUENCE or LAST-MODIFIED are compared by their times.
+    """
+    def export(start, end='20250303T110000Z'):
+        return io.StringIO(f"BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:evt-1\r\n"
+                           f"DTSTART:{start}\r\nDTEND:{end}\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n")
+
+    def at(hour):
+        return int(pytz.UTC.localize(datetime(2025, 3, 3, hour)).timestamp())
+
+    imported = ImportedCalendars()
+    assert imported.import_ics('r1', export('20250303T100000Z')).added == 1
+    assert imported.import_ics('r1', export('20250303T100000Z')).unchanged == 1
+    stats = imported.import_ics('r1', export('20250303T140000Z', '20250303T150000Z'))
+    assert stats.updated == 1 and stats.unchanged == 0
+    assert imported.is_free('r1', at(10), at(11)) and not imported.is_free('r1', at(14), at(15))
+
+    # Malformed events are parsed again on every import, not taken as unchanged
+    assert imported.import_ics('r1', export('2025-03-03')).skipped == 1
+    assert imported.import_ics('r1', export('2025-03-03')).skipped == 1
+
+
+def test_calendar_manager_import(tmp_path):
+    """
+    Test that imported busy time blocks slots, bookings and the bitmap.
+    """
+    calendar = CalendarManager()
+    calendar.set_participant_settings('r1', 'Europe/Paris')
+    bitmap = calendar.build_slot_bitmap(date(2025, 3, 3), n_days=14)
+    path = tmp_path / "r1.ics"
+    path.write_text('BEGIN:VCALENDAR\nBEGIN:VEVENT\nUID:offsite\nDTSTART;VALUE=DATE:20250304\n'
+                    'END:VEVENT\nBEGIN:VEVENT\nUID:sync\nDTSTART;TZID=Europe/Paris:20250303T100000'
+                    '\nDTEND;TZID=Europe/Paris:20250303T110000\nEND:VEVENT\nEND:VCALENDAR\n')
+    assert calendar.import_ics('r1', str(path)).added == 2
+    assert calendar.slot_bitmap is not bitmap
+
+    sync = pytz.timezone('Europe/Paris').localize(datetime(2025, 3, 3, 10))
+    assert calendar.find_conflicts(['r1', 'c1'], sync, sync + timedelta(hours=1)) == ['r1']
+    assert calendar.book_slot(['r1', 'c1'], sync, sync + timedelta(minutes=30)) == ['r1']
+    offsite = pytz.timezone('Europe/Paris').localize(datetime(2025, 3, 4, 9))
+    assert not calendar.check_availability(offsite.date(), offsite.time(), 30, 'Europe/Paris',
+                                           ['r1'])
+    assert calendar.suggest_next_slots('Technical Interview', 'Europe/Paris',
+                                       sync.replace(hour=9), count=1, participants=['r1']) == [
+        sync.replace(hour=11, minute=15)]
@@ -0,0 +1,125 @@
+"""
+Test module for background invite dispatch
+"""
+
+import smtplib
+import time
+from calendar_utils import CalendarManager
+from invite_queue import InviteDispatcher, TokenBucket
+from test_smtp_pool import LocalSMTPServer, local_pool, meeting
+
+
+class FlakyPool:
+    """SMTP pool stand-in that fails a number of times before succeeding."""
+
+    def __init__(self, failures, error=None):
+        self.failures = failures
+        self.error = error or smtplib.SMTPServerDisconnected("connection lost")
+        self.sent = []
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.sent.append(message)
+        return True
+
+
+def test_enqueue_returns_immediately_and_dedups(tmp_path):
+    """
+    Test background delivery through SMTP and deduplication of repeats.
+    """
+    server = LocalSMTPServer()
+    try:
+        calendar = CalendarManager(smtp_pool=local_pool(server))
+        dispatcher = InviteDispatcher(calendar, str(tmp_path / "queue.sqlite3"))
+        dispatcher.start()
+
+        begin = time.perf_counter()
+        job_id = dispatcher.enqueue(meeting(0))
+        assert time.perf_counter() - begin < 0.5
+        assert dispatcher.enqueue(meeting(0)) == job_id
+        assert dispatcher.wait(job_id, timeout=10)['status'] == 'sent'
+        assert dispatcher.enqueue(meeting(0)) == job_id
+        other = dispatcher.enqueue(meeting(1))
+        assert other != job_id
+        assert dispatcher.wait(other, timeout=10)['status'] == 'sent'
+        dispatcher.stop()
+        assert len(server.messages) == 2
+    finally:
+        server.stop()
+
+
+def test_retries_with_backoff_then_fails(tmp_path):
+    """
+    Test that failed attempts are retried and eventually marked failed.
+    """
+    pool = FlakyPool(failures=2)
+    dispatcher = InviteDispatcher(CalendarManager(smtp_pool=pool),
+                                  str(tmp_path / "queue.sqlite3"),
+                                  base_delay=0.01, max_attempts=3)
+    dispatcher.start()
+    status = dispatcher.wait(dispatcher.enqueue(meeting(0)), timeout=10)
+    assert status == {'status': 'sent', 'attempts': 3, 'last_error': None}
+
+    pool.failures = 10
+    job_id = dispatcher.enqueue(meeting(1))
+    status = dispatcher.wait(job_id, timeout=10)
+    assert status['status'] == 'failed' and status['attempts'] == 3
+    assert 'SMTPServerDisconnected' in status['last_error']
+
+    # A failed invite can be queued again
+    pool.failures = 0
+    assert dispatcher.enqueue(meeting(1)) == job_id
+    assert dispatcher.wait(job_id, timeout=10)['status'] == 'sent'
+
+    # 4xx replies are retried, 5xx replies and refused recipients are not
+    pool.failures, pool.error = 1, smtplib.SMTPDataError(451, b"Try again later")
+    assert dispatcher.wait(dispatcher.enqueue(meeting(2)), timeout=10)['attempts'] == 2
+    permanent = [smtplib.SMTPDataError(554, b"Rejected"),
+                 smtplib.SMTPRecipientsRefused({'c@example.com': (550, b"No such user")})]
+    for i, error in enumerate(permanent):
+        pool.failures, pool.error = 10, error
+        status = dispatcher.wait(dispatcher.enqueue(meeting(3 + i)), timeout=10)
+        assert status['status'] == 'failed' and status['attempts'] == 1
+    dispatcher.stop()
+    assert len(pool.sent) == 3
+
+
+def test_queue_survives_restart(tmp_path):
+    """
+    Test that queued and interrupted jobs are delivered after a restart.
+    """
+    path = str(tmp_path / "queue.sqlite3")
+    first = InviteDispatcher(CalendarManager(smtp_pool=FlakyPool(0)), path)
+    queued = first.enqueue(meeting(0))
+    interrupted = first.enqueue(meeting(1))
+    first._db.execute("UPDATE invite_jobs SET status = 'sending' WHERE id = ?",
+                      (interrupted,))
+    first._db.commit()
+    # The invite of a meeting cancelled before it went out is never sent
+    cancelled = first.enqueue(meeting(2))
+    assert first.cancel(cancelled) and not first.cancel(interrupted)
+
+    pool = FlakyPool(0)
+    second = InviteDispatcher(CalendarManager(smtp_pool=pool), path)
+    second.start()
+    assert second.wait(queued, timeout=10)['status'] == 'sent'
+    assert second.wait(interrupted, timeout=10)['status'] == 'sent'
+    assert second.status(cancelled)['status'] == 'cancelled'
+    second.stop()
+    assert len(pool.sent) == 2
+
+
+def test_token_bucket():
+    """
+    Test burst capacity and refill rate of the rate limiter.
+    """
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == 0.5
+    now[0] += 0.5
+    assert bucket.try_acquire() == 0
+    now[0] += 10
+    assert [bucket.try_acquire() for _ in range(4)] == [0, 0, 0, 0.5]
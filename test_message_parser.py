@@ -0,0 +1,74 @@
+"""
+Test module for the chat message parser
+"""
+
+from datetime import date, datetime, time
+from message_parser import parse_date_time, parse_message, parse_messages
+
+# A Wednesday
+NOW = datetime(2025, 3, 5, 10)
+
+
+def test_dataset_messages():
+    """
+    Test the message shapes of conversation_dataset.csv.
+    """
+    entities = parse_message("I'm available next Monday between 9:00 AM and 4:00 PM", NOW)
+    assert entities['Date'] == date(2025, 3, 10) and entities['Day'] == 'Monday'
+    assert (entities['StartTime'], entities['EndTime']) == (time(9), time(16))
+    assert entities['TimeSlot'] == 'Morning'
+
+    entities = parse_message("My schedule is open on Friday from 3:30 PM to 11:00 AM", NOW)
+    assert (entities['Day'], entities['StartTime'], entities['EndTime']) == \
+        ('Friday', time(15, 30), time(11))
+
+    entities = parse_message("Can we schedule a 30-minute interview for Thursday?", NOW)
+    assert (entities['Duration'], entities['DurationMinutes'], entities['Day']) == \
+        ('30 min', 30, 'Thursday')
+    assert entities['StartTime'] is None
+
+    assert parse_message("I'm in EST. What times work best for you?", NOW)['TimeZone'] == 'UTC-5'
+    assert parse_message("Can we accommodate my UTC schedule?", NOW)['TimeZone'] == 'UTC'
+    assert parse_message("I prefer morning/afternoon meetings on Monday", NOW)['TimeSlot'] == 'Morning'
+    assert parse_message("I need to reschedule our previous meeting", NOW) == {
+        'Date': None, 'Day': None, 'StartTime': None, 'EndTime': None,
+        'Duration': None, 'DurationMinutes': None, 'TimeZone': None, 'TimeSlot': None}
+
+
+def test_times_dates_and_zones():
+    """
+    Test meridian inference, date forms and zone offsets.
+    """
+    cases = {
+        "tomorrow between 2 and 4 pm": (date(2025, 3, 6), time(14), time(16)),
+        "11-2pm today": (date(2025, 3, 5), time(11), time(14)),
+        "noon to 1:30 pm on thursday": (date(2025, 3, 6), time(12), time(13, 30)),
+        "25/03 at 2:30 PM": (date(2025, 3, 25), time(14, 30), None),
+        "01/02 at 9am": (date(2026, 2, 1), time(9), None),
+        "on 2026-12-01 at 10:30": (date(2026, 12, 1), time(10, 30), None),
+        "March 7th at 3 in the afternoon": (date(2025, 3, 7), time(15), None),
+        "the 4th of july at 10": (date(2025, 7, 4), time(10), None),
+        "tonight at 8": (date(2025, 3, 5), time(20), None),
+        "wednesday at 14:00": (date(2025, 3, 12), time(14), None),
+        "I have 3 candidates for the 2025 round": (None, None, None),
+    }
+    for message, expected in cases.items():
+        entities = parse_message(message, NOW)
+        assert (entities['Date'], entities['StartTime'], entities['EndTime']) == expected, message
+
+    assert parse_message("a 1.5 hour slot", NOW)['DurationMinutes'] == 90
+    assert parse_message("9am UTC+5:30", NOW)['TimeZone'] == 'UTC+5:30'
+    assert parse_message("9am gmt -8", NOW)['TimeZone'] == 'UTC-8'
+    assert parse_message("9am PST", NOW)['TimeZone'] == 'UTC-8'
+    assert parse_date_time("Monday at 2 PM", NOW) == (date(2025, 3, 10), time(14))
+
+
+def test_batch_matches_single():
+    """
+    Test that batch parsing matches parsing messages one at a time.
+    """
+    messages = ["tomorrow at 3:30 PM", "Friday 9-11am EST", "tomorrow at 3:30 PM", "hello"]
+    results = parse_messages(messages, NOW)
+    assert results == [parse_message(message, NOW) for message in messages]
+    results[0]['Day'] = None
+    assert results[2]['Day'] == 'Thursday'
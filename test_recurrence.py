@@ -0,0 +1,158 @@
+"""
+Test module for recurring meetings
+"""
+
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import pytest
+import pytz
+from dateutil.rrule import rrulestr
+from calendar_utils import CalendarManager
+from event_store import EventStore
+from recurrence import WEEKDAY_CODES, Recurrence, RecurringEvent
+from test_ics import random_meeting
+
+
+def random_rule(rng):
+    freq = rng.choice(['DAILY', 'WEEKLY'])
+    parts = [f"FREQ={freq}"]
+    interval, byday = rng.randint(1, 3), None
+    if freq == 'WEEKLY' and rng.random() < 0.7:
+        byday = sorted(rng.sample(range(7), rng.randint(1, 4)))
+    elif freq == 'DAILY' and rng.random() < 0.3:
+        interval, byday = 1, [0, 1, 2, 3, 4]
+    if interval > 1:
+        parts.append(f"INTERVAL={interval}")
+    if byday:
+        parts.append("BYDAY=" + ','.join(WEEKDAY_CODES[day] for day in byday))
+    bound = rng.random()
+    if bound < 0.4:
+        parts.append(f"COUNT={rng.randint(1, 60)}")
+    elif bound < 0.8:
+        parts.append(f"UNTIL=2026{rng.randint(1, 12):02}{rng.randint(1, 28):02}T120000Z")
+    return ';'.join(parts)
+
+
+def test_occurrences_match_dateutil():
+    """
+    Test windowed expansion against dateutil on random rules and zones.
+    """
+    rng = random.Random(0)
+    for _ in range(500):
+        zone = rng.choice(['UTC', 'UTC-5', 'Europe/Paris', 'America/New_York'])
+        first = datetime(2025, rng.randint(1, 12), rng.randint(1, 28), rng.randint(6, 20),
+                         rng.choice([0, 30]), tzinfo=ZoneInfo('Etc/GMT+5' if zone == 'UTC-5'
+                                                              else zone))
+        rule = random_rule(rng)
+        duration = rng.choice([1800, 3600, 5400])
+        expected = [int(moment.timestamp()) for moment in rrulestr(rule, dtstart=first).between(
+            first, first + timedelta(days=3 * 365), inc=True)]
+        exdates = set(rng.sample(expected, min(len(expected), 2)))
+        start = int(first.timestamp())
+        series = RecurringEvent(start, start + duration, rule, exdates, zone)
+
+        for _ in range(3):
+            window_start = start + rng.randint(-10 * 86400, 400 * 86400)
+            window_end = window_start + rng.randint(3600, 60 * 86400)
+            occurrences = [(moment, moment + duration) for moment in expected
+                           if moment not in exdates and moment < window_end and
+                           moment + duration > window_start]
+            assert series.between(window_start, window_end) == occurrences, rule
+            assert list(series.occurrences(window_start, window_end)) == occurrences, rule
+
+
+def test_rule_parsing():
+    """
+    Test writing rules back and rejecting ones that cannot be expanded.
+    """
+    assert (Recurrence.parse('RRULE:FREQ=WEEKLY;BYDAY=WE,MO;INTERVAL=2;UNTIL=20251231')
+            .to_ical() == 'FREQ=WEEKLY;UNTIL=20251231T235959Z;INTERVAL=2;BYDAY=MO,WE')
+    for rule in ['FREQ=MONTHLY', 'FREQ=WEEKLY;BYMONTH=1', 'FREQ=DAILY;COUNT=2;UNTIL=20250101',
+                 'FREQ=WEEKLY;BYDAY=XX', 'FREQ=WEEKLY;WKST=SU']:
+        with pytest.raises(ValueError):
+            Recurrence.parse(rule)
+
+
+def test_recurring_availability():
+    """
+    Test that a year-long weekly series blocks its slots and nothing else.
+    """
+    calendar = CalendarManager()
+    first = datetime(2025, 3, 3, 10, tzinfo=pytz.UTC)  # a Monday
+    calendar.add_recurring_busy_time('r1', first, first + timedelta(hours=1),
+                                     'FREQ=WEEKLY;BYDAY=MO;COUNT=52',
+                                     exdates=[first + timedelta(weeks=2)])
+
+    monday = first + timedelta(weeks=30)
+    assert calendar.find_conflicts(['r1', 'c1'], monday, monday + timedelta(hours=1)) == ['r1']
+    assert not calendar.find_conflicts(['r1'], first + timedelta(weeks=2),
+                                       first + timedelta(weeks=2, hours=1))
+    assert not calendar.find_conflicts(['r1'], first + timedelta(weeks=52),
+                                       first + timedelta(weeks=52, hours=1))
+    assert not calendar.check_availability(monday.date(), monday.time(), 30, 'UTC', ['r1'])
+    # Slot search works around the occurrence and its buffer
+    assert calendar.suggest_next_slots('Technical Interview', 'UTC', monday.replace(hour=9),
+                                       count=2, participants=['r1']) == [
+        monday.replace(hour=11, minute=15), monday.replace(hour=12, minute=15)]
+    assert calendar.book_slot(['r1'], monday, monday + timedelta(minutes=30)) == ['r1']
+
+    # Booking a series checks each occurrence
+    assert calendar.book_recurring(['r1', 'c1'], first + timedelta(days=7, minutes=30),
+                                   first + timedelta(days=7, minutes=90),
+                                   'FREQ=DAILY;COUNT=5') == ['r1']
+    assert calendar.book_recurring(['c1'], first, first + timedelta(hours=1),
+                                   'FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR') == []
+    assert calendar.find_conflicts(['c1'], first + timedelta(days=100),
+                                   first + timedelta(days=100, hours=1)) == ['c1']
+
+
+def test_recurring_invite_matches_icalendar():
+    """
+    Test RRULE and EXDATE lines of the template writer against icalendar.
+    """
+    rng = random.Random(3)
+    calendar = CalendarManager()
+    for _ in range(100):
+        meeting_info = random_meeting(rng)
+        meeting_info['rrule'] = random_rule(rng)
+        meeting_info['exdates'] = [meeting_info['start_time'] + timedelta(weeks=week)
+                                   for week in range(1, rng.randint(1, 12))]
+        ics = calendar.calendar_event_ics(meeting_info)
+        assert ics == calendar.create_calendar_event(meeting_info).to_ical()
+        assert b'RRULE:' + Recurrence.parse(meeting_info['rrule']).to_ical().encode() in ics
+
+
+def test_recurring_bookings_persist(tmp_path):
+    """
+    Test that booked series survive a restart, reach other processes and respect holds.
+    """
+    path = str(tmp_path / "events.sqlite3")
+    first = datetime(2025, 3, 3, 10, tzinfo=pytz.UTC)  # a Monday
+    calendar = CalendarManager(event_store=EventStore(path))
+    other = CalendarManager(event_store=EventStore(path))
+
+    # Another session's hold on a later occurrence blocks the series; the holder's does not
+    held = first + timedelta(weeks=3)
+    assert calendar.hold_slot(['r1'], held, held + timedelta(hours=1), 's1') is not None
+    assert calendar.book_recurring(['r1', 'c1'], first, first + timedelta(hours=1),
+                                   'FREQ=WEEKLY;COUNT=10', session_id='s2') == ['r1']
+    assert calendar.book_recurring(['r1', 'c1'], first, first + timedelta(hours=1),
+                                   'FREQ=WEEKLY;COUNT=10', exdates=[first + timedelta(weeks=1)],
+                                   session_id='s1') == []
+
+    # The other manager sees the series and cannot book over it
+    week = first + timedelta(weeks=5)
+    assert other.find_conflicts(['r1', 'c1', 'c2'], week, week + timedelta(hours=1)) == [
+        'r1', 'c1']
+    daily = first + timedelta(days=7)
+    assert other.book_recurring(['c1'], daily, daily + timedelta(hours=1),
+                                'FREQ=DAILY;COUNT=30') == ['c1']
+    assert other.book_slot(['c2'], week, week + timedelta(hours=1)) == []
+
+    restarted = CalendarManager(event_store=EventStore(path))
+    assert restarted.find_conflicts(['r1', 'c1'], week, week + timedelta(hours=1)) == [
+        'r1', 'c1']
+    assert not restarted.find_conflicts(['r1'], first + timedelta(weeks=1),
+                                        first + timedelta(weeks=1, hours=1))
+    assert len(restarted.recurring.series('r1')) == 1
@@ -0,0 +1,63 @@
+"""
+Test module for the per-session conversation context store
+"""
+
+from datetime import datetime
+from scheduling_bot import SchedulingBot
+from session_store import ConversationContext, SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sessions_are_isolated():
+    """
+    Test that concurrent sessions on one bot do not share context.
+    """
+    bot = SchedulingBot()
+    bot.set_participants("r1@example.com", "c1@example.com", session_id="a")
+    bot.set_participants("r2@example.com", "c2@example.com", session_id="b")
+    bot.suggest_time_slot("Engineering", 45, session_id="a")
+
+    assert bot.get_context("a").current_candidate == "c1@example.com"
+    assert bot.get_context("b").current_candidate == "c2@example.com"
+    assert bot.get_context("a").duration == 45
+    assert bot.get_context("b").duration == 60
+    assert bot.context.current_candidate is None
+
+    bot.end_session("a")
+    assert bot.get_context("a").current_candidate is None
+
+
+def test_lru_and_ttl_eviction():
+    """
+    Test that the store stays bounded by size and idle time.
+    """
+    clock = FakeClock()
+    store = SessionStore(max_sessions=2, ttl_seconds=10, clock=clock)
+    store.get("a").meeting_type = "HR Screening"
+    store.get("b")
+    store.get("a")
+    store.get("c")  # evicts "b", the least recently used
+    assert "a" in store and "c" in store and "b" not in store
+    assert store.get("a").meeting_type == "HR Screening"
+
+    clock.now = 11
+    assert "a" not in store
+    assert len(store) == 0
+
+
+def test_context_dict_compatibility():
+    """
+    Test that the context still reads like the former context dict.
+    """
+    context = ConversationContext()
+    context['proposed_time'] = datetime(2025, 1, 1, 10)
+    assert context.proposed_time == datetime(2025, 1, 1, 10)
+    assert context.get('duration', 30) == 60
+    assert context.to_dict()['meeting_type'] is None
@@ -0,0 +1,113 @@
+"""
+Test module for the slot bitmap calendar representation
+"""
+
+import os
+import random
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytz
+from availability import AvailabilityIndex
+from calendar_utils import CalendarManager
+from config import CALENDAR_CONFIG
+from slot_bitmap import SlotBitmap
+
+
+def random_calendar(rng, participants, first_day, n_days):
+    """Events on 15-minute boundaries, so the bitmap represents them exactly."""
+    calendar = CalendarManager()
+    start = pytz.UTC.localize(datetime.combine(first_day, datetime.min.time()))
+    for participant in participants:
+        for _ in range(rng.randrange(10, 60)):
+            begin = start + timedelta(minutes=15 * rng.randrange(n_days * 96))
+            calendar.add_busy_time(participant, begin,
+                                   begin + timedelta(minutes=15 * rng.randrange(1, 9)))
+    return calendar
+
+
+def test_bitmap_matches_interval_index():
+    """
+    Test bitmap free/busy answers against the interval index, with buffers.
+    """
+    rng = random.Random(11)
+    people = [f"p{i}" for i in range(20)]
+    first_day = date(2025, 3, 3)
+    calendar = random_calendar(rng, people, first_day, 14)
+    bitmap = calendar.build_slot_bitmap(first_day, 14, slot_minutes=5)
+
+    for _ in range(500):
+        start = bitmap.origin + 300 * rng.randrange(bitmap.n_slots - 40)
+        end = start + 300 * rng.randrange(1, 30)
+        expected = [calendar.availability.is_free(p, start, end) for p in people]
+        free = bitmap.free_participants(people, start, end, calendar.buffer_time)
+        assert free.tolist() == expected
+
+
+def test_dilate_and_working_mask():
+    """
+    Test buffer dilation and the weekday working-hours mask.
+    """
+    bitmap = SlotBitmap(date(2025, 3, 3), 7, slot_minutes=15)  # Monday
+    busy = np.zeros(bitmap.n_slots, dtype=bool)
+    busy[40] = True
+    assert np.flatnonzero(bitmap.dilate(busy, 20)).tolist() == [38, 39, 40, 41, 42]
+
+    mask = bitmap.working_mask('UTC', {'start': 9, 'end': 17})
+    assert mask.sum() == 5 * 32  # five weekdays of eight hours
+    assert mask[36] and mask[67] and not mask[35] and not mask[68]
+
+    # 9 AM in New York is 14:00 UTC outside daylight saving time
+    mask = bitmap.working_mask('America/New_York', {'start': 9, 'end': 17})
+    assert mask[14 * 4] and not mask[14 * 4 - 1]
+
+
+def test_calendar_manager_uses_bitmap():
+    """
+    Test that slot suggestions and availability checks agree with and
+    without the bitmap when events sit on slot boundaries.
+    """
+    rng = random.Random(5)
+    people = ["r1", "r2", "c1"]
+    first_day = date(2025, 3, 3)
+    calendar = random_calendar(rng, people, first_day, 35)
+    tz = pytz.timezone('America/New_York')
+    start_from = tz.localize(datetime(2025, 3, 3, 8, 7))
+
+    for meeting_type in ('Initial Discussion', 'Final Round'):
+        expected = calendar.suggest_next_slots(meeting_type, 'America/New_York',
+                                               start_from, count=10,
+                                               participants=people)
+        calendar.build_slot_bitmap(first_day - timedelta(days=1), 35)
+        slots = calendar.suggest_next_slots(meeting_type, 'America/New_York',
+                                            start_from, count=10, participants=people)
+        calendar.slot_bitmap = None
+        assert slots == expected and len(slots) == 10
+
+    calendar.build_slot_bitmap(first_day, 14)
+    for _ in range(200):
+        day = first_day + timedelta(days=rng.randrange(10))
+        start = (datetime.min + timedelta(minutes=15 * rng.randrange(36, 64))).time()
+        with_bitmap = calendar.check_availability(day, start, 45, participants=people)
+        bitmap, calendar.slot_bitmap = calendar.slot_bitmap, None
+        assert with_bitmap == calendar.check_availability(day, start, 45,
+                                                          participants=people)
+        calendar.slot_bitmap = bitmap
+
+
+def test_bitmap_from_dataset():
+    """
+    Test building a bitmap straight from calendar_dataset.csv.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        CALENDAR_CONFIG['calendar_dataset'])
+    index = AvailabilityIndex()
+    index.load_csv(path, CALENDAR_CONFIG['busy_statuses'])
+    bitmap = SlotBitmap.from_csv(path, CALENDAR_CONFIG['busy_statuses'],
+                                 date(2025, 1, 1), 31)
+
+    rng = random.Random(3)
+    participants = [p for p in index.participants() if p in bitmap.rows]
+    assert participants
+    for participant in rng.sample(participants, 50):
+        for start, end in index.busy_intervals(participant, bitmap.origin, bitmap.end):
+            assert not bitmap.is_free([participant], start, end)
@@ -0,0 +1,165 @@
+"""
+Test module for slot holds and atomic booking
+"""
+
+import random
+import threading
+from datetime import datetime, timedelta
+import pytz
+from calendar_utils import CalendarManager
+from event_store import EventStore
+from slot_holds import HoldTable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hold_table_expiry():
+    """
+    Test that holds block other sessions until they expire or are released.
+    """
+    clock = FakeClock()
+    holds = HoldTable(60, clock)
+    first = holds.add(['r1', 'c1'], 1000, 2000, 'a')
+    holds.add(['r1', 'c2'], 3000, 4000, 'b', ttl_seconds=120)
+
+    assert holds.conflicts(['r1'], 1500, 2500, 'b') == ['r1']
+    assert holds.conflicts(['r1', 'c1'], 1500, 2500, 'a') == []  # a's own hold
+    assert holds.conflicts(['r1'], 2000, 3000) == []  # touching is not overlapping
+    assert len(holds.holds_for(['r1'], 'a')) == 1
+
+    clock.now = 60
+    assert holds.get(first.hold_id) is None and len(holds) == 1
+    assert holds.conflicts(['c1'], 1000, 2000) == []
+    holds.add(['c1'], 1000, 2000, 'c')
+    assert holds.release_session('c') == 1
+    clock.now = 500
+    assert len(holds) == 0 and not holds._deadlines
+
+
+def test_hold_and_confirm():
+    """
+    Test holding an offered slot, skipping it for others and confirming it.
+    """
+    clock = FakeClock()
+    calendar = CalendarManager()
+    calendar.holds.clock = clock
+    start = datetime(2025, 3, 3, 9, tzinfo=pytz.UTC)
+    end = start + timedelta(hours=1)
+
+    hold = calendar.hold_slot(['r1', 'c1'], start, end, 'a')
+    assert hold is not None
+    assert calendar.hold_slot(['r1', 'c2'], start, end, 'b') is None
+    # Suggestions for other sessions skip the held hour and its buffer; 'a' is
+    # still offered it
+    buffer = timedelta(minutes=calendar.buffer_time)
+    assert calendar.suggest_next_slots('Technical Interview', start_from=start,
+                                       participants=['r1'], session_id='b') == [
+        end + buffer]
+    assert calendar.suggest_next_slots('Technical Interview', start_from=start,
+                                       participants=['r1'], session_id='a') == [start]
+    window = (start, start + timedelta(hours=3))
+    assert start not in [option['start'] for option in
+                         calendar.find_common_slots(['r1', 'r2'], 60, window, 10, session_id='b')]
+    assert start in [option['start'] for option in
+                     calendar.find_common_slots(['r1', 'r2'], 60, window, 10, session_id='a')]
+    assert calendar.book_slot(['r1', 'c2'], start, end, 'b') == ['r1']
+
+    # Only the holding session can confirm, and only for the held meeting
+    assert not calendar.confirm_hold(hold.hold_id, session_id='b')
+    assert not calendar.confirm_hold(hold.hold_id, ['r1', 'c2'], start, end, 'a')
+    assert not calendar.confirm_hold(hold.hold_id, ['r1', 'c1'], start, end + timedelta(1), 'a')
+    # A booking that fails on a conflict keeps the hold
+    calendar.add_busy_time('c1', start, start + timedelta(minutes=30))
+    assert not calendar.confirm_hold(hold.hold_id, ['r1', 'c1'], start, end, 'a')
+    assert calendar.holds.get(hold.hold_id) is not None
+    calendar.cancel_booking(['c1'], start, start + timedelta(minutes=30))
+    assert calendar.confirm_hold(hold.hold_id, ['r1', 'c1'], start, end, 'a')
+    assert not calendar.confirm_hold(hold.hold_id)
+    assert calendar.find_conflicts(['r1', 'c1', 'c2'], start, end) == ['r1', 'c1']
+
+    # An expired hold books nothing and frees the slot for others
+    later = start + timedelta(days=1)
+    expired = calendar.hold_slot(['r2'], later, later + timedelta(hours=1), 'a', 30)
+    clock.now = 30
+    assert not calendar.confirm_hold(expired.hold_id)
+    assert calendar.hold_slot(['r2'], later, later + timedelta(hours=1), 'b') is not None
+
+
+def test_long_hold_blocks_suggestions():
+    """
+    Test that a hold longer than the meeting blocks every slot it covers, with buffers.
+    """
+    calendar = CalendarManager()
+    start = datetime(2025, 3, 3, 9, tzinfo=pytz.UTC)
+    calendar.hold_slot(['r1'], start, start.replace(hour=16), 'a')
+    buffer = timedelta(minutes=calendar.buffer_time)
+    expected = [start.replace(hour=16) + buffer,
+                start + timedelta(days=1), start + timedelta(days=1, minutes=30)]
+    for bitmap in [False, True]:
+        if bitmap:
+            calendar.build_slot_bitmap(start.date(), n_days=35)
+        assert calendar.suggest_next_slots('Initial Discussion', start_from=start, count=3,
+                                           participants=['r1'], session_id='b') == expected
+
+
+def run_sessions(calendar, n_sessions, recruiters, slots):
+    """
+    Let every session race to hold and confirm random recruiter slots.
+
+    Returns:
+        list: (recruiter, start, end) of every confirmed booking
+    """
+    booked = []
+    barrier = threading.Barrier(n_sessions)
+
+    def session(number):
+        rng = random.Random(number)
+        barrier.wait()
+        for _ in range(5):
+            recruiter = rng.choice(recruiters)
+            start = rng.choice(slots)
+            end = start + timedelta(minutes=rng.choice([30, 60]))
+            participants = [recruiter, f"candidate{number}"]
+            if rng.random() < 0.5:
+                hold = calendar.hold_slot(participants, start, end, number)
+                if hold is not None:
+                    if calendar.confirm_hold(hold.hold_id):
+                        booked.append((recruiter, start, end))
+                    else:
+                        calendar.release_hold(hold.hold_id)
+            elif not calendar.book_slot(participants, start, end, number):
+                booked.append((recruiter, start, end))
+
+    threads = [threading.Thread(target=session, args=(number,))
+               for number in range(n_sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return booked
+
+
+def test_no_double_bookings(tmp_path):
+    """
+    Test that hundreds of concurrent sessions never book overlapping slots.
+    """
+    origin = datetime(2025, 3, 3, 9, tzinfo=pytz.UTC)
+    slots = [origin + timedelta(minutes=15 * i) for i in range(32)]
+    recruiters = [f"recruiter{i}" for i in range(4)]
+    buffer = timedelta(minutes=CalendarManager().buffer_time)
+
+    for calendar in [CalendarManager(),
+                     CalendarManager(event_store=EventStore(str(tmp_path / "events.sqlite3")))]:
+        booked = run_sessions(calendar, 200, recruiters, slots)
+        assert booked
+        for recruiter in recruiters:
+            meetings = sorted((start, end) for r, start, end in booked if r == recruiter)
+            for (_, previous_end), (start, _) in zip(meetings, meetings[1:]):
+                assert start >= previous_end + buffer
+        assert len(calendar.holds) == 0
@@ -0,0 +1,174 @@
+"""
+Test module for pooled SMTP delivery of calendar invites, against a local
+SMTP stand-in
+"""
+
+import smtplib
+import socketserver
+import threading
+from datetime import datetime, timedelta
+import pytest
+import pytz
+from calendar_utils import CalendarManager
+from smtp_pool import SMTPConnectionPool
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server that records connections and delivered messages."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.sockets = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def drop_connections(self):
+        """Close every open session, as a server does with idle clients."""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+
+    def stop(self):
+        self.shutdown()
+        self.drop_connections()
+        self.server_close()
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.sockets.append(self.request)
+        self.reply("220 localhost ready")
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command.startswith("DATA"):
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data.rstrip(b"\r\n") == b".":
+                        break
+                    lines.append(data)
+                with self.server.lock:
+                    self.server.messages.append(b"".join(lines))
+                self.reply("250 OK")
+            elif command.startswith("RCPT") and "REFUSED" in command:
+                self.reply("550 No such user")
+            elif command.startswith("QUIT"):
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+def meeting(i):
+    start = pytz.UTC.localize(datetime(2025, 3, 3, 9) + timedelta(hours=i))
+    return {
+        'title': f"Interview {i}",
+        'start_time': start,
+        'end_time': start + timedelta(minutes=60),
+        'location': 'https://meet.google.com/abc-defg-hij',
+        'description': 'Technical interview',
+        'recruiter_email': 'recruiter@example.com',
+        'candidate_email': f"candidate{i}@example.com",
+        'meeting_type': 'Technical Interview',
+        'timezone': 'UTC'
+    }
+
+
+def local_pool(server, **kwargs):
+    return SMTPConnectionPool('127.0.0.1', server.port, username='', starttls=False,
+                              timeout=5, **kwargs)
+
+
+def test_invites_share_one_session():
+    """
+    Test that bulk and repeated sends reuse one authenticated session.
+    """
+    server = LocalSMTPServer()
+    try:
+        calendar = CalendarManager(smtp_pool=local_pool(server))
+        assert calendar.send_calendar_invites([meeting(i) for i in range(5)]) == [True] * 5
+        assert calendar.send_calendar_invite(meeting(5))
+        assert len(server.messages) == 6 and server.connections == 1
+        assert b"invite.ics" in server.messages[0]
+    finally:
+        server.stop()
+
+
+def test_reconnect_after_server_drops_session():
+    """
+    Test NOOP health checks and retrying on a fresh connection.
+    """
+    server = LocalSMTPServer()
+    try:
+        # keepalive_seconds=0: idle connections are always checked with NOOP
+        checked = CalendarManager(smtp_pool=local_pool(server, keepalive_seconds=0))
+        assert checked.send_calendar_invite(meeting(0))
+        server.drop_connections()
+        assert checked.send_calendar_invite(meeting(1))
+
+        # Without a health check the dropped session fails and is retried
+        unchecked = CalendarManager(smtp_pool=local_pool(server, keepalive_seconds=3600))
+        assert unchecked.send_calendar_invite(meeting(2))
+        server.drop_connections()
+        assert unchecked.send_calendar_invites([meeting(3), meeting(4)]) == [True, True]
+        assert len(server.messages) == 5 and server.connections == 4
+    finally:
+        server.stop()
+
+
+def test_refused_recipient_keeps_session():
+    """
+    Test that a refused recipient fails the message but not the session.
+    """
+    server = LocalSMTPServer()
+    try:
+        pool = local_pool(server)
+        calendar = CalendarManager(smtp_pool=pool)
+        refused = calendar.create_invite_message(
+            dict(meeting(0), recruiter_email='refused1@example.com',
+                 candidate_email='refused2@example.com'))
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            pool.send(refused)
+        assert calendar.send_calendar_invites([meeting(1), meeting(2)]) == [True, True]
+        assert len(server.messages) == 2 and server.connections == 1
+    finally:
+        server.stop()
+
+
+def test_pool_size_limits_connections():
+    """
+    Test that concurrent senders share at most pool_size connections.
+    """
+    server = LocalSMTPServer()
+    try:
+        calendar = CalendarManager(smtp_pool=local_pool(server, pool_size=2))
+        threads = [threading.Thread(target=calendar.send_calendar_invites,
+                                    args=([meeting(i), meeting(i + 1)],))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(server.messages) == 16
+        assert server.connections <= 2
+    finally:
+        server.stop()
@@ -0,0 +1,143 @@
+"""
+Test module for the timer service and meeting reminders
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+import pytz
+from calendar_utils import CalendarManager
+from invite_queue import InviteDispatcher
+from test_invite_queue import FlakyPool
+from test_slot_holds import FakeClock
+from timer_service import MeetingReminders, TimerService
+
+
+def test_timers_fire_in_order_and_persist(tmp_path):
+    """
+    Test firing order, cancelling, moving and reloading pending timers.
+    """
+    path = str(tmp_path / "timers.sqlite3")
+    clock = FakeClock()
+    timers = TimerService(path, clock)
+    fired = []
+    timers.register('ping', fired.append)
+    timers.schedule_many([('ping', due, {'due': due}, f"t{due}") for due in [30, 10, 20, 40]])
+    timers.schedule('ping', datetime(1970, 1, 1, 0, 0, 5, tzinfo=pytz.UTC), 'dated')
+    assert timers.cancel('t20') and not timers.cancel('t20')
+    timers.schedule('ping', 50, {'due': 50}, 't30')  # moved
+
+    assert timers.run_due(25) == 2
+    assert fired == ['dated', {'due': 10}]
+    assert len(timers) == 2
+
+    # Pending timers outlive the process; kinds without a handler stay stored
+    timers.schedule('other', 1, None)
+    restarted = TimerService(path, clock)
+    restarted.register('ping', fired.append)
+    assert len(restarted) == 3
+    assert restarted.get('t30')[1:] == (50, {'due': 50})
+    assert restarted.run_due(100) == 2
+    assert fired[2:] == [{'due': 40}, {'due': 50}]
+    assert len(TimerService(path, clock)) == 1
+
+
+def test_late_handlers_and_retries(caplog):
+    """
+    Test that due timers wait for their handler and failing handlers are retried.
+    """
+    clock = FakeClock()
+    timers = TimerService(':memory:', clock, max_attempts=3, base_delay=10)
+    timers.schedule('ping', 5, 'early')
+    assert timers.run_due(10) == 0 and len(timers) == 1
+    fired = []
+    timers.register('ping', fired.append)
+    assert timers.run_due(10) == 1 and fired == ['early'] and len(timers) == 0
+
+    calls = []
+
+    def flaky(payload):
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise RuntimeError("mail server down")
+
+    timers.register('flaky', flaky)
+    timers.schedule('flaky', 0, None, 'f')
+    clock.now = 100
+    with caplog.at_level(logging.ERROR, logger='timer_service'):
+        assert timers.run_due(100) == 1 and timers.get('f')[1] == 110
+        assert timers.run_due(109) == 0
+        clock.now = 110
+        assert timers.run_due() == 1 and timers.get('f')[1] == 130
+        clock.now = 130
+        assert timers.run_due() == 1 and timers.get('f') is None
+    assert calls == [100, 110, 130]
+    assert [record.exc_info[1].args[0] for record in caplog.records] == ['mail server down'] * 2
+
+    # A timer that keeps failing is dropped after max_attempts runs
+    timers.register('broken', lambda payload: 1 / 0)
+    timers.schedule('broken', 0, None, 'b')
+    for _ in range(3):
+        clock.now += 1000
+        assert timers.run_due() == 1
+    assert timers.get('b') is None and len(timers) == 0
+
+
+def test_background_thread():
+    """
+    Test that the timer thread wakes up for a timer earlier than the rest.
+    """
+    timers = TimerService(':memory:')
+    fired = []
+    timers.register('ping', fired.append)
+    timers.start()
+    try:
+        timers.schedule('ping', time.time() + 3600, 'later')
+        timers.schedule('ping', time.time() + 0.05, 'soon')
+        deadline = time.monotonic() + 5
+        while not fired and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert fired == ['soon'] and len(timers) == 1
+    finally:
+        timers.stop()
+
+
+def test_reminders_and_follow_ups(tmp_path):
+    """
+    Test reminder and follow-up emails until the candidate answers.
+    """
+    clock = FakeClock()
+    start = datetime(2025, 3, 10, 9, tzinfo=pytz.UTC)
+    clock.now = (start - timedelta(days=4)).timestamp()
+    pool = FlakyPool(0)
+    dispatcher = InviteDispatcher(CalendarManager(smtp_pool=pool),
+                                  str(tmp_path / "queue.sqlite3"))
+    timers = TimerService(str(tmp_path / "timers.sqlite3"), clock)
+    reminders = MeetingReminders(timers, dispatcher, reminder_minutes=[1440, 60],
+                                 follow_up_hours=24, max_follow_ups=2)
+    meeting = {'title': 'Interview', 'start_time': start, 'end_time': start + timedelta(hours=1),
+               'timezone': 'UTC', 'location': 'https://meet.google.com/abc',
+               'meeting_type': 'Technical Interview', 'recruiter_email': 'r@example.com',
+               'candidate_email': 'c@example.com'}
+    uid = reminders.schedule_meeting(meeting)
+    assert reminders.schedule_meeting(meeting) == uid and len(timers) == 3
+
+    dispatcher.start()
+    try:
+        for days in range(1, 4):
+            clock.now += 86400
+            timers.run_due()
+        # Two follow-ups (days 1 and 2), then the day-before reminder
+        deadline = time.monotonic() + 10
+        while len(pool.sent) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [m['Subject'] for m in pool.sent] == [
+            'Please confirm: Interview', 'Please confirm: Interview', 'Reminder: Interview']
+        assert pool.sent[0]['To'] == 'c@example.com'
+        assert pool.sent[2]['To'] == 'c@example.com, r@example.com'
+
+        # A decline cancels what is left
+        reminders.record_response(uid, 'declined')
+        assert len(timers) == 0
+    finally:
+        dispatcher.stop()
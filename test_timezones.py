@@ -0,0 +1,69 @@
+"""
+Test module for zone resolution and offset transition tables
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+import pytz
+from calendar_utils import CalendarManager
+from timezones import OffsetTable, get_timezone, working_windows
+
+ZONES = ['America/New_York', 'Europe/London', 'Australia/Lord_Howe', 'Asia/Kolkata',
+         'America/Sao_Paulo', 'UTC']
+
+
+def test_dataset_offsets():
+    """
+    Test the datasets' fixed-offset zone names and caching.
+    """
+    assert get_timezone('UTC-5').utcoffset(None) == timedelta(hours=-5)
+    assert get_timezone('UTC+5:30').utcoffset(None) == timedelta(hours=5, minutes=30)
+    assert get_timezone('UTC') is pytz.UTC
+    assert get_timezone('Europe/Paris') is get_timezone('Europe/Paris')
+
+    calendar = CalendarManager()
+    # 9 AM Monday in UTC-5 is 14:00 UTC
+    assert calendar.check_availability(date(2025, 3, 3), time(9), 60, timezone='UTC-5')
+    assert not calendar.check_availability(date(2025, 3, 3), time(8), 60, timezone='UTC-5')
+    slot = calendar.suggest_next_slot('Technical Interview', 'UTC+5',
+                                      datetime(2025, 3, 1, 12))
+    assert slot.utcoffset() == timedelta(hours=5) and slot.hour == 9
+
+
+def test_offset_table_matches_pytz():
+    """
+    Test conversions against pytz around DST transitions, including repeated
+    and skipped wall-clock times.
+    """
+    rng = random.Random(9)
+    start = int(datetime(2024, 1, 1, tzinfo=pytz.UTC).timestamp())
+    end = int(datetime(2026, 1, 1, tzinfo=pytz.UTC).timestamp())
+    for name in ZONES:
+        tz = get_timezone(name)
+        table = OffsetTable(tz, start, end)
+        moments = [rng.randrange(start + 86400, end - 86400) for _ in range(300)]
+        # Wall-clock times on either side of every transition
+        moments += [moment + offset + delta
+                    for moment, offset in zip(table.times[1:], table.offsets)
+                    for delta in range(-7200, 7201, 900)]
+        for moment in moments:
+            assert table.offset_at(moment) == datetime.fromtimestamp(
+                moment, tz).utcoffset().total_seconds()
+            local = datetime.fromtimestamp(moment, pytz.UTC).replace(tzinfo=None)
+            local_seconds = int(local.replace(tzinfo=pytz.UTC).timestamp())
+            expected = int(tz.localize(local, is_dst=False).timestamp())
+            assert table.to_utc(local_seconds) == expected, (name, local)
+
+
+def test_working_windows_match_localize():
+    """
+    Test cached working windows against localizing each day with pytz.
+    """
+    first_day = date(2025, 3, 1)
+    for name in ZONES:
+        tz = get_timezone(name)
+        expected = [(int(tz.localize(datetime.combine(day, time(9))).timestamp()),
+                     int(tz.localize(datetime.combine(day, time(17))).timestamp()))
+                    for day in (first_day + timedelta(days=i) for i in range(60))
+                    if day.weekday() < 5]
+        assert list(working_windows(name, 9, 17, first_day, 60)) == expected
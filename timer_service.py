@@ -0,0 +1,394 @@
+"""
+Timer Service Module
+
+This module fires timed work (meeting reminders, follow-ups on unanswered
+invites) from one background thread, however many timers are pending.
+
+It provides:
+- A min-heap of deadlines with O(log n) scheduling and cancellation
+- Persistence of pending timers in SQLite, so they survive restarts
+- Reminder emails before booked meetings and follow-up nudges to candidates
+  who have not answered their invite, delivered by the invite dispatcher
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from availability import to_timestamp
+from calendar_utils import CalendarManager
+from config import TIMER_CONFIG
+from invite_queue import FOLLOW_UP, REMINDER, _decode, _encode
+
+logger = logging.getLogger(__name__)
+
+# iCalendar participation status of an invitee who has not answered
+NEEDS_ACTION = 'NEEDS-ACTION'
+
+
+class TimerService:
+    """
+    Persistent one-shot timers, fired by a single thread.
+
+    Every timer has an ID, a kind and a JSON payload; when it comes due, the
+    handler registered for its kind is called with the payload. Scheduling an
+    existing ID moves the timer. Cancelled and moved timers leave their heap
+    entry behind; it is skipped when it comes up, and the heap is rebuilt
+    when such entries outnumber the live ones.
+
+    A timer is removed from the database only after its handler returns, so
+    timers interrupted by a restart fire again (at least once); a timer
+    cannot be cancelled while its handler runs. A handler that raises is
+    retried with exponential backoff, up to ``max_attempts`` runs. Due
+    timers of a kind with no handler wait, stored, until one is registered.
+    """
+
+    def __init__(self, path=None, clock=time.time, max_attempts=None, base_delay=None,
+                 max_delay=None):
+        """
+        Open the timer store and load the pending timers. Retry defaults come
+        from TIMER_CONFIG.
+
+        Args:
+            path (str, optional): SQLite file holding the timers; ':memory:'
+                keeps them in memory (default: TIMER_CONFIG['timer_path'])
+            clock (callable): Wall-clock time source, in POSIX seconds
+            max_attempts (int, optional): Handler runs before a failing
+                timer is dropped
+            base_delay (float, optional): Seconds before the first retry;
+                doubles with every further failure
+            max_delay (float, optional): Longest delay between retries
+        """
+        if path is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                TIMER_CONFIG['timer_path'])
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.clock = clock
+        self.max_attempts = max_attempts or TIMER_CONFIG['max_attempts']
+        self.base_delay = TIMER_CONFIG['base_delay'] if base_delay is None else base_delay
+        self.max_delay = TIMER_CONFIG['max_delay'] if max_delay is None else max_delay
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            # Each schedule, cancel and fire commits; WAL keeps commits cheap
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS timers (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                due REAL NOT NULL,
+                payload TEXT NOT NULL
+            )""")
+        self._db.commit()
+        self._handlers = {}
+        self._sequence = itertools.count()
+        self._timers = {}  # timer ID -> (due, sequence, kind, payload)
+        self._heap = []    # (due, sequence, timer ID)
+        self._parked = {}  # kind without a handler -> heap entries of its due timers
+        self._failures = {}  # timer ID -> failed handler runs
+        for timer_id, kind, due, payload in self._db.execute(
+                "SELECT id, kind, due, payload FROM timers"):
+            sequence = next(self._sequence)
+            self._timers[timer_id] = (due, sequence, kind, payload)
+            self._heap.append((due, sequence, timer_id))
+        heapq.heapify(self._heap)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._stopping = False
+
+    def __len__(self):
+        return len(self._timers)
+
+    def register(self, kind, handler):
+        """Call ``handler(payload)`` when timers of ``kind`` come due."""
+        with self._wakeup:
+            self._handlers[kind] = handler
+            parked = self._parked.pop(kind, ())
+            for entry in parked:
+                heapq.heappush(self._heap, entry)
+            if parked:
+                self._wakeup.notify()
+
+    def get(self, timer_id):
+        """
+        Return a pending timer.
+
+        Returns:
+            tuple: (kind, due, payload), or None if the timer is not pending
+        """
+        with self._lock:
+            timer = self._timers.get(timer_id)
+        if timer is None:
+            return None
+        due, _, kind, payload = timer
+        return kind, due, json.loads(payload, object_hook=_decode)
+
+    def schedule(self, kind, due, payload=None, timer_id=None):
+        """
+        Schedule a timer, replacing any pending timer with the same ID.
+
+        Args:
+            kind (str): Selects the handler
+            due (float or datetime): When to fire (POSIX seconds or an aware
+                datetime)
+            payload (optional): JSON-serializable handler argument; may
+                contain datetimes
+            timer_id (str, optional): ID to cancel or move the timer by
+                (default: a new one)
+
+        Returns:
+            str: The timer ID
+        """
+        return self.schedule_many([(kind, due, payload, timer_id)])[0]
+
+    def schedule_many(self, timers):
+        """Schedule (kind, due, payload, timer_id) timers in one transaction."""
+        rows = []
+        for kind, due, payload, timer_id in timers:
+            if isinstance(due, datetime):
+                due = to_timestamp(due)
+            rows.append((timer_id or f"{kind}:{next(self._sequence)}:{time.time_ns()}",
+                         kind, float(due), json.dumps(payload, default=_encode)))
+        with self._wakeup:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO timers (id, kind, due, payload) VALUES (?, ?, ?, ?)",
+                rows)
+            self._db.commit()
+            earliest = self._heap[0][0] if self._heap else None
+            for timer_id, kind, due, payload in rows:
+                sequence = next(self._sequence)
+                self._timers[timer_id] = (due, sequence, kind, payload)
+                self._failures.pop(timer_id, None)
+                heapq.heappush(self._heap, (due, sequence, timer_id))
+            if earliest is None or self._heap[0][0] < earliest:
+                self._wakeup.notify()
+        return [row[0] for row in rows]
+
+    def cancel(self, timer_id):
+        """Cancel a pending timer; returns whether there was one."""
+        with self._lock:
+            if self._timers.pop(timer_id, None) is None:
+                return False
+            self._failures.pop(timer_id, None)
+            self._db.execute("DELETE FROM timers WHERE id = ?", (timer_id,))
+            self._db.commit()
+            if len(self._heap) > 2 * len(self._timers) + 64:
+                self._compact()
+        return True
+
+    def _compact(self):
+        """Drop heap entries of cancelled and moved timers."""
+        self._heap = [(due, sequence, timer_id)
+                      for timer_id, (due, sequence, _, _) in self._timers.items()]
+        heapq.heapify(self._heap)
+        self._parked = {}  # parked timers are back on the heap
+
+    def _pop_due(self, now):
+        """
+        Take the next due timer off the heap.
+
+        Returns:
+            tuple: (timer ID, kind, payload) and None, or None and the
+                seconds until the next timer is due (None if there is none)
+        """
+        heap = self._heap
+        while heap:
+            due, sequence, timer_id = heap[0]
+            timer = self._timers.get(timer_id)
+            if timer is None or timer[1] != sequence:
+                heapq.heappop(heap)  # cancelled or moved
+                continue
+            if due > now:
+                return None, due - now
+            heapq.heappop(heap)
+            if timer[2] not in self._handlers:
+                # Kept until a handler for the kind is registered
+                self._parked.setdefault(timer[2], []).append((due, sequence, timer_id))
+                continue
+            del self._timers[timer_id]
+            return (timer_id, timer[2], timer[3]), None
+        return None, None
+
+    def _fire(self, timer_id, kind, payload):
+        error = None
+        try:
+            self._handlers[kind](json.loads(payload, object_hook=_decode))
+        except Exception as e:
+            error = e
+        with self._wakeup:
+            if timer_id in self._timers:  # the handler scheduled it again
+                self._failures.pop(timer_id, None)
+                return
+            attempts = self._failures.pop(timer_id, 0) + 1
+            if error is not None and attempts < self.max_attempts:
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+                logger.error("Timer %s (%s) failed, retrying in %.0f s",
+                             timer_id, kind, delay, exc_info=error)
+                due = self.clock() + delay
+                sequence = next(self._sequence)
+                self._db.execute("UPDATE timers SET due = ? WHERE id = ?", (due, timer_id))
+                self._timers[timer_id] = (due, sequence, kind, payload)
+                self._failures[timer_id] = attempts
+                heapq.heappush(self._heap, (due, sequence, timer_id))
+                self._wakeup.notify()
+            else:
+                if error is not None:
+                    logger.error("Timer %s (%s) failed %d times, dropping it",
+                                 timer_id, kind, attempts, exc_info=error)
+                self._db.execute("DELETE FROM timers WHERE id = ?", (timer_id,))
+            self._db.commit()
+
+    def run_due(self, now=None):
+        """
+        Fire every timer due at ``now`` on the calling thread.
+
+        Returns:
+            int: Number of timers fired
+        """
+        now = self.clock() if now is None else now
+        fired = 0
+        while True:
+            with self._lock:
+                timer, _ = self._pop_due(now)
+            if timer is None:
+                return fired
+            self._fire(*timer)
+            fired += 1
+
+    def start(self):
+        """Start firing timers on a background thread."""
+        with self._lock:
+            self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='timer-service', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the background thread after the handler it is running."""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while True:
+                    if self._stopping:
+                        return
+                    timer, wait = self._pop_due(self.clock())
+                    if timer is not None:
+                        break
+                    self._wakeup.wait(wait)
+            self._fire(*timer)
+
+
+class MeetingReminders:
+    """
+    Reminder and follow-up emails for booked meetings.
+
+    Booking a meeting schedules a reminder for each of ``reminder_minutes``
+    before it starts, and a follow-up to the candidate every
+    ``follow_up_hours`` until they answer the invite, at most
+    ``max_follow_ups`` times and never after the meeting has started. Emails
+    are queued on the invite dispatcher, which retries failed sends.
+    """
+
+    def __init__(self, timers, dispatcher, reminder_minutes=None, follow_up_hours=None,
+                 max_follow_ups=None):
+        """
+        Register the reminder handlers on a timer service. Defaults come from
+        TIMER_CONFIG.
+
+        Args:
+            timers (TimerService): Fires the reminders
+            dispatcher (InviteDispatcher): Sends the emails
+            reminder_minutes (list, optional): Minutes before the meeting at
+                which reminders are sent
+            follow_up_hours (float, optional): Hours between follow-ups
+            max_follow_ups (int, optional): Most follow-ups per meeting
+        """
+        self.timers = timers
+        self.dispatcher = dispatcher
+        self.reminder_minutes = (TIMER_CONFIG['reminder_minutes'] if reminder_minutes is None
+                                 else reminder_minutes)
+        self.follow_up_seconds = 3600 * (follow_up_hours or TIMER_CONFIG['follow_up_hours'])
+        self.max_follow_ups = (TIMER_CONFIG['max_follow_ups'] if max_follow_ups is None
+                               else max_follow_ups)
+        timers.register(REMINDER, self._send_reminder)
+        timers.register(FOLLOW_UP, self._send_follow_up)
+
+    def schedule_meeting(self, meeting_info):
+        """
+        Schedule the reminders and follow-ups of a booked meeting.
+
+        Scheduling the same meeting again moves its timers rather than adding
+        more.
+
+        Args:
+            meeting_info (dict): Meeting details (same structure as
+                CalendarManager.create_calendar_event)
+
+        Returns:
+            str: The meeting's UID, to record responses and cancel it by
+        """
+        uid = CalendarManager.invite_uid(meeting_info)
+        now = self.timers.clock()
+        start = to_timestamp(meeting_info['start_time'])
+        timers = [(REMINDER, start - 60 * minutes,
+                   {'meeting': meeting_info, 'minutes': minutes}, f"{REMINDER}:{minutes}:{uid}")
+                  for minutes in self.reminder_minutes if start - 60 * minutes > now]
+        if self.max_follow_ups and now + self.follow_up_seconds < start:
+            timers.append((FOLLOW_UP, now + self.follow_up_seconds,
+                           {'meeting': meeting_info, 'sent': 0}, f"{FOLLOW_UP}:{uid}"))
+        self.timers.schedule_many(timers)
+        return uid
+
+    def record_response(self, uid, partstat):
+        """
+        Note the candidate's answer to an invite.
+
+        Any answer other than NEEDS-ACTION stops the follow-ups; a decline
+        also cancels the reminders.
+
+        Args:
+            uid (str): Meeting UID (see schedule_meeting)
+            partstat (str): iCalendar PARTSTAT, e.g. 'ACCEPTED' or 'DECLINED'
+        """
+        partstat = partstat.upper()
+        if partstat == NEEDS_ACTION:
+            return
+        if partstat == 'DECLINED':
+            self.cancel_meeting(uid)
+        else:
+            self.timers.cancel(f"{FOLLOW_UP}:{uid}")
+
+    def cancel_meeting(self, uid):
+        """Cancel every pending reminder and follow-up of a meeting."""
+        self.timers.cancel(f"{FOLLOW_UP}:{uid}")
+        for minutes in self.reminder_minutes:
+            self.timers.cancel(f"{REMINDER}:{minutes}:{uid}")
+
+    def _send_reminder(self, payload):
+        meeting_info = payload['meeting']
+        uid = CalendarManager.invite_uid(meeting_info)
+        self.dispatcher.enqueue(meeting_info, f"{REMINDER}:{payload['minutes']}:{uid}",
+                                REMINDER)
+
+    def _send_follow_up(self, payload):
+        meeting_info = payload['meeting']
+        uid = CalendarManager.invite_uid(meeting_info)
+        sent = payload['sent'] + 1
+        self.dispatcher.enqueue(meeting_info, f"{FOLLOW_UP}:{sent}:{uid}", FOLLOW_UP)
+        due = self.timers.clock() + self.follow_up_seconds
+        if sent < self.max_follow_ups and due < to_timestamp(meeting_info['start_time']):
+            self.timers.schedule(FOLLOW_UP, due, {'meeting': meeting_info, 'sent': sent},
+                                 f"{FOLLOW_UP}:{uid}")
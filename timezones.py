@@ -0,0 +1,196 @@
+"""
+Timezone Module
+
+This module resolves the timezone names used by the bot and the datasets once
+and precomputes UTC offsets over a search horizon, so that slot searches do
+not localize every candidate time through pytz.
+
+It provides:
+- Cached zone lookup that also understands the datasets' 'UTC-5' / 'UTC+5:30'
+  fixed-offset notation
+- Tables of UTC-offset transitions over a time range for fast conversions
+- Cached UTC intervals of working hours for a zone
+"""
+
+import bisect
+import functools
+from datetime import datetime, time, timedelta, timezone
+import pytz
+
+
+def parse_utc_offset(name):
+    """
+    Parse the fixed-offset zone names used by the datasets.
+
+    Args:
+        name (str): Zone name such as 'UTC', 'UTC-5' or 'UTC+5:30'
+
+    Returns:
+        timedelta: Offset from UTC, or None if ``name`` is not of that form
+    """
+    if not name.startswith('UTC'):
+        return None
+    offset = name[3:]
+    if not offset:
+        return timedelta(0)
+    if offset[0] not in '+-':
+        return None
+    hours, _, minutes = offset[1:].partition(':')
+    try:
+        delta = timedelta(hours=int(hours), minutes=int(minutes or 0))
+    except ValueError:
+        return None
+    return -delta if offset[0] == '-' else delta
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(name):
+    """
+    Resolve a timezone name, caching the result.
+
+    Args:
+        name (str): IANA name ('Europe/Paris'), 'UTC' or a dataset offset
+            such as 'UTC-5'
+
+    Returns:
+        pytz tzinfo: Zone object supporting ``localize``
+
+    Raises:
+        pytz.UnknownTimeZoneError: If the name is not recognized
+    """
+    offset = parse_utc_offset(name)
+    if offset is None:
+        return pytz.timezone(name)
+    if not offset:
+        return pytz.UTC
+    return pytz.FixedOffset(int(offset.total_seconds()) // 60)
+
+
+class OffsetTable:
+    """
+    UTC offsets of one zone over [start, end), as a list of transitions.
+
+    Offsets are sampled every six hours (zones change offset at most a few
+    times a year) and each change is narrowed down to the exact second, so
+    any tzinfo works and a conversion afterwards is a binary search.
+    """
+
+    STEP = 6 * 3600
+
+    def __init__(self, tz, start, end):
+        """
+        Build the table.
+
+        Args:
+            tz (tzinfo): Zone, e.g. from get_timezone
+            start, end (int): Range in POSIX seconds
+        """
+        self.tz = tz
+        self.start = start
+        self.end = end
+        self.times = [start]  # UTC instants at which each offset starts
+        offset, dst = self._probe(start)
+        self.offsets = [offset]
+        self.dst = [dst]
+
+        previous = start
+        for moment in range(start + self.STEP, end + self.STEP, self.STEP):
+            probed = self._probe(moment)
+            if probed[0] != self.offsets[-1]:
+                # The offset changed in (previous, moment]; find the exact second
+                low, high = previous, moment
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if self._probe(middle)[0] == self.offsets[-1]:
+                        low = middle
+                    else:
+                        high = middle
+                self.times.append(high)
+                self.offsets.append(probed[0])
+                self.dst.append(probed[1])
+            previous = moment
+
+    def _probe(self, moment):
+        local = datetime.fromtimestamp(moment, timezone.utc).astimezone(self.tz)
+        return int(local.utcoffset().total_seconds()), bool(local.dst())
+
+    def offset_at(self, moment):
+        """UTC offset in seconds at a POSIX timestamp."""
+        return self.offsets[max(bisect.bisect_right(self.times, moment) - 1, 0)]
+
+    def to_utc(self, local_seconds):
+        """
+        Convert a local wall-clock time to a POSIX timestamp.
+
+        Args:
+            local_seconds (int): Wall-clock time as seconds since the local epoch
+
+        Returns:
+            int: POSIX seconds. Like pytz's ``localize(is_dst=False)``,
+                ambiguous and skipped times use standard time.
+        """
+        guess = bisect.bisect_right(self.times, local_seconds - self.offsets[0]) - 1
+        candidates = range(max(guess - 1, 0), min(guess + 2, len(self.offsets)))
+        valid = [i for i in candidates
+                 if self.offset_at(local_seconds - self.offsets[i]) == self.offsets[i]]
+        if len(valid) != 1:
+            # Repeated or skipped wall-clock time: prefer standard time
+            pool = valid or list(candidates)
+            valid = [i for i in pool if not self.dst[i]] or pool
+        return local_seconds - self.offsets[valid[0]]
+
+
+def offset_table(name, start, end):
+    """
+    OffsetTable of a zone covering [start, end).
+
+    Tables span whole UTC calendar years and are cached, so searches over
+    nearby ranges share one table.
+    """
+    return _year_table(name, datetime.fromtimestamp(start, timezone.utc).year,
+                       datetime.fromtimestamp(end, timezone.utc).year)
+
+
+@functools.lru_cache(maxsize=256)
+def _year_table(name, first_year, last_year):
+    return OffsetTable(get_timezone(name),
+                       int(datetime(first_year, 1, 1, tzinfo=timezone.utc).timestamp()),
+                       int(datetime(last_year + 1, 1, 1, tzinfo=timezone.utc).timestamp()))
+
+
+@functools.lru_cache(maxsize=1024)
+def working_windows(name, start_hour, end_hour, first_day, n_days):
+    """
+    UTC intervals of working hours on weekdays, computed once per zone and range.
+
+    Args:
+        name (str): Zone name
+        start_hour, end_hour (int): Local working hours
+        first_day (date): First local day
+        n_days (int): Number of days
+
+    Returns:
+        tuple: (start, end) POSIX seconds per weekday
+    """
+    epoch_day = (first_day - datetime(1970, 1, 1).date()).days
+    # Local midnights span these UTC instants, give or take a day of offset
+    table = offset_table(name, (epoch_day - 1) * 86400, (epoch_day + n_days + 1) * 86400)
+    windows = []
+    for offset in range(n_days):
+        day = first_day + timedelta(days=offset)
+        if day.weekday() >= 5:  # Skip weekends
+            continue
+        midnight = (epoch_day + offset) * 86400
+        windows.append((table.to_utc(midnight + start_hour * 3600),
+                        table.to_utc(midnight + end_hour * 3600)))
+    return tuple(windows)
+
+
+def localize(name, dt):
+    """Attach a zone (by name) to a naive local datetime."""
+    return get_timezone(name).localize(dt)
+
+
+def local_midnight(name, day):
+    """POSIX timestamp of the start of a local day."""
+    return int(localize(name, datetime.combine(day, time())).timestamp())
@@ -1,7 +1,12 @@
 """Utility functions for the AI Interview Scheduler application."""
 
 import random
+import re
 import string
+import time
+from typing import Iterator, Optional
+
+_WORD = re.compile(r'\s*\S+\s*')
 
 
 def generate_meet_link() -> str:
@@ -14,3 +19,31 @@ def generate_meet_link() -> str:
     chars = string.ascii_letters + string.digits
     code = ''.join(random.choices(chars, k=10))
     return f"https://meet.google.com/{code}-{code[:3]}-{code[3:6]}"
+
+
+def stream_words(text: str, word_delay: float = 0.0,
+                 max_seconds: Optional[float] = None) -> Iterator[str]:
+    """Yield a text word by word, for streaming it into the chat.
+
+    Chunks keep their whitespace, so they join back into ``text`` exactly
+    (line breaks in markdown responses survive).
+
+    Args:
+        text (str): Text to stream.
+        word_delay (float): Pause before each word after the first, in seconds.
+        max_seconds (float, optional): Upper bound on the total pause; long
+            texts get a shorter per-word delay.
+
+    Yields:
+        str: Successive chunks of ``text``.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        yield text
+        return
+    if max_seconds is not None and len(words) > 1:
+        word_delay = min(word_delay, max_seconds / (len(words) - 1))
+    for i, word in enumerate(words):
+        if i and word_delay > 0:
+            time.sleep(word_delay)
+        yield word